@@ -6,13 +6,30 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
-from app.books.models import Book, Genre  # noqa: F401
+from app.admin.analytics_models import (  # noqa: F401
+    SalesDaily,
+    SalesDailyTotal,
+    SalesRollupState,
+)
+from app.books.models import (  # noqa: F401
+    Book,
+    BookCopurchase,
+    BookCopurchasePair,
+    BookCopurchaseState,
+    Genre,
+)
 from app.cart.models import Cart, CartItem  # noqa: F401
 from app.core.config import get_settings
+from app.core.idempotency import IdempotencyKey  # noqa: F401
 from app.db.base import Base
-from app.orders.models import Order, OrderItem  # noqa: F401
+from app.orders.models import (  # noqa: F401
+    Order,
+    OrderItem,
+    StockReservation,
+    UserBookPurchase,
+)
 from app.prebooks.models import PreBooking  # noqa: F401
-from app.reviews.models import Review  # noqa: F401
+from app.reviews.models import BookRatingStats, Review  # noqa: F401
 from app.users.models import OAuthAccount, RefreshToken, User  # noqa: F401
 from app.wishlist.models import WishlistItem  # noqa: F401
 
@@ -41,14 +58,24 @@ def get_url() -> str:
     return settings.DATABASE_URL
 
 
+# Indexes managed only by hand-written migrations.
+_UNMANAGED_INDEXES = {
+    "ix_books_search_vector",
+    # pg_trgm GIN indexes live outside the models so create_all() works on
+    # databases without the extension (see h4i5j6k7l8m9 migration).
+    "ix_books_author_trgm",
+    "ix_books_title_trgm",
+}
+
+
 def include_object(object, name, type_, reflected, compare_to):
-    """Exclude FTS GIN index from autogenerate detection (Alembic bug #1390).
+    """Exclude hand-managed GIN indexes from autogenerate detection (Alembic bug #1390).
 
     Alembic repeatedly detects expression-based GIN indexes as changed due to
     PostgreSQL normalizing the stored expression differently from what Alembic writes.
-    Excluding this index prevents spurious migrations after initial creation.
+    Excluding these indexes prevents spurious migrations after initial creation.
     """
-    if type_ == "index" and name == "ix_books_search_vector":
+    if type_ == "index" and name in _UNMANAGED_INDEXES:
         return False
     return True
 
@@ -0,0 +1,96 @@
+"""Create book_rating_stats table.
+
+Per-book review count, rating sum and 1-5 histogram, maintained incrementally by
+ReviewRepository. avg_rating and bayesian_avg are stored generated columns.
+Backfilled from existing non-deleted reviews.
+
+Revision ID: h3i4j5k6l7m8
+Revises: g2h3i4j5k6l7
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "h3i4j5k6l7m8"
+down_revision: str | None = "g2h3i4j5k6l7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "book_rating_stats",
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("review_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rating_1", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rating_2", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rating_3", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rating_4", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("rating_5", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "avg_rating",
+            sa.Numeric(),
+            sa.Computed(
+                "CASE WHEN review_count > 0 "
+                "THEN rating_sum::numeric / review_count END",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+        sa.Column(
+            "bayesian_avg",
+            sa.Numeric(),
+            sa.Computed(
+                "(rating_sum + 15)::numeric / (review_count + 5)", persisted=True
+            ),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("book_id"),
+    )
+    op.create_index(
+        "ix_book_rating_stats_avg_rating",
+        "book_rating_stats",
+        [sa.text("avg_rating DESC NULLS LAST"), "book_id"],
+    )
+    op.create_index(
+        "ix_book_rating_stats_bayesian_avg",
+        "book_rating_stats",
+        ["bayesian_avg", "book_id"],
+    )
+
+    op.execute(
+        """
+        INSERT INTO book_rating_stats
+            (book_id, review_count, rating_sum,
+             rating_1, rating_2, rating_3, rating_4, rating_5)
+        SELECT book_id,
+               count(*),
+               sum(rating),
+               count(*) FILTER (WHERE rating = 1),
+               count(*) FILTER (WHERE rating = 2),
+               count(*) FILTER (WHERE rating = 3),
+               count(*) FILTER (WHERE rating = 4),
+               count(*) FILTER (WHERE rating = 5)
+        FROM reviews
+        WHERE deleted_at IS NULL
+        GROUP BY book_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_book_rating_stats_bayesian_avg", table_name="book_rating_stats")
+    op.drop_index("ix_book_rating_stats_avg_rating", table_name="book_rating_stats")
+    op.drop_table("book_rating_stats")
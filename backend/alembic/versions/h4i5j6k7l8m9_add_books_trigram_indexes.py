@@ -0,0 +1,40 @@
+"""Add pg_trgm GIN indexes on books.author and books.title.
+
+Lets `author ILIKE '%x%'` substring filters and fuzzy=true similarity search
+(%> / word_similarity) use an index instead of scanning books.
+
+Revision ID: h4i5j6k7l8m9
+Revises: h3i4j5k6l7m8
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision: str = "h4i5j6k7l8m9"
+down_revision: str | None = "h3i4j5k6l7m8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_books_author_trgm",
+        "books",
+        ["author"],
+        postgresql_using="gin",
+        postgresql_ops={"author": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_books_title_trgm",
+        "books",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_title_trgm", table_name="books")
+    op.drop_index("ix_books_author_trgm", table_name="books")
+    # The extension is left installed; other objects may depend on it.
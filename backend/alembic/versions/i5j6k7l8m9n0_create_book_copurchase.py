@@ -0,0 +1,67 @@
+"""Create book_copurchase, book_copurchase_pairs and book_copurchase_state.
+
+Precomputed "also bought" index (app/books/copurchase.py). Tables start empty:
+the first refresh (background task or scripts/refresh_copurchase.py) counts
+every existing confirmed order from the zero high-water mark.
+
+Revision ID: i5j6k7l8m9n0
+Revises: h4i5j6k7l8m9
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "i5j6k7l8m9n0"
+down_revision: str | None = "h4i5j6k7l8m9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "book_copurchase_pairs",
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("other_book_id", sa.Integer(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["other_book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("book_id", "other_book_id"),
+    )
+    op.create_table(
+        "book_copurchase",
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("other_book_id", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("support", sa.Numeric(), nullable=False),
+        sa.Column("lift", sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["other_book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("book_id", "other_book_id"),
+    )
+    op.create_index(
+        "ix_book_copurchase_book_rank",
+        "book_copurchase",
+        ["book_id", "rank"],
+        unique=True,
+    )
+    op.create_table(
+        "book_copurchase_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("last_order_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint("id = 1", name="ck_book_copurchase_state_single_row"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("book_copurchase_state")
+    op.drop_index("ix_book_copurchase_book_rank", table_name="book_copurchase")
+    op.drop_table("book_copurchase")
+    op.drop_table("book_copurchase_pairs")
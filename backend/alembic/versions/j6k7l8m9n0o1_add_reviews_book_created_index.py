@@ -0,0 +1,33 @@
+"""Add a partial index for the newest live reviews of a book.
+
+Serves the LEFT JOIN LATERAL behind GET /books/{id}?reviews=N (and the
+newest-first review list) as an index range scan instead of a sort.
+
+Revision ID: j6k7l8m9n0o1
+Revises: i5j6k7l8m9n0
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "j6k7l8m9n0o1"
+down_revision: str | None = "i5j6k7l8m9n0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_reviews_book_created_live",
+        "reviews",
+        ["book_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reviews_book_created_live", table_name="reviews")
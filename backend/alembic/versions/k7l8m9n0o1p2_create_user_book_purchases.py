@@ -0,0 +1,59 @@
+"""Create user_book_purchases ledger.
+
+One row per (user, book) bought in a CONFIRMED order, written by checkout.
+Replaces the orders/order_items EXISTS join behind the review purchase gate
+and verified_purchase flags. Backfilled from existing confirmed orders.
+
+Revision ID: k7l8m9n0o1p2
+Revises: j6k7l8m9n0o1
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "k7l8m9n0o1p2"
+down_revision: str | None = "j6k7l8m9n0o1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_book_purchases",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("first_order_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "purchased_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["first_order_id"], ["orders.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("user_id", "book_id"),
+    )
+    op.create_index(
+        "ix_user_book_purchases_book_id", "user_book_purchases", ["book_id"]
+    )
+
+    op.execute(
+        """
+        INSERT INTO user_book_purchases (user_id, book_id, first_order_id, purchased_at)
+        SELECT o.user_id, oi.book_id, min(o.id), min(o.created_at)
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id
+        WHERE o.status = 'confirmed' AND oi.book_id IS NOT NULL
+        GROUP BY o.user_id, oi.book_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_book_purchases_book_id", table_name="user_book_purchases")
+    op.drop_table("user_book_purchases")
@@ -0,0 +1,53 @@
+"""Create stock_reservations.
+
+Stock held by in-flight checkouts between the reserve and confirm/release
+steps, so payment runs after the book row locks are released. Expired rows
+are released by the reservation sweeper.
+
+Revision ID: l8m9n0o1p2q3
+Revises: k7l8m9n0o1p2
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "l8m9n0o1p2q3"
+down_revision: str | None = "k7l8m9n0o1p2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_reservations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("token", sa.String(length=32), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "token", "book_id", name="uq_stock_reservations_token_book"
+        ),
+    )
+    op.create_index(
+        "ix_stock_reservations_expires_at", "stock_reservations", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_reservations_expires_at", table_name="stock_reservations")
+    op.drop_table("stock_reservations")
@@ -0,0 +1,33 @@
+"""Index a user's orders newest first for keyset-paginated GET /orders.
+
+Replaces ix_orders_user_id, which is a prefix of the new index.
+
+Revision ID: n0o1p2q3r4s5
+Revises: m9n0o1p2q3r4
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "n0o1p2q3r4s5"
+down_revision: str | None = "m9n0o1p2q3r4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_orders_user_created",
+        "orders",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.drop_index("ix_orders_user_id", table_name="orders")
+
+
+def downgrade() -> None:
+    op.create_index("ix_orders_user_id", "orders", ["user_id"])
+    op.drop_index("ix_orders_user_created", table_name="orders")
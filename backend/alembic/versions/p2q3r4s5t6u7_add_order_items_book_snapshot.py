@@ -0,0 +1,49 @@
+"""Add title/author/isbn/cover_image_url snapshot columns to order_items.
+
+Written at checkout so order history, admin orders and emails need no join to
+books, and lines keep their title after the book is deleted. Backfilled from
+books; lines whose book is already gone stay NULL.
+
+Revision ID: p2q3r4s5t6u7
+Revises: o1p2q3r4s5t6
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "p2q3r4s5t6u7"
+down_revision: str | None = "o1p2q3r4s5t6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("order_items", sa.Column("title", sa.String(500), nullable=True))
+    op.add_column("order_items", sa.Column("author", sa.String(255), nullable=True))
+    op.add_column("order_items", sa.Column("isbn", sa.String(17), nullable=True))
+    op.add_column(
+        "order_items", sa.Column("cover_image_url", sa.String(2048), nullable=True)
+    )
+
+    op.execute(
+        """
+        UPDATE order_items oi
+        SET title = b.title,
+            author = b.author,
+            isbn = b.isbn,
+            cover_image_url = b.cover_image_url
+        FROM books b
+        WHERE b.id = oi.book_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("order_items", "cover_image_url")
+    op.drop_column("order_items", "isbn")
+    op.drop_column("order_items", "author")
+    op.drop_column("order_items", "title")
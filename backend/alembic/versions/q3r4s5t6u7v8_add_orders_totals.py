@@ -0,0 +1,64 @@
+"""Add orders.total_amount and orders.item_count, with a revenue index.
+
+Written by checkout from the order's items, so order lists and revenue
+summaries need no join to order_items. Backfilled from order_items.
+ix_orders_status_created (status, created_at) INCLUDE (total_amount) lets the
+revenue summary run as an index-only scan of orders.
+
+Revision ID: q3r4s5t6u7v8
+Revises: p2q3r4s5t6u7
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "q3r4s5t6u7v8"
+down_revision: str | None = "p2q3r4s5t6u7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "orders",
+        sa.Column(
+            "total_amount", sa.Numeric(12, 2), server_default="0", nullable=False
+        ),
+    )
+    op.add_column(
+        "orders",
+        sa.Column("item_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    op.execute(
+        """
+        UPDATE orders o
+        SET total_amount = t.total_amount,
+            item_count = t.item_count
+        FROM (
+            SELECT order_id,
+                   sum(quantity * unit_price) AS total_amount,
+                   count(*) AS item_count
+            FROM order_items
+            GROUP BY order_id
+        ) t
+        WHERE t.order_id = o.id
+        """
+    )
+
+    op.create_index(
+        "ix_orders_status_created",
+        "orders",
+        ["status", "created_at"],
+        postgresql_include=["total_amount"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_status_created", table_name="orders")
+    op.drop_column("orders", "item_count")
+    op.drop_column("orders", "total_amount")
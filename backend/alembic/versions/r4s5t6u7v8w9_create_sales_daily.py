@@ -0,0 +1,56 @@
+"""Create sales_daily, sales_daily_totals and sales_rollup_state.
+
+Daily sales rollup behind the admin sales analytics (app/admin/sales_rollup.py).
+Tables start empty: until the first refresh (background task or
+scripts/refresh_sales_rollup.py) folds in every existing confirmed order from
+the zero high-water mark, analytics read all orders from the raw tables.
+
+Revision ID: r4s5t6u7v8w9
+Revises: q3r4s5t6u7v8
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "r4s5t6u7v8w9"
+down_revision: str | None = "q3r4s5t6u7v8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sales_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("units", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(14, 2), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("day", "book_id"),
+    )
+    op.create_table(
+        "sales_daily_totals",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("revenue", sa.Numeric(14, 2), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+    op.create_table(
+        "sales_rollup_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("last_order_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint("id = 1", name="ck_sales_rollup_state_single_row"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sales_rollup_state")
+    op.drop_table("sales_daily_totals")
+    op.drop_table("sales_daily")
@@ -0,0 +1,65 @@
+"""Daily sales rollup behind the admin sales analytics (app/admin/sales_rollup.py).
+
+Confirmed orders are folded in by UTC day past the high-water mark kept in
+sales_rollup_state; AnalyticsRepository reads whole days from here and only
+the rest (partial days, orders not yet folded in) from orders/order_items.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import CheckConstraint, Date, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SalesDaily(Base):
+    """Units, revenue and orders per book per UTC day (confirmed orders only).
+
+    Lines of deleted books (order_items.book_id NULL) are not counted, and a
+    book's rows go with it, as top-books leaves deleted books out.
+    """
+
+    __tablename__ = "sales_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    units: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class SalesDailyTotal(Base):
+    """Revenue and order count per UTC day, for the sales summary.
+
+    Kept apart from sales_daily because an order spans several books (its
+    orders are not the sum of the per-book counts) and still counts after its
+    books are deleted.
+    """
+
+    __tablename__ = "sales_daily_totals"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class SalesRollupState(Base):
+    """Single-row high-water mark: orders with id <= last_order_id are in the rollup."""
+
+    __tablename__ = "sales_rollup_state"
+
+    __table_args__ = (
+        CheckConstraint("id = 1", name="ck_sales_rollup_state_single_row"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    last_order_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    refreshed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -1,19 +1,94 @@
-"""Analytics repository — read-only aggregate queries against existing order tables."""
+"""Analytics repository — aggregate queries over orders and the daily sales rollup.
 
+AnalyticsRepository reads; SalesRollupRepository maintains the rollup tables
+(app/admin/analytics_models.py, refreshed by app/admin/sales_rollup.py).
+"""
+
+from datetime import UTC, date, datetime, time, timedelta
 from decimal import Decimal
-from datetime import datetime
 
-from sqlalchemy import asc, desc, func, select
+from sqlalchemy import (
+    Date,
+    Integer,
+    asc,
+    cast,
+    delete,
+    desc,
+    func,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.admin.analytics_models import SalesDaily, SalesDailyTotal, SalesRollupState
 from app.books.models import Book
 from app.orders.models import Order, OrderItem, OrderStatus
 
 
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time(), UTC)
+
+
+def _whole_days(
+    period_start: datetime, period_end: datetime
+) -> tuple[date, date] | None:
+    """UTC days lying entirely inside [period_start, period_end), as [first, last).
+
+    None when the period holds no whole day (e.g. "today").
+    """
+    first = period_start.astimezone(UTC).date()
+    if _midnight(first) < period_start:
+        first += timedelta(days=1)
+    last = period_end.astimezone(UTC).date()
+    return (first, last) if first < last else None
+
+
+def _rolled_up_to():
+    """orders.id high-water mark of the rollup (0 before the first refresh).
+
+    Read in the same statement as the rollup itself, so a refresh committing
+    meanwhile can neither double count nor drop orders.
+    """
+    return func.coalesce(
+        select(SalesRollupState.last_order_id)
+        .where(SalesRollupState.id == 1)
+        .scalar_subquery(),
+        0,
+    )
+
+
+def _raw_order_ranges(
+    period_start: datetime | None, period_end: datetime | None
+) -> list[list]:
+    """Filters on orders for what the rollup does not cover, one per index range.
+
+    All time: the orders past the high-water mark. A period: the partial days
+    at either end, plus the orders of its whole days past the high-water mark.
+    """
+    if period_start is None or period_end is None:
+        return [[Order.id > _rolled_up_to()]]
+    days = _whole_days(period_start, period_end)
+    if days is None:
+        return [[Order.created_at >= period_start, Order.created_at < period_end]]
+    first, last = _midnight(days[0]), _midnight(days[1])
+    ranges = [
+        [Order.id > _rolled_up_to(), Order.created_at >= first, Order.created_at < last]
+    ]
+    if period_start < first:
+        ranges.append([Order.created_at >= period_start, Order.created_at < first])
+    if last < period_end:
+        ranges.append([Order.created_at >= last, Order.created_at < period_end])
+    return ranges
+
+
 class AnalyticsRepository:
     """Read-only repository for analytics aggregate queries.
 
-    Reads directly from Order and OrderItem tables — no writes, no migrations.
+    Sales figures combine the daily rollup, for whole UTC days, with orders
+    and order_items for the rest (partial days and orders not yet rolled up),
+    so they match a scan of the raw tables exactly. No writes.
     """
 
     def __init__(self, db: AsyncSession) -> None:
@@ -24,6 +99,9 @@ class AnalyticsRepository:
     ) -> dict:
         """Return total revenue and order count for CONFIRMED orders in the given period.
 
+        Whole days come from sales_daily_totals; the raw parts sum the
+        denormalized orders.total_amount (index-only scans of
+        ix_orders_status_created, or the primary key past the high-water mark).
         Uses func.coalesce so empty periods return Decimal("0") instead of None.
 
         Args:
@@ -33,20 +111,28 @@ class AnalyticsRepository:
         Returns:
             dict with keys "revenue" (Decimal) and "order_count" (int).
         """
-        stmt = (
+        parts = [
             select(
-                func.coalesce(
-                    func.sum(OrderItem.quantity * OrderItem.unit_price),
-                    Decimal("0"),
-                ).label("revenue"),
-                func.count(Order.id.distinct()).label("order_count"),
-            )
-            .join(OrderItem, OrderItem.order_id == Order.id)
-            .where(
-                Order.status == OrderStatus.CONFIRMED,
-                Order.created_at >= period_start,
-                Order.created_at < period_end,
+                func.sum(Order.total_amount).label("revenue"),
+                func.count().label("order_count"),
+            ).where(Order.status == OrderStatus.CONFIRMED, *where)
+            for where in _raw_order_ranges(period_start, period_end)
+        ]
+        days = _whole_days(period_start, period_end)
+        if days is not None:
+            parts.append(
+                select(
+                    func.sum(SalesDailyTotal.revenue),
+                    func.sum(SalesDailyTotal.order_count),
+                ).where(SalesDailyTotal.day >= days[0], SalesDailyTotal.day < days[1])
             )
+        sales = union_all(*parts).subquery()
+
+        stmt = select(
+            func.coalesce(func.sum(sales.c.revenue), Decimal("0")).label("revenue"),
+            cast(func.coalesce(func.sum(sales.c.order_count), 0), Integer).label(
+                "order_count"
+            ),
         )
         row = (await self._db.execute(stmt)).one()
         return {"revenue": row.revenue, "order_count": row.order_count}
@@ -62,7 +148,9 @@ class AnalyticsRepository:
         """Return top-selling books ranked by revenue or volume.
 
         Only CONFIRMED orders are included. Books that have been deleted
-        (book_id IS NULL in order_items) are excluded.
+        (book_id IS NULL in order_items) are excluded. Whole days (all of
+        them, without a period) come from sales_daily, the rest from
+        order_items. Ties are broken by book_id.
 
         Args:
             sort_by: "revenue" to rank by total_revenue, "volume" to rank by units_sold.
@@ -73,37 +161,48 @@ class AnalyticsRepository:
         Returns:
             List of dicts with keys: book_id, title, author, total_revenue, units_sold.
         """
-        revenue_col = func.sum(OrderItem.unit_price * OrderItem.quantity).label(
-            "total_revenue"
-        )
-        volume_col = func.sum(OrderItem.quantity).label("units_sold")
+        parts = [
+            select(
+                OrderItem.book_id,
+                func.sum(OrderItem.unit_price * OrderItem.quantity).label("revenue"),
+                func.sum(OrderItem.quantity).label("units"),
+            )
+            .join(Order, OrderItem.order_id == Order.id)
+            .where(
+                Order.status == OrderStatus.CONFIRMED,
+                OrderItem.book_id.is_not(None),
+                *where,
+            )
+            .group_by(OrderItem.book_id)
+            for where in _raw_order_ranges(period_start, period_end)
+        ]
+        rollup = select(SalesDaily.book_id, SalesDaily.revenue, SalesDaily.units)
+        if period_start is None or period_end is None:
+            parts.append(rollup)
+        elif (days := _whole_days(period_start, period_end)) is not None:
+            parts.append(
+                rollup.where(SalesDaily.day >= days[0], SalesDaily.day < days[1])
+            )
+        sales = union_all(*parts).subquery()
+
+        revenue_col = func.sum(sales.c.revenue).label("total_revenue")
+        volume_col = cast(func.sum(sales.c.units), Integer).label("units_sold")
         order_col = revenue_col if sort_by == "revenue" else volume_col
 
         stmt = (
             select(
-                OrderItem.book_id,
+                sales.c.book_id,
                 Book.title,
                 Book.author,
                 revenue_col,
                 volume_col,
             )
-            .join(Order, OrderItem.order_id == Order.id)
-            .join(Book, OrderItem.book_id == Book.id)
-            .where(
-                Order.status == OrderStatus.CONFIRMED,
-                OrderItem.book_id.is_not(None),
-            )
-            .group_by(OrderItem.book_id, Book.title, Book.author)
-            .order_by(desc(order_col))
+            .join(Book, sales.c.book_id == Book.id)
+            .group_by(sales.c.book_id, Book.title, Book.author)
+            .order_by(desc(order_col), sales.c.book_id)
             .limit(limit)
         )
 
-        if period_start is not None and period_end is not None:
-            stmt = stmt.where(
-                Order.created_at >= period_start,
-                Order.created_at < period_end,
-            )
-
         result = await self._db.execute(stmt)
         return [row._asdict() for row in result.all()]
 
@@ -129,3 +228,110 @@ class AnalyticsRepository:
         )
         result = await self._db.execute(stmt)
         return [row._asdict() for row in result.all()]
+
+
+class SalesRollupRepository:
+    """Set-based maintenance of the daily sales rollup (app/admin/sales_rollup.py)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def lock_state(self) -> int | None:
+        """Lock the rollup state row; return its last_order_id.
+
+        Returns None when another refresh holds the lock (SKIP LOCKED), so
+        concurrent workers never fold the same orders twice.
+        """
+        await self.session.execute(
+            insert(SalesRollupState).values(id=1).on_conflict_do_nothing()
+        )
+        return await self.session.scalar(
+            select(SalesRollupState.last_order_id)
+            .where(SalesRollupState.id == 1)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def reset(self) -> None:
+        """Forget every rolled-up order (full rebuild from the first order)."""
+        await self.session.execute(delete(SalesDaily))
+        await self.session.execute(delete(SalesDailyTotal))
+        await self.session.execute(update(SalesRollupState).values(last_order_id=0))
+
+    async def add_orders(self, after_id: int, upto_id: int) -> tuple[int, int]:
+        """Fold confirmed orders with after_id < id <= upto_id into the rollup.
+
+        One statement: the orders are grouped by UTC day (and book) and added
+        to sales_daily_totals and sales_daily with ON CONFLICT.
+        Returns (orders counted, sales_daily rows written).
+        """
+        new_orders = (
+            select(
+                Order.id,
+                cast(func.timezone("UTC", Order.created_at), Date).label("day"),
+                Order.total_amount,
+            )
+            .where(
+                Order.id > after_id,
+                Order.id <= upto_id,
+                Order.status == OrderStatus.CONFIRMED,
+            )
+            .cte("new_orders")
+        )
+
+        totals = insert(SalesDailyTotal).from_select(
+            ["day", "revenue", "order_count"],
+            select(
+                new_orders.c.day, func.sum(new_orders.c.total_amount), func.count()
+            ).group_by(new_orders.c.day),
+        )
+        totals = totals.on_conflict_do_update(
+            index_elements=[SalesDailyTotal.day],
+            set_={
+                "revenue": SalesDailyTotal.revenue + totals.excluded.revenue,
+                "order_count": SalesDailyTotal.order_count
+                + totals.excluded.order_count,
+            },
+        ).cte("totals")
+
+        books = insert(SalesDaily).from_select(
+            ["day", "book_id", "units", "revenue", "order_count"],
+            select(
+                new_orders.c.day,
+                OrderItem.book_id,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.quantity * OrderItem.unit_price),
+                func.count(OrderItem.order_id.distinct()),
+            )
+            .join(OrderItem, OrderItem.order_id == new_orders.c.id)
+            .where(OrderItem.book_id.is_not(None))
+            .group_by(new_orders.c.day, OrderItem.book_id),
+        )
+        books = (
+            books.on_conflict_do_update(
+                index_elements=[SalesDaily.day, SalesDaily.book_id],
+                set_={
+                    "units": SalesDaily.units + books.excluded.units,
+                    "revenue": SalesDaily.revenue + books.excluded.revenue,
+                    "order_count": SalesDaily.order_count + books.excluded.order_count,
+                },
+            )
+            .returning(SalesDaily.day)
+            .cte("books")
+        )
+
+        row = (
+            await self.session.execute(
+                select(
+                    select(func.count()).select_from(new_orders).scalar_subquery(),
+                    select(func.count()).select_from(books).scalar_subquery(),
+                ).add_cte(totals)
+            )
+        ).one()
+        return row[0], row[1]
+
+    async def save_state(self, last_order_id: int) -> None:
+        await self.session.execute(
+            update(SalesRollupState)
+            .where(SalesRollupState.id == 1)
+            .values(last_order_id=last_order_id, refreshed_at=func.now())
+        )
@@ -11,6 +11,7 @@ from app.admin.reviews_schemas import (
     BulkDeleteResponse,
 )
 from app.core.deps import AdminUser, DbSession, require_admin
+from app.core.pagination import TotalMode
 from app.reviews.repository import ReviewRepository
 
 router = APIRouter(
@@ -32,6 +33,8 @@ async def list_reviews(
     rating_max: int | None = Query(None, ge=1, le=5),
     sort_by: str = Query("date", pattern="^(date|rating)$"),
     sort_dir: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
+    total_mode: TotalMode = Query("exact"),  # noqa: B008
 ) -> AdminReviewListResponse:
     """Return paginated, filtered list of all non-deleted reviews for admin moderation.
 
@@ -44,16 +47,22 @@ async def list_reviews(
     - rating_max: Maximum rating 1-5 inclusive (optional).
     - sort_by: "date" (default) or "rating".
     - sort_dir: "desc" (default) or "asc".
+    - cursor: next_cursor from a previous response (keyset paging; overrides page).
+    - total_mode: "exact" (default), "estimate" or "none" (skip the count; use has_more).
+      estimate counts up to 1,000 rows, then adds an EXPLAIN round trip.
 
     Filters combine as AND. Admin only. Invalid values return 422.
     """
     repo = ReviewRepository(db)
-    reviews, total = await repo.list_all_admin(
+    result = await repo.list_all_admin(
         page=page, per_page=per_page,
         book_id=book_id, user_id=user_id,
         rating_min=rating_min, rating_max=rating_max,
         sort_by=sort_by, sort_dir=sort_dir,
+        cursor=cursor,
+        total_mode=total_mode,
     )
+    reviews, total = result
     items = [
         AdminReviewEntry.model_validate({
             "id": r.id,
@@ -71,7 +80,12 @@ async def list_reviews(
         total_count=total,
         page=page,
         per_page=per_page,
-        total_pages=math.ceil(total / per_page) if total > 0 else 0,
+        total_pages=(
+            None if total is None else math.ceil(total / per_page) if total > 0 else 0
+        ),
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        total_mode=result.total_mode,
     )
 
 
@@ -5,6 +5,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from app.core.pagination import TotalMode
+
 
 class AdminReviewAuthor(BaseModel):
     """Reviewer identity in the admin moderation list."""
@@ -39,13 +41,19 @@ class AdminReviewEntry(BaseModel):
 
 
 class AdminReviewListResponse(BaseModel):
-    """Paginated envelope for admin review list — follows admin convention."""
+    """Paginated envelope for admin review list — follows admin convention.
+
+    total_count/total_pages are null when total_mode='none'; see BookListResponse.
+    """
 
     items: list[AdminReviewEntry]
-    total_count: int
+    total_count: int | None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: int | None
+    next_cursor: str | None = None
+    has_more: bool = False
+    total_mode: TotalMode = "exact"
 
 
 class BulkDeleteRequest(BaseModel):
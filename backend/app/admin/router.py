@@ -7,6 +7,7 @@ from fastapi import APIRouter, Query
 from app.admin.schemas import AdminUserResponse, UserListResponse
 from app.admin.service import AdminUserService
 from app.core.deps import AdminUser, DbSession
+from app.core.pagination import TotalMode
 from app.users.models import UserRole
 from app.users.repository import RefreshTokenRepository, UserRepository
 
@@ -28,25 +29,38 @@ async def list_users(
     per_page: int = Query(20, ge=1, le=100),
     role: UserRole | None = Query(None),  # noqa: B008
     is_active: bool | None = Query(None),  # noqa: B008
+    cursor: str | None = Query(None),
+    total_mode: TotalMode = Query("exact"),  # noqa: B008
 ) -> UserListResponse:
     """Return a paginated list of all users. Admin only.
 
     Supports optional filtering by role and/or is_active status.
     Results are sorted by created_at DESC (newest first).
+    Pass next_cursor back as cursor= for keyset paging (page= is then ignored).
+    total_mode=estimate|none skips or bounds the count query; see total_mode in the response.
+    estimate adds an EXPLAIN round trip above 1,000 matches (small sets cost more than exact).
     """
     svc = _make_service(db)
-    users, total = await svc.list_users(
+    result = await svc.list_users(
         page=page,
         per_page=per_page,
         role=role,
         is_active=is_active,
+        cursor=cursor,
+        total_mode=total_mode,
     )
+    users, total = result
     return UserListResponse(
         items=[AdminUserResponse.model_validate(u) for u in users],
         total_count=total,
         page=page,
         per_page=per_page,
-        total_pages=math.ceil(total / per_page) if total > 0 else 0,
+        total_pages=(
+            None if total is None else math.ceil(total / per_page) if total > 0 else 0
+        ),
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+        total_mode=result.total_mode,
     )
 
 
@@ -0,0 +1,79 @@
+"""Daily sales rollup behind GET /admin/analytics/sales/summary and /sales/top-books.
+
+Scanning orders and order_items for every request (all of history for
+all-time top books) does not scale, so confirmed orders are summed per UTC day:
+
+  - sales_daily holds units, revenue and orders per book per day;
+    sales_daily_totals holds revenue and orders per day.
+  - Each refresh folds in only the orders past the high-water mark kept in
+    sales_rollup_state, in one set-based statement. Orders never change once
+    written, so a folded-in day stays exact.
+
+AnalyticsRepository reads whole days from the rollup and everything else
+(partial days, orders past the mark) from the raw tables, so the figures do
+not depend on how recently a refresh ran. Refreshes run in the background
+(run_refresher, every SALES_ROLLUP_REFRESH_SECONDS) and from
+scripts/refresh_sales_rollup.py. The state row is locked with SKIP LOCKED, so
+concurrent workers never double count.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.admin.analytics_repository import SalesRollupRepository
+from app.orders.repository import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+# Orders younger than this are left for the next refresh: a checkout that took
+# a lower id may still be committing (see OrderRepository.settled_order_id).
+SALES_ROLLUP_SETTLE_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class SalesRollupRefresh:
+    orders: int
+    rows: int
+    last_order_id: int
+
+
+async def refresh_sales_rollup(
+    session: AsyncSession, *, full: bool = False
+) -> SalesRollupRefresh | None:
+    """Fold new confirmed orders into the rollup; the caller commits.
+
+    full=True rebuilds the rollup from the first order.
+    Returns None when another refresh is already running.
+    """
+    repo = SalesRollupRepository(session)
+    last_order_id = await repo.lock_state()
+    if last_order_id is None:
+        return None
+    if full:
+        await repo.reset()
+        last_order_id = 0
+
+    upto = await OrderRepository(session).settled_order_id(SALES_ROLLUP_SETTLE_SECONDS)
+    if upto is None or upto <= last_order_id:
+        return SalesRollupRefresh(orders=0, rows=0, last_order_id=last_order_id)
+
+    orders, rows = await repo.add_orders(last_order_id, upto)
+    await repo.save_state(upto)
+    return SalesRollupRefresh(orders=orders, rows=rows, last_order_id=upto)
+
+
+async def run_refresher(interval_seconds: float) -> None:
+    """Refresh the daily sales rollup forever, every interval_seconds (app lifespan task)."""
+    from app.db.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as session:
+                await refresh_sales_rollup(session)
+                await session.commit()
+        except Exception:
+            logger.exception("Sales rollup refresh failed")
@@ -4,6 +4,8 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.core.pagination import TotalMode
+
 
 class AdminUserResponse(BaseModel):
     """Admin view of a user account."""
@@ -21,10 +23,16 @@ class AdminUserResponse(BaseModel):
 
 
 class UserListResponse(BaseModel):
-    """Paginated envelope for admin user list."""
+    """Paginated envelope for admin user list.
+
+    total_count/total_pages are null when total_mode='none'; see BookListResponse.
+    """
 
     items: list[AdminUserResponse]
-    total_count: int
+    total_count: int | None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: int | None
+    next_cursor: str | None = None
+    has_more: bool = False
+    total_mode: TotalMode = "exact"
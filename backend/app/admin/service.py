@@ -1,6 +1,7 @@
 """Admin business logic for user management: list, deactivate, reactivate."""
 
 from app.core.exceptions import AppError
+from app.core.pagination import Page, TotalMode
 from app.users.models import User, UserRole
 from app.users.repository import RefreshTokenRepository, UserRepository
 
@@ -19,12 +20,16 @@ class AdminUserService:
         per_page: int = 20,
         role: UserRole | None = None,
         is_active: bool | None = None,
-    ) -> tuple[list[User], int]:
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+    ) -> Page[User]:
         return await self.user_repo.list_paginated(
             page=page,
             per_page=per_page,
             role=role,
             is_active=is_active,
+            cursor=cursor,
+            total_mode=total_mode,
         )
 
     async def deactivate_user(self, target_user_id: int) -> User:
@@ -0,0 +1,120 @@
+"""Cache keys and invalidation tags for public catalog reads.
+
+Entries live in app.core.cache.catalog_cache. Tags:
+  - books:list          every GET /books page (membership/order may change)
+  - books:sort:<sort>   GET /books pages ordered by <sort> (e.g. avg_rating)
+  - book:<id>           GET /books/{id} and every GET /books page containing id
+  - books:detail        every GET /books/{id} (bulk writes drop them all at once)
+  - genres              GET /genres
+  - books:also-bought   every GET /books/{id}/also-bought (co-purchase refresh)
+"""
+
+from collections.abc import Hashable, Iterable
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import catalog_cache
+
+BOOKS_LIST_TAG = "books:list"
+BOOK_DETAIL_TAG = "books:detail"
+ALSO_BOUGHT_TAG = "books:also-bought"
+GENRES_TAG = "genres"
+GENRES_KEY = ("genres",)
+
+
+def book_tag(book_id: int) -> str:
+    return f"book:{book_id}"
+
+
+def sort_tag(sort: str) -> str:
+    return f"books:sort:{sort}"
+
+
+def book_detail_key(
+    book_id: int, fields: tuple[str, ...] | None = None, reviews: int = 0
+) -> Hashable:
+    return ("book", book_id, fields, reviews)
+
+
+def also_bought_key(book_id: int, limit: int) -> Hashable:
+    return ("also-bought", book_id, limit)
+
+
+def book_list_key(
+    *,
+    q: str | None,
+    genre_id: int | None,
+    author: str | None,
+    min_price: Decimal | None,
+    max_price: Decimal | None,
+    sort: str,
+    sort_dir: str,
+    page: int,
+    size: int,
+    cursor: str | None,
+    total_mode: str,
+    fuzzy: bool,
+    facets: bool,
+    price_buckets: list[Decimal] | None,
+    fields: tuple[str, ...] | None = None,
+) -> Hashable:
+    """Normalize GET /books parameters so equivalent requests share one entry.
+
+    Search and author matching are case-insensitive, prices compare by value
+    (7 == 7.00), and page is irrelevant once a cursor is given.
+    """
+    return (
+        "books",
+        (q or "").strip().lower() or None,
+        genre_id,
+        (author or "").strip().lower() or None,
+        None if min_price is None else min_price.normalize(),
+        None if max_price is None else max_price.normalize(),
+        sort,
+        sort_dir,
+        None if cursor else page,
+        size,
+        cursor,
+        total_mode,
+        fuzzy and bool(q),
+        facets,
+        tuple(b.normalize() for b in price_buckets) if price_buckets else None,
+        fields,
+    )
+
+
+def invalidate_books(
+    session: AsyncSession, book_ids: Iterable[int], *, listing: bool = False
+) -> None:
+    """Drop cached entries for the given books; listing=True also drops every list page.
+
+    Use listing=True when the change can alter which books a filter/sort returns
+    (create, delete, title/price/genre edits). Stock-only changes need just the
+    per-book tags, which also cover the list pages those books appear on.
+    """
+    tags = [book_tag(book_id) for book_id in book_ids]
+    if listing:
+        tags.append(BOOKS_LIST_TAG)
+    if tags:
+        catalog_cache.invalidate_on_commit(session, *tags)
+
+
+def invalidate_all_books(session: AsyncSession) -> None:
+    """Drop every cached book list and detail (bulk writes touching many books)."""
+    catalog_cache.invalidate_on_commit(session, BOOKS_LIST_TAG, BOOK_DETAIL_TAG)
+
+
+def invalidate_ratings(session: AsyncSession, book_ids: Iterable[int]) -> None:
+    """Drop entries affected by a change in the books' review aggregates."""
+    catalog_cache.invalidate_on_commit(
+        session, sort_tag("avg_rating"), *(book_tag(b) for b in book_ids)
+    )
+
+
+def invalidate_also_bought(session: AsyncSession) -> None:
+    catalog_cache.invalidate_on_commit(session, ALSO_BOUGHT_TAG)
+
+
+def invalidate_genres(session: AsyncSession) -> None:
+    catalog_cache.invalidate_on_commit(session, GENRES_TAG)
@@ -0,0 +1,97 @@
+"""Precomputed "frequently bought together" index behind GET /books/{id}/also-bought.
+
+Joining order_items to itself per request does not scale, so co-purchases are
+counted ahead of time:
+
+  - book_copurchase_pairs holds, for every pair of books, the number of
+    confirmed orders containing both (the diagonal counts orders per book).
+    Each refresh folds in only the orders past the high-water mark kept in
+    book_copurchase_state, in one set-based statement.
+  - book_copurchase keeps the top COPURCHASE_TOP_K partners per book with
+    support and lift. Only books that appeared in the new orders are re-ranked;
+    other books keep their ranking (their counts did not change) while their
+    lift drifts slightly as the order total grows, until a full rebuild.
+
+Refreshes run in the background (run_refresher, every COPURCHASE_REFRESH_SECONDS)
+and from scripts/refresh_copurchase.py. The state row is locked with SKIP
+LOCKED, so concurrent workers never double count.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.cache import invalidate_also_bought
+from app.books.repository import CopurchaseRepository
+from app.orders.repository import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+# Partners kept per book (upper bound of the endpoint's limit).
+COPURCHASE_TOP_K = 20
+
+# Pairs bought together in fewer orders are noise, not a recommendation.
+COPURCHASE_MIN_ORDERS = 2
+
+# Orders younger than this are left for the next refresh: a checkout that took
+# a lower id may still be committing (see OrderRepository.settled_order_id).
+COPURCHASE_SETTLE_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class CopurchaseRefresh:
+    orders: int
+    books: int
+    last_order_id: int
+
+
+async def refresh_copurchase(
+    session: AsyncSession, *, full: bool = False
+) -> CopurchaseRefresh | None:
+    """Fold new confirmed orders into the index; the caller commits.
+
+    full=True recounts every order and re-ranks every book (also refreshing
+    lift values of books untouched by recent orders).
+    Returns None when another refresh is already running.
+    """
+    repo = CopurchaseRepository(session)
+    state = await repo.lock_state()
+    if state is None:
+        return None
+    last_order_id, order_count = state
+    if full:
+        await repo.reset()
+        last_order_id, order_count = 0, 0
+
+    upto = await OrderRepository(session).settled_order_id(COPURCHASE_SETTLE_SECONDS)
+    if upto is None or upto <= last_order_id:
+        return CopurchaseRefresh(orders=0, books=0, last_order_id=last_order_id)
+
+    added, book_ids = await repo.add_orders(last_order_id, upto)
+    order_count += added
+    await repo.save_state(upto, order_count)
+    if book_ids:
+        await repo.rebuild_top(
+            None if full else book_ids,
+            order_count=order_count,
+            top_k=COPURCHASE_TOP_K,
+            min_orders=COPURCHASE_MIN_ORDERS,
+        )
+        invalidate_also_bought(session)
+    return CopurchaseRefresh(orders=added, books=len(book_ids), last_order_id=upto)
+
+
+async def run_refresher(interval_seconds: float) -> None:
+    """Refresh the co-purchase index forever, every interval_seconds (app lifespan task)."""
+    from app.db.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as session:
+                await refresh_copurchase(session)
+                await session.commit()
+        except Exception:
+            logger.exception("Co-purchase index refresh failed")
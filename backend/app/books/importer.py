@@ -0,0 +1,154 @@
+"""Bulk catalog import behind POST /admin/books/import and scripts/import_books.py.
+
+Supplier catalogs run to hundreds of thousands of titles, so rows are never
+inserted one by one:
+
+  1. Records are read from the file stream, validated with BookImportRow and
+     COPYed in batches of COPY_BATCH_ROWS into a temp staging table (asyncpg
+     copy_records_to_table). Only one batch is held in memory at a time.
+  2. Staged rows with an unknown genre name (unless create_genres) or an ISBN
+     repeated later in the file are reported and skipped.
+  3. One INSERT ... SELECT ... ON CONFLICT (isbn) DO UPDATE upserts the rest,
+     resolving genres by name (BookRepository.upsert_from_import_staging).
+
+Everything runs in the caller's transaction: the import is all-or-nothing at
+the database level, while invalid records are rejected individually and
+listed in the report (at most MAX_IMPORT_ERRORS entries).
+"""
+
+import csv
+import json
+from collections.abc import Iterator
+from typing import Literal, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.cache import invalidate_all_books, invalidate_genres
+from app.books.repository import IMPORT_STAGING_COLUMNS, BookRepository
+from app.books.schemas import BookImportError, BookImportReport, BookImportRow
+from app.core.exceptions import AppError
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# Rows per COPY round trip; bounds memory regardless of file size.
+COPY_BATCH_ROWS = 5000
+
+# Rejections listed in the report; further ones are only counted.
+MAX_IMPORT_ERRORS = 1000
+
+REQUIRED_COLUMNS = ("title", "author", "price")
+
+
+def iter_records(stream: TextIO, fmt: ImportFormat) -> Iterator[tuple[int, object]]:
+    """Yield (row number, raw record) pairs; row numbers are 1-based, header excluded.
+
+    CSV rows come back as dicts keyed by the header. NDJSON lines are parsed
+    individually, so a malformed line is yielded as a ValueError for the caller
+    to report instead of aborting the import. Blank NDJSON lines are skipped.
+
+    Raises AppError(422) BOOK_IMPORT_INVALID_HEADER when a CSV header lacks
+    a required column.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or ())]
+        if missing:
+            raise AppError(
+                status_code=422,
+                detail=f"CSV header is missing required columns: {', '.join(missing)}",
+                code="BOOK_IMPORT_INVALID_HEADER",
+                field="file",
+            )
+        for row_no, record in enumerate(reader, start=1):
+            record.pop(None, None)  # cells beyond the header
+            yield row_no, record
+        return
+
+    row_no = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            yield row_no, json.loads(line)
+        except ValueError as e:
+            yield row_no, ValueError(f"Invalid JSON: {e}")
+
+
+async def import_catalog(
+    session: AsyncSession,
+    stream: TextIO,
+    fmt: ImportFormat,
+    *,
+    create_genres: bool = False,
+) -> BookImportReport:
+    """Validate, stage and upsert every record in `stream`; return the report.
+
+    create_genres=True creates genres named in the file that do not exist yet;
+    otherwise rows naming an unknown genre are rejected.
+
+    Raises AppError(422) BOOK_IMPORT_INVALID_ENCODING for non-UTF-8 input.
+    """
+    repo = BookRepository(session)
+    errors: list[BookImportError] = []
+    rows = 0
+    batch: list[tuple] = []
+
+    def reject(row_no: int, field: str | None, message: str) -> None:
+        if len(errors) < MAX_IMPORT_ERRORS:
+            errors.append(BookImportError(row=row_no, field=field, message=message))
+
+    await repo.create_import_staging()
+    try:
+        for row_no, raw in iter_records(stream, fmt):
+            rows += 1
+            if isinstance(raw, ValueError):
+                reject(row_no, None, str(raw))
+                continue
+            try:
+                record = BookImportRow.model_validate(raw)
+            except ValidationError as e:
+                for err in e.errors(include_url=False):
+                    field = str(err["loc"][0]) if err["loc"] else None
+                    reject(row_no, field, err["msg"])
+                continue
+            batch.append(
+                (row_no, *(getattr(record, c) for c in IMPORT_STAGING_COLUMNS[1:]))
+            )
+            if len(batch) >= COPY_BATCH_ROWS:
+                await repo.copy_import_rows(batch)
+                batch = []
+    except UnicodeDecodeError as e:
+        raise AppError(
+            status_code=422,
+            detail=f"Import file is not valid UTF-8: {e.reason}",
+            code="BOOK_IMPORT_INVALID_ENCODING",
+            field="file",
+        ) from e
+    if batch:
+        await repo.copy_import_rows(batch)
+
+    await repo.index_import_staging()
+    genres_created = await repo.create_import_genres() if create_genres else 0
+    for row_no, field, message in await repo.list_import_rejections(MAX_IMPORT_ERRORS):
+        reject(row_no, field, message)
+    inserted, updated = await repo.upsert_from_import_staging()
+    await repo.drop_import_staging()
+
+    if inserted or updated:
+        invalidate_all_books(session)
+    if genres_created:
+        invalidate_genres(session)
+
+    rejected = rows - inserted - updated
+    errors.sort(key=lambda e: e.row)
+    return BookImportReport(
+        rows=rows,
+        inserted=inserted,
+        updated=updated,
+        rejected=rejected,
+        genres_created=genres_created,
+        errors=errors,
+        errors_truncated=len({e.row for e in errors}) < rejected,
+    )
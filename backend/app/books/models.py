@@ -1,4 +1,6 @@
-"""Book catalog models: Genre (flat taxonomy) and Book (with stock tracking)."""
+"""Book catalog models: Genre (flat taxonomy), Book (with stock tracking) and
+the precomputed co-purchase ("also bought") tables.
+"""
 
 from datetime import date, datetime
 from decimal import Decimal
@@ -80,3 +82,70 @@ class Book(Base):
     )
 
     genre: Mapped["Genre | None"] = relationship(back_populates="books")
+
+
+class BookCopurchasePair(Base):
+    """Running count of confirmed orders that contain both books.
+
+    Stored in both directions so a book's partners are one index range. The
+    diagonal row (book_id == other_book_id) counts orders containing the book.
+    Maintained incrementally by app/books/copurchase.py.
+    """
+
+    __tablename__ = "book_copurchase_pairs"
+
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    other_book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class BookCopurchase(Base):
+    """Top co-purchased books per book, served by GET /books/{id}/also-bought.
+
+    Rebuilt from book_copurchase_pairs for the books touched by each refresh.
+    support = share of all counted orders containing both books;
+    lift = support / (support(book) * support(other)), > 1 when bought together
+    more often than chance.
+    """
+
+    __tablename__ = "book_copurchase"
+
+    __table_args__ = (
+        Index("ix_book_copurchase_book_rank", "book_id", "rank", unique=True),
+    )
+
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    other_book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    support: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+    lift: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+
+
+class BookCopurchaseState(Base):
+    """Single-row high-water mark of the orders folded into book_copurchase_pairs."""
+
+    __tablename__ = "book_copurchase_state"
+
+    __table_args__ = (
+        CheckConstraint("id = 1", name="ck_book_copurchase_state_single_row"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    last_order_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    order_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    refreshed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -1,12 +1,89 @@
 """Repository layer for Genre and Book database access."""
 
 import re
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 
-from sqlalchemy import func, nulls_last, select
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    Numeric,
+    Row,
+    Select,
+    String,
+    and_,
+    any_,
+    bindparam,
+    case,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
-from app.books.models import Book, Genre
+from app.books.models import (
+    Book,
+    BookCopurchase,
+    BookCopurchasePair,
+    BookCopurchaseState,
+    Genre,
+)
+from app.core.fields import load_only_fields
+from app.core.pagination import Page, SortKey, TotalMode, count_total, paginate
+
+# pg_trgm word_similarity cut-off for fuzzy=true ("tolkein" ~ "Tolkien" scores 0.5).
+# Applied per transaction via set_config so the GIN-indexable %> operator uses it.
+FUZZY_WORD_SIMILARITY = 0.4
+
+# Price histogram boundaries for facets when the caller supplies none:
+# buckets are (<10), [10, 20), [20, 50), [50, 100), (>=100).
+DEFAULT_PRICE_BUCKETS = [Decimal("10"), Decimal("20"), Decimal("50"), Decimal("100")]
+
+# Book columns GET /books/{id} returns (BookDetailResponse minus derived fields).
+DETAIL_COLUMNS = (
+    "id",
+    "title",
+    "author",
+    "price",
+    "isbn",
+    "genre_id",
+    "description",
+    "cover_image_url",
+    "publish_date",
+    "stock_quantity",
+)
+
+# Temporary table bulk imports COPY into before the set-based upsert (dropped on commit).
+IMPORT_STAGING_TABLE = "book_import_staging"
+IMPORT_STAGING_COLUMNS = (
+    "row_no",
+    "title",
+    "author",
+    "price",
+    "isbn",
+    "genre",
+    "description",
+    "cover_image_url",
+    "publish_date",
+    "stock_quantity",
+)
 
 
 def _build_tsquery(q: str) -> str:
@@ -27,6 +104,56 @@ def _build_tsquery(q: str) -> str:
     return " & ".join(prefix_tokens)
 
 
+@lru_cache(maxsize=64)
+def _detail_statement(
+    names: tuple[str, ...], *, genre: bool, ratings: bool, reviews: bool
+) -> Select:
+    """Build (once per shape) the BookRepository.get_detail statement.
+
+    book_id and the review limit are bind parameters, so the built statement
+    and its compiled-cache key are reused across requests; constructing the
+    lateral subquery per call cost more than executing it.
+    """
+    # imported here to avoid circular imports at module level
+    from app.reviews.models import BookRatingStats, Review
+    from app.users.models import User
+
+    stmt = select(*(getattr(Book, name) for name in names)).where(
+        Book.id == bindparam("book_id")
+    )
+    if genre:
+        stmt = stmt.add_columns(Genre.name.label("genre_name")).outerjoin(
+            Genre, Genre.id == Book.genre_id
+        )
+    if ratings:
+        stmt = stmt.add_columns(
+            BookRatingStats.avg_rating, BookRatingStats.review_count
+        ).outerjoin(BookRatingStats, BookRatingStats.book_id == Book.id)
+    if reviews:
+        recent = (
+            select(
+                Review.id.label("review_id"),
+                Review.user_id.label("review_user_id"),
+                func.split_part(User.email, "@", 1).label("review_display_name"),
+                Review.rating.label("review_rating"),
+                Review.text.label("review_text"),
+                Review.created_at.label("review_created_at"),
+                Review.updated_at.label("review_updated_at"),
+            )
+            .join(User, User.id == Review.user_id)
+            .where(Review.book_id == Book.id, Review.deleted_at.is_(None))
+            .order_by(Review.created_at.desc(), Review.id.desc())
+            .limit(bindparam("reviews", type_=Integer))
+            .lateral("recent")
+        )
+        stmt = (
+            stmt.add_columns(*recent.c)
+            .outerjoin(recent, true())
+            .order_by(recent.c.review_created_at.desc(), recent.c.review_id.desc())
+        )
+    return stmt
+
+
 class GenreRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -43,6 +170,17 @@ class GenreRepository:
         result = await self.session.execute(select(Genre).where(Genre.id == genre_id))
         return result.scalar_one_or_none()
 
+    async def get_version(self) -> tuple[int, int | None]:
+        """Return (genre count, max genre id) -- the genre list's version counter.
+
+        Genres are insert-only (no rename/delete endpoints), so every change to
+        GET /genres bumps one of the two values.
+        """
+        row = (
+            await self.session.execute(select(func.count(Genre.id), func.max(Genre.id)))
+        ).one()
+        return row[0], row[1]
+
     async def create(self, name: str) -> Genre:
         genre = Genre(name=name)
         self.session.add(genre)
@@ -54,10 +192,217 @@ class BookRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def get_by_id(self, book_id: int) -> Book | None:
-        result = await self.session.execute(select(Book).where(Book.id == book_id))
+    async def get_by_id(
+        self, book_id: int, *, columns: Sequence[str] | None = None
+    ) -> Book | None:
+        """Return the book or None; columns= limits the SELECT list (load_only)."""
+        stmt = select(Book).where(Book.id == book_id)
+        if columns is not None:
+            stmt = stmt.options(load_only_fields(Book, columns))
+        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_version(self, book_id: int, *, reviews: bool = False) -> tuple | None:
+        """Return the cheap version tuple behind GET /books/{id}'s ETag, or None if missing.
+
+        Reads book.updated_at and stock plus the book_rating_stats counters in one
+        narrow query, without loading the Book entity. reviews=True adds the
+        book's latest review updated_at, for details embedding recent reviews
+        (text-only edits leave the counters unchanged).
+        """
+        # imported here to avoid a circular import at module level
+        from app.reviews.models import BookRatingStats, Review
+
+        stmt = (
+            select(
+                Book.updated_at,
+                Book.stock_quantity,
+                BookRatingStats.review_count,
+                BookRatingStats.rating_sum,
+            )
+            .outerjoin(BookRatingStats, BookRatingStats.book_id == Book.id)
+            .where(Book.id == book_id)
+        )
+        if reviews:
+            stmt = stmt.add_columns(
+                select(func.max(Review.updated_at))
+                .where(Review.book_id == book_id)
+                .scalar_subquery()
+            )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return tuple(row) if row else None
+
+    async def get_detail(
+        self,
+        book_id: int,
+        *,
+        columns: Sequence[str] | None = None,
+        genre: bool = True,
+        ratings: bool = True,
+        reviews: int = 0,
+    ) -> list[Row]:
+        """Fetch everything GET /books/{id} shows in one statement; [] if missing.
+
+        Book columns (columns= limits them; default DETAIL_COLUMNS), the genre
+        name and the book_rating_stats aggregates come from LEFT JOINs. With
+        reviews=N the N newest live reviews (and reviewer display names) are
+        added by a LEFT JOIN LATERAL, giving one row per review, newest first,
+        with the book columns repeated. A book without reviews still yields one
+        row whose review_* columns are NULL.
+        """
+        stmt = _detail_statement(
+            DETAIL_COLUMNS
+            if columns is None
+            else ("id", *(c for c in columns if c != "id")),
+            genre=genre,
+            ratings=ratings,
+            reviews=reviews > 0,
+        )
+        params = (
+            {"book_id": book_id, "reviews": reviews}
+            if reviews
+            else {"book_id": book_id}
+        )
+        result = await self.session.execute(stmt, params)
+        return list(result.all())
+
+    async def list_ids(self) -> set[int]:
+        """Return every book id (index-only scan of the primary key)."""
+        return set((await self.session.scalars(select(Book.id))).all())
+
+    async def list_suggestion_rows(
+        self, *, updated_since: datetime | None = None
+    ) -> list[tuple[int, str, str, int, datetime]]:
+        """Return (id, title, author, popularity, updated_at) rows for the suggest index.
+
+        popularity = units sold in confirmed orders + live review count.
+        updated_at is the later of the book's and its rating stats' updated_at
+        (review writes move only the latter). With updated_since, only books
+        where either is >= updated_since.
+        """
+        from app.orders.models import Order, OrderItem, OrderStatus  # avoid circular
+        from app.reviews.models import BookRatingStats
+
+        sold = (
+            select(
+                OrderItem.book_id.label("book_id"),
+                func.sum(OrderItem.quantity).label("units"),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(Order.status == OrderStatus.CONFIRMED)
+            .group_by(OrderItem.book_id)
+        )
+        changed = None
+        if updated_since is not None:
+            changed = or_(
+                Book.updated_at >= updated_since,
+                BookRatingStats.updated_at >= updated_since,
+            )
+            sold = sold.where(
+                OrderItem.book_id.in_(
+                    select(Book.id)
+                    .outerjoin(BookRatingStats, BookRatingStats.book_id == Book.id)
+                    .where(changed)
+                )
+            )
+        sold = sold.subquery()
+
+        stmt = (
+            select(
+                Book.id,
+                Book.title,
+                Book.author,
+                (
+                    func.coalesce(sold.c.units, 0)
+                    + func.coalesce(BookRatingStats.review_count, 0)
+                ).label("popularity"),
+                func.greatest(Book.updated_at, BookRatingStats.updated_at),
+            )
+            .outerjoin(sold, sold.c.book_id == Book.id)
+            .outerjoin(BookRatingStats, BookRatingStats.book_id == Book.id)
+        )
+        if changed is not None:
+            stmt = stmt.where(changed)
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def stream_export_rows(
+        self, *, updated_since: datetime | None = None, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield every book, ordered by id, in partitions of batch_size rows.
+
+        Rows carry the book columns plus genre (name), avg_rating, review_count
+        and updated_at = the later of the book's and its rating stats' updated_at.
+        Streamed through a server-side cursor (yield_per), so memory stays flat
+        however large the catalog. With updated_since, only rows whose
+        updated_at >= updated_since.
+        """
+        from app.reviews.models import BookRatingStats  # avoid circular at module level
+
+        updated_at = func.greatest(
+            Book.updated_at, func.coalesce(BookRatingStats.updated_at, Book.updated_at)
+        )
+        stmt = (
+            select(
+                Book.id,
+                Book.title,
+                Book.author,
+                Book.price,
+                Book.isbn,
+                Book.genre_id,
+                Genre.name.label("genre"),
+                Book.description,
+                Book.cover_image_url,
+                Book.publish_date,
+                Book.stock_quantity,
+                BookRatingStats.avg_rating,
+                func.coalesce(BookRatingStats.review_count, 0).label("review_count"),
+                Book.created_at,
+                updated_at.label("updated_at"),
+            )
+            .outerjoin(Genre, Genre.id == Book.genre_id)
+            .outerjoin(BookRatingStats, BookRatingStats.book_id == Book.id)
+            .order_by(Book.id)
+        )
+        if updated_since is not None:
+            stmt = stmt.where(updated_at >= updated_since)
+        result = await self.session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_many(
+        self,
+        *,
+        ids: list[int] | None = None,
+        isbns: list[str] | None = None,
+        include_ratings: bool = False,
+    ) -> list[tuple[Book, Decimal | None, int | None]]:
+        """Fetch books by id and/or isbn in one query: (book, avg_rating, review_count).
+
+        Uses = ANY(array) so the statement shape does not depend on list length.
+        Rating columns come from book_rating_stats when include_ratings is set,
+        otherwise they are None. Order is unspecified; callers map results back.
+        """
+        from app.reviews.models import BookRatingStats  # avoid circular at module level
+
+        conditions = []
+        if ids:
+            conditions.append(Book.id == any_(array(ids, type_=Integer)))
+        if isbns:
+            conditions.append(Book.isbn == any_(array(isbns, type_=String)))
+        if not conditions:
+            return []
+
+        if include_ratings:
+            stmt = select(
+                Book, BookRatingStats.avg_rating, BookRatingStats.review_count
+            ).outerjoin(BookRatingStats, BookRatingStats.book_id == Book.id)
+        else:
+            stmt = select(Book, null(), null())
+        result = await self.session.execute(stmt.where(or_(*conditions)))
+        return [tuple(row) for row in result.all()]
+
     async def get_by_isbn(self, isbn: str) -> Book | None:
         result = await self.session.execute(select(Book).where(Book.isbn == isbn))
         return result.scalar_one_or_none()
@@ -83,6 +428,77 @@ class BookRepository:
         await self.session.flush()
         return book
 
+    async def bulk_set_stock(
+        self, entries: list[tuple[int | None, str | None, int, bool]]
+    ) -> list[Row]:
+        """Apply many stock changes with one UPDATE ... FROM (VALUES ...).
+
+        entries are (book_id, isbn, amount, is_delta) -- amount is the new
+        quantity, or added to the current one when is_delta. Returns one row per
+        matched entry: (ord, id, title, old_qty, new_qty, applied), where ord is
+        the entry's index. Unmatched entries have no row.
+
+        Target rows are locked (FOR UPDATE, id order) before old_qty is read, so
+        deltas compose correctly with concurrent writers. The UPDATE is a no-op
+        (applied=False everywhere) when any new_qty would be negative or two
+        entries resolve to the same book; the caller turns that into an error.
+        Book instances already in the session get the new quantity too.
+        """
+        v = values(
+            column("ord", Integer),
+            column("book_id", Integer),
+            column("isbn", String),
+            column("amount", Integer),
+            column("is_delta", Boolean),
+            name="v",
+        ).data([(i, *entry) for i, entry in enumerate(entries)])
+        target = (
+            select(
+                v.c.ord,
+                Book.id,
+                Book.title,
+                Book.stock_quantity.label("old_qty"),
+                case(
+                    (v.c.is_delta, Book.stock_quantity + v.c.amount), else_=v.c.amount
+                ).label("new_qty"),
+            )
+            .join_from(v, Book, or_(Book.id == v.c.book_id, Book.isbn == v.c.isbn))
+            .order_by(Book.id)
+            .with_for_update(of=Book)
+            .cte("target")
+        )
+        valid = and_(
+            ~exists().where(target.c.new_qty < 0),
+            ~exists(select(target.c.id).group_by(target.c.id).having(func.count() > 1)),
+        )
+        updated = (
+            update(Book)
+            .where(Book.id == target.c.id, valid)
+            .values(stock_quantity=target.c.new_qty, updated_at=func.now())
+            .returning(Book.id)
+            .cte("updated")
+        )
+        rows = (
+            await self.session.execute(
+                select(
+                    target.c.ord,
+                    target.c.id,
+                    target.c.title,
+                    target.c.old_qty,
+                    target.c.new_qty,
+                    updated.c.id.is_not(None).label("applied"),
+                )
+                .outerjoin(updated, updated.c.id == target.c.id)
+                .order_by(target.c.ord)
+            )
+        ).all()
+
+        for row in rows:
+            book = self.session.identity_map.get(identity_key(Book, row.id))
+            if row.applied and book is not None:
+                set_committed_value(book, "stock_quantity", row.new_qty)
+        return rows
+
     async def search(
         self,
         *,
@@ -95,12 +511,20 @@ class BookRepository:
         max_price: Decimal | None = None,
         page: int = 1,
         size: int = 20,
-    ) -> tuple[list[Book], int]:
-        """Return (books, total_count) for the given search/filter/sort/page.
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+        fuzzy: bool = False,
+        facets: bool = False,
+        price_buckets: list[Decimal] | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Page[Book]:
+        """Return a Page of books (unpacks as (books, total_count)).
 
         When q is provided: filters by FTS match AND sorts by ts_rank DESC
           (relevance sort overrides the sort parameter -- locked decision).
         When q is absent: sorts by the sort parameter.
+        With fuzzy=True and no FTS match for q, falls back to pg_trgm word
+          similarity on title/author (typo tolerant) ranked by similarity DESC.
 
         Sort values: 'title' (A-Z), 'price' (asc), 'date' (publish_date asc),
           'created_at' (desc -- newest first), 'avg_rating' (desc -- highest rated first).
@@ -109,90 +533,515 @@ class BookRepository:
 
         genre_id and author filters combine with AND when both are provided.
         min_price and max_price filter by price range (inclusive).
-        """
-        stmt = select(Book)
 
-        # FTS filter
-        if q:
-            tsquery_str = _build_tsquery(q)
-            if tsquery_str:
-                ts_query = func.to_tsquery("simple", tsquery_str)
-                stmt = stmt.where(Book.search_vector.bool_op("@@")(ts_query))
+        When cursor is provided, the page is located by keyset on the active
+        sort key + id and page is ignored; otherwise page/size use OFFSET.
+
+        total_mode selects how total is produced (see count_total): 'exact',
+        'estimate' (planner estimate above a cap), or 'none' (total is None).
 
-        # Genre filter (exact match by ID -- clients pick from GET /genres list)
-        if genre_id is not None:
-            stmt = stmt.where(Book.genre_id == genre_id)
+        facets=True also fills Page.facets (see _facets): genre counts and a
+        price histogram over price_buckets (default DEFAULT_PRICE_BUCKETS).
 
-        # Author filter (case-insensitive substring -- covers "J.R.R. Tolkien" when searching "tolkien")
+        columns= loads only those Book columns (sparse fieldsets); the rest stay
+        deferred and must not be touched on the returned entities.
+        """
+        stmt = select(Book)
+
+        # Author filter (case-insensitive substring -- covers "J.R.R. Tolkien" when searching "tolkien").
+        # Served by the ix_books_author_trgm GIN index rather than a sequential scan.
         if author:
             stmt = stmt.where(Book.author.ilike(f"%{author}%"))
 
-        # Price range filter (inclusive bounds)
+        # Genre and price range filters (inclusive bounds). Kept as separate
+        # predicates so facets can drop their own dimension (see _facets).
+        genre_filter = Book.genre_id == genre_id if genre_id is not None else None
+        price_filters = []
         if min_price is not None:
-            stmt = stmt.where(Book.price >= min_price)
+            price_filters.append(Book.price >= min_price)
         if max_price is not None:
-            stmt = stmt.where(Book.price <= max_price)
-
-        # Sort order
-        if q:
-            tsquery_str_for_rank = _build_tsquery(q)
-            if tsquery_str_for_rank:
-                ts_query_rank = func.to_tsquery("simple", tsquery_str_for_rank)
-                stmt = stmt.order_by(
-                    func.ts_rank(Book.search_vector, ts_query_rank).desc(),
-                    Book.id,
+            price_filters.append(Book.price <= max_price)
+        price_filter = and_(*price_filters) if price_filters else None
+
+        # FTS filter; fuzzy=True swaps in trigram similarity when FTS finds nothing
+        tsquery_str = _build_tsquery(q) if q else ""
+        ts_query = func.to_tsquery("simple", tsquery_str) if tsquery_str else None
+        fuzzy_q: str | None = None
+        if ts_query is not None:
+            fts_stmt = stmt.where(Book.search_vector.bool_op("@@")(ts_query))
+            probe = fts_stmt.where(
+                *(f for f in (genre_filter, price_filter) if f is not None)
+            )
+            if fuzzy and not await self.session.scalar(select(probe.exists())):
+                fuzzy_q = q.strip().lower()
+                await self.session.execute(
+                    select(
+                        func.set_config(
+                            "pg_trgm.word_similarity_threshold",
+                            str(FUZZY_WORD_SIMILARITY),
+                            True,
+                        )
+                    )
+                )
+                stmt = stmt.where(
+                    or_(Book.title.op("%>")(fuzzy_q), Book.author.op("%>")(fuzzy_q))
                 )
-            # If tsquery_str is empty (all special chars stripped), fall through to default sort
             else:
-                stmt = stmt.order_by(Book.title, Book.id)
+                stmt = fts_stmt
+
+        facet_counts = (
+            await self._facets(
+                stmt,
+                genre_filter,
+                price_filter,
+                price_buckets or DEFAULT_PRICE_BUCKETS,
+            )
+            if facets
+            else None
+        )
+        stmt = stmt.where(*(f for f in (genre_filter, price_filter) if f is not None))
+
+        # Total count BEFORE pagination (reuses same filters)
+        total, total_mode = await count_total(self.session, stmt, total_mode)
+
+        # Sort keys -- each doubles as the keyset column for cursor pagination
+        if fuzzy_q is not None:
+            scope = f"books:fuzzy:{fuzzy_q}"
+            keys = [
+                SortKey(
+                    func.greatest(
+                        func.word_similarity(fuzzy_q, Book.title),
+                        func.word_similarity(fuzzy_q, Book.author),
+                    ),
+                    descending=True,
+                ),
+                SortKey(Book.id),
+            ]
+        elif q and ts_query is not None:
+            scope = f"books:rank:{tsquery_str}"
+            keys = [
+                SortKey(func.ts_rank(Book.search_vector, ts_query), descending=True),
+                SortKey(Book.id),
+            ]
+        elif q:
+            # tsquery_str is empty (all special chars stripped) -- default sort
+            scope = "books:title:asc"
+            keys = [SortKey(Book.title), SortKey(Book.id)]
         elif sort == "avg_rating":
-            # Left-join subquery against reviews to compute avg rating per book
-            from app.reviews.models import Review  # avoid circular at module level
+            # Left-join the incrementally maintained per-book stats row
+            # (imported here to avoid a circular import at module level)
+            from app.reviews.models import BookRatingStats
+
+            stmt = stmt.outerjoin(BookRatingStats, Book.id == BookRatingStats.book_id)
+            # Default for avg_rating: desc (highest first); sort_dir overrides.
+            # Books with no reviews always sort last.
+            scope = f"books:avg_rating:{sort_dir}"
+            keys = [
+                SortKey(
+                    BookRatingStats.avg_rating,
+                    descending=sort_dir != "asc",
+                    nullable=True,
+                    nulls_last=True,
+                ),
+                SortKey(Book.id),
+            ]
+        elif sort == "created_at":
+            # For created_at, default is desc (newest first); sort_dir overrides
+            scope = f"books:created_at:{sort_dir}"
+            keys = [
+                SortKey(Book.created_at, descending=sort_dir != "asc"),
+                SortKey(Book.id),
+            ]
+        else:
+            sort_col_map = {
+                "title": Book.title,
+                "price": Book.price,
+                "date": Book.publish_date,
+            }
+            col = sort_col_map.get(sort, Book.title)
+            scope = f"books:{sort}:{sort_dir}"
+            keys = [
+                SortKey(col, descending=sort_dir == "desc", nullable=sort == "date"),
+                SortKey(Book.id),
+            ]
+
+        if columns is not None:
+            stmt = stmt.options(load_only_fields(Book, columns))
+
+        books, next_cursor = await paginate(
+            self.session,
+            stmt,
+            keys,
+            scope=scope,
+            cursor=cursor,
+            page=page,
+            size=size,
+        )
+        return Page(
+            items=books,
+            total=total,
+            next_cursor=next_cursor,
+            total_mode=total_mode,
+            facets=facet_counts,
+        )
+
+    async def _facets(
+        self,
+        base_stmt: Select,
+        genre_filter: object,
+        price_filter: object,
+        bounds: list[Decimal],
+    ) -> dict:
+        """Return genre counts and a price histogram for one filtered book set.
+
+        Both facets come from a single GROUPING SETS ((genre_id), (bucket)) scan
+        of base_stmt (q/author filters already applied). Each facet ignores its
+        own dimension so the UI can offer alternatives: genre counts apply the
+        price filter, price buckets apply the genre filter (via FILTER clauses).
+
+        bounds are ascending; bucket i spans [bounds[i-1], bounds[i]) with open
+        ends below bounds[0] and from bounds[-1] up. Empty buckets are included.
+        """
+        bucket = func.width_bucket(
+            Book.price, array([literal(b, Numeric) for b in bounds])
+        )
+        rows_sub = base_stmt.with_only_columns(
+            Book.genre_id,
+            bucket.label("bucket"),
+            (genre_filter if genre_filter is not None else true()).label("in_genre"),
+            (price_filter if price_filter is not None else true()).label("in_price"),
+        ).subquery()
+
+        stmt = select(
+            func.grouping(rows_sub.c.genre_id).label("is_bucket_row"),
+            rows_sub.c.genre_id,
+            rows_sub.c.bucket,
+            func.count().filter(rows_sub.c.in_price).label("genre_count"),
+            func.count().filter(rows_sub.c.in_genre).label("bucket_count"),
+        ).group_by(
+            func.grouping_sets(tuple_(rows_sub.c.genre_id), tuple_(rows_sub.c.bucket))
+        )
+        rows = (await self.session.execute(stmt)).all()
+
+        genres = sorted(
+            (
+                {"genre_id": r.genre_id, "count": r.genre_count}
+                for r in rows
+                if not r.is_bucket_row and r.genre_count
+            ),
+            key=lambda g: (-g["count"], g["genre_id"] is None, g["genre_id"] or 0),
+        )
+        bucket_counts = {r.bucket: r.bucket_count for r in rows if r.is_bucket_row}
+        price = [
+            {
+                "min": bounds[i - 1] if i > 0 else None,
+                "max": bounds[i] if i < len(bounds) else None,
+                "count": bucket_counts.get(i, 0),
+            }
+            for i in range(len(bounds) + 1)
+        ]
+        return {"genres": genres, "price": price}
+
+    # ------------------------------------------------------------------
+    # Bulk import (app/books/importer.py)
+    # ------------------------------------------------------------------
+
+    async def create_import_staging(self) -> None:
+        """Create the per-transaction staging table the import COPYs into.
+
+        Any leftover from an aborted import earlier in the transaction is dropped.
+        """
+        await self.drop_import_staging()
+        await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE {IMPORT_STAGING_TABLE} ("
+                " row_no integer NOT NULL, title text, author text, price numeric,"
+                " isbn text, genre text, description text, cover_image_url text,"
+                " publish_date date, stock_quantity integer"
+                ") ON COMMIT DROP"
+            )
+        )
+
+    async def copy_import_rows(self, records: list[tuple]) -> None:
+        """COPY records (IMPORT_STAGING_COLUMNS order) into the staging table.
+
+        Uses asyncpg's binary COPY on the session's own connection, so rows are
+        visible to the rest of the transaction.
+        """
+        conn = await self.session.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            IMPORT_STAGING_TABLE, records=records, columns=IMPORT_STAGING_COLUMNS
+        )
+
+    async def index_import_staging(self) -> None:
+        """Index and analyze the filled staging table before the set-based steps."""
+        await self.session.execute(
+            text(f"CREATE INDEX ON {IMPORT_STAGING_TABLE} (isbn)")
+        )
+        await self.session.execute(text(f"ANALYZE {IMPORT_STAGING_TABLE}"))
+
+    async def create_import_genres(self) -> int:
+        """Insert staged genre names that do not exist yet; return how many were created."""
+        result = await self.session.execute(
+            text(
+                "INSERT INTO genres (name)"
+                f" SELECT DISTINCT genre FROM {IMPORT_STAGING_TABLE}"
+                " WHERE genre IS NOT NULL"
+                " ON CONFLICT (name) DO NOTHING"
+            )
+        )
+        return result.rowcount
+
+    async def list_import_rejections(self, limit: int) -> list[tuple[int, str, str]]:
+        """Return up to `limit` staged rows the upsert will skip, as (row, field, message).
+
+        A row is skipped when its genre name is unknown, or when a later row of
+        the same file carries the same ISBN (the last occurrence wins).
+        """
+        result = await self.session.execute(
+            text(
+                "SELECT row_no, field, message FROM ("
+                "  SELECT s.row_no, 'genre' AS field,"
+                "         'Unknown genre: ' || s.genre AS message"
+                f"  FROM {IMPORT_STAGING_TABLE} s"
+                "  WHERE s.genre IS NOT NULL"
+                "    AND NOT EXISTS (SELECT 1 FROM genres g WHERE g.name = s.genre)"
+                "  UNION ALL"
+                "  SELECT row_no, 'isbn',"
+                "         'Duplicate isbn in file; superseded by row ' || last_row"
+                "  FROM (SELECT row_no, max(row_no) OVER (PARTITION BY isbn) AS last_row"
+                f"        FROM {IMPORT_STAGING_TABLE} WHERE isbn IS NOT NULL) d"
+                "  WHERE row_no < last_row"
+                ") r ORDER BY row_no LIMIT :limit"
+            ),
+            {"limit": limit},
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def upsert_from_import_staging(self) -> tuple[int, int]:
+        """Upsert every accepted staged row into books; return (inserted, updated).
+
+        One INSERT ... SELECT ... ON CONFLICT (isbn) DO UPDATE. Genres are
+        resolved by name in the same statement. On update, optional columns the
+        file left empty keep their current value, and stock_quantity is never
+        touched (stock is managed through the stock endpoints).
+        """
+        row = (
+            await self.session.execute(
+                text(
+                    "WITH upserted AS ("
+                    "  INSERT INTO books (title, author, price, isbn, genre_id,"
+                    "    description, cover_image_url, publish_date, stock_quantity)"
+                    "  SELECT s.title, s.author, s.price, s.isbn, g.id,"
+                    "    s.description, s.cover_image_url, s.publish_date,"
+                    "    coalesce(s.stock_quantity, 0)"
+                    f"  FROM {IMPORT_STAGING_TABLE} s"
+                    "  LEFT JOIN genres g ON g.name = s.genre"
+                    "  WHERE (s.genre IS NULL OR g.id IS NOT NULL)"
+                    "    AND (s.isbn IS NULL OR NOT EXISTS ("
+                    f"      SELECT 1 FROM {IMPORT_STAGING_TABLE} d"
+                    "      WHERE d.isbn = s.isbn AND d.row_no > s.row_no))"
+                    "  ON CONFLICT (isbn) DO UPDATE SET"
+                    "    title = EXCLUDED.title,"
+                    "    author = EXCLUDED.author,"
+                    "    price = EXCLUDED.price,"
+                    "    genre_id = coalesce(EXCLUDED.genre_id, books.genre_id),"
+                    "    description = coalesce(EXCLUDED.description, books.description),"
+                    "    cover_image_url = coalesce(EXCLUDED.cover_image_url, books.cover_image_url),"
+                    "    publish_date = coalesce(EXCLUDED.publish_date, books.publish_date),"
+                    "    updated_at = now()"
+                    "  RETURNING (xmax = 0) AS inserted"
+                    ")"
+                    " SELECT count(*) FILTER (WHERE inserted),"
+                    "        count(*) FILTER (WHERE NOT inserted)"
+                    " FROM upserted"
+                )
+            )
+        ).one()
+        return row[0], row[1]
+
+    async def drop_import_staging(self) -> None:
+        await self.session.execute(text(f"DROP TABLE IF EXISTS {IMPORT_STAGING_TABLE}"))
 
-            avg_sub = (
+
+class CopurchaseRepository:
+    """Set-based maintenance and lookup of the "also bought" tables (app/books/copurchase.py)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def lock_state(self) -> tuple[int, int] | None:
+        """Lock the refresh state row; return (last_order_id, order_count).
+
+        Returns None when another refresh holds the lock (SKIP LOCKED), so
+        concurrent workers never fold the same orders twice.
+        """
+        await self.session.execute(
+            insert(BookCopurchaseState).values(id=1).on_conflict_do_nothing()
+        )
+        row = (
+            await self.session.execute(
                 select(
-                    Review.book_id,
-                    func.avg(Review.rating).label("avg_rating"),
+                    BookCopurchaseState.last_order_id, BookCopurchaseState.order_count
                 )
-                .where(Review.deleted_at.is_(None))
-                .group_by(Review.book_id)
-                .subquery()
-            )
-            stmt = stmt.outerjoin(avg_sub, Book.id == avg_sub.c.book_id)
-            # Default for avg_rating: desc (highest first); sort_dir overrides
-            if sort_dir == "asc":
-                stmt = stmt.order_by(nulls_last(avg_sub.c.avg_rating.asc()), Book.id)
-            else:
-                stmt = stmt.order_by(nulls_last(avg_sub.c.avg_rating.desc()), Book.id)
-        else:
-            # For created_at, default is desc (newest first); sort_dir overrides
-            if sort == "created_at":
-                if sort_dir == "asc":
-                    order_col = Book.created_at.asc()
-                else:
-                    order_col = Book.created_at.desc()
-            else:
-                sort_col_map = {
-                    "title": Book.title,
-                    "price": Book.price,
-                    "date": Book.publish_date,
-                }
-                col = sort_col_map.get(sort, Book.title)
-                if sort_dir == "desc":
-                    order_col = col.desc()
-                else:
-                    order_col = col.asc()
-            stmt = stmt.order_by(order_col, Book.id)
+                .where(BookCopurchaseState.id == 1)
+                .with_for_update(skip_locked=True)
+            )
+        ).first()
+        return None if row is None else (row.last_order_id, row.order_count)
 
-        # Total count BEFORE pagination (reuses same filters)
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = await self.session.scalar(count_stmt)
+    async def reset(self) -> None:
+        """Forget every counted order (full rebuild from the first order)."""
+        await self.session.execute(delete(BookCopurchasePair))
+        await self.session.execute(delete(BookCopurchase))
+        await self.session.execute(
+            update(BookCopurchaseState).values(last_order_id=0, order_count=0)
+        )
 
-        # Apply pagination
-        offset = (page - 1) * size
-        stmt = stmt.limit(size).offset(offset)
+    async def add_orders(self, after_id: int, upto_id: int) -> tuple[int, list[int]]:
+        """Fold confirmed orders with after_id < id <= upto_id into the pair counts.
 
-        result = await self.session.execute(stmt)
-        books = list(result.scalars().all())
+        One statement: the orders' distinct books are self-joined per order and
+        the resulting pair (and diagonal) counts are added with ON CONFLICT.
+        Returns (orders counted, ids of the books whose counts changed).
+        """
+        from app.orders.models import Order, OrderItem, OrderStatus  # avoid circular
 
-        return books, total or 0
+        items = (
+            select(OrderItem.order_id, OrderItem.book_id)
+            .distinct()
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(
+                OrderItem.order_id > after_id,
+                OrderItem.order_id <= upto_id,
+                Order.status == OrderStatus.CONFIRMED,
+                OrderItem.book_id.is_not(None),
+            )
+            .cte("items")
+        )
+        a, b = items.alias("a"), items.alias("b")
+        pairs = insert(BookCopurchasePair).from_select(
+            ["book_id", "other_book_id", "order_count"],
+            select(a.c.book_id, b.c.book_id, func.count())
+            .join(b, b.c.order_id == a.c.order_id)
+            .group_by(a.c.book_id, b.c.book_id),
+        )
+        counted = (
+            pairs.on_conflict_do_update(
+                index_elements=[
+                    BookCopurchasePair.book_id,
+                    BookCopurchasePair.other_book_id,
+                ],
+                set_={
+                    "order_count": BookCopurchasePair.order_count
+                    + pairs.excluded.order_count
+                },
+            )
+            .returning(BookCopurchasePair.book_id)
+            .cte("counted")
+        )
+        row = (
+            await self.session.execute(
+                select(
+                    select(func.count(items.c.order_id.distinct())).scalar_subquery(),
+                    func.array(
+                        select(counted.c.book_id)
+                        .distinct()
+                        .order_by(counted.c.book_id)
+                        .scalar_subquery()
+                    ),
+                )
+            )
+        ).one()
+        return row[0], list(row[1])
+
+    async def save_state(self, last_order_id: int, order_count: int) -> None:
+        await self.session.execute(
+            update(BookCopurchaseState)
+            .where(BookCopurchaseState.id == 1)
+            .values(
+                last_order_id=last_order_id,
+                order_count=order_count,
+                refreshed_at=func.now(),
+            )
+        )
+
+    async def rebuild_top(
+        self,
+        book_ids: list[int] | None,
+        *,
+        order_count: int,
+        top_k: int,
+        min_orders: int,
+    ) -> int:
+        """Recompute the top_k rows of book_copurchase for book_ids (None: every book).
+
+        Partners are ranked by co-purchase count, then lift. Pairs seen in
+        fewer than min_orders orders are left out. Returns rows written.
+        """
+        p = aliased(BookCopurchasePair, name="p")
+        a = aliased(BookCopurchasePair, name="a")  # p.book_id's diagonal
+        b = aliased(BookCopurchasePair, name="b")  # p.other_book_id's diagonal
+        clear = delete(BookCopurchase)
+        ranked = (
+            select(
+                p.book_id,
+                p.other_book_id,
+                func.row_number()
+                .over(
+                    partition_by=p.book_id,
+                    order_by=(
+                        p.order_count.desc(),
+                        b.order_count.asc(),
+                        p.other_book_id,
+                    ),
+                )
+                .label("rank"),
+                p.order_count,
+                (cast(p.order_count, Numeric) / order_count).label("support"),
+                (
+                    cast(p.order_count, Numeric)
+                    * order_count
+                    / (a.order_count * b.order_count)
+                ).label("lift"),
+            )
+            .join(a, and_(a.book_id == p.book_id, a.other_book_id == p.book_id))
+            .join(
+                b,
+                and_(b.book_id == p.other_book_id, b.other_book_id == p.other_book_id),
+            )
+            .where(p.other_book_id != p.book_id, p.order_count >= min_orders)
+        )
+        if book_ids is not None:
+            # One array parameter, however many books the refresh touched
+            scope = any_(bindparam("book_ids", book_ids, type_=ARRAY(Integer)))
+            clear = clear.where(BookCopurchase.book_id == scope)
+            ranked = ranked.where(p.book_id == scope)
+        ranked = ranked.subquery("ranked")
+
+        await self.session.execute(clear)
+        columns = ["book_id", "other_book_id", "rank", "order_count", "support", "lift"]
+        result = await self.session.execute(
+            insert(BookCopurchase).from_select(
+                columns,
+                select(*(ranked.c[name] for name in columns)).where(
+                    ranked.c.rank <= top_k
+                ),
+            )
+        )
+        return result.rowcount
+
+    async def list_for_book(self, book_id: int, limit: int) -> list[Row]:
+        """Return up to `limit` (BookCopurchase, Book) rows for book_id, best first.
+
+        Reads the (book_id, rank) index; no aggregation at request time.
+        """
+        result = await self.session.execute(
+            select(BookCopurchase, Book)
+            .join(Book, Book.id == BookCopurchase.other_book_id)
+            .where(BookCopurchase.book_id == book_id)
+            .order_by(BookCopurchase.rank)
+            .limit(limit)
+        )
+        return list(result.all())
@@ -1,28 +1,109 @@
 """Catalog HTTP endpoints: book CRUD, stock management, genre taxonomy."""
 
-from decimal import Decimal
+import io
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import pairwise
+from pathlib import PurePath
 from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, Query, status
-
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from app.books.cache import (
+    ALSO_BOUGHT_TAG,
+    BOOK_DETAIL_TAG,
+    BOOKS_LIST_TAG,
+    GENRES_KEY,
+    GENRES_TAG,
+    also_bought_key,
+    book_detail_key,
+    book_list_key,
+    book_tag,
+    sort_tag,
+)
+from app.books.copurchase import COPURCHASE_TOP_K
+from app.books.exporter import (
+    MEDIA_TYPES,
+    ExportFormat,
+    export_catalog,
+    export_watermark,
+)
+from app.books.importer import ImportFormat, import_catalog
 from app.books.repository import BookRepository, GenreRepository
-from app.reviews.repository import ReviewRepository
 from app.books.schemas import (
+    MAX_DETAIL_REVIEWS,
+    AlsoBoughtItem,
+    AlsoBoughtResponse,
+    BookBatchItem,
+    BookBatchRequest,
+    BookBatchResponse,
     BookCreate,
     BookDetailResponse,
+    BookImportReport,
     BookListResponse,
     BookResponse,
+    BookSuggestion,
+    BookSuggestionResponse,
     BookUpdate,
+    BulkStockResponse,
+    BulkStockResult,
+    BulkStockUpdate,
+    CacheStatsResponse,
     GenreCreate,
     GenreResponse,
     StockUpdate,
 )
 from app.books.service import BookService
+from app.books.suggest import suggestion_index
+from app.core.cache import catalog_cache
 from app.core.deps import AdminUser, DbSession
+from app.core.etag import is_not_modified, make_etag, not_modified
+from app.core.exceptions import AppError
+from app.core.fields import parse_fields, pick, sparse_response
+from app.core.pagination import TotalMode
 from app.email.service import EmailSvc
 
 router = APIRouter(tags=["catalog"])
 
+MAX_PRICE_BUCKETS = 20
+
+
+def _parse_price_buckets(raw: str | None) -> list[Decimal] | None:
+    """Parse "10,20,50" into ascending Decimal boundaries; None when not given.
+
+    Raises AppError(422) BOOK_PRICE_BUCKETS_INVALID for non-numeric, negative,
+    unsorted/duplicate or too many boundaries.
+    """
+    if raw is None or not raw.strip():
+        return None
+    try:
+        bounds = [Decimal(part.strip()) for part in raw.split(",")]
+    except InvalidOperation:
+        bounds = []
+    if (
+        not bounds
+        or len(bounds) > MAX_PRICE_BUCKETS
+        or any(not b.is_finite() or b < 0 for b in bounds)
+        or any(a >= b for a, b in pairwise(bounds))
+    ):
+        raise AppError(
+            status_code=422,
+            detail=f"price_buckets must be up to {MAX_PRICE_BUCKETS} ascending, "
+            "comma-separated non-negative prices",
+            code="BOOK_PRICE_BUCKETS_INVALID",
+            field="price_buckets",
+        )
+    return bounds
+
 
 def _make_service(db: DbSession) -> BookService:
     """Instantiate BookService with repositories bound to the current DB session."""
@@ -61,7 +142,13 @@ async def list_books(
     sort_dir: Literal["asc", "desc"] = Query("asc", description="Sort direction: asc or desc"),
     page: int = Query(1, ge=1, description="Page number, 1-indexed"),
     size: int = Query(20, ge=1, le=100, description="Items per page (max 100)"),
-) -> BookListResponse:
+    cursor: str | None = Query(None, description="Opaque cursor from a previous response's next_cursor; overrides page"),
+    total_mode: TotalMode = Query("exact", description="How total is computed: exact (count), estimate (planner estimate for large sets), none (skip; use has_more)"),  # noqa: B008
+    fuzzy: bool = Query(False, description="Typo-tolerant search: when q has no full-text match, rank by trigram similarity instead"),
+    facets: bool = Query(False, description="Include genre counts and a price histogram for the filtered set"),
+    price_buckets: str | None = Query(None, description="Facet price boundaries, comma-separated ascending (default 10,20,50,100)"),
+    fields: str | None = Query(None, description="Comma-separated book fields to return, e.g. id,title,author,price,cover_image_url (id is always included)"),
+) -> BookListResponse | Response:
     """Browse the book catalog. Public -- no auth required.
 
     Supports pagination (page/size), sorting (sort + sort_dir), full-text search (q),
@@ -69,54 +156,206 @@ async def list_books(
     Filters combine with AND.
 
     When q is present, results are sorted by relevance (ts_rank) regardless of sort param.
-    sort=avg_rating uses a left-join subquery on reviews; books with no reviews sort last.
+    fuzzy=true answers misspelled q ("tolkein") by pg_trgm similarity when FTS finds nothing.
+    sort=avg_rating joins book_rating_stats; books with no reviews sort last.
+
+    Pass next_cursor back as cursor= for constant-cost deep paging (keyset);
+    page= keeps working for backward compatibility.
+    total_mode=estimate|none avoids the full count(*) over the filtered set;
+    estimate still counts up to 1,000 rows and, for larger filtered sets, adds an
+    EXPLAIN round trip, so it can cost more than exact on small result sets.
+    facets=true adds genre counts and price buckets computed in one extra query.
+    fields=title,price,... selects only those columns and returns only those
+    keys per item (sparse fieldset); unknown names are 422 FIELDS_INVALID.
+
+    Responses are served from the process-local catalog cache (normalized
+    parameters as key) until a catalog write invalidates them or the TTL expires.
+    """
+    params = {
+        "q": q,
+        "genre_id": genre_id,
+        "author": author,
+        "min_price": min_price,
+        "max_price": max_price,
+        "sort": sort,
+        "sort_dir": sort_dir,
+        "page": page,
+        "size": size,
+        "cursor": cursor,
+        "total_mode": total_mode,
+        "fuzzy": fuzzy,
+        "facets": facets,
+        "price_buckets": _parse_price_buckets(price_buckets) if facets else None,
+    }
+    selected = parse_fields(fields, BookResponse)
+
+    async def load() -> BookListResponse | dict:
+        result = await _make_service(db).list_books(**params, columns=selected)
+        if selected is None:
+            items = [BookResponse.model_validate(b) for b in result.items]
+        else:
+            items = []
+        envelope = BookListResponse(
+            items=items,
+            total=result.total,
+            page=page,
+            size=size,
+            next_cursor=result.next_cursor,
+            has_more=result.has_more,
+            total_mode=result.total_mode,
+            facets=result.facets,
+        )
+        if selected is None:
+            return envelope
+        # Sparse: the envelope is unchanged, items carry only the selected keys
+        return {
+            **envelope.model_dump(),
+            "items": [pick(b, selected) for b in result.items],
+        }
+
+    def tags(response: BookListResponse | dict) -> list[str]:
+        if isinstance(response, dict):
+            ids = [item["id"] for item in response["items"]]
+        else:
+            ids = [b.id for b in response.items]
+        return [BOOKS_LIST_TAG, sort_tag(sort), *(book_tag(i) for i in ids)]
+
+    result = await catalog_cache.get_or_load(
+        book_list_key(**params, fields=selected), tags, load
+    )
+    return result if selected is None else sparse_response(result)
+
+
+@router.post("/books/batch", response_model=BookBatchResponse)
+async def get_books_batch(body: BookBatchRequest, db: DbSession) -> BookBatchResponse:
+    """Look up many books by id and/or ISBN in one request. Public -- no auth required.
+
+    Up to 300 keys per call, resolved with a single query. Results list ids
+    first, then isbns, each in request order; unknown keys come back with
+    found=false. include_ratings=true adds avg_rating/review_count.
     """
     service = _make_service(db)
-    books, total = await service.list_books(
-        q=q,
-        genre_id=genre_id,
-        author=author,
-        min_price=min_price,
-        max_price=max_price,
-        sort=sort,
-        sort_dir=sort_dir,
-        page=page,
-        size=size,
+    entries = await service.get_books_batch(
+        body.ids, body.isbns, include_ratings=body.include_ratings
     )
-    return BookListResponse(
-        items=[BookResponse.model_validate(b) for b in books],
-        total=total,
-        page=page,
-        size=size,
+    return BookBatchResponse(items=[BookBatchItem.model_validate(e) for e in entries])
+
+
+@router.get("/books/suggest", response_model=BookSuggestionResponse)
+async def suggest_books(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Text typed so far; every word is matched as a prefix of a title or author word"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum suggestions to return"),
+) -> BookSuggestionResponse:
+    """Typeahead suggestions for the search box. Public -- no auth required.
+
+    Served entirely from the in-process prefix index (app/books/suggest.py);
+    no database access on this path. Results are ranked by popularity.
+    The index trails catalog writes by up to SUGGEST_REFRESH_SECONDS.
+    """
+    matches = suggestion_index.search(prefix, limit)
+    return BookSuggestionResponse(
+        items=[BookSuggestion.model_validate(m) for m in matches]
     )
 
 
 @router.get("/books/{book_id}", response_model=BookDetailResponse)
-async def get_book(book_id: int, db: DbSession) -> BookDetailResponse:
+async def get_book(
+    book_id: int,
+    db: DbSession,
+    request: Request,
+    response: Response,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. title,price,in_stock (id is always included)"),
+    reviews: int = Query(0, ge=0, le=MAX_DETAIL_REVIEWS, description=f"Embed the newest N reviews as recent_reviews (max {MAX_DETAIL_REVIEWS})"),
+) -> BookDetailResponse | Response:
     """Get book by ID including stock status and rating aggregates. Public -- no auth required.
 
-    Returns in_stock boolean (true when stock_quantity > 0).
+    Returns in_stock boolean (true when stock_quantity > 0) and genre_name.
     Returns avg_rating (float | None) rounded to 1 decimal place.
     Returns review_count (int), 0 when no reviews exist.
-    404 if book not found.
+    reviews=N adds the N newest reviews as recent_reviews.
+    404 if book not found (404s are not cached).
+
+    The book, genre name, rating aggregates and recent reviews are read in one
+    statement (LEFT JOIN LATERAL for the reviews; see BookRepository.get_detail).
+
+    Sends a strong ETag built from book.updated_at, stock and the rating stats
+    counters; a matching If-None-Match gets 304 without loading the book.
+
+    fields= returns only the named keys and loads only the columns they need;
+    the genre, rating aggregates and reviews are skipped unless asked for.
     """
-    service = _make_service(db)
-    book = await service._get_book_or_404(book_id)
-    review_repo = ReviewRepository(db)
-    aggregates = await review_repo.get_aggregates(book.id)
-    return BookDetailResponse.model_validate({
-        "id": book.id,
-        "title": book.title,
-        "author": book.author,
-        "price": book.price,
-        "isbn": book.isbn,
-        "genre_id": book.genre_id,
-        "description": book.description,
-        "cover_image_url": book.cover_image_url,
-        "publish_date": book.publish_date,
-        "stock_quantity": book.stock_quantity,
-        **aggregates,
-    })
+    selected = parse_fields(fields, BookDetailResponse)
+    if selected is not None and "recent_reviews" not in selected:
+        reviews = 0
+    version = await BookRepository(db).get_version(book_id, reviews=reviews > 0)
+    headers: dict[str, str] = {}
+    if version is not None:
+        etag = make_etag("book", book_id, selected, reviews, *version)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        headers["ETag"] = response.headers["ETag"] = etag
+
+    if selected is not None:
+
+        async def load_sparse() -> dict:
+            columns = [f for f in selected if f in BookResponse.model_fields]
+            if "in_stock" in selected and "stock_quantity" not in columns:
+                columns.append("stock_quantity")
+            data = await _make_service(db).get_book_detail(
+                book_id,
+                columns=columns,
+                genre="genre_name" in selected,
+                ratings="avg_rating" in selected or "review_count" in selected,
+                reviews=reviews,
+            )
+            if "in_stock" in selected:
+                data["in_stock"] = data["stock_quantity"] > 0
+            return pick(data, selected)
+
+        data = await catalog_cache.get_or_load(
+            book_detail_key(book_id, selected, reviews),
+            [book_tag(book_id), BOOK_DETAIL_TAG],
+            load_sparse,
+        )
+        return sparse_response(data, headers=headers)
+
+    async def load() -> BookDetailResponse:
+        data = await _make_service(db).get_book_detail(book_id, reviews=reviews)
+        return BookDetailResponse.model_validate(data)
+
+    return await catalog_cache.get_or_load(
+        book_detail_key(book_id, reviews=reviews), [book_tag(book_id), BOOK_DETAIL_TAG], load
+    )
+
+
+@router.get("/books/{book_id}/also-bought", response_model=AlsoBoughtResponse)
+async def get_also_bought(
+    book_id: int,
+    db: DbSession,
+    limit: int = Query(10, ge=1, le=COPURCHASE_TOP_K, description=f"Maximum books to return (max {COPURCHASE_TOP_K})"),
+) -> AlsoBoughtResponse:
+    """Books frequently bought together with this one. Public -- no auth required.
+
+    Served from the precomputed book_copurchase index (app/books/copurchase.py)
+    with one indexed lookup; ranked by how many confirmed orders contained both
+    books. Trails checkouts by up to COPURCHASE_REFRESH_SECONDS.
+    Empty items when the book has no co-purchases yet; 404 if book not found.
+    """
+
+    async def load() -> AlsoBoughtResponse:
+        items = await _make_service(db).get_also_bought(book_id, limit)
+        return AlsoBoughtResponse(
+            book_id=book_id, items=[AlsoBoughtItem.model_validate(i) for i in items]
+        )
+
+    def tags(response: AlsoBoughtResponse) -> list[str]:
+        return [
+            ALSO_BOUGHT_TAG,
+            book_tag(book_id),
+            *(book_tag(item.id) for item in response.items),
+        ]
+
+    return await catalog_cache.get_or_load(also_bought_key(book_id, limit), tags, load)
 
 
 @router.put("/books/{book_id}", response_model=BookResponse)
@@ -189,6 +428,55 @@ async def update_stock(
     return BookResponse.model_validate(book)
 
 
+@router.patch("/admin/books/stock", response_model=BulkStockResponse)
+async def bulk_update_stock(
+    body: BulkStockUpdate,
+    db: DbSession,
+    admin: AdminUser,
+    background_tasks: BackgroundTasks,
+    email_svc: EmailSvc,
+) -> BulkStockResponse:
+    """Apply a whole shipment of stock changes in one request. Admin only.
+
+    Each entry names a book by book_id or isbn and sets an absolute quantity
+    or adds a signed delta. All changes run as one UPDATE ... FROM (VALUES ...)
+    that also reports old and new quantities; books going from 0 to >0 have
+    their waiting pre-bookings notified in one more statement, and the
+    restock emails are enqueued after a single email lookup.
+
+    Unknown books are reported with found=false; the others still apply.
+    409 BOOK_STOCK_NEGATIVE / 422 BOOK_STOCK_DUPLICATE reject the whole batch.
+    """
+    from app.prebooks.repository import (
+        PreBookRepository,  # avoid circular at module level
+    )
+    from app.users.repository import UserRepository
+
+    service = _make_service(db)
+    results, notified, titles = await service.bulk_update_stock(
+        body.items, PreBookRepository(db)
+    )
+
+    if notified:
+        email_map = await UserRepository(db).get_emails_by_ids(
+            list({user_id for user_id, _ in notified})
+        )
+        for user_id, book_id in notified:
+            if user_id in email_map:
+                email_svc.enqueue(
+                    background_tasks,
+                    to=email_map[user_id],
+                    template_name="restock_alert.html",
+                    subject=f"'{titles[book_id]}' is back in stock",
+                    context={"book_title": titles[book_id], "book_id": book_id},
+                )
+
+    return BulkStockResponse(
+        items=[BulkStockResult.model_validate(r) for r in results],
+        notified=len(notified),
+    )
+
+
 @router.post(
     "/genres", response_model=GenreResponse, status_code=status.HTTP_201_CREATED
 )
@@ -205,11 +493,114 @@ async def create_genre(
 
 
 @router.get("/genres", response_model=list[GenreResponse])
-async def list_genres(db: DbSession) -> list[GenreResponse]:
+async def list_genres(
+    db: DbSession, request: Request, response: Response
+) -> list[GenreResponse] | Response:
     """List all genres alphabetically. Public -- no auth required.
 
     Genres are reference data. Empty list if no genres yet.
+    Cached until the next POST /genres.
+    Sends an ETag from the genre version counter; If-None-Match may yield 304.
     """
-    service = _make_service(db)
-    genres = await service.list_genres()
-    return [GenreResponse.model_validate(g) for g in genres]
+    etag = make_etag("genres", *await GenreRepository(db).get_version())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    async def load() -> list[GenreResponse]:
+        genres = await _make_service(db).list_genres()
+        return [GenreResponse.model_validate(g) for g in genres]
+
+    return await catalog_cache.get_or_load(GENRES_KEY, [GENRES_TAG], load)
+
+
+_IMPORT_FORMATS_BY_SUFFIX = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+_IMPORT_FORMATS_BY_TYPE = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def _import_format(file: UploadFile, fmt: ImportFormat | None) -> ImportFormat:
+    """Return the explicit format, else infer it from the file name or content type."""
+    if fmt is not None:
+        return fmt
+    suffix = PurePath(file.filename or "").suffix.lower()
+    inferred = _IMPORT_FORMATS_BY_SUFFIX.get(suffix) or _IMPORT_FORMATS_BY_TYPE.get(
+        (file.content_type or "").split(";")[0].strip()
+    )
+    if inferred is None:
+        raise AppError(
+            status_code=422,
+            detail="Cannot tell the file format; pass format=csv or format=ndjson",
+            code="BOOK_IMPORT_FORMAT_UNKNOWN",
+            field="format",
+        )
+    return inferred
+
+
+@router.post("/admin/books/import", response_model=BookImportReport)
+async def import_books(
+    db: DbSession,
+    admin: AdminUser,
+    file: UploadFile,
+    format: ImportFormat | None = Query(None, description="csv or ndjson; inferred from the file name/content type when omitted"),  # noqa: B008
+    create_genres: bool = Query(False, description="Create genres named in the file that do not exist yet (otherwise such rows are rejected)"),
+) -> BookImportReport:
+    """Bulk-import a supplier catalog from CSV (with header) or NDJSON. Admin only.
+
+    Columns/keys: title, author, price (required); isbn, genre (name),
+    description, cover_image_url, publish_date, stock_quantity. Books are
+    matched on ISBN: existing ones are updated (stock untouched, empty optional
+    cells keep the current value), the rest are inserted.
+
+    Rows are COPYed into a staging table and upserted with one statement (see
+    app/books/importer.py); invalid rows are skipped and listed in the report.
+    422 BOOK_IMPORT_INVALID_HEADER / BOOK_IMPORT_INVALID_ENCODING /
+    BOOK_IMPORT_FORMAT_UNKNOWN reject the whole file.
+    """
+    fmt = _import_format(file, format)
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await import_catalog(db, stream, fmt, create_genres=create_genres)
+    finally:
+        stream.detach()  # UploadFile owns and closes the underlying file
+
+
+@router.get("/admin/books/export", response_class=StreamingResponse)
+async def export_books(
+    db: DbSession,
+    admin: AdminUser,
+    format: ExportFormat = Query("ndjson", description="ndjson (one JSON object per line) or csv (with header)"),  # noqa: B008
+    updated_since: datetime | None = Query(None, description="Only books changed at or after this time; pass the previous X-Export-Watermark"),  # noqa: B008
+    gzip: bool = Query(False, description="gzip the body (Content-Encoding: gzip)"),
+) -> StreamingResponse:
+    """Stream the whole catalog with genre names and rating aggregates. Admin only.
+
+    Replaces paging through GET /books: rows are read through a server-side
+    cursor and written as they arrive, so memory stays flat for any catalog
+    size. Ordered by id. X-Export-Watermark carries the updated_since value
+    for the next incremental export (see app/books/exporter.py).
+    """
+    headers = {
+        "X-Export-Watermark": (await export_watermark(db)).isoformat(),
+        "Content-Disposition": f'attachment; filename="books.{format}"',
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_catalog(db, format, updated_since=updated_since, gzip=gzip),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
+@router.get("/admin/cache/catalog", response_model=CacheStatsResponse)
+async def catalog_cache_stats(admin: AdminUser) -> CacheStatsResponse:
+    """Return catalog cache size and hit/miss/eviction counters. Admin only.
+
+    Counters are per process and reset on restart; use them to size
+    CATALOG_CACHE_MAX_ENTRIES and CATALOG_CACHE_TTL_SECONDS.
+    """
+    return CacheStatsResponse(**catalog_cache.stats())
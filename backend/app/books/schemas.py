@@ -1,11 +1,13 @@
 """Pydantic schemas for book catalog CRUD."""
 
 import re
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Annotated
 
-from pydantic import BaseModel, computed_field, Field, field_validator
+from pydantic import BaseModel, computed_field, Field, field_validator, model_validator
+
+from app.core.pagination import TotalMode
 
 
 def _validate_isbn(isbn: str) -> str:
@@ -86,6 +88,61 @@ class StockUpdate(BaseModel):
     quantity: int = Field(ge=0, description="Absolute stock quantity to set")
 
 
+MAX_BULK_STOCK_ITEMS = 1000
+
+
+class BulkStockItem(BaseModel):
+    """One entry of PATCH /admin/books/stock.
+
+    Identify the book by book_id or isbn, and give either an absolute
+    quantity or a signed delta (e.g. +24 for a received carton).
+    """
+
+    book_id: int | None = None
+    isbn: str | None = None
+    quantity: int | None = Field(None, ge=0)
+    delta: int | None = None
+
+    @field_validator("isbn")
+    @classmethod
+    def normalize_isbn(cls, v: str | None) -> str | None:
+        return None if v is None else re.sub(r"[-\s]", "", v).upper()
+
+    @model_validator(mode="after")
+    def check_exclusive(self) -> "BulkStockItem":
+        if (self.book_id is None) == (self.isbn is None):
+            raise ValueError("Give exactly one of book_id or isbn")
+        if (self.quantity is None) == (self.delta is None):
+            raise ValueError("Give exactly one of quantity or delta")
+        return self
+
+
+class BulkStockUpdate(BaseModel):
+    """Request body for PATCH /admin/books/stock."""
+
+    items: list[BulkStockItem] = Field(min_length=1, max_length=MAX_BULK_STOCK_ITEMS)
+
+
+class BulkStockResult(BaseModel):
+    """Outcome for one request entry; found=False leaves the quantities None."""
+
+    book_id: int | None
+    isbn: str | None = None
+    found: bool
+    old_quantity: int | None = None
+    new_quantity: int | None = None
+
+
+class BulkStockResponse(BaseModel):
+    """Response for PATCH /admin/books/stock, items in request order.
+
+    notified counts pre-bookings switched to notified by 0 -> positive restocks.
+    """
+
+    items: list[BulkStockResult]
+    notified: int
+
+
 class BookResponse(BaseModel):
     """Response schema for book records."""
 
@@ -103,12 +160,32 @@ class BookResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# Upper bound for GET /books/{id}?reviews=N (latest reviews embedded in the detail).
+MAX_DETAIL_REVIEWS = 10
+
+
+class BookRecentReview(BaseModel):
+    """A live review embedded in GET /books/{id}?reviews=N (newest first).
+
+    display_name is derived from the reviewer's email, as in ReviewAuthorSummary.
+    """
+
+    id: int
+    user_id: int
+    display_name: str
+    rating: int
+    text: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
 class BookDetailResponse(BaseModel):
     """Response for GET /books/{id} -- extends BookResponse with computed in_stock field.
 
     in_stock is a derived boolean (stock_quantity > 0) -- not stored in DB.
     stock_quantity is still included for admin-facing clients that need the exact count.
-    avg_rating and review_count are computed live from reviews (AGGR-01, AGGR-02).
+    avg_rating and review_count are read from book_rating_stats (AGGR-01, AGGR-02).
+    recent_reviews is None unless the caller asked for reviews=N.
     """
 
     id: int
@@ -121,8 +198,10 @@ class BookDetailResponse(BaseModel):
     cover_image_url: str | None
     publish_date: date | None
     stock_quantity: int
+    genre_name: str | None = None
     avg_rating: float | None = None   # None when no reviews exist
     review_count: int = 0             # 0 when no reviews exist
+    recent_reviews: list[BookRecentReview] | None = None
 
     @computed_field  # type: ignore[misc]
     @property
@@ -133,13 +212,196 @@ class BookDetailResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+MAX_BATCH_LOOKUP = 300
+
+
+class BookBatchRequest(BaseModel):
+    """Request body for POST /books/batch. At most MAX_BATCH_LOOKUP ids + isbns."""
+
+    ids: list[int] = Field(default_factory=list)
+    isbns: list[str] = Field(default_factory=list)
+    include_ratings: bool = False
+
+    @field_validator("isbns")
+    @classmethod
+    def normalize_isbns(cls, v: list[str]) -> list[str]:
+        """Strip hyphens/spaces and uppercase, matching how ISBNs are stored.
+
+        Checksums are not validated here: an invalid ISBN is simply not found.
+        """
+        return [re.sub(r"[-\s]", "", isbn).upper() for isbn in v]
+
+    @model_validator(mode="after")
+    def check_size(self) -> "BookBatchRequest":
+        count = len(self.ids) + len(self.isbns)
+        if count == 0:
+            raise ValueError("Provide at least one id or isbn")
+        if count > MAX_BATCH_LOOKUP:
+            raise ValueError(f"At most {MAX_BATCH_LOOKUP} ids and isbns per batch")
+        return self
+
+
+class BookBatchItem(BaseModel):
+    """One requested id or isbn; book is None (found=False) when nothing matched.
+
+    avg_rating / review_count are filled only when include_ratings was set.
+    """
+
+    id: int | None = None
+    isbn: str | None = None
+    found: bool
+    book: BookResponse | None = None
+    avg_rating: float | None = None
+    review_count: int | None = None
+
+
+class BookBatchResponse(BaseModel):
+    """Response for POST /books/batch: ids first, then isbns, each in request order."""
+
+    items: list[BookBatchItem]
+
+
+class GenreFacet(BaseModel):
+    """Number of matching books in one genre (genre_id None = uncategorized)."""
+
+    genre_id: int | None
+    count: int
+
+
+class PriceBucketFacet(BaseModel):
+    """Number of matching books priced in [min, max); None means unbounded."""
+
+    min: Decimal | None
+    max: Decimal | None
+    count: int
+
+
+class BookFacets(BaseModel):
+    """Facet counts over the whole filtered result set, not just the page.
+
+    genres ignores the genre_id filter and price ignores min_price/max_price,
+    so the UI can show how many books each alternative choice would return.
+    """
+
+    genres: list[GenreFacet]
+    price: list[PriceBucketFacet]
+
+
 class BookListResponse(BaseModel):
-    """Paginated book list response envelope for GET /books."""
+    """Paginated book list response envelope for GET /books.
+
+    next_cursor is an opaque token for the following page (pass as ?cursor=);
+    None on the last page. has_more is always exact (fetched size+1 rows).
+    total_mode reports what produced total: 'exact', 'estimate' (planner
+    estimate, large result sets only) or 'none' (total is null).
+    facets is present only when requested with facets=true.
+    """
 
     items: list[BookResponse]
-    total: int
+    total: int | None
     page: int
     size: int
+    next_cursor: str | None = None
+    has_more: bool = False
+    total_mode: TotalMode = "exact"
+    facets: BookFacets | None = None
+
+
+class BookSuggestion(BaseModel):
+    """One typeahead match for GET /books/suggest."""
+
+    id: int
+    title: str
+    author: str
+
+    model_config = {"from_attributes": True}
+
+
+class BookSuggestionResponse(BaseModel):
+    """Response envelope for GET /books/suggest (most popular first)."""
+
+    items: list[BookSuggestion]
+
+
+class AlsoBoughtItem(BaseModel):
+    """One co-purchased book for GET /books/{id}/also-bought.
+
+    order_count is the number of orders containing both books; support is that
+    count as a share of all orders; lift > 1 means they are bought together
+    more often than their separate popularity predicts.
+    """
+
+    id: int
+    title: str
+    author: str
+    price: Decimal
+    cover_image_url: str | None
+    in_stock: bool
+    order_count: int
+    support: float
+    lift: float
+
+
+class AlsoBoughtResponse(BaseModel):
+    """Response envelope for GET /books/{id}/also-bought (strongest first)."""
+
+    book_id: int
+    items: list[AlsoBoughtItem]
+
+
+class BookImportRow(BaseModel):
+    """One record of a bulk catalog import (CSV row or NDJSON object).
+
+    genre is a genre *name*, resolved in SQL. stock_quantity only applies to
+    books the import creates; existing books keep their stock.
+    """
+
+    title: str = Field(min_length=1, max_length=500)
+    author: str = Field(min_length=1, max_length=255)
+    price: Decimal = Field(gt=0, lt=Decimal("100000000"), decimal_places=2)
+    isbn: str | None = None
+    genre: str | None = Field(None, max_length=100)
+    description: str | None = None
+    cover_image_url: str | None = Field(None, max_length=2048)
+    publish_date: date | None = None
+    stock_quantity: int | None = Field(None, ge=0, le=2_147_483_647)
+
+    @field_validator("isbn", mode="before")
+    @classmethod
+    def validate_isbn(cls, v: str | None) -> str | None:
+        if v is None or (isinstance(v, str) and v.strip() == ""):
+            return None
+        return _validate_isbn(str(v))
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def empty_as_none(cls, v: object) -> object:
+        """CSV has no null: treat empty cells as missing."""
+        return None if isinstance(v, str) and v.strip() == "" else v
+
+
+class BookImportError(BaseModel):
+    """A rejected import record; row is its 1-based position in the file (header excluded)."""
+
+    row: int
+    field: str | None = None
+    message: str
+
+
+class BookImportReport(BaseModel):
+    """Result of POST /admin/books/import.
+
+    rows = inserted + updated + rejected. errors lists at most MAX_IMPORT_ERRORS
+    entries (errors_truncated=True when more were rejected).
+    """
+
+    rows: int
+    inserted: int
+    updated: int
+    rejected: int
+    genres_created: int = 0
+    errors: list[BookImportError]
+    errors_truncated: bool = False
 
 
 class GenreCreate(BaseModel):
@@ -155,3 +417,17 @@ class GenreResponse(BaseModel):
     name: str
 
     model_config = {"from_attributes": True}
+
+
+class CacheStatsResponse(BaseModel):
+    """Counters for GET /admin/cache/catalog (process-local, reset on restart)."""
+
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_ratio: float | None
+    evictions: int
+    expirations: int
+    invalidations: int
@@ -2,38 +2,134 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Sequence
+from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from sqlalchemy.exc import IntegrityError
 
+from app.books.cache import invalidate_books, invalidate_genres
 from app.books.models import Book, Genre
-from app.books.repository import BookRepository, GenreRepository
-from app.books.schemas import BookCreate, BookUpdate
+from app.books.repository import (
+    DETAIL_COLUMNS,
+    BookRepository,
+    CopurchaseRepository,
+    GenreRepository,
+)
+from app.books.schemas import BookCreate, BookUpdate, BulkStockItem
+from app.books.suggest import suggestion_index
 from app.core.exceptions import AppError
+from app.core.pagination import Page, TotalMode
 
 if TYPE_CHECKING:
     from app.prebooks.repository import PreBookRepository
 
 
+def _book_not_found() -> AppError:
+    return AppError(
+        status_code=404,
+        detail="Book not found",
+        code="BOOK_NOT_FOUND",
+        field="book_id",
+    )
+
+
 class BookService:
     def __init__(self, book_repo: BookRepository, genre_repo: GenreRepository) -> None:
         self.book_repo = book_repo
         self.genre_repo = genre_repo
 
-    async def _get_book_or_404(self, book_id: int) -> Book:
-        book = await self.book_repo.get_by_id(book_id)
+    async def _get_book_or_404(
+        self, book_id: int, *, columns: Sequence[str] | None = None
+    ) -> Book:
+        book = await self.book_repo.get_by_id(book_id, columns=columns)
         if not book:
-            raise AppError(
-                status_code=404,
-                detail="Book not found",
-                code="BOOK_NOT_FOUND",
-                field="book_id",
-            )
+            raise _book_not_found()
         return book
 
+    async def get_book_detail(
+        self,
+        book_id: int,
+        *,
+        columns: Sequence[str] | None = None,
+        genre: bool = True,
+        ratings: bool = True,
+        reviews: int = 0,
+    ) -> dict:
+        """Return BookDetailResponse data from a single query (BookRepository.get_detail).
+
+        columns= limits the book columns; genre/ratings=False skip genre_name and
+        avg_rating/review_count; reviews=N fills recent_reviews (None when 0).
+
+        Raises:
+            AppError(404) BOOK_NOT_FOUND if book_id does not exist.
+        """
+        rows = await self.book_repo.get_detail(
+            book_id, columns=columns, genre=genre, ratings=ratings, reviews=reviews
+        )
+        if not rows:
+            raise _book_not_found()
+        first = rows[0]._mapping
+        data = {
+            name: first[name]
+            for name in (DETAIL_COLUMNS if columns is None else ["id", *columns])
+        }
+        if genre:
+            data["genre_name"] = first["genre_name"]
+        if ratings:
+            avg_rating = first["avg_rating"]
+            data["avg_rating"] = (
+                float(round(avg_rating, 1)) if avg_rating is not None else None
+            )
+            data["review_count"] = first["review_count"] or 0
+        data["recent_reviews"] = (
+            [
+                {
+                    "id": row.review_id,
+                    "user_id": row.review_user_id,
+                    "display_name": row.review_display_name,
+                    "rating": row.review_rating,
+                    "text": row.review_text,
+                    "created_at": row.review_created_at,
+                    "updated_at": row.review_updated_at,
+                }
+                for row in rows
+                if row.review_id is not None
+            ]
+            if reviews
+            else None
+        )
+        return data
+
+    async def get_also_bought(self, book_id: int, limit: int) -> list[dict]:
+        """Return up to `limit` books most often bought with book_id (precomputed).
+
+        Raises:
+            AppError(404) BOOK_NOT_FOUND if book_id does not exist.
+        """
+        await self._get_book_or_404(book_id, columns=("id",))
+        rows = await CopurchaseRepository(self.book_repo.session).list_for_book(
+            book_id, limit
+        )
+        return [
+            {
+                "id": book.id,
+                "title": book.title,
+                "author": book.author,
+                "price": book.price,
+                "cover_image_url": book.cover_image_url,
+                "in_stock": book.stock_quantity > 0,
+                "order_count": pair.order_count,
+                "support": round(float(pair.support), 4),
+                "lift": round(float(pair.lift), 2),
+            }
+            for pair, book in rows
+        ]
+
     async def create_book(self, data: BookCreate) -> Book:
         try:
-            return await self.book_repo.create(**data.model_dump())
+            book = await self.book_repo.create(**data.model_dump())
         except IntegrityError as e:
             if "isbn" in str(e.orig).lower():
                 raise AppError(
@@ -43,12 +139,14 @@ class BookService:
                     field="isbn",
                 ) from e
             raise
+        invalidate_books(self.book_repo.session, [], listing=True)
+        return book
 
     async def update_book(self, book_id: int, data: BookUpdate) -> Book:
         book = await self._get_book_or_404(book_id)
         updates = {k: v for k, v in data.model_dump(exclude_unset=True).items()}
         try:
-            return await self.book_repo.update(book, **updates)
+            book = await self.book_repo.update(book, **updates)
         except IntegrityError as e:
             if "isbn" in str(e.orig).lower():
                 raise AppError(
@@ -58,14 +156,20 @@ class BookService:
                     field="isbn",
                 ) from e
             raise
+        invalidate_books(self.book_repo.session, [book_id], listing=True)
+        return book
 
     async def delete_book(self, book_id: int) -> None:
         book = await self._get_book_or_404(book_id)
         await self.book_repo.delete(book)
+        invalidate_books(self.book_repo.session, [book_id], listing=True)
+        suggestion_index.remove(book_id)
 
     async def set_stock(self, book_id: int, quantity: int) -> Book:
         book = await self._get_book_or_404(book_id)
-        return await self.book_repo.set_stock(book, quantity)
+        book = await self.book_repo.set_stock(book, quantity)
+        invalidate_books(self.book_repo.session, [book_id])
+        return book
 
     async def set_stock_and_notify(
         self,
@@ -83,6 +187,7 @@ class BookService:
         book = await self._get_book_or_404(book_id)
         old_qty = book.stock_quantity
         book = await self.book_repo.set_stock(book, quantity)
+        invalidate_books(self.book_repo.session, [book_id])
 
         notified_user_ids: list[int] = []
         if old_qty == 0 and quantity > 0:
@@ -90,6 +195,72 @@ class BookService:
 
         return book, notified_user_ids
 
+    async def bulk_update_stock(
+        self,
+        items: list[BulkStockItem],
+        prebook_repo: PreBookRepository,
+    ) -> tuple[list[dict], list[tuple[int, int]], dict[int, str]]:
+        """Apply many absolute/delta stock changes and notify restocked pre-bookers.
+
+        One UPDATE applies every change and reports old/new quantities; every
+        0-to-positive transition then notifies its waiting pre-bookings in one
+        more statement. Unknown books come back with found=False.
+
+        Returns (results in request order, notified (user_id, book_id) pairs,
+        {book_id: title} for the restocked books).
+
+        Raises:
+            AppError(409) BOOK_STOCK_NEGATIVE if a delta would take stock below 0.
+            AppError(422) BOOK_STOCK_DUPLICATE if two entries target the same book.
+        """
+        rows = await self.book_repo.bulk_set_stock(
+            [
+                (
+                    item.book_id,
+                    item.isbn,
+                    item.quantity if item.quantity is not None else item.delta,
+                    item.quantity is None,
+                )
+                for item in items
+            ]
+        )
+
+        negative = sorted({r.id for r in rows if r.new_qty < 0})
+        if negative:
+            raise AppError(
+                status_code=409,
+                detail=f"Stock would go below zero for book ids: {negative}",
+                code="BOOK_STOCK_NEGATIVE",
+                field="items",
+            )
+        duplicates = sorted(i for i, n in Counter(r.id for r in rows).items() if n > 1)
+        if duplicates:
+            raise AppError(
+                status_code=422,
+                detail=f"Several entries target the same book ids: {duplicates}",
+                code="BOOK_STOCK_DUPLICATE",
+                field="items",
+            )
+
+        by_ord = {r.ord: r for r in rows}
+        results = []
+        for i, item in enumerate(items):
+            row = by_ord.get(i)
+            results.append(
+                {
+                    "book_id": row.id if row else item.book_id,
+                    "isbn": item.isbn,
+                    "found": row is not None,
+                    "old_quantity": row.old_qty if row else None,
+                    "new_quantity": row.new_qty if row else None,
+                }
+            )
+        invalidate_books(self.book_repo.session, [r.id for r in rows])
+
+        restocked = {r.id: r.title for r in rows if r.old_qty == 0 and r.new_qty > 0}
+        notified = await prebook_repo.notify_waiting_by_books(list(restocked))
+        return results, notified, restocked
+
     async def create_genre(self, name: str) -> Genre:
         existing = await self.genre_repo.get_by_name(name)
         if existing:
@@ -99,7 +270,37 @@ class BookService:
                 code="GENRE_CONFLICT",
                 field="name",
             )
-        return await self.genre_repo.create(name)
+        genre = await self.genre_repo.create(name)
+        invalidate_genres(self.genre_repo.session)
+        return genre
+
+    async def get_books_batch(
+        self, ids: list[int], isbns: list[str], *, include_ratings: bool = False
+    ) -> list[dict]:
+        """Resolve ids and isbns with one repository query, preserving request order.
+
+        Returns one dict per requested key (ids first, then isbns, duplicates
+        kept): {"id"|"isbn", "found", "book", "avg_rating", "review_count"}.
+        """
+        rows = await self.book_repo.get_many(
+            ids=ids, isbns=isbns, include_ratings=include_ratings
+        )
+        by_id = {book.id: (book, avg, count) for book, avg, count in rows}
+        by_isbn = {book.isbn: by_id[book.id] for book, _, _ in rows if book.isbn}
+
+        def entry(key: dict, hit: tuple | None) -> dict:
+            if hit is None:
+                return {**key, "found": False}
+            book, avg, count = hit
+            data = {**key, "found": True, "book": book}
+            if include_ratings:
+                data["avg_rating"] = float(round(avg, 1)) if avg is not None else None
+                data["review_count"] = count or 0
+            return data
+
+        return [entry({"id": i}, by_id.get(i)) for i in ids] + [
+            entry({"isbn": isbn}, by_isbn.get(isbn)) for isbn in isbns
+        ]
 
     async def list_books(
         self,
@@ -113,11 +314,17 @@ class BookService:
         max_price: object = None,
         page: int = 1,
         size: int = 20,
-    ) -> tuple[list[Book], int]:
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+        fuzzy: bool = False,
+        facets: bool = False,
+        price_buckets: list[Decimal] | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Page[Book]:
         """Browse catalog with optional FTS search, genre/author filters, sort, and pagination.
 
         Delegates entirely to BookRepository.search() -- no additional business logic.
-        Returns (books, total_count) for the route to wrap in BookListResponse.
+        Returns a Page (items, total, next_cursor, facets) for the route to wrap in BookListResponse.
         """
         return await self.book_repo.search(
             q=q,
@@ -129,6 +336,12 @@ class BookService:
             max_price=max_price,
             page=page,
             size=size,
+            cursor=cursor,
+            total_mode=total_mode,
+            fuzzy=fuzzy,
+            facets=facets,
+            price_buckets=price_buckets,
+            columns=columns,
         )
 
     async def list_genres(self) -> list[Genre]:
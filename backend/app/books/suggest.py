@@ -0,0 +1,232 @@
+"""In-process prefix index behind GET /books/suggest (search-box typeahead).
+
+Each book contributes its normalized title and author tokens (lowercased,
+accents stripped). Tokens are kept in one sorted list, each with its postings
+pre-sorted by rank: popularity (units sold + review count) DESC, then title.
+A prefix lookup is a bisect plus a forward scan over the matching tokens,
+whose postings are merged lazily until `limit` books are found, so a short
+prefix costs one step per matching token plus `limit`, not one per book.
+
+The hot path never touches the database. The index is built at startup and
+refreshed in the background (see run_refresher) from Book.updated_at, which
+also moves when stock changes on checkout, and book_rating_stats.updated_at,
+which moves on review writes, so popularity stays current.
+BookService.delete_book drops a deleted book at once; each refresh also
+compares the indexed ids with the ids in books, so deletes made by other
+workers are dropped too.
+"""
+
+import asyncio
+import heapq
+import logging
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.repository import BookRepository
+
+logger = logging.getLogger(__name__)
+
+# Re-read rows updated this long before the watermark, so transactions that
+# stamped updated_at earlier but committed after the previous refresh are seen.
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+# Upper bound on distinct tokens scanned for one prefix (keeps 1-letter lookups cheap).
+MAX_TOKENS_SCANNED = 2000
+
+# Upper bound on ranked candidates examined for a multi-word query whose earlier
+# words filter most of the last word's matches out.
+MAX_CANDIDATES_SCANNED = 5000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents ("Tolkién" -> "tolkien")."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    id: int
+    title: str
+    author: str
+    weight: int
+    sort_title: str
+    tokens: frozenset[str]
+
+    @property
+    def rank(self) -> tuple[int, str, int]:
+        """Sort key within a posting list: weight DESC, then title, then id."""
+        return (-self.weight, self.sort_title, self.id)
+
+
+class PrefixIndex:
+    """Sorted-token prefix index over book titles and authors.
+
+    Mutations and lookups are synchronous, so on a single event loop a lookup
+    never observes a half-applied refresh.
+    """
+
+    def __init__(self) -> None:
+        self._docs: dict[int, Suggestion] = {}
+        # token -> ranks of the books carrying it, ascending (best first)
+        self._postings: dict[str, list[tuple[int, str, int]]] = {}
+        self._tokens: list[str] = []
+        self.watermark: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def clear(self) -> None:
+        self._docs.clear()
+        self._postings.clear()
+        self._tokens.clear()
+        self.watermark = None
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def upsert(self, book_id: int, title: str, author: str, weight: int) -> None:
+        """Add or replace one book's entry."""
+        self.remove(book_id)
+        tokens = frozenset(tokenize(title) + tokenize(author))
+        doc = Suggestion(book_id, title, author, weight, normalize(title), tokens)
+        self._docs[book_id] = doc
+        for token in tokens:
+            ranks = self._postings.get(token)
+            if ranks is None:
+                self._postings[token] = ranks = []
+                insort(self._tokens, token)
+            insort(ranks, doc.rank)
+
+    def remove(self, book_id: int) -> None:
+        doc = self._docs.pop(book_id, None)
+        if doc is None:
+            return
+        for token in doc.tokens:
+            ranks = self._postings[token]
+            del ranks[bisect_left(ranks, doc.rank)]
+            if not ranks:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def rebuild(self, rows: list[tuple[int, str, str, int]]) -> None:
+        """Replace the whole index from (id, title, author, weight) rows."""
+        self._docs.clear()
+        self._postings.clear()
+        for book_id, title, author, weight in rows:
+            tokens = frozenset(tokenize(title) + tokenize(author))
+            doc = Suggestion(book_id, title, author, weight, normalize(title), tokens)
+            self._docs[book_id] = doc
+            for token in tokens:
+                self._postings.setdefault(token, []).append(doc.rank)
+        for ranks in self._postings.values():
+            ranks.sort()
+        self._tokens = sorted(self._postings)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 8) -> list[Suggestion]:
+        """Return up to `limit` books matching every query token as a prefix.
+
+        The last token drives the index scan: the ranked postings of its
+        matching tokens are merged best first, and earlier tokens ("lord ri")
+        filter the merged books (examining at most MAX_CANDIDATES_SCANNED).
+        Ordered by weight DESC, then title, then id.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        *others, last = terms
+
+        runs: list[list[tuple[int, str, int]]] = []
+        i = bisect_left(self._tokens, last)
+        end = min(len(self._tokens), i + MAX_TOKENS_SCANNED)
+        while i < end and self._tokens[i].startswith(last):
+            runs.append(self._postings[self._tokens[i]])
+            i += 1
+
+        found: list[Suggestion] = []
+        seen: set[int] = set()
+        for rank in islice(heapq.merge(*runs), MAX_CANDIDATES_SCANNED):
+            book_id = rank[2]
+            if book_id in seen:  # the book carries several matching tokens
+                continue
+            seen.add(book_id)
+            doc = self._docs[book_id]
+            if others and not all(
+                any(t.startswith(o) for t in doc.tokens) for o in others
+            ):
+                continue
+            found.append(doc)
+            if len(found) == limit:
+                break
+        return found
+
+    # ------------------------------------------------------------------
+    # Refresh from the database
+    # ------------------------------------------------------------------
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """Apply books changed since the watermark; rebuild fully when needed.
+
+        Indexed books missing from the books table are removed. A full rebuild
+        runs on first use and whenever the table has books the index lacks
+        after applying changes (a book committed later than the overlap).
+        """
+        repo = BookRepository(session)
+        if self.watermark is None:
+            await self._rebuild_from(repo)
+            return
+
+        rows = await repo.list_suggestion_rows(
+            updated_since=self.watermark - REFRESH_OVERLAP
+        )
+        for book_id, title, author, weight, updated_at in rows:
+            self.upsert(book_id, title, author, weight)
+            self.watermark = max(self.watermark, updated_at)
+
+        ids = await repo.list_ids()
+        for book_id in self._docs.keys() - ids:
+            self.remove(book_id)
+        if len(self._docs) != len(ids):
+            await self._rebuild_from(repo)
+
+    async def _rebuild_from(self, repo: BookRepository) -> None:
+        rows = await repo.list_suggestion_rows()
+        self.rebuild([(r[0], r[1], r[2], r[3]) for r in rows])
+        self.watermark = max((r[4] for r in rows), default=_EPOCH)
+        if rows:
+            logger.info("Suggestion index rebuilt: %d books", len(rows))
+
+
+suggestion_index = PrefixIndex()
+
+
+async def run_refresher(interval_seconds: float) -> None:
+    """Refresh suggestion_index forever, every interval_seconds (app lifespan task)."""
+    from app.db.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as session:
+                await suggestion_index.refresh(session)
+        except Exception:
+            logger.exception("Suggestion index refresh failed")
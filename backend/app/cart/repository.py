@@ -1,6 +1,6 @@
 """Repository layer for Cart and CartItem database access."""
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -46,6 +46,10 @@ class CartRepository:
         )
         return result.scalar_one_or_none()
 
+    async def clear(self, cart_id: int) -> None:
+        """Delete every item in the cart with one statement (the cart row is kept)."""
+        await self.session.execute(delete(CartItem).where(CartItem.cart_id == cart_id))
+
 
 class CartItemRepository:
     """Handles CartItem persistence — add, fetch, update quantity, delete."""
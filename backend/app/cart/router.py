@@ -7,6 +7,7 @@ from app.cart.repository import CartItemRepository, CartRepository
 from app.cart.schemas import CartItemAdd, CartItemResponse, CartItemUpdate, CartResponse
 from app.cart.service import CartService
 from app.core.deps import ActiveUser, DbSession
+from app.core.idempotency import Idempotent
 
 router = APIRouter(prefix="/cart", tags=["cart"])
 
@@ -35,9 +36,9 @@ async def get_cart(db: DbSession, current_user: ActiveUser) -> CartResponse:
     "/items", response_model=CartItemResponse, status_code=status.HTTP_201_CREATED
 )
 async def add_cart_item(
-    body: CartItemAdd, db: DbSession, current_user: ActiveUser
+    body: CartItemAdd, db: DbSession, current_user: ActiveUser, idempotency: Idempotent
 ) -> CartItemResponse:
-    """Add a book to the user's cart.
+    """Add a book to the user's cart (Idempotency-Key header replays retries).
 
     409 CART_BOOK_OUT_OF_STOCK if book has no stock.
     409 CART_ITEM_DUPLICATE if book is already in the cart.
@@ -46,7 +47,9 @@ async def add_cart_item(
     user_id = int(current_user["sub"])
     service = _make_service(db)
     item = await service.add_item(user_id, body.book_id, body.quantity)
-    return CartItemResponse.model_validate(item)
+    response = CartItemResponse.model_validate(item)
+    await idempotency.save(status.HTTP_201_CREATED, response)
+    return response
 
 
 @router.put("/items/{item_id}", response_model=CartItemResponse)
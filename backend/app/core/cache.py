@@ -0,0 +1,190 @@
+"""Process-local TTL + LRU cache with tag-based invalidation.
+
+Used in front of read-heavy, anonymous endpoints whose data changes only on
+explicit writes (the public catalog). Each entry carries a set of tags; writers
+invalidate by tag so only the entries that could have changed are dropped.
+
+Two races are closed without locks:
+  - A reader that started loading before an invalidation must not store its
+    (now stale) result. get_or_load() snapshots an invalidation counter
+    before loading and discards the result if an invalidation ran meanwhile.
+  - A reader that starts after the invalidation but before the writer's
+    transaction commits still sees the old rows. invalidate_on_commit()
+    therefore invalidates again from the session's after_commit hook.
+
+Entries are shared between requests, so cached values must be immutable from
+the caller's point of view (response models, not live ORM objects).
+
+Usage:
+    page = await catalog_cache.get_or_load(key, tags, loader)
+    catalog_cache.invalidate_on_commit(session, "books:list", "book:42")
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+
+
+@dataclass
+class _Entry:
+    value: Any
+    tags: frozenset[str]
+    expires_at: float
+
+
+class TaggedTTLCache:
+    """Bounded mapping with per-entry TTL, LRU eviction and tag invalidation.
+
+    Not thread-safe; intended for a single asyncio event loop, where no await
+    happens between reading and mutating the internal dicts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._tag_index: dict[str, set[Hashable]] = {}
+        self._epoch = 0  # bumped by every invalidate_tags() call
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (found, value). Expired entries count as misses and are dropped."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        """Store value under key, evicting least-recently-used entries if full."""
+        if not self.enabled:
+            return
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(value, frozenset(tags), self._clock() + self.ttl_seconds)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        tags: Iterable[str] | Callable[[Any], Iterable[str]],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached value for key, or await loader() and cache its result.
+
+        tags may be a callable receiving the loaded value, for entries whose
+        tags depend on the result (e.g. the ids of the books on a page).
+        The result is not cached if any invalidation happened while loading.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+        epoch = self._epoch
+        value = await loader()
+        if epoch == self._epoch:
+            self.set(key, value, tags(value) if callable(tags) else tags)
+        return value
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of the given tags; return how many were dropped."""
+        self._epoch += 1
+        dropped = 0
+        for tag in tags:
+            for key in list(self._tag_index.get(tag, ())):
+                self._remove(key)
+                dropped += 1
+        self.invalidations += dropped
+        return dropped
+
+    def invalidate_on_commit(self, session: AsyncSession, *tags: str) -> None:
+        """Invalidate tags now and again once the session's transaction commits."""
+        self.invalidate_tags(*tags)
+        event.listen(
+            session.sync_session,
+            "after_commit",
+            lambda _session: self.invalidate_tags(*tags),
+            once=True,
+        )
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self._tag_index.clear()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.invalidations = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return size and hit/miss/eviction counters for sizing the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+_settings = get_settings()
+
+# Public catalog reads: GET /books, GET /books/{id}, GET /genres (see app/books/router.py)
+catalog_cache = TaggedTTLCache(
+    max_entries=_settings.CATALOG_CACHE_MAX_ENTRIES,
+    ttl_seconds=_settings.CATALOG_CACHE_TTL_SECONDS,
+)
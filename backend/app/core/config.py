@@ -5,6 +5,7 @@ Use get_settings() (cached) for all config access throughout the app.
 """
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -34,6 +35,33 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
     ENV: str = "development"
 
+    # Catalog read cache (app/core/cache.py); 0 for either disables it
+    CATALOG_CACHE_MAX_ENTRIES: int = 2048
+    CATALOG_CACHE_TTL_SECONDS: float = 60.0
+
+    # GET /books/suggest prefix index refresh interval (app/books/suggest.py); 0 disables
+    SUGGEST_REFRESH_SECONDS: float = 30.0
+
+    # "Also bought" co-purchase index refresh interval (app/books/copurchase.py); 0 disables
+    COPURCHASE_REFRESH_SECONDS: float = 600.0
+
+    # Daily sales rollup refresh interval (app/admin/sales_rollup.py); 0 disables
+    SALES_ROLLUP_REFRESH_SECONDS: float = 300.0
+
+    # Checkout stock handling (app/orders/service.py): "reserve" holds stock in
+    # stock_reservations so payment runs without row locks; "atomic" validates and
+    # decrements with one UPDATE ... RETURNING; "lock" uses SELECT ... FOR UPDATE
+    CHECKOUT_STOCK_MODE: Literal["reserve", "atomic", "lock"] = "reserve"
+    # Reserve mode: hold lifetime, and expired-hold sweep interval (app/orders/reservations.py; 0 disables)
+    STOCK_RESERVATION_TTL_SECONDS: float = 300.0
+    STOCK_RESERVATION_SWEEP_SECONDS: float = 30.0
+
+    # Idempotency-Key (app/core/idempotency.py): stored response lifetime, how long a
+    # duplicate waits for an in-flight first request, expired-key purge interval (0 disables)
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_PURGE_SECONDS: float = 3600.0
+
     # Email
     MAIL_USERNAME: str = ""
     MAIL_PASSWORD: str = ""
@@ -0,0 +1,49 @@
+"""Strong ETags and If-None-Match handling for conditional GETs.
+
+Routes compute a cheap *version* for the resource (timestamps, counters —
+a single narrow query, no ORM entity loading), turn it into an ETag with
+make_etag(), and short-circuit with a 304 before doing the expensive work:
+
+    etag = make_etag("book", book_id, *version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    ... build the body as usual ...
+
+Versions must change whenever the serialized body could change; each route
+documents which columns feed its version.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Return a quoted strong ETag derived from the given version parts."""
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match matches etag.
+
+    If-None-Match uses the weak comparison (RFC 9110 §13.1.2), so a W/ prefix
+    on the client's copy is ignored. "*" matches any current representation.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Return an empty 304 carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -8,10 +8,13 @@ Handlers registered in app/main.py via add_exception_handler().
 """
 
 import logging
+from collections.abc import Sequence
+from typing import Any
 
 from fastapi import Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 logger = logging.getLogger(__name__)
@@ -51,6 +54,34 @@ async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
     return JSONResponse(status_code=exc.status_code, content=body)
 
 
+class InsufficientStockError(AppError):
+    """Checkout found one or more cart items short of stock.
+
+    A 409 ORDER_INSUFFICIENT_STOCK AppError that also carries the per-item
+    details (InsufficientStockItem) so the response can list them.
+    """
+
+    def __init__(self, items: Sequence[BaseModel]) -> None:
+        self.items = list(items)
+        super().__init__(
+            409, "Insufficient stock for one or more items", "ORDER_INSUFFICIENT_STOCK"
+        )
+
+
+async def insufficient_stock_handler(
+    request: Request, exc: InsufficientStockError
+) -> JSONResponse:
+    """Handle InsufficientStockError - the AppError body plus the short items."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "detail": exc.detail,
+            "code": exc.code,
+            "items": [item.model_dump() for item in exc.items],
+        },
+    )
+
+
 class DuplicateReviewError(Exception):
     """Raised when a user tries to submit a second review for the same book.
 
@@ -77,6 +108,30 @@ async def duplicate_review_handler(
     )
 
 
+class IdempotentReplayError(Exception):
+    """A retried request whose Idempotency-Key already has a stored response.
+
+    Raised by the idempotency dependency (app/core/idempotency.py) before the
+    endpoint runs; the handler sends the stored response back.
+    """
+
+    def __init__(self, status_code: int, body: Any) -> None:
+        self.status_code = status_code
+        self.body = body
+        super().__init__(f"Idempotent replay ({status_code})")
+
+
+async def idempotent_replay_handler(
+    request: Request, exc: IdempotentReplayError
+) -> JSONResponse:
+    """Handle IdempotentReplayError - the first response again, marked as a replay."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=exc.body,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
 async def http_exception_handler(
     request: Request, exc: StarletteHTTPException
 ) -> JSONResponse:
@@ -0,0 +1,97 @@
+"""Sparse fieldsets: ?fields=id,title,price on list and detail endpoints.
+
+A grid view rarely needs every column (Book.description is unbounded text),
+so routes that accept fields= narrow both ends of the request:
+
+  - SQL: the repository applies load_only() to the requested columns and
+    skips relationship loads / derived lookups nobody asked for.
+  - HTTP: the route returns only the requested keys via sparse_response().
+
+    fields = parse_fields(raw, BookResponse)
+    books = await repo.search(..., columns=fields)
+    return sparse_response([pick(b, fields) for b in books])
+
+Entities loaded with load_only() have their other columns deferred; touching
+one would trigger a lazy load, which fails under asyncio. Read only the
+attributes listed in `fields` (pick() does exactly that).
+
+Sparse responses bypass the route's response_model (which requires every
+field), so they are encoded with pydantic's JSON rules to stay byte-compatible
+with the full representation (Decimal as string, ISO datetimes).
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.core.exceptions import AppError
+
+Fields = tuple[str, ...]
+
+
+def selectable_fields(model: type[BaseModel]) -> Fields:
+    """Return a response model's field names, computed fields included, in declaration order."""
+    return (*model.model_fields, *model.model_computed_fields)
+
+
+def parse_fields(
+    raw: str | None,
+    model: type[BaseModel],
+    *,
+    always: Iterable[str] = ("id",),
+) -> Fields | None:
+    """Parse "title,price" into a normalized tuple of field names; None when not given.
+
+    The result is ordered as the model declares its fields (so equivalent
+    requests share cache keys) and always includes `always` (the id).
+
+    Raises AppError(422) FIELDS_INVALID for unknown field names.
+    """
+    if raw is None or not raw.strip():
+        return None
+    allowed = selectable_fields(model)
+    requested = {part.strip() for part in raw.split(",") if part.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise AppError(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(unknown)}. "
+            f"Allowed: {', '.join(allowed)}",
+            code="FIELDS_INVALID",
+            field="fields",
+        )
+    requested.update(always)
+    return tuple(name for name in allowed if name in requested)
+
+
+def load_only_fields(entity: type, fields: Iterable[str]) -> ORMOption:
+    """Return load_only() over the entity columns named in `fields`.
+
+    Names that are not columns (computed fields, relationships, derived
+    values) are ignored; the primary key is always loaded by SQLAlchemy.
+    """
+    columns = inspect(entity).column_attrs
+    return load_only(
+        *(getattr(entity, name) for name in fields if name in columns),
+        *(getattr(entity, c.key) for c in inspect(entity).primary_key),
+    )
+
+
+def pick(source: Any, fields: Iterable[str]) -> dict[str, Any]:
+    """Return {name: value} for `fields`, read from a mapping or an object's attributes."""
+    if isinstance(source, Mapping):
+        return {name: source[name] for name in fields}
+    return {name: getattr(source, name) for name in fields}
+
+
+def sparse_response(
+    content: Any, *, headers: Mapping[str, str] | None = None
+) -> JSONResponse:
+    """Return `content` as JSON using pydantic's encoding (bypasses response_model)."""
+    return JSONResponse(to_jsonable_python(content), headers=dict(headers or {}))
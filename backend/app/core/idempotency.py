@@ -0,0 +1,253 @@
+"""Idempotency-Key support for non-idempotent POST endpoints.
+
+A client that retries a POST with the same Idempotency-Key header gets the
+first response back instead of running the endpoint again:
+
+  - The first request claims (user_id, key) in idempotency_keys inside the
+    request transaction and stores its response there before get_db commits
+    (Idempotency.save), so the stored response appears exactly when the
+    business changes do.
+  - A retry finds the stored response and gets it replayed (IdempotentReplayError,
+    with an Idempotent-Replayed: true header); the endpoint is not called.
+  - A concurrent duplicate blocks on the claim's primary key until the first
+    request commits or rolls back. When the first request commits part-way
+    (checkout commits its stock reservation), the duplicate polls until the
+    response is stored, for up to IDEMPOTENCY_WAIT_SECONDS (then 409).
+  - Errors are not stored: a failed request gives its claim up, so a retry
+    runs again.
+  - Reusing a key for a different method, path or body is a 422.
+
+Keys live IDEMPOTENCY_TTL_SECONDS. An expired key is reclaimed on reuse and
+purged by run_purger (app lifespan task).
+
+Usage:
+    async def create_thing(..., idempotency: Idempotent) -> ThingResponse:
+        response = ThingResponse.model_validate(...)
+        await idempotency.save(status.HTTP_201_CREATED, response)
+        return response
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from typing import Annotated, Any
+
+from fastapi import Depends, Header, Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    delete,
+    event,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.config import get_settings
+from app.core.deps import ActiveUser, DbSession
+from app.core.exceptions import AppError, IdempotentReplayError
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 0.1
+
+
+class IdempotencyKey(Base):
+    """One Idempotency-Key per user: request fingerprint and, once done, the response.
+
+    status_code/response_body stay NULL while the first request is in flight.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[Any] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+
+def request_fingerprint(method: str, path: str, query: str, body: bytes) -> str:
+    """sha256 over what makes two requests "the same request"."""
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query.encode(), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class Idempotency:
+    """The current request's Idempotency-Key claim (key=None: no header, all no-ops)."""
+
+    def __init__(self, session: AsyncSession, user_id: int, key: str | None) -> None:
+        self.session = session
+        self.user_id = user_id
+        self.key = key
+
+    def _where(self) -> list:
+        return [IdempotencyKey.user_id == self.user_id, IdempotencyKey.key == self.key]
+
+    async def claim(
+        self, fingerprint: str, *, ttl_seconds: float, wait_seconds: float
+    ) -> None:
+        """Claim the key, or raise IdempotentReplayError with the stored response.
+
+        Raises:
+            IdempotentReplayError if the key already has a stored response.
+            AppError(422) IDEMPOTENCY_KEY_REUSED if the key was used for another request.
+            AppError(409) IDEMPOTENCY_KEY_IN_PROGRESS if the first request is
+                still running after wait_seconds.
+        """
+        deadline = asyncio.get_running_loop().time() + wait_seconds
+        while True:
+            claimed = await self.session.scalar(
+                insert(IdempotencyKey)
+                .values(
+                    user_id=self.user_id,
+                    key=self.key,
+                    fingerprint=fingerprint,
+                    expires_at=func.now() + timedelta(seconds=ttl_seconds),
+                )
+                .on_conflict_do_nothing()
+                .returning(IdempotencyKey.user_id)
+            )
+            if claimed is not None:
+                return
+            row = (
+                await self.session.execute(
+                    select(
+                        IdempotencyKey.fingerprint,
+                        IdempotencyKey.status_code,
+                        IdempotencyKey.response_body,
+                        (IdempotencyKey.expires_at <= func.now()).label("expired"),
+                    ).where(*self._where())
+                )
+            ).one_or_none()
+            if row is None:
+                continue  # the first request gave the key up meanwhile
+            if row.expired:
+                await self.session.execute(
+                    delete(IdempotencyKey).where(
+                        *self._where(), IdempotencyKey.expires_at <= func.now()
+                    )
+                )
+                continue
+            if row.fingerprint != fingerprint:
+                raise AppError(
+                    422,
+                    "Idempotency-Key was already used for a different request",
+                    "IDEMPOTENCY_KEY_REUSED",
+                    "Idempotency-Key",
+                )
+            if row.status_code is not None:
+                raise IdempotentReplayError(row.status_code, row.response_body)
+            if asyncio.get_running_loop().time() >= deadline:
+                raise AppError(
+                    409,
+                    "A request with this Idempotency-Key is still in progress",
+                    "IDEMPOTENCY_KEY_IN_PROGRESS",
+                    "Idempotency-Key",
+                )
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def save(self, status_code: int, body: Any) -> None:
+        """Store the response to replay for retries (no-op without a key)."""
+        if self.key is None:
+            return
+        await self.session.execute(
+            update(IdempotencyKey)
+            .where(*self._where())
+            .values(status_code=status_code, response_body=jsonable_encoder(body))
+        )
+
+    async def release(self) -> None:
+        """Give the claim up so a retry runs the request again."""
+        await self.session.execute(delete(IdempotencyKey).where(*self._where()))
+
+
+async def idempotency(
+    request: Request,
+    db: DbSession,
+    current_user: ActiveUser,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=255)] = None,
+) -> AsyncIterator[Idempotency]:
+    """Claim the request's Idempotency-Key header for the endpoint (see module docstring).
+
+    A claim is normally undone by get_db's rollback when the endpoint fails.
+    If the endpoint committed part-way, the claim is already durable, so the
+    failed request's remaining work is rolled back and the claim deleted here.
+    """
+    handle = Idempotency(db, int(current_user["sub"]), idempotency_key)
+    if idempotency_key is None:
+        yield handle
+        return
+
+    settings = get_settings()
+    fingerprint = request_fingerprint(
+        request.method, request.url.path, request.url.query, await request.body()
+    )
+    await handle.claim(
+        fingerprint,
+        ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+        wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+    )
+
+    committed = False
+
+    def on_commit(_session: object) -> None:
+        nonlocal committed
+        committed = True
+
+    event.listen(db.sync_session, "after_commit", on_commit)
+    try:
+        yield handle
+    except Exception:
+        if committed:
+            await db.rollback()
+            await handle.release()
+            await db.commit()
+        raise
+    finally:
+        event.remove(db.sync_session, "after_commit", on_commit)
+
+
+Idempotent = Annotated[Idempotency, Depends(idempotency)]
+
+
+async def purge_expired(session: AsyncSession) -> int:
+    """Delete expired keys; returns how many. The caller commits."""
+    result = await session.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now())
+    )
+    return result.rowcount
+
+
+async def run_purger(interval_seconds: float) -> None:
+    """Purge expired keys forever, every interval_seconds (app lifespan task)."""
+    from app.db.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as session:
+                await purge_expired(session)
+                await session.commit()
+        except Exception:
+            logger.exception("Idempotency key purge failed")
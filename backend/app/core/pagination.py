@@ -0,0 +1,330 @@
+"""Keyset (cursor) pagination shared by every list endpoint.
+
+LIMIT/OFFSET makes Postgres read and discard every skipped row, so deep pages
+get slower as the page number grows. Keyset pagination instead resumes from
+the last row of the previous page with a WHERE clause on the sort key, which
+an index can seek to directly — page 5,000 costs the same as page 1.
+
+Cursors are opaque, signed strings (itsdangerous, keyed by SECRET_KEY) that
+encode the active sort key values plus the ``id`` tiebreaker of the last row
+served. Each cursor is bound to a *scope* (e.g. ``books:price:asc``) so a cursor
+issued for one ordering cannot be replayed against another.
+
+Totals are produced by count_total() in one of three modes (TotalMode):
+  - exact:    SELECT count(*) over the filtered set (original behaviour)
+  - estimate: exact count bounded at ESTIMATE_EXACT_CAP rows, falling back to
+              the planner's row estimate (EXPLAIN, a second round trip) for
+              larger result sets; an unfiltered table is estimated from
+              pg_class.reltuples without counting
+  - none:     no count at all; clients rely on has_more / next_cursor
+
+Usage (inside a repository):
+    keys = [SortKey(Book.title), SortKey(Book.id)]
+    total, mode = await count_total(session, stmt, total_mode)
+    items, next_cursor = await paginate(session, stmt, keys, scope="books:title:asc",
+                                        cursor=cursor, page=page, size=size)
+"""
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal
+
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import (
+    Select,
+    Table,
+    and_,
+    false,
+    func,
+    nulls_first,
+    nulls_last,
+    or_,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.exceptions import AppError
+
+TotalMode = Literal["exact", "estimate", "none"]
+
+_CURSOR_SALT = "pagination-cursor"
+
+# In estimate mode, result sets up to this size are still counted exactly —
+# the bounded count reads at most this many rows, so it stays cheap.
+ESTIMATE_EXACT_CAP = 1000
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One ORDER BY term that also drives the keyset WHERE clause.
+
+    nulls_last=None keeps the PostgreSQL default (NULLS LAST for ASC, NULLS FIRST
+    for DESC). Set nullable=True for columns that may hold NULL so the keyset
+    comparison places NULL rows on the correct side of the cursor.
+    """
+
+    expr: Any
+    descending: bool = False
+    nullable: bool = False
+    nulls_last: bool | None = None
+
+    @property
+    def clause(self) -> Any:
+        """Return the ORDER BY clause for this key."""
+        clause = self.expr.desc() if self.descending else self.expr.asc()
+        if self.nulls_last is True:
+            return nulls_last(clause)
+        if self.nulls_last is False:
+            return nulls_first(clause)
+        return clause
+
+    @property
+    def _nulls_sort_last(self) -> bool:
+        if self.nulls_last is not None:
+            return self.nulls_last
+        return not self.descending
+
+
+@dataclass
+class Page[T]:
+    """One page of results from a list_* / search repository method.
+
+    Unpacks as (items, total) so callers written against the original
+    tuple-returning API keep working unchanged. facets carries optional
+    aggregate counts over the whole filtered set (e.g. BookRepository.search).
+    """
+
+    items: list[T]
+    total: int | None
+    next_cursor: str | None = None
+    total_mode: TotalMode = "exact"
+    facets: dict[str, Any] | None = None
+
+    @property
+    def has_more(self) -> bool:
+        """True when at least one more row exists after this page."""
+        return self.next_cursor is not None
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.items, self.total))
+
+
+# ---------------------------------------------------------------------------
+# Cursor encoding
+# ---------------------------------------------------------------------------
+
+
+def _serializer() -> URLSafeSerializer:
+    return URLSafeSerializer(get_settings().SECRET_KEY, salt=_CURSOR_SALT)
+
+
+def _dump_value(value: Any) -> Any:
+    """Tag non-JSON scalar types so they decode back to the same Python type."""
+    if isinstance(value, Decimal):
+        return {"d": str(value)}
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"da": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "d" in value:
+            return Decimal(value["d"])
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "da" in value:
+            return date.fromisoformat(value["da"])
+    return value
+
+
+def encode_cursor(scope: str, values: list[Any]) -> str:
+    """Return an opaque, signed cursor for the given sort key values."""
+    return _serializer().dumps({"s": scope, "k": [_dump_value(v) for v in values]})
+
+
+def decode_cursor(cursor: str, scope: str, expected_len: int) -> list[Any]:
+    """Verify and decode a cursor issued by encode_cursor().
+
+    Raises AppError(400) PAGINATION_INVALID_CURSOR when the signature is bad,
+    the cursor belongs to a different scope (sort order), or is malformed.
+    """
+    try:
+        payload = _serializer().loads(cursor)
+    except BadSignature:
+        payload = None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("s") != scope
+        or not isinstance(payload.get("k"), list)
+        or len(payload["k"]) != expected_len
+    ):
+        raise AppError(
+            status_code=400,
+            detail="Invalid or expired pagination cursor",
+            code="PAGINATION_INVALID_CURSOR",
+            field="cursor",
+        )
+    return [_load_value(v) for v in payload["k"]]
+
+
+# ---------------------------------------------------------------------------
+# Totals
+# ---------------------------------------------------------------------------
+
+
+async def _planner_estimate(session: AsyncSession, stmt: Select) -> int:
+    """Return the planner's row estimate for `stmt` from EXPLAIN (FORMAT JSON).
+
+    Binds are rendered as literals (SQLAlchemy escapes them) and the statement is
+    sent with exec_driver_sql so no bind-parameter parsing is applied to the text.
+    """
+    conn = await session.connection()
+    sql = str(
+        stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    )
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _whole_table(stmt: Select) -> Table | None:
+    """The table `stmt` reads in full (no WHERE, join, GROUP BY, DISTINCT or LIMIT)."""
+    froms = stmt.get_final_froms()
+    if (
+        len(froms) != 1
+        or not isinstance(froms[0], Table)
+        or stmt.whereclause is not None
+        or stmt._group_by_clauses
+        or stmt._having_criteria
+        or stmt._distinct
+        or stmt._limit_clause is not None
+        or stmt._offset_clause is not None
+    ):
+        return None
+    return froms[0]
+
+
+async def _table_estimate(session: AsyncSession, table: Table) -> int:
+    """Return pg_class.reltuples for `table` (-1 when never vacuumed/analyzed)."""
+    reltuples = await session.scalar(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": table.fullname},
+    )
+    return -1 if reltuples is None else int(reltuples)
+
+
+async def count_total(
+    session: AsyncSession, stmt: Select, mode: TotalMode = "exact"
+) -> tuple[int | None, TotalMode]:
+    """Return (total, mode_used) for the filtered, unordered `stmt`.
+
+    mode_used reports what actually produced the number: "estimate" requests
+    whose result set fits under ESTIMATE_EXACT_CAP come back as "exact".
+    Estimating a filtered set costs the bounded count plus an EXPLAIN round
+    trip; an unfiltered table known to be large is one pg_class lookup.
+    """
+    if mode == "none":
+        return None, "none"
+    if mode == "exact":
+        total = await session.scalar(select(func.count()).select_from(stmt.subquery()))
+        return total or 0, "exact"
+
+    table = _whole_table(stmt)
+    if table is not None:
+        estimate = await _table_estimate(session, table)
+        if estimate > ESTIMATE_EXACT_CAP:
+            return estimate, "estimate"
+
+    bounded = await session.scalar(
+        select(func.count()).select_from(stmt.limit(ESTIMATE_EXACT_CAP + 1).subquery())
+    )
+    if (bounded or 0) <= ESTIMATE_EXACT_CAP:
+        return bounded or 0, "exact"
+    estimate = await _planner_estimate(session, stmt)
+    return max(estimate, ESTIMATE_EXACT_CAP + 1), "estimate"
+
+
+# ---------------------------------------------------------------------------
+# Keyset predicate
+# ---------------------------------------------------------------------------
+
+
+def _after(key: SortKey, value: Any) -> Any:
+    """Predicate: row sorts strictly after `value` on this key alone."""
+    col = key.expr
+    if value is None:
+        # Nothing sorts after NULL when NULLs come last; every non-NULL does otherwise.
+        return false() if key._nulls_sort_last else col.is_not(None)
+    cmp = col < value if key.descending else col > value
+    if key.nullable and key._nulls_sort_last:
+        return or_(cmp, col.is_(None))
+    return cmp
+
+
+def _equal(key: SortKey, value: Any) -> Any:
+    return key.expr.is_(None) if value is None else key.expr == value
+
+
+def keyset_where(keys: list[SortKey], values: list[Any]) -> Any:
+    """Build the WHERE clause selecting rows strictly after `values` in `keys` order.
+
+    When every key shares one direction and none is nullable, emits a row-value
+    comparison ``(a, b) > (:a, :b)`` that a composite index can seek on.
+    Otherwise expands to the equivalent OR-of-ANDs form.
+    """
+    directions = {k.descending for k in keys}
+    if len(directions) == 1 and not any(k.nullable for k in keys):
+        lhs = tuple_(*(k.expr for k in keys))
+        rhs = tuple_(*values)
+        return lhs < rhs if keys[0].descending else lhs > rhs
+
+    clauses = []
+    for i, (key, value) in enumerate(zip(keys, values, strict=True)):
+        prefix = [_equal(k, v) for k, v in zip(keys[:i], values[:i], strict=True)]
+        clauses.append(and_(*prefix, _after(key, value)))
+    return or_(*clauses)
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    keys: list[SortKey],
+    *,
+    scope: str,
+    cursor: str | None = None,
+    page: int = 1,
+    size: int = 20,
+) -> tuple[list[Any], str | None]:
+    """Execute `stmt` for one page and return (entities, next_cursor).
+
+    `stmt` must select a single ORM entity and carry no ORDER BY / LIMIT yet;
+    the sort keys are appended as extra columns so the cursor can be built from
+    the last row even when a key is computed (ts_rank, joined aggregates).
+
+    With a cursor, rows are located by keyset WHERE and `page` is ignored.
+    Without one, OFFSET (page - 1) * size is used for backward compatibility.
+    One extra row is fetched to decide whether a next cursor exists.
+    """
+    stmt = stmt.add_columns(*(k.expr for k in keys)).order_by(*(k.clause for k in keys))
+    if cursor is not None:
+        stmt = stmt.where(keyset_where(keys, decode_cursor(cursor, scope, len(keys))))
+    else:
+        stmt = stmt.offset((page - 1) * size)
+
+    rows = (await session.execute(stmt.limit(size + 1))).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(scope, list(rows[-1][1:]))
+    return [row[0] for row in rows], next_cursor
@@ -8,6 +8,11 @@ Usage:
     uvicorn app.main:app --reload
 """
 
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -20,21 +25,30 @@ from starlette.middleware.sessions import SessionMiddleware
 from app.admin.analytics_router import router as analytics_router
 from app.admin.reviews_router import router as reviews_admin_router
 from app.admin.router import router as admin_users_router
+from app.admin.sales_rollup import run_refresher as run_sales_rollup_refresher
+from app.books.copurchase import run_refresher as run_copurchase_refresher
 from app.books.router import router as books_router
+from app.books.suggest import run_refresher, suggestion_index
 from app.cart.router import router as cart_router
 from app.core.config import get_settings
 from app.core.exceptions import (
     AppError,
     DuplicateReviewError,
+    IdempotentReplayError,
+    InsufficientStockError,
     app_error_handler,
     duplicate_review_handler,
     generic_exception_handler,
     http_exception_handler,
+    idempotent_replay_handler,
+    insufficient_stock_handler,
     validation_exception_handler,
 )
 from app.core.health import router as health_router
+from app.core.idempotency import run_purger as run_idempotency_purger
 from app.core.logging_config import setup_logging
 from app.core.oauth import configure_oauth
+from app.orders.reservations import run_sweeper as run_reservation_sweeper
 from app.orders.router import admin_router as orders_admin_router
 from app.orders.router import router as orders_router
 from app.prebooks.router import router as prebooks_router
@@ -43,6 +57,63 @@ from app.uploads.router import router as uploads_router
 from app.users.router import router as auth_router
 from app.wishlist.router import router as wishlist_router
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """Build in-process indexes at startup and keep them refreshed.
+
+    A failed initial build is logged, not fatal: /books/suggest returns no
+    matches until the background refresher succeeds. The co-purchase index
+    and the daily sales rollup live in the database and are only topped up in
+    the background. Expired checkout stock reservations and idempotency keys
+    are cleaned up on their own intervals.
+    """
+    from app.db.session import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as session:
+            await suggestion_index.refresh(session)
+    except Exception:
+        logger.exception("Initial suggestion index build failed")
+
+    settings = get_settings()
+    refreshers = []
+    if settings.SUGGEST_REFRESH_SECONDS > 0:
+        refreshers.append(
+            asyncio.create_task(run_refresher(settings.SUGGEST_REFRESH_SECONDS))
+        )
+    if settings.COPURCHASE_REFRESH_SECONDS > 0:
+        refreshers.append(
+            asyncio.create_task(
+                run_copurchase_refresher(settings.COPURCHASE_REFRESH_SECONDS)
+            )
+        )
+    if settings.SALES_ROLLUP_REFRESH_SECONDS > 0:
+        refreshers.append(
+            asyncio.create_task(
+                run_sales_rollup_refresher(settings.SALES_ROLLUP_REFRESH_SECONDS)
+            )
+        )
+    if settings.STOCK_RESERVATION_SWEEP_SECONDS > 0:
+        refreshers.append(
+            asyncio.create_task(
+                run_reservation_sweeper(settings.STOCK_RESERVATION_SWEEP_SECONDS)
+            )
+        )
+    if settings.IDEMPOTENCY_PURGE_SECONDS > 0:
+        refreshers.append(
+            asyncio.create_task(
+                run_idempotency_purger(settings.IDEMPOTENCY_PURGE_SECONDS)
+            )
+        )
+    yield
+    for refresher in refreshers:
+        refresher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await refresher
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application.
@@ -56,12 +127,16 @@ def create_app() -> FastAPI:
         title="Bookstore API",
         version="1.0.0",
         description="Bookstore e-commerce API — browse, purchase, and manage books.",
+        lifespan=lifespan,
     )
 
     # Register exception handlers in precedence order:
     # Most specific first, most generic (Exception) last.
     # DuplicateReviewError before AppError — it has a non-standard 409 body with existing_review_id.
     application.add_exception_handler(DuplicateReviewError, duplicate_review_handler)  # type: ignore[arg-type]
+    application.add_exception_handler(IdempotentReplayError, idempotent_replay_handler)  # type: ignore[arg-type]
+    # InsufficientStockError is an AppError whose 409 body also lists the short items.
+    application.add_exception_handler(InsufficientStockError, insufficient_stock_handler)  # type: ignore[arg-type]
     application.add_exception_handler(AppError, app_error_handler)  # type: ignore[arg-type]
     application.add_exception_handler(StarletteHTTPException, http_exception_handler)  # type: ignore[arg-type]
     application.add_exception_handler(
@@ -84,7 +159,10 @@ def create_app() -> FastAPI:
         allow_origins=get_settings().ALLOWED_ORIGINS,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-        allow_headers=["Authorization", "Content-Type"],
+        allow_headers=["Authorization", "Content-Type", "Idempotency-Key", "If-None-Match"],
+        # Response headers the frontend reads (conditional GETs, idempotent
+        # replays, export resume) must be exposed explicitly.
+        expose_headers=["ETag", "Idempotent-Replayed", "X-Export-Watermark"],
     )
 
     # Register OAuth providers (Google OIDC).
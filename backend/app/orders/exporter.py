@@ -0,0 +1,84 @@
+"""Streaming order export behind GET /admin/orders/export.
+
+Rows come from OrderRepository.stream_export_rows (server-side cursor, one
+partition of EXPORT_BATCH_ROWS in memory at a time) and are encoded one
+partition per chunk as NDJSON or CSV, one line per order item, so memory use
+does not grow with the number of orders exported.
+"""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Literal
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.orders.repository import OrderFilters, OrderRepository
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_ROWS = 1000
+
+EXPORT_COLUMNS = (
+    "order_id",
+    "user_id",
+    "status",
+    "created_at",
+    "item_id",
+    "book_id",
+    "title",
+    "author",
+    "isbn",
+    "quantity",
+    "unit_price",
+)
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _value(value: Any) -> Any:
+    """Match the API's JSON representation: prices as strings, ISO timestamps."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(rows: Sequence[Row]) -> str:
+    return "".join(
+        json.dumps(
+            {c: _value(v) for c, v in zip(EXPORT_COLUMNS, row, strict=True)},
+            ensure_ascii=False,
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: Sequence[Row], *, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(["" if v is None else _value(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def export_order_lines(
+    session: AsyncSession, fmt: ExportFormat, filters: OrderFilters
+) -> AsyncIterator[bytes]:
+    """Yield the encoded order lines matching `filters`, chunk by chunk."""
+    if fmt == "csv":
+        yield encode_csv([], header=True).encode()
+    async for rows in OrderRepository(session).stream_export_rows(
+        filters, batch_size=EXPORT_BATCH_ROWS
+    ):
+        yield (encode_ndjson(rows) if fmt == "ndjson" else encode_csv(rows)).encode()
@@ -7,7 +7,16 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, func
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -33,7 +42,6 @@ class Order(Base):
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     status: Mapped[OrderStatus] = mapped_column(
         SAEnum(
@@ -49,6 +57,12 @@ class Order(Base):
         server_default=func.now(),
         nullable=False,
     )
+    # Denormalized from the items by OrderRepository.create_order, so lists and
+    # revenue reports need no join to order_items. item_count counts lines.
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2), nullable=False, server_default="0"
+    )
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
 
     items: Mapped[list[OrderItem]] = relationship(
         back_populates="order",
@@ -56,8 +70,29 @@ class Order(Base):
     )
 
 
+# A user's order history, newest first (GET /orders keyset pages). Also serves
+# plain user_id lookups, so there is no separate user_id index.
+Index(
+    "ix_orders_user_created",
+    Order.user_id,
+    Order.created_at.desc(),
+    Order.id.desc(),
+)
+
+# All orders, newest first (GET /admin/orders keyset pages and export).
+Index("ix_orders_created", Order.created_at.desc(), Order.id.desc())
+
+# Revenue by status and period as an index-only scan (admin sales analytics).
+Index(
+    "ix_orders_status_created",
+    Order.status,
+    Order.created_at,
+    postgresql_include=["total_amount"],
+)
+
+
 class OrderItem(Base):
-    """Line item in an order — stores price snapshot at time of purchase."""
+    """Line item in an order — stores price and book snapshots at time of purchase."""
 
     __tablename__ = "order_items"
 
@@ -77,6 +112,68 @@ class OrderItem(Base):
         Numeric(10, 2),
         nullable=False,
     )
+    # Book snapshot written at checkout, so order history needs no join to
+    # books and survives edits and deletes. NULL only for lines whose book was
+    # deleted before the snapshot columns were added.
+    title: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    author: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    isbn: Mapped[str | None] = mapped_column(String(17), nullable=True)
+    cover_image_url: Mapped[str | None] = mapped_column(String(2048), nullable=True)
 
     order: Mapped[Order] = relationship(back_populates="items")
     book: Mapped[Book | None] = relationship()
+
+
+class UserBookPurchase(Base):
+    """Purchase ledger: one row per (user, book) ever bought in a CONFIRMED order.
+
+    Written by OrderRepository.create_order in the checkout transaction, so the
+    purchase gate and verified_purchase flags are primary-key lookups instead
+    of joins over orders/order_items.
+    """
+
+    __tablename__ = "user_book_purchases"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    first_order_id: Mapped[int | None] = mapped_column(
+        ForeignKey("orders.id", ondelete="SET NULL"), nullable=True
+    )
+    purchased_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class StockReservation(Base):
+    """Stock held for an in-flight checkout: reserve, then confirm or release.
+
+    Reserving takes the quantity off books.stock_quantity in a short committed
+    transaction, so payment runs without row locks. Confirming deletes the
+    rows (the stock stays sold); releasing deletes them and gives the stock
+    back -- on a declined payment, or via the sweeper once expires_at passes.
+    """
+
+    __tablename__ = "stock_reservations"
+    __table_args__ = (
+        UniqueConstraint("token", "book_id", name="uq_stock_reservations_token_book"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    token: Mapped[str] = mapped_column(String(32), nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), nullable=False
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
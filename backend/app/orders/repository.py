@@ -1,12 +1,119 @@
 """Repository layer for Order and OrderItem database access."""
 
-from sqlalchemy import exists, select
+from collections.abc import AsyncIterator, Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    any_,
+    column,
+    delete,
+    exists,
+    func,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import array, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql.expression import Values
 
 from app.books.models import Book
 from app.cart.models import CartItem
-from app.orders.models import Order, OrderItem, OrderStatus
+from app.core.fields import load_only_fields
+from app.core.pagination import (
+    Page,
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    keyset_where,
+    paginate,
+)
+from app.orders.models import (
+    Order,
+    OrderItem,
+    OrderStatus,
+    StockReservation,
+    UserBookPurchase,
+)
+
+
+def _list_options(fields: Collection[str] | None) -> list[ORMOption]:
+    """Loader options for order lists, pruned to an OrderResponse sparse fieldset.
+
+    Items carry their book snapshot, so books are never loaded. Without
+    fields: items are eager-loaded. With fields: only the requested Order
+    columns (total_price is read from total_amount), plus items when items
+    is requested.
+    """
+    if fields is None:
+        return [selectinload(Order.items)]
+    columns = [*fields, "total_amount"] if "total_price" in fields else fields
+    options = [load_only_fields(Order, columns)]
+    if "items" in fields:
+        options.append(selectinload(Order.items))
+    return options
+
+
+@dataclass(frozen=True)
+class OrderFilters:
+    """Admin order filters (GET /admin/orders and its export); None means any."""
+
+    status: OrderStatus | None = None
+    user_id: int | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    book_id: int | None = None
+
+    def clauses(self) -> list[ColumnElement[bool]]:
+        """WHERE clauses on Order. created_to is exclusive; book_id matches any line."""
+        clauses = []
+        if self.status is not None:
+            clauses.append(Order.status == self.status)
+        if self.user_id is not None:
+            clauses.append(Order.user_id == self.user_id)
+        if self.created_from is not None:
+            clauses.append(Order.created_at >= self.created_from)
+        if self.created_to is not None:
+            clauses.append(Order.created_at < self.created_to)
+        if self.book_id is not None:
+            clauses.append(
+                exists().where(
+                    OrderItem.order_id == Order.id, OrderItem.book_id == self.book_id
+                )
+            )
+        return clauses
+
+
+_NO_FILTERS = OrderFilters()
+
+
+def _newest_first(created_at: ColumnElement, id_: ColumnElement) -> list[SortKey]:
+    """Keyset for order lists: newest first, id as the tiebreaker."""
+    return [SortKey(created_at, descending=True), SortKey(id_, descending=True)]
+
+
+def _quantities(quantities: Mapping[int, int]) -> Values:
+    """book_id -> quantity as a VALUES list v(book_id, qty), in book id order."""
+    return values(column("book_id", Integer), column("qty", Integer), name="v").data(
+        sorted(quantities.items())
+    )
+
+
+def _sync_stock(session: AsyncSession, rows: Iterable[Row]) -> None:
+    """Copy stock_quantity from RETURNING rows onto Book instances in the session."""
+    for row in rows:
+        book = session.identity_map.get(identity_key(Book, row.id))
+        if book is not None:
+            set_committed_value(book, "stock_quantity", row.stock_quantity)
 
 
 class OrderRepository:
@@ -29,81 +136,461 @@ class OrderRepository:
         )
         return list(result.scalars().all())
 
+    async def decrement_stock(self, quantities: Mapping[int, int]) -> list[Row]:
+        """Validate and take stock for many books with one UPDATE ... FROM (VALUES ...).
+
+        quantities maps book_id -> quantity. Only books holding at least that
+        quantity are decremented (the check is part of the WHERE clause), and
+        each comes back as (id, title, price, stock_quantity) with the new
+        stock. Fewer rows than quantities means a short count: the caller undoes
+        the applied rows with restore_stock. Target rows are locked in id order
+        first, like lock_books. Book instances already in the session get the
+        new quantity too.
+        """
+        v = _quantities(quantities)
+        locked = (
+            select(Book.id)
+            .join(v, v.c.book_id == Book.id)
+            .order_by(Book.id)
+            .with_for_update(of=Book)
+            .cte("locked")
+        )
+        rows = (
+            await self.session.execute(
+                update(Book)
+                .where(
+                    Book.id == v.c.book_id,
+                    Book.id == locked.c.id,
+                    Book.stock_quantity >= v.c.qty,
+                )
+                .values(
+                    stock_quantity=Book.stock_quantity - v.c.qty, updated_at=func.now()
+                )
+                .returning(Book.id, Book.title, Book.price, Book.stock_quantity)
+            )
+        ).all()
+        _sync_stock(self.session, rows)
+        return rows
+
+    async def restore_stock(self, quantities: Mapping[int, int]) -> None:
+        """Give back stock taken by decrement_stock (book_id -> quantity).
+
+        The rows stay locked until the transaction ends, so this restores the
+        exact previous values even if the caller never rolls back.
+        """
+        if not quantities:
+            return
+        v = _quantities(quantities)
+        rows = (
+            await self.session.execute(
+                update(Book)
+                .where(Book.id == v.c.book_id)
+                .values(stock_quantity=Book.stock_quantity + v.c.qty)
+                .returning(Book.id, Book.stock_quantity)
+            )
+        ).all()
+        _sync_stock(self.session, rows)
+
+    async def settled_order_id(self, settle_seconds: float) -> int | None:
+        """Highest order id created at least settle_seconds ago (background rollups).
+
+        Checkouts still in flight may hold lower ids than ones already
+        committed; stopping short of the newest orders keeps a high-water mark
+        (copurchase index, daily sales rollup) from skipping past them.
+        create_order stamps created_at at insert time, after payment, so the
+        window only has to cover the rest of the checkout transaction.
+        """
+        return await self.session.scalar(
+            select(func.max(Order.id)).where(
+                Order.created_at <= func.now() - timedelta(seconds=settle_seconds)
+            )
+        )
+
+    async def stock_levels(self, book_ids: Iterable[int]) -> dict[int, Row]:
+        """Return {book_id: (id, title, stock_quantity)} for the books that exist."""
+        rows = await self.session.execute(
+            select(Book.id, Book.title, Book.stock_quantity).where(
+                Book.id == any_(array(list(book_ids), type_=Integer))
+            )
+        )
+        return {row.id: row for row in rows}
+
     async def create_order(
         self,
         user_id: int,
         cart_items: list[CartItem],
-        book_map: dict[int, Book],
+        book_map: Mapping[int, Book | Row],
+        *,
+        stock_taken: bool = False,
     ) -> Order:
-        """Create an order from the cart, decrement stock, and flush.
+        """Create an order from the cart with one statement per table.
 
-        Eagerly loads items and their books so the returned Order is ready
-        for response serialization without additional async queries.
-        """
-        order = Order(user_id=user_id, status=OrderStatus.CONFIRMED)
-        self.session.add(order)
-        await self.session.flush()  # obtain order.id
+        INSERT ... RETURNING creates the order (with its denormalized
+        total_amount and item_count), one multi-row INSERT ...
+        RETURNING its items, and one more statement records the books in the
+        user_book_purchases ledger. Unless stock_taken, stock is decremented on
+        the locked Book instances in book_map and flushed; with stock_taken=True
+        decrement_stock already took it and book_map (its rows) is only read for
+        prices.
 
-        for item in cart_items:
-            oi = OrderItem(
-                order_id=order.id,
-                book_id=item.book_id,
-                quantity=item.quantity,
-                unit_price=book_map[item.book_id].price,
+        Items, their order and their books (the cart items' books, loaded by
+        CartRepository.get_with_items) are attached in memory, so the returned
+        Order is ready for response serialization without further queries.
+        """
+        order = await self.session.scalar(
+            insert(Order)
+            .values(
+                user_id=user_id,
+                status=OrderStatus.CONFIRMED,
+                # Insert time, not now() (the transaction's start): in lock and
+                # atomic modes the payment call runs earlier in this transaction,
+                # and settled_order_id measures its window from created_at.
+                created_at=func.clock_timestamp(),
+                total_amount=sum(
+                    (
+                        book_map[item.book_id].price * item.quantity
+                        for item in cart_items
+                    ),
+                    Decimal("0"),
+                ),
+                item_count=len(cart_items),
             )
-            self.session.add(oi)
-            book_map[item.book_id].stock_quantity -= item.quantity
-
-        await self.session.flush()
-
-        # Eagerly load relationships for response serialization
-        await self.session.refresh(order, ["items"])
-        for oi in order.items:
-            await self.session.refresh(oi, ["book"])
+            .returning(Order)
+        )
+        items = (
+            await self.session.scalars(
+                insert(OrderItem).returning(OrderItem, sort_by_parameter_order=True),
+                [
+                    {
+                        "order_id": order.id,
+                        "book_id": item.book_id,
+                        "quantity": item.quantity,
+                        "unit_price": book_map[item.book_id].price,
+                        "title": item.book.title,
+                        "author": item.book.author,
+                        "isbn": item.book.isbn,
+                        "cover_image_url": item.book.cover_image_url,
+                    }
+                    for item in cart_items
+                ],
+            )
+        ).all()
+        if not stock_taken:
+            for item in cart_items:
+                book_map[item.book_id].stock_quantity -= item.quantity
+            await self.session.flush()
+        await self.record_purchases(
+            user_id, [item.book_id for item in cart_items], order.id
+        )
 
+        for oi in items:
+            set_committed_value(oi, "order", order)
+        set_committed_value(order, "items", list(items))
         return order
 
     async def get_by_id_for_user(self, order_id: int, user_id: int) -> Order | None:
-        """Fetch a single order owned by the given user, with items and books."""
+        """Fetch a single order owned by the given user, with its items."""
         result = await self.session.execute(
             select(Order)
             .where(Order.id == order_id, Order.user_id == user_id)
-            .options(selectinload(Order.items).selectinload(OrderItem.book))
+            .options(selectinload(Order.items))
         )
         return result.scalar_one_or_none()
 
-    async def list_for_user(self, user_id: int) -> list[Order]:
-        """Return all orders for a user, newest first, with items and books."""
-        result = await self.session.execute(
+    async def list_for_user(
+        self,
+        user_id: int,
+        *,
+        size: int = 20,
+        cursor: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> Page[Order]:
+        """Return one page of a user's orders, newest first, with their items.
+
+        fields (sparse fieldset) prunes what is loaded; see _list_options.
+        Pages share their cursors with list_summaries_for_user. total is not
+        counted (total_mode "none").
+        """
+        orders, next_cursor = await paginate(
+            self.session,
             select(Order)
             .where(Order.user_id == user_id)
-            .order_by(Order.created_at.desc())
-            .options(selectinload(Order.items).selectinload(OrderItem.book))
+            .options(*_list_options(fields)),
+            _newest_first(Order.created_at, Order.id),
+            scope=f"orders:user:{user_id}",
+            cursor=cursor,
+            size=size,
         )
-        return list(result.scalars().all())
+        return Page(
+            items=orders, total=None, next_cursor=next_cursor, total_mode="none"
+        )
+
+    async def list_all_for_user(
+        self, user_id: int, *, fields: Collection[str] | None = None
+    ) -> list[Order]:
+        """Return all of a user's orders, newest first, with their items (unpaged GET /orders).
 
-    async def list_all(self) -> list[Order]:
-        """Return all orders (admin view), newest first, with items and books."""
+        fields (sparse fieldset) prunes what is loaded; see _list_options.
+        """
         result = await self.session.execute(
             select(Order)
-            .order_by(Order.created_at.desc())
-            .options(selectinload(Order.items).selectinload(OrderItem.book))
+            .where(Order.user_id == user_id)
+            .order_by(*(k.clause for k in _newest_first(Order.created_at, Order.id)))
+            .options(*_list_options(fields))
         )
         return list(result.scalars().all())
 
+    async def list_summaries_for_user(
+        self, user_id: int, *, size: int = 20, cursor: str | None = None
+    ) -> Page[Row]:
+        """Return one page of a user's order summaries, without line items.
+
+        Rows carry id, status, created_at, item_count and total_price, read
+        from the denormalized orders columns, plus first_title: the title
+        snapshot of the order's first line, one index probe per row. Still a
+        single keyset query on the (user_id, created_at, id) index.
+        """
+        scope = f"orders:user:{user_id}"
+        keys = _newest_first(Order.created_at, Order.id)
+        first_title = (
+            select(OrderItem.title)
+            .where(OrderItem.order_id == Order.id)
+            .order_by(OrderItem.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                Order.id,
+                Order.status,
+                Order.created_at,
+                Order.item_count,
+                Order.total_amount.label("total_price"),
+                first_title.label("first_title"),
+            )
+            .where(Order.user_id == user_id)
+            .order_by(*(k.clause for k in keys))
+            .limit(size + 1)
+        )
+        if cursor is not None:
+            stmt = stmt.where(
+                keyset_where(keys, decode_cursor(cursor, scope, len(keys)))
+            )
+        rows = list((await self.session.execute(stmt)).all())
+
+        next_cursor = None
+        if len(rows) > size:
+            rows = rows[:size]
+            next_cursor = encode_cursor(scope, [rows[-1].created_at, rows[-1].id])
+        return Page(items=rows, total=None, next_cursor=next_cursor, total_mode="none")
+
+    async def list_all(
+        self,
+        filters: OrderFilters = _NO_FILTERS,
+        *,
+        size: int = 20,
+        cursor: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> Page[Order]:
+        """Return one page of all orders (admin view), newest first, with their items.
+
+        Keyset pages on the (created_at, id) index; total is not counted.
+        """
+        orders, next_cursor = await paginate(
+            self.session,
+            select(Order).where(*filters.clauses()).options(*_list_options(fields)),
+            _newest_first(Order.created_at, Order.id),
+            scope="orders:admin",
+            cursor=cursor,
+            size=size,
+        )
+        return Page(
+            items=orders, total=None, next_cursor=next_cursor, total_mode="none"
+        )
+
+    async def stream_export_rows(
+        self, filters: OrderFilters = _NO_FILTERS, *, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield one row per order line, newest order first, in partitions of batch_size.
+
+        Rows carry order_id, user_id, status, created_at, item_id, book_id,
+        the title/author/isbn snapshot, quantity and unit_price. Streamed through a server-side cursor
+        (yield_per), so memory stays flat however many orders match; no ORM
+        entities enter the identity map.
+        """
+        stmt = (
+            select(
+                Order.id.label("order_id"),
+                Order.user_id,
+                Order.status,
+                Order.created_at,
+                OrderItem.id.label("item_id"),
+                OrderItem.book_id,
+                OrderItem.title,
+                OrderItem.author,
+                OrderItem.isbn,
+                OrderItem.quantity,
+                OrderItem.unit_price,
+            )
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(*filters.clauses())
+            .order_by(Order.created_at.desc(), Order.id.desc(), OrderItem.id)
+        )
+        result = await self.session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+    async def record_purchases(
+        self, user_id: int, book_ids: Iterable[int], order_id: int | None
+    ) -> None:
+        """Add (user, book) rows to the purchase ledger; books bought before are skipped."""
+        rows = [
+            {"user_id": user_id, "book_id": book_id, "first_order_id": order_id}
+            for book_id in sorted(set(book_ids))
+        ]
+        if rows:
+            await self.session.execute(
+                insert(UserBookPurchase).values(rows).on_conflict_do_nothing()
+            )
+
     async def has_user_purchased_book(self, user_id: int, book_id: int) -> bool:
         """Return True if user has a CONFIRMED order containing this book.
 
-        Uses EXISTS subquery for efficiency — returns a boolean without fetching rows.
-        Only CONFIRMED orders count — PAYMENT_FAILED does NOT qualify as a purchase.
+        A primary-key lookup in the user_book_purchases ledger (only confirmed
+        checkouts write to it -- PAYMENT_FAILED does NOT qualify as a purchase).
         """
         stmt = select(
             exists().where(
-                Order.user_id == user_id,
-                Order.status == OrderStatus.CONFIRMED,
-                OrderItem.order_id == Order.id,
-                OrderItem.book_id == book_id,
+                UserBookPurchase.user_id == user_id,
+                UserBookPurchase.book_id == book_id,
             )
         )
         result = await self.session.scalar(stmt)
         return bool(result)
+
+    async def purchasers_of_book(
+        self, book_id: int, user_ids: Iterable[int]
+    ) -> set[int]:
+        """Return which of user_ids have purchased book_id, in one ledger lookup.
+
+        Resolves verified_purchase for a whole page of reviews at once.
+        """
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return set()
+        result = await self.session.scalars(
+            select(UserBookPurchase.user_id).where(
+                UserBookPurchase.book_id == book_id,
+                UserBookPurchase.user_id == any_(array(user_ids)),
+            )
+        )
+        return set(result.all())
+
+
+class StockReservationRepository:
+    """Reserve / confirm / release stock for in-flight checkouts (StockReservation)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def reserve(
+        self,
+        token: str,
+        user_id: int,
+        quantities: Mapping[int, int],
+        expires_at: datetime,
+    ) -> list[Row]:
+        """Take stock for book_id -> quantity and hold it under token until expires_at.
+
+        Stock is taken by OrderRepository.decrement_stock; only the books that
+        had enough are held, and their (id, title, price, stock_quantity) rows
+        are returned. On a short count the caller releases the token.
+        """
+        taken = await OrderRepository(self.session).decrement_stock(quantities)
+        if taken:
+            await self.session.execute(
+                insert(StockReservation).values(
+                    [
+                        {
+                            "token": token,
+                            "user_id": user_id,
+                            "book_id": row.id,
+                            "quantity": quantities[row.id],
+                            "expires_at": expires_at,
+                        }
+                        for row in taken
+                    ]
+                )
+            )
+        return taken
+
+    async def confirm(self, token: str) -> dict[int, int]:
+        """Turn the token's holds into a sale: delete them, keeping the stock taken.
+
+        Returns {book_id: quantity} for the holds that were still there; a hold
+        already released by the sweeper is missing (its stock went back).
+        """
+        rows = await self.session.execute(
+            delete(StockReservation)
+            .where(StockReservation.token == token)
+            .returning(StockReservation.book_id, StockReservation.quantity)
+        )
+        return {row.book_id: row.quantity for row in rows}
+
+    async def release(self, token: str) -> list[int]:
+        """Delete the token's holds and give their stock back; returns the book ids."""
+        return await self._release(StockReservation.token == token)
+
+    async def release_expired(self, limit: int) -> list[int]:
+        """Release up to `limit` expired holds (sweeper); returns the restocked book ids.
+
+        Holds locked by a concurrent confirm or sweeper are skipped (SKIP LOCKED).
+        """
+        expired = (
+            select(StockReservation.id)
+            .where(StockReservation.expires_at <= func.now())
+            .order_by(StockReservation.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return await self._release(StockReservation.id.in_(expired.scalar_subquery()))
+
+    async def _release(self, where: ColumnElement[bool]) -> list[int]:
+        """One statement: delete matching holds and add their quantities back to books.
+
+        Book rows are locked in id order first, like OrderRepository.decrement_stock.
+        """
+        released = (
+            delete(StockReservation)
+            .where(where)
+            .returning(StockReservation.book_id, StockReservation.quantity)
+            .cte("released")
+        )
+        totals = (
+            select(released.c.book_id, func.sum(released.c.quantity).label("qty"))
+            .group_by(released.c.book_id)
+            .cte("totals")
+        )
+        locked = (
+            select(Book.id)
+            .join(totals, totals.c.book_id == Book.id)
+            .order_by(Book.id)
+            .with_for_update(of=Book)
+            .cte("locked")
+        )
+        books = (
+            Book.__table__
+        )  # Core UPDATE: the ORM-enabled one returns no rows with a DELETE CTE
+        rows = (
+            await self.session.execute(
+                update(books)
+                .where(books.c.id == totals.c.book_id, books.c.id == locked.c.id)
+                .values(
+                    stock_quantity=books.c.stock_quantity + totals.c.qty,
+                    updated_at=func.now(),
+                )
+                .returning(books.c.id, books.c.stock_quantity)
+            )
+        ).all()
+        _sync_stock(self.session, rows)
+        return [row.id for row in rows]
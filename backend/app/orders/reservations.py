@@ -0,0 +1,50 @@
+"""Sweeper for expired stock reservations.
+
+Checkout in "reserve" mode (OrderService._checkout_reserved) commits a hold in
+stock_reservations before taking payment and confirms it afterwards. A request
+that dies in between leaves the hold behind; once its expires_at passes
+(STOCK_RESERVATION_TTL_SECONDS after reserving), the sweeper deletes it and gives
+the stock back. Batches are claimed with SKIP LOCKED, so several workers can
+sweep at once and a hold being confirmed is never released under it.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.cache import invalidate_books
+from app.orders.repository import StockReservationRepository
+
+logger = logging.getLogger(__name__)
+
+SWEEP_BATCH_SIZE = 500
+
+
+async def sweep_expired(
+    session: AsyncSession, *, batch_size: int = SWEEP_BATCH_SIZE
+) -> int:
+    """Release every expired hold, one statement per batch; the caller commits.
+
+    Returns the number of book stock updates made (a book can count once per batch).
+    """
+    restocked = 0
+    repo = StockReservationRepository(session)
+    while book_ids := await repo.release_expired(batch_size):
+        invalidate_books(session, book_ids)
+        restocked += len(book_ids)
+    return restocked
+
+
+async def run_sweeper(interval_seconds: float) -> None:
+    """Sweep expired holds forever, every interval_seconds (app lifespan task)."""
+    from app.db.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as session:
+                if await sweep_expired(session):
+                    await session.commit()
+        except Exception:
+            logger.exception("Stock reservation sweep failed")
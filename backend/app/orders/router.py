@@ -1,12 +1,35 @@
-"""Order HTTP endpoints: POST /orders/checkout, GET /orders, GET /orders/{id}, GET /admin/orders."""
+"""Order HTTP endpoints: POST /orders/checkout, GET /orders, GET /orders/{id},
+GET /admin/orders, GET /admin/orders/export."""
 
-from fastapi import APIRouter, BackgroundTasks, status
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.cart.repository import CartRepository
+from app.core.config import get_settings
 from app.core.deps import ActiveUser, AdminUser, DbSession
+from app.core.fields import Fields, parse_fields, pick, sparse_response
+from app.core.idempotency import Idempotent
 from app.email.service import EmailSvc
-from app.orders.repository import OrderRepository
-from app.orders.schemas import CheckoutRequest, OrderResponse
+from app.orders.exporter import MEDIA_TYPES, ExportFormat, export_order_lines
+from app.orders.models import Order, OrderStatus
+from app.orders.repository import (
+    OrderFilters,
+    OrderRepository,
+    StockReservationRepository,
+)
+from app.orders.schemas import (
+    AdminOrderListResponse,
+    AdminOrderResponse,
+    CheckoutRequest,
+    OrderItemResponse,
+    OrderListResponse,
+    OrderListView,
+    OrderResponse,
+    OrderSummaryResponse,
+)
 from app.orders.service import MockPaymentService, OrderService
 from app.users.repository import UserRepository
 
@@ -16,10 +39,14 @@ admin_router = APIRouter(prefix="/admin/orders", tags=["admin"])
 
 def _make_service(db: DbSession) -> OrderService:
     """Instantiate OrderService with all repositories bound to the current DB session."""
+    settings = get_settings()
     return OrderService(
         order_repo=OrderRepository(db),
         cart_repo=CartRepository(db),
         payment_service=MockPaymentService(),
+        stock_mode=settings.CHECKOUT_STOCK_MODE,
+        reservation_repo=StockReservationRepository(db),
+        reservation_ttl_seconds=settings.STOCK_RESERVATION_TTL_SECONDS,
     )
 
 
@@ -32,9 +59,13 @@ async def checkout(
     current_user: ActiveUser,
     background_tasks: BackgroundTasks,
     email_svc: EmailSvc,
+    idempotency: Idempotent,
 ) -> OrderResponse:
     """Convert the authenticated user's cart into a confirmed order.
 
+    Send an Idempotency-Key header to make retries safe: a retry with the same
+    key gets the first order back instead of checking out again.
+
     422 ORDER_CART_EMPTY if cart is empty.
     409 ORDER_INSUFFICIENT_STOCK if any item lacks stock.
     402 ORDER_PAYMENT_FAILED if payment is declined.
@@ -60,19 +91,19 @@ async def checkout(
                 "order_id": order.id,
                 "items": [
                     {
-                        "title": item.book.title if item.book else "Unknown Book",
-                        "author": item.book.author if item.book else "",
+                        "title": item.title or "Unknown Book",
+                        "author": item.author or "",
                         "quantity": item.quantity,
                         "unit_price": f"{item.unit_price:.2f}",
                         "cover_image_url": (
-                            item.book.cover_image_url
-                            if item.book and item.book.cover_image_url
-                            and item.book.cover_image_url.startswith("http")
-                            and "localhost" not in item.book.cover_image_url
-                            and "127.0.0.1" not in item.book.cover_image_url
+                            item.cover_image_url
+                            if item.cover_image_url
+                            and item.cover_image_url.startswith("http")
+                            and "localhost" not in item.cover_image_url
+                            and "127.0.0.1" not in item.cover_image_url
                             else None
                         ),
-                        "isbn": item.book.isbn if item.book else None,
+                        "isbn": item.isbn,
                     }
                     for item in order.items
                 ],
@@ -80,16 +111,71 @@ async def checkout(
             },
         )
 
+    await idempotency.save(status.HTTP_201_CREATED, order_response)
     return order_response
 
 
-@router.get("", response_model=list[OrderResponse])
-async def list_orders(db: DbSession, current_user: ActiveUser) -> list[OrderResponse]:
-    """Return the authenticated user's order history with line items."""
+def _sparse_order(order: Order, fields: Fields) -> dict:
+    """Serialize only `fields` of an order loaded with list_for_user/list_all(fields=...)."""
+    data = pick(order, (f for f in fields if f not in ("items", "total_price")))
+    if "items" in fields:
+        data["items"] = [OrderItemResponse.model_validate(i) for i in order.items]
+    if "total_price" in fields:
+        data["total_price"] = order.total_amount
+    return pick(data, fields)
+
+
+@router.get("", response_model=list[OrderResponse] | OrderListResponse)
+async def list_orders(
+    db: DbSession,
+    current_user: ActiveUser,
+    view: OrderListView | None = Query(None, description="summary: totals only; full: with line items"),  # noqa: B008
+    size: int | None = Query(None, ge=1, le=100),
+    cursor: str | None = Query(None),
+    fields: str | None = Query(None, description="Comma-separated order fields to return, e.g. status,created_at,total_price (id is always included)"),
+) -> list[OrderResponse] | OrderListResponse | Response:
+    """Return the authenticated user's order history, newest first.
+
+    Without view/size/cursor the full history is returned as a list of
+    orders with line items (original behaviour). With any of them, one page
+    of `size` orders (default 20) is returned in an envelope with
+    next_cursor: view=summary (default) returns id, status, created_at,
+    item_count, total_price and the first line's title; line items are
+    loaded only for view=full. Pass next_cursor back as cursor= for the
+    next page. fields= returns only the named keys of each order; line items
+    are not loaded unless items is requested.
+    """
     user_id = int(current_user["sub"])
     service = _make_service(db)
-    orders = await service.list_for_user(user_id)
-    return [OrderResponse.model_validate(o) for o in orders]
+    if view is None and size is None and cursor is None:
+        selected = parse_fields(fields, OrderResponse)
+        orders = await service.list_all_for_user(user_id, fields=selected)
+        if selected is not None:
+            return sparse_response([_sparse_order(o, selected) for o in orders])
+        return [OrderResponse.model_validate(o) for o in orders]
+
+    view = view or "summary"
+    size = size or 20
+    item_model = OrderSummaryResponse if view == "summary" else OrderResponse
+    selected = parse_fields(fields, item_model)
+    result = await service.list_for_user(
+        user_id, view=view, size=size, cursor=cursor, fields=selected
+    )
+    if selected is not None:
+        envelope = OrderListResponse(
+            items=[], size=size, next_cursor=result.next_cursor, has_more=result.has_more
+        ).model_dump()
+        envelope["items"] = [
+            pick(row, selected) if view == "summary" else _sparse_order(row, selected)
+            for row in result.items
+        ]
+        return sparse_response(envelope)
+    return OrderListResponse(
+        items=[item_model.model_validate(row) for row in result.items],
+        size=size,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+    )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -106,9 +192,71 @@ async def get_order(
     return OrderResponse.model_validate(order)
 
 
-@admin_router.get("", response_model=list[OrderResponse])
-async def list_all_orders(db: DbSession, _: AdminUser) -> list[OrderResponse]:
-    """Return all orders across all users (admin only)."""
+def _order_filters(
+    status: OrderStatus | None = Query(None),  # noqa: B008
+    user_id: int | None = Query(None),
+    created_from: datetime | None = Query(None, description="Only orders placed at or after this time"),  # noqa: B008
+    created_to: datetime | None = Query(None, description="Only orders placed before this time"),  # noqa: B008
+    book_id: int | None = Query(None, description="Only orders with a line for this book"),
+) -> OrderFilters:
+    return OrderFilters(
+        status=status,
+        user_id=user_id,
+        created_from=created_from,
+        created_to=created_to,
+        book_id=book_id,
+    )
+
+
+AdminOrderFilters = Annotated[OrderFilters, Depends(_order_filters)]
+
+
+@admin_router.get("", response_model=AdminOrderListResponse)
+async def list_all_orders(
+    db: DbSession,
+    _: AdminUser,
+    filters: AdminOrderFilters,
+    size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    fields: str | None = Query(None, description="Comma-separated order fields to return (id is always included)"),
+) -> AdminOrderListResponse | Response:
+    """Return one page of orders across all users, newest first (admin only).
+
+    Filters combine with AND. Pass next_cursor back as cursor= (with the same
+    filters) for the next page. Supports fields= like GET /orders?view=full.
+    For bulk reads use GET /admin/orders/export.
+    """
+    selected = parse_fields(fields, AdminOrderResponse)
     service = _make_service(db)
-    orders = await service.list_all()
-    return [OrderResponse.model_validate(o) for o in orders]
+    result = await service.list_all(filters, size=size, cursor=cursor, fields=selected)
+    if selected is not None:
+        envelope = AdminOrderListResponse(
+            items=[], size=size, next_cursor=result.next_cursor, has_more=result.has_more
+        ).model_dump()
+        envelope["items"] = [_sparse_order(o, selected) for o in result.items]
+        return sparse_response(envelope)
+    return AdminOrderListResponse(
+        items=[AdminOrderResponse.model_validate(o) for o in result.items],
+        size=size,
+        next_cursor=result.next_cursor,
+        has_more=result.has_more,
+    )
+
+
+@admin_router.get("/export", response_class=StreamingResponse)
+async def export_orders(
+    db: DbSession,
+    _: AdminUser,
+    filters: AdminOrderFilters,
+    format: ExportFormat = Query("ndjson", description="ndjson (one JSON object per line) or csv (with header)"),  # noqa: B008
+) -> StreamingResponse:
+    """Stream every order line matching the filters, newest order first. Admin only.
+
+    Rows are read through a server-side cursor and written as they arrive, so
+    memory stays flat however many orders match (see app/orders/exporter.py).
+    """
+    return StreamingResponse(
+        export_order_lines(db, format, filters),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'},
+    )
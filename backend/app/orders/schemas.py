@@ -2,8 +2,9 @@
 
 from datetime import datetime
 from decimal import Decimal
+from typing import Literal
 
-from pydantic import BaseModel, computed_field
+from pydantic import BaseModel, Field, computed_field
 
 
 class CheckoutRequest(BaseModel):
@@ -13,25 +14,57 @@ class CheckoutRequest(BaseModel):
 
 
 class OrderItemBookSummary(BaseModel):
-    """Minimal book info embedded in order item responses."""
+    """Minimal book info embedded in order item responses.
 
-    id: int
+    Built from the item's checkout snapshot. id is None once the book is
+    deleted. price is the unit price paid (same as the item's unit_price),
+    not the book's current price.
+    """
+
+    id: int | None
     title: str
     author: str
     cover_image_url: str | None = None
-    price: Decimal | None = None
+    price: Decimal | None = Field(
+        None, description="Unit price paid at checkout, not the book's current price"
+    )
 
     model_config = {"from_attributes": True}
 
 
 class OrderItemResponse(BaseModel):
-    """Response schema for a single order item."""
+    """Response schema for a single order item.
+
+    title, author, isbn and cover_image_url are the book as it was at checkout
+    (None only for lines whose book was deleted before snapshots were kept).
+    """
 
     id: int
     book_id: int | None
     quantity: int
     unit_price: Decimal
-    book: OrderItemBookSummary | None
+    title: str | None = None
+    author: str | None = None
+    isbn: str | None = None
+    cover_image_url: str | None = None
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def book(self) -> OrderItemBookSummary | None:
+        """The snapshot in its original nested shape (price: unit price paid).
+
+        Kept after the book is deleted, with id None; None only when the line
+        has no snapshot.
+        """
+        if self.title is None:
+            return None
+        return OrderItemBookSummary(
+            id=self.book_id,
+            title=self.title,
+            author=self.author or "",
+            cover_image_url=self.cover_image_url,
+            price=self.unit_price,
+        )
 
     model_config = {"from_attributes": True}
 
@@ -53,6 +86,57 @@ class OrderResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class OrderSummaryResponse(BaseModel):
+    """One order without line items (GET /orders?view=summary).
+
+    item_count (lines) and total_price come from the order's denormalized
+    totals; total_price matches OrderResponse.total_price for the same order.
+    first_title is the title snapshot of the first line (None when the order
+    has no lines or that line has no snapshot).
+    """
+
+    id: int
+    status: str
+    created_at: datetime
+    item_count: int
+    total_price: Decimal
+    first_title: str | None = None
+
+    model_config = {"from_attributes": True}
+
+
+OrderListView = Literal["summary", "full"]
+
+
+class OrderListResponse(BaseModel):
+    """Paginated order history envelope for GET /orders.
+
+    items are OrderSummaryResponse for view=summary, OrderResponse for view=full.
+    next_cursor is an opaque token for the following page (pass as ?cursor=);
+    None on the last page.
+    """
+
+    items: list[OrderSummaryResponse] | list[OrderResponse]
+    size: int
+    next_cursor: str | None = None
+    has_more: bool = False
+
+
+class AdminOrderResponse(OrderResponse):
+    """An order as seen by admins: OrderResponse plus the ordering user."""
+
+    user_id: int
+
+
+class AdminOrderListResponse(BaseModel):
+    """Paginated order list envelope for GET /admin/orders (see OrderListResponse)."""
+
+    items: list[AdminOrderResponse]
+    size: int
+    next_cursor: str | None = None
+    has_more: bool = False
+
+
 class InsufficientStockItem(BaseModel):
     """Details of a single item with insufficient stock — used in error responses."""
 
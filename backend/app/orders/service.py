@@ -1,12 +1,26 @@
 """Business logic for the orders feature: checkout orchestration and payment."""
 
 import random
+import secrets
+from collections.abc import Collection
+from datetime import UTC, datetime, timedelta
+from typing import Literal
 
+from sqlalchemy import Row
+
+from app.books.cache import invalidate_books
+from app.books.models import Book
+from app.cart.models import CartItem
 from app.cart.repository import CartRepository
-from app.core.exceptions import AppError
+from app.core.exceptions import AppError, InsufficientStockError
+from app.core.pagination import Page
 from app.orders.models import Order
-from app.orders.repository import OrderRepository
-from app.orders.schemas import CheckoutRequest, InsufficientStockItem
+from app.orders.repository import (
+    OrderFilters,
+    OrderRepository,
+    StockReservationRepository,
+)
+from app.orders.schemas import CheckoutRequest, InsufficientStockItem, OrderListView
 
 
 class MockPaymentService:
@@ -18,35 +32,85 @@ class MockPaymentService:
             return False
         return random.random() > 0.10
 
+    async def refund(self) -> None:
+        """Reverse a successful charge (the mock gateway has nothing to undo)."""
+
+
+def _items_unavailable() -> AppError:
+    return AppError(
+        409,
+        "Some items in your cart are no longer available",
+        "ORDER_ITEMS_UNAVAILABLE",
+    )
+
 
 class OrderService:
-    """Orchestrates checkout: lock books, validate stock, payment, create order, clear cart."""
+    """Orchestrates checkout: lock books, validate stock, payment, create order, clear cart.
+
+    stock_mode (settings.CHECKOUT_STOCK_MODE) picks how stock is taken:
+      - "reserve" (default): hold the stock in stock_reservations and commit,
+        so payment runs without book row locks; then confirm the hold.
+      - "atomic": validate and decrement with a single UPDATE ... RETURNING.
+      - "lock": SELECT ... FOR UPDATE and check stock in Python first.
+    In "atomic" and "lock" payment runs while the book rows are locked.
+    """
 
     def __init__(
         self,
         order_repo: OrderRepository,
         cart_repo: CartRepository,
         payment_service: MockPaymentService,
+        stock_mode: Literal["reserve", "atomic", "lock"] = "reserve",
+        reservation_repo: StockReservationRepository | None = None,
+        reservation_ttl_seconds: float = 300.0,
     ) -> None:
         self.order_repo = order_repo
         self.cart_repo = cart_repo
         self.payment_service = payment_service
+        self.stock_mode = stock_mode
+        self.reservation_repo = reservation_repo or StockReservationRepository(
+            order_repo.session
+        )
+        self.reservation_ttl = timedelta(seconds=reservation_ttl_seconds)
 
     async def checkout(self, user_id: int, request: CheckoutRequest) -> Order:
         """Convert the user's cart into a confirmed order.
 
         Raises:
             AppError(422) ORDER_CART_EMPTY if cart is empty or does not exist.
-            AppError(409) ORDER_INSUFFICIENT_STOCK if any item lacks stock.
+            AppError(409) ORDER_ITEMS_UNAVAILABLE if a cart book no longer exists.
+            InsufficientStockError (409 ORDER_INSUFFICIENT_STOCK, per-item details)
+                if any item lacks stock.
             AppError(402) ORDER_PAYMENT_FAILED if payment is declined.
+            AppError(409) ORDER_RESERVATION_EXPIRED if the stock hold was swept
+                before payment completed ("reserve" mode; the charge is refunded).
         """
         # Step 1: Load cart
         cart = await self.cart_repo.get_with_items(user_id)
         if cart is None or not cart.items:
             raise AppError(422, "Cart is empty", "ORDER_CART_EMPTY")
 
+        if self.stock_mode == "reserve":
+            order = await self._checkout_reserved(user_id, cart.items, request)
+        elif self.stock_mode == "atomic":
+            order = await self._checkout_atomic(user_id, cart.items, request)
+        else:
+            order = await self._checkout_locked(user_id, cart.items, request)
+        invalidate_books(self.order_repo.session, [item.book_id for item in cart.items])
+
+        # Step 7: Clear cart items in one statement (cart row itself is preserved)
+        await self.cart_repo.clear(cart.id)
+        # Expire the cart so subsequent reads reload items from DB, not the identity map
+        self.cart_repo.session.expire(cart)
+
+        return order
+
+    async def _checkout_locked(
+        self, user_id: int, items: list[CartItem], request: CheckoutRequest
+    ) -> Order:
+        """Lock mode: SELECT ... FOR UPDATE, check stock in Python, pay, then decrement."""
         # Step 2: Sort book IDs ascending (deadlock prevention)
-        book_ids = sorted(item.book_id for item in cart.items)
+        book_ids = sorted(item.book_id for item in items)
 
         # Step 3: Lock books with SELECT FOR UPDATE
         books = await self.order_repo.lock_books(book_ids)
@@ -55,15 +119,11 @@ class OrderService:
         # Step 3b: Detect books deleted after being added to cart
         missing_ids = set(book_ids) - set(book_map.keys())
         if missing_ids:
-            raise AppError(
-                409,
-                "Some items in your cart are no longer available",
-                "ORDER_ITEMS_UNAVAILABLE",
-            )
+            raise _items_unavailable()
 
         # Step 4: Validate stock for ALL items before any mutation
         insufficient: list[InsufficientStockItem] = []
-        for item in cart.items:
+        for item in items:
             book = book_map[item.book_id]
             if book.stock_quantity < item.quantity:
                 insufficient.append(
@@ -75,33 +135,151 @@ class OrderService:
                     )
                 )
         if insufficient:
-            detail = "Insufficient stock for one or more items"
-            raise AppError(409, detail, "ORDER_INSUFFICIENT_STOCK")
+            raise InsufficientStockError(insufficient)
 
         # Step 5: Attempt payment
+        await self._charge(request)
+
+        # Step 6: Create order (decrements stock inside)
+        return await self.order_repo.create_order(user_id, items, book_map)
+
+    async def _checkout_atomic(
+        self, user_id: int, items: list[CartItem], request: CheckoutRequest
+    ) -> Order:
+        """Atomic mode: one UPDATE validates and decrements, then pay and create the order.
+
+        Any failure after the UPDATE (short count, declined payment) gives the
+        stock back before raising, so the transaction is left as it was found.
+        """
+        quantities = {item.book_id: item.quantity for item in items}
+        taken = await self.order_repo.decrement_stock(quantities)
+        book_map: dict[int, Book | Row] = {row.id: row for row in taken}
+
+        if len(book_map) < len(quantities):
+            await self.order_repo.restore_stock(
+                {book_id: quantities[book_id] for book_id in book_map}
+            )
+            raise await self._shortage(items, book_map)
+
+        try:
+            await self._charge(request)
+        except AppError:
+            await self.order_repo.restore_stock(quantities)
+            raise
+        return await self.order_repo.create_order(
+            user_id, items, book_map, stock_taken=True
+        )
+
+    async def _checkout_reserved(
+        self, user_id: int, items: list[CartItem], request: CheckoutRequest
+    ) -> Order:
+        """Reserve mode: reserve and commit, pay with no locks held, then confirm.
+
+        The reservation is committed on its own so the book row locks are gone
+        before the payment gateway is called; releasing it after a declined
+        payment is committed too, since get_db rolls back on errors. Confirm
+        and order creation share a savepoint: if a hold was swept meanwhile or
+        the order cannot be written, the savepoint is rolled back, the holds
+        still there are released and committed, and the charge is refunded.
+        A crash between reserve and confirm leaves the hold for the sweeper
+        (app/orders/reservations.py) to give back once it expires.
+        """
+        session = self.order_repo.session
+        quantities = {item.book_id: item.quantity for item in items}
+        token = secrets.token_hex(16)
+        taken = await self.reservation_repo.reserve(
+            token, user_id, quantities, datetime.now(UTC) + self.reservation_ttl
+        )
+        book_map: dict[int, Book | Row] = {row.id: row for row in taken}
+        if len(book_map) < len(quantities):
+            await self.reservation_repo.release(token)
+            raise await self._shortage(items, book_map)
+        invalidate_books(session, book_map)
+        await session.commit()
+
+        try:
+            await self._charge(request)
+        except AppError:
+            invalidate_books(session, await self.reservation_repo.release(token))
+            await session.commit()
+            raise
+
+        try:
+            async with session.begin_nested():
+                confirmed = await self.reservation_repo.confirm(token)
+                if len(confirmed) < len(quantities):
+                    raise AppError(
+                        409,
+                        "Your stock reservation expired before payment completed",
+                        "ORDER_RESERVATION_EXPIRED",
+                    )
+                order = await self.order_repo.create_order(
+                    user_id, items, book_map, stock_taken=True
+                )
+        except Exception:
+            invalidate_books(session, await self.reservation_repo.release(token))
+            await session.commit()
+            await self.payment_service.refund()
+            raise
+        return order
+
+    async def _shortage(
+        self, items: list[CartItem], taken: Collection[int]
+    ) -> AppError:
+        """Build the error for a short count: books that were not in `taken`."""
+        levels = await self.order_repo.stock_levels(
+            item.book_id for item in items if item.book_id not in taken
+        )
+        if len(levels) + len(taken) < len(items):
+            return _items_unavailable()
+        return InsufficientStockError(
+            [
+                InsufficientStockItem(
+                    book_id=item.book_id,
+                    title=levels[item.book_id].title,
+                    requested=item.quantity,
+                    available=levels[item.book_id].stock_quantity,
+                )
+                for item in items
+                if item.book_id in levels
+            ]
+        )
+
+    async def _charge(self, request: CheckoutRequest) -> None:
         paid = await self.payment_service.charge(
             force_fail=request.force_payment_failure
         )
         if not paid:
             raise AppError(402, "Payment declined", "ORDER_PAYMENT_FAILED")
 
-        # Step 6: Create order (decrements stock inside)
-        order = await self.order_repo.create_order(user_id, cart.items, book_map)
-
-        # Step 7: Clear cart items (cart row itself is preserved)
-        # Snapshot items list before deletion to avoid iterating a mutating collection
-        items_to_delete = list(cart.items)
-        for item in items_to_delete:
-            await self.cart_repo.session.delete(item)
-        await self.cart_repo.session.flush()
-        # Expire the cart so subsequent reads reload items from DB, not the identity map
-        self.cart_repo.session.expire(cart)
+    async def list_all_for_user(
+        self, user_id: int, *, fields: Collection[str] | None = None
+    ) -> list[Order]:
+        """Return all orders for the given user (fields: sparse fieldset, see repository)."""
+        return await self.order_repo.list_all_for_user(user_id, fields=fields)
 
-        return order
+    async def list_for_user(
+        self,
+        user_id: int,
+        *,
+        view: OrderListView = "summary",
+        size: int = 20,
+        cursor: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> Page[Order] | Page[Row]:
+        """Return one page of the user's orders, newest first.
 
-    async def list_for_user(self, user_id: int) -> list[Order]:
-        """Return all orders for the given user."""
-        return await self.order_repo.list_for_user(user_id)
+        view="summary" returns aggregate rows (no line items are loaded);
+        view="full" returns orders with items (fields: sparse fieldset, see
+        repository). Both views accept each other's cursors.
+        """
+        if view == "summary":
+            return await self.order_repo.list_summaries_for_user(
+                user_id, size=size, cursor=cursor
+            )
+        return await self.order_repo.list_for_user(
+            user_id, size=size, cursor=cursor, fields=fields
+        )
 
     async def get_order(self, user_id: int, order_id: int) -> Order:
         """Return a specific order owned by the user.
@@ -114,6 +292,15 @@ class OrderService:
             raise AppError(404, "Order not found", "ORDER_NOT_FOUND")
         return order
 
-    async def list_all(self) -> list[Order]:
-        """Return all orders (admin view)."""
-        return await self.order_repo.list_all()
+    async def list_all(
+        self,
+        filters: OrderFilters,
+        *,
+        size: int = 20,
+        cursor: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> Page[Order]:
+        """Return one page of all orders matching filters (admin view)."""
+        return await self.order_repo.list_all(
+            filters, size=size, cursor=cursor, fields=fields
+        )
@@ -2,12 +2,13 @@
 
 from datetime import UTC, datetime
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import AppError
+from app.core.pagination import Page, SortKey, paginate
 from app.prebooks.models import PreBooking, PreBookStatus
 
 
@@ -57,6 +58,27 @@ class PreBookRepository:
         )
         return list(result.scalars().all())
 
+    async def get_page_for_user(
+        self, user_id: int, *, cursor: str | None = None, size: int = 20
+    ) -> Page[PreBooking]:
+        """Return one keyset page of the user's pre-bookings, newest first (id DESC tiebreak)."""
+        stmt = select(PreBooking).where(PreBooking.user_id == user_id)
+        total = await self.session.scalar(
+            select(func.count()).select_from(stmt.subquery())
+        )
+        items, next_cursor = await paginate(
+            self.session,
+            stmt.options(selectinload(PreBooking.book)),
+            [
+                SortKey(PreBooking.created_at, descending=True),
+                SortKey(PreBooking.id, descending=True),
+            ],
+            scope=f"prebooks:{user_id}",
+            cursor=cursor,
+            size=size,
+        )
+        return Page(items=items, total=total or 0, next_cursor=next_cursor)
+
     async def get_by_id(self, prebook_id: int) -> PreBooking | None:
         """Fetch a pre-booking by its primary key."""
         result = await self.session.execute(
@@ -88,3 +110,25 @@ class PreBookRepository:
             .returning(PreBooking.user_id)
         )
         return list(result.scalars().all())
+
+    async def notify_waiting_by_books(
+        self, book_ids: list[int]
+    ) -> list[tuple[int, int]]:
+        """Bulk-update WAITING pre-bookings for many books to NOTIFIED in one statement.
+
+        Returns (user_id, book_id) pairs for every notified pre-booking; empty
+        when book_ids is empty or nobody was waiting. Set-based counterpart of
+        notify_waiting_by_book for bulk restocks.
+        """
+        if not book_ids:
+            return []
+        result = await self.session.execute(
+            update(PreBooking)
+            .where(
+                PreBooking.book_id.in_(book_ids),
+                PreBooking.status == PreBookStatus.WAITING,
+            )
+            .values(status=PreBookStatus.NOTIFIED, notified_at=datetime.now(UTC))
+            .returning(PreBooking.user_id, PreBooking.book_id)
+        )
+        return [(row.user_id, row.book_id) for row in result]
@@ -1,6 +1,6 @@
 """Pre-booking HTTP endpoints: POST /prebooks, GET /prebooks, DELETE /prebooks/{id}."""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, status
 
 from app.books.repository import BookRepository
 from app.core.deps import ActiveUser, DbSession
@@ -36,13 +36,27 @@ async def create_pre_booking(
 
 
 @router.get("", response_model=PreBookListResponse)
-async def list_pre_bookings(db: DbSession, current_user: ActiveUser) -> PreBookListResponse:
-    """Return all pre-bookings for the authenticated user (all statuses, newest first)."""
+async def list_pre_bookings(
+    db: DbSession,
+    current_user: ActiveUser,
+    cursor: str | None = Query(None),
+    size: int | None = Query(None, ge=1, le=100),
+) -> PreBookListResponse:
+    """Return all pre-bookings for the authenticated user (all statuses, newest first).
+
+    With cursor and/or size, returns one keyset page (default 20) plus next_cursor.
+    """
     user_id = int(current_user["sub"])
     service = _make_service(db)
-    prebooks = await service.list(user_id)
+    if cursor is None and size is None:
+        prebooks = await service.list(user_id)
+        return PreBookListResponse(
+            items=[PreBookResponse.from_orm_with_book(pb) for pb in prebooks]
+        )
+    result = await service.list_page(user_id, cursor=cursor, size=size or 20)
     return PreBookListResponse(
-        items=[PreBookResponse.from_orm_with_book(pb) for pb in prebooks]
+        items=[PreBookResponse.from_orm_with_book(pb) for pb in result.items],
+        next_cursor=result.next_cursor,
     )
 
 
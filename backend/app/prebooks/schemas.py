@@ -47,6 +47,10 @@ class PreBookResponse(BaseModel):
 
 
 class PreBookListResponse(BaseModel):
-    """Response envelope for GET /prebooks."""
+    """Response envelope for GET /prebooks.
+
+    next_cursor is only set when the client opted into paging (cursor/size).
+    """
 
     items: list[PreBookResponse]
+    next_cursor: str | None = None
@@ -2,6 +2,7 @@
 
 from app.books.repository import BookRepository
 from app.core.exceptions import AppError
+from app.core.pagination import Page
 from app.prebooks.models import PreBooking, PreBookStatus
 from app.prebooks.repository import PreBookRepository
 
@@ -42,6 +43,14 @@ class PreBookService:
         """Return all pre-bookings for a user (all statuses)."""
         return await self.prebook_repo.get_all_for_user(user_id)
 
+    async def list_page(
+        self, user_id: int, *, cursor: str | None = None, size: int = 20
+    ) -> Page[PreBooking]:
+        """Return one cursor page of the user's pre-bookings (all statuses)."""
+        return await self.prebook_repo.get_page_for_user(
+            user_id, cursor=cursor, size=size
+        )
+
     async def cancel(self, user_id: int, prebook_id: int) -> None:
         """Cancel a pre-booking (soft-delete to CANCELLED status).
 
@@ -3,9 +3,21 @@
 from __future__ import annotations
 
 from datetime import datetime
+from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import (
+    CheckConstraint,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -53,3 +65,79 @@ class Review(Base):
 
     book: Mapped[Book] = relationship()
     user: Mapped[User] = relationship()
+
+
+# Newest live reviews of a book (GET /books/{id}?reviews=N, review lists).
+Index(
+    "ix_reviews_book_created_live",
+    Review.book_id,
+    Review.created_at.desc(),
+    Review.id.desc(),
+    postgresql_where=Review.deleted_at.is_(None),
+)
+
+
+# Bayesian average prior: every book starts as if it had BAYES_PRIOR_WEIGHT
+# reviews averaging BAYES_PRIOR_MEAN, so one 5-star review does not outrank
+# a hundred 4.8s.
+BAYES_PRIOR_MEAN = 3
+BAYES_PRIOR_WEIGHT = 5
+
+
+class BookRatingStats(Base):
+    """Per-book rating aggregates, maintained incrementally by ReviewRepository.
+
+    One row per book that has ever had a review. Counts cover non-deleted
+    reviews only. avg_rating and bayesian_avg are generated columns so they
+    can never disagree with the counters they derive from.
+    Rebuilt from `reviews` by scripts/reconcile_rating_stats.py.
+    """
+
+    __tablename__ = "book_rating_stats"
+
+    __table_args__ = (
+        Index("ix_book_rating_stats_bayesian_avg", "bayesian_avg", "book_id"),
+    )
+
+    book_id: Mapped[int] = mapped_column(
+        ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_4: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_5: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    avg_rating: Mapped[Decimal | None] = mapped_column(
+        Numeric,
+        Computed(
+            "CASE WHEN review_count > 0 "
+            "THEN rating_sum::numeric / review_count END",
+            persisted=True,
+        ),
+        nullable=True,
+    )
+    bayesian_avg: Mapped[Decimal] = mapped_column(
+        Numeric,
+        Computed(
+            f"(rating_sum + {BAYES_PRIOR_MEAN * BAYES_PRIOR_WEIGHT})::numeric "
+            f"/ (review_count + {BAYES_PRIOR_WEIGHT})",
+            persisted=True,
+        ),
+        nullable=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+# GET /books?sort=avg_rating, in its exact ORDER BY (avg_rating DESC NULLS LAST, id).
+Index(
+    "ix_book_rating_stats_avg_rating",
+    BookRatingStats.avg_rating.desc().nulls_last(),
+    BookRatingStats.book_id,
+)
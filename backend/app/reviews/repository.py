@@ -1,18 +1,44 @@
 """Repository layer for Review database access."""
 
+from collections.abc import Sequence
 from datetime import UTC, datetime
 
-from sqlalchemy import asc, desc, func, select, update
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.books.cache import invalidate_books, invalidate_ratings
 from app.core.exceptions import AppError
-from app.reviews.models import Review
+from app.core.fields import load_only_fields
+from app.core.pagination import Page, SortKey, TotalMode, count_total, paginate
+from app.reviews.models import BookRatingStats, Review
 
 # Sentinel value to distinguish "not provided" from explicit None for text field
 _UNSET = object()
 
+# Additive counters on BookRatingStats (avg_rating/bayesian_avg are generated from these)
+_STATS_COUNTERS = (
+    "review_count",
+    "rating_sum",
+    "rating_1",
+    "rating_2",
+    "rating_3",
+    "rating_4",
+    "rating_5",
+)
+
+
+def _add_rating(
+    deltas: dict[int, dict[str, int]], book_id: int, rating: int, sign: int
+) -> None:
+    """Accumulate the counter changes for adding (sign=1) or removing (sign=-1) one rating."""
+    delta = deltas.setdefault(book_id, dict.fromkeys(_STATS_COUNTERS, 0))
+    delta["review_count"] += sign
+    delta["rating_sum"] += sign * rating
+    delta[f"rating_{rating}"] += sign
+
 
 class ReviewRepository:
     """Handles Review persistence — CRUD, pagination, and aggregates."""
@@ -48,6 +74,10 @@ class ReviewRepository:
                 ) from e
             raise
 
+        deltas: dict[int, dict[str, int]] = {}
+        _add_rating(deltas, book_id, rating, 1)
+        await self._apply_rating_stats(deltas)
+
         # Eager-load relationships for response serialization
         await self.session.refresh(review, ["book", "user"])
         return review
@@ -88,32 +118,53 @@ class ReviewRepository:
         Only updates fields that are explicitly provided.
         Pass text=None to clear the review text (rating-only review).
         The _UNSET sentinel distinguishes "not provided" from explicit None.
+        A rating change moves the review between histogram buckets in book_rating_stats.
         """
-        if rating is not None:
+        if rating is not None and rating != review.rating:
+            if review.deleted_at is None:
+                deltas: dict[int, dict[str, int]] = {}
+                _add_rating(deltas, review.book_id, review.rating, -1)
+                _add_rating(deltas, review.book_id, rating, 1)
+                await self._apply_rating_stats(deltas)
             review.rating = rating
-        if text is not _UNSET:
+        if text is not _UNSET and text != review.text:
             review.text = text  # type: ignore[assignment]
+            # Book details can embed recent reviews (GET /books/{id}?reviews=N)
+            invalidate_books(self.session, [review.book_id])
         await self.session.flush()
         await self.session.refresh(review)
         return review
 
     async def soft_delete(self, review: Review) -> None:
         """Soft-delete a review by setting deleted_at timestamp."""
+        if review.deleted_at is not None:
+            return
         review.deleted_at = datetime.now(UTC)
         await self.session.flush()
 
+        deltas: dict[int, dict[str, int]] = {}
+        _add_rating(deltas, review.book_id, review.rating, -1)
+        await self._apply_rating_stats(deltas)
+
     async def list_for_book(
         self,
         book_id: int,
         *,
         page: int = 1,
         size: int = 20,
-    ) -> tuple[list[Review], int]:
+        cursor: str | None = None,
+        columns: Sequence[str] | None = None,
+        with_user: bool = True,
+        with_book: bool = True,
+    ) -> Page[Review]:
         """Return paginated reviews for a book, newest first.
 
-        Secondary sort by id DESC provides a stable tiebreaker.
+        Secondary sort by id DESC provides a stable tiebreaker (and keyset column).
         Eager-loads user relationship for reviewer info.
-        Returns (reviews, total_count).
+        Returns a Page (unpacks as (reviews, total_count)).
+
+        Sparse fieldsets: columns= loads only those Review columns, and
+        with_user / with_book=False skip the eager loads of the relationships.
         """
         base_stmt = (
             select(Review)
@@ -127,16 +178,63 @@ class ReviewRepository:
         total = count_result.scalar_one()
 
         # Paginated data query
-        result = await self.session.execute(
-            base_stmt
-            .options(selectinload(Review.user), selectinload(Review.book))
-            .order_by(Review.created_at.desc(), Review.id.desc())
-            .limit(size)
-            .offset((page - 1) * size)
+        options = []
+        if columns is not None:
+            options.append(load_only_fields(Review, columns))
+        if with_user:
+            options.append(selectinload(Review.user))
+        if with_book:
+            options.append(selectinload(Review.book))
+        reviews, next_cursor = await paginate(
+            self.session,
+            base_stmt.options(*options),
+            [
+                SortKey(Review.created_at, descending=True),
+                SortKey(Review.id, descending=True),
+            ],
+            scope=f"reviews:book:{book_id}",
+            cursor=cursor,
+            page=page,
+            size=size,
         )
-        reviews = list(result.scalars().all())
 
-        return reviews, total
+        return Page(items=reviews, total=total, next_cursor=next_cursor)
+
+    async def get_list_version(self, book_id: int) -> tuple:
+        """Return the watermark behind GET /books/{book_id}/reviews's ETag.
+
+        One query over indexed columns: review count / latest updated_at /
+        deleted count for the book, the book's own updated_at (title and cover
+        are embedded in each review), and the book's purchase ledger size
+        (verified_purchase flags can flip when a reviewer buys it).
+        """
+        from app.books.models import Book  # avoid circular at module level
+        from app.orders.models import UserBookPurchase
+
+        reviews = (
+            select(
+                func.count(Review.id).label("review_count"),
+                func.max(Review.updated_at).label("reviews_updated_at"),
+                func.count(Review.deleted_at).label("deleted_count"),
+            )
+            .where(Review.book_id == book_id)
+            .subquery()
+        )
+        book_updated_at = (
+            select(Book.updated_at).where(Book.id == book_id).scalar_subquery()
+        )
+        purchasers = (
+            select(func.count())
+            .select_from(UserBookPurchase)
+            .where(UserBookPurchase.book_id == book_id)
+            .scalar_subquery()
+        )
+        row = (
+            await self.session.execute(
+                select(reviews, book_updated_at, purchasers)
+            )
+        ).one()
+        return tuple(row)
 
     async def list_all_admin(
         self,
@@ -149,7 +247,9 @@ class ReviewRepository:
         rating_max: int | None = None,
         sort_by: str = "date",
         sort_dir: str = "desc",
-    ) -> tuple[list[Review], int]:
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+    ) -> Page[Review]:
         """Return paginated, filtered, sorted reviews for admin moderation.
 
         Filters combine as AND (e.g., book_id=5 AND rating_min=3).
@@ -157,7 +257,7 @@ class ReviewRepository:
         Eager-loads user and book relationships for response serialization.
 
         Args:
-            page: 1-indexed page number.
+            page: 1-indexed page number (ignored when cursor is given).
             per_page: Items per page.
             book_id: Filter to reviews for this book only.
             user_id: Filter to reviews by this user only.
@@ -165,9 +265,11 @@ class ReviewRepository:
             rating_max: Maximum rating (inclusive, 1-5).
             sort_by: "date" (created_at) or "rating".
             sort_dir: "asc" or "desc".
+            cursor: Opaque keyset cursor from a previous page's next_cursor.
+            total_mode: "exact", "estimate" or "none" (see count_total).
 
         Returns:
-            Tuple of (reviews list, total count).
+            Page of reviews (unpacks as (reviews list, total count)).
         """
         stmt = (
             select(Review)
@@ -185,20 +287,29 @@ class ReviewRepository:
         if rating_max is not None:
             stmt = stmt.where(Review.rating <= rating_max)
 
-        # Sort column and direction
-        sort_col = Review.created_at if sort_by == "date" else Review.rating
-        order_expr = desc(sort_col) if sort_dir == "desc" else asc(sort_col)
-        stmt = stmt.order_by(order_expr, Review.id.desc())  # id as stable tiebreaker
-
         # Count (reuses same filters via subquery)
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = (await self.session.execute(count_stmt)).scalar_one()
+        total, total_mode = await count_total(self.session, stmt, total_mode)
+
+        # Sort column and direction; id DESC as stable tiebreaker
+        sort_col = Review.created_at if sort_by == "date" else Review.rating
+        keys = [
+            SortKey(sort_col, descending=sort_dir == "desc"),
+            SortKey(Review.id, descending=True),
+        ]
 
         # Paginate
-        result = await self.session.execute(
-            stmt.limit(per_page).offset((page - 1) * per_page)
+        reviews, next_cursor = await paginate(
+            self.session,
+            stmt,
+            keys,
+            scope=f"reviews:admin:{sort_by}:{sort_dir}",
+            cursor=cursor,
+            page=page,
+            size=per_page,
+        )
+        return Page(
+            items=reviews, total=total, next_cursor=next_cursor, total_mode=total_mode
         )
-        return list(result.scalars().all()), total
 
     async def bulk_soft_delete(self, review_ids: list[int]) -> int:
         """Soft-delete multiple reviews by ID list in a single UPDATE.
@@ -207,6 +318,7 @@ class ReviewRepository:
         Returns the count of reviews actually soft-deleted.
 
         Uses synchronize_session="fetch" per project convention (STATE.md).
+        RETURNING (book_id, rating) feeds one set-based book_rating_stats update.
         """
         if not review_ids:
             return 0
@@ -215,30 +327,130 @@ class ReviewRepository:
             update(Review)
             .where(Review.id.in_(review_ids), Review.deleted_at.is_(None))
             .values(deleted_at=datetime.now(UTC))
+            .returning(Review.book_id, Review.rating)
             .execution_options(synchronize_session="fetch")
         )
-        return result.rowcount
+        deleted = result.all()
+
+        deltas: dict[int, dict[str, int]] = {}
+        for book_id, rating in deleted:
+            _add_rating(deltas, book_id, rating, -1)
+        await self._apply_rating_stats(deltas)
+        return len(deleted)
 
     async def get_aggregates(self, book_id: int) -> dict:
-        """Return avg_rating and review_count for a book.
+        """Return avg_rating and review_count for a book from book_rating_stats.
 
         avg_rating is rounded to 1 decimal place, or None if no reviews.
         review_count is 0 if no reviews.
         """
         result = await self.session.execute(
-            select(
-                func.avg(Review.rating),
-                func.count(Review.id),
-            ).where(
-                Review.book_id == book_id,
-                Review.deleted_at.is_(None),
+            select(BookRatingStats.avg_rating, BookRatingStats.review_count).where(
+                BookRatingStats.book_id == book_id
             )
         )
-        row = result.one()
-        avg_rating = row[0]
-        review_count = row[1]
+        row = result.one_or_none()
+        avg_rating = row[0] if row else None
+        review_count = row[1] if row else 0
 
         return {
             "avg_rating": float(round(avg_rating, 1)) if avg_rating is not None else None,
             "review_count": review_count,
         }
+
+    # ------------------------------------------------------------------
+    # book_rating_stats maintenance
+    # ------------------------------------------------------------------
+
+    async def _apply_rating_stats(self, deltas: dict[int, dict[str, int]]) -> None:
+        """Add per-book counter deltas to book_rating_stats in one upsert.
+
+        Runs in the caller's transaction, so the stats commit or roll back
+        together with the review change that produced them.
+        """
+        if not deltas:
+            return
+        stmt = pg_insert(BookRatingStats).values(
+            [{"book_id": book_id, **delta} for book_id, delta in deltas.items()]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BookRatingStats.book_id],
+            set_={
+                **{
+                    c: getattr(BookRatingStats, c) + getattr(stmt.excluded, c)
+                    for c in _STATS_COUNTERS
+                },
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+        invalidate_ratings(self.session, deltas)
+
+    async def reconcile_rating_stats(self, *, apply: bool = True) -> list[dict]:
+        """Compare book_rating_stats against live reviews and repair any drift.
+
+        Returns one dict per drifted book: {book_id, stored: {...}, expected: {...}}.
+        Books whose stats row is missing or whose reviews are all gone are included.
+        With apply=False only the report is produced (dry run).
+        """
+        expected = (
+            select(
+                Review.book_id.label("book_id"),
+                func.count().label("review_count"),
+                func.sum(Review.rating).label("rating_sum"),
+                *[
+                    func.count().filter(Review.rating == k).label(f"rating_{k}")
+                    for k in range(1, 6)
+                ],
+            )
+            .where(Review.deleted_at.is_(None))
+            .group_by(Review.book_id)
+            .subquery()
+        )
+        stored = BookRatingStats.__table__
+        drift_stmt = (
+            select(
+                func.coalesce(expected.c.book_id, stored.c.book_id).label("book_id"),
+                *[stored.c[c].label(f"stored_{c}") for c in _STATS_COUNTERS],
+                *[expected.c[c].label(f"expected_{c}") for c in _STATS_COUNTERS],
+            )
+            .select_from(
+                expected.join(
+                    stored, stored.c.book_id == expected.c.book_id, full=True
+                )
+            )
+            .where(
+                or_(
+                    *[
+                        func.coalesce(stored.c[c], 0)
+                        != func.coalesce(expected.c[c], 0)
+                        for c in _STATS_COUNTERS
+                    ]
+                )
+            )
+            .order_by("book_id")
+        )
+        rows = (await self.session.execute(drift_stmt)).mappings().all()
+        report = [
+            {
+                "book_id": row["book_id"],
+                "stored": {c: row[f"stored_{c}"] for c in _STATS_COUNTERS},
+                "expected": {c: row[f"expected_{c}"] or 0 for c in _STATS_COUNTERS},
+            }
+            for row in rows
+        ]
+
+        if apply and report:
+            stmt = pg_insert(BookRatingStats).values(
+                [{"book_id": r["book_id"], **r["expected"]} for r in report]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[BookRatingStats.book_id],
+                set_={
+                    **{c: getattr(stmt.excluded, c) for c in _STATS_COUNTERS},
+                    "updated_at": func.now(),
+                },
+            )
+            await self.session.execute(stmt)
+            invalidate_ratings(self.session, [r["book_id"] for r in report])
+        return report
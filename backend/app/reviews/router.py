@@ -1,9 +1,12 @@
 """Review HTTP endpoints: POST /books/{book_id}/reviews, GET /books/{book_id}/reviews, GET /reviews/{review_id}, PATCH /reviews/{review_id}, DELETE /reviews/{review_id}."""
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Query, Request, Response, status
 
 from app.books.repository import BookRepository
 from app.core.deps import ActiveUser, DbSession
+from app.core.etag import is_not_modified, make_etag, not_modified
+from app.core.fields import parse_fields, sparse_response
+from app.core.idempotency import Idempotent
 from app.orders.repository import OrderRepository
 from app.reviews.repository import _UNSET, ReviewRepository
 from app.reviews.schemas import (
@@ -36,10 +39,12 @@ async def create_review(
     body: ReviewCreate,
     db: DbSession,
     current_user: ActiveUser,
+    idempotency: Idempotent,
 ) -> ReviewResponse:
     """Create a review for a book.
 
     Requires authentication. The user must have a confirmed purchase of the book.
+    An Idempotency-Key header makes retries replay the first response.
 
     403 NOT_PURCHASED if the user has not purchased the book.
     404 BOOK_NOT_FOUND if the book does not exist.
@@ -48,28 +53,66 @@ async def create_review(
     user_id = int(current_user["sub"])
     service = _make_service(db)
     review, verified_purchase = await service.create(user_id, book_id, body.rating, body.text)
-    return ReviewResponse.model_validate(service._build_review_data(review, verified_purchase))
+    response = ReviewResponse.model_validate(service._build_review_data(review, verified_purchase))
+    await idempotency.save(status.HTTP_201_CREATED, response)
+    return response
 
 
 @router.get("/books/{book_id}/reviews", response_model=ReviewListResponse)
 async def list_reviews(
     book_id: int,
     db: DbSession,
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-) -> ReviewListResponse:
+    cursor: str | None = Query(None),
+    fields: str | None = Query(None, description="Comma-separated review fields to return, e.g. rating,text,created_at (id is always included)"),
+) -> ReviewListResponse | Response:
     """Return paginated reviews for a book.
 
     Public endpoint — no authentication required.
     Each review includes a verified_purchase flag indicating confirmed purchase.
+    Pass next_cursor back as cursor= for keyset paging (page= is then ignored).
+    Sends a strong ETag from the book's review watermark (see
+    ReviewRepository.get_list_version); a matching If-None-Match gets 304.
+    fields= returns only the named keys per review; author, book and
+    verified_purchase are only looked up when requested.
     """
+    selected = parse_fields(fields, ReviewResponse)
+    version = await ReviewRepository(db).get_list_version(book_id)
+    etag = make_etag("reviews", book_id, selected, *version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     service = _make_service(db)
-    items_with_vp, total = await service.list_for_book(book_id, page, size)
+    result = await service.list_for_book(
+        book_id, page, size, cursor=cursor, fields=selected
+    )
+    if selected is not None:
+        envelope = ReviewListResponse(
+            items=[],
+            total=result.total,
+            page=page,
+            size=size,
+            next_cursor=result.next_cursor,
+        ).model_dump()
+        envelope["items"] = [
+            service._build_sparse_review_data(r, vp, selected) for r, vp in result.items
+        ]
+        return sparse_response(envelope, headers={"ETag": etag})
     items = [
         ReviewResponse.model_validate(service._build_review_data(r, vp))
-        for r, vp in items_with_vp
+        for r, vp in result.items
     ]
-    return ReviewListResponse(items=items, total=total, page=page, size=size)
+    return ReviewListResponse(
+        items=items,
+        total=result.total,
+        page=page,
+        size=size,
+        next_cursor=result.next_cursor,
+    )
 
 
 @router.get("/reviews/{review_id}", response_model=ReviewResponse)
@@ -80,3 +80,4 @@ class ReviewListResponse(BaseModel):
     total: int
     page: int
     size: int
+    next_cursor: str | None = None
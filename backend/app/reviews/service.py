@@ -8,8 +8,11 @@ Enforces:
 - verified_purchase computation per review
 """
 
+from collections.abc import Collection, Iterable
+
 from app.books.repository import BookRepository
 from app.core.exceptions import AppError, DuplicateReviewError
+from app.core.pagination import Page
 from app.orders.repository import OrderRepository
 from app.reviews.models import Review
 from app.reviews.repository import _UNSET, ReviewRepository
@@ -76,24 +79,45 @@ class ReviewService:
         book_id: int,
         page: int,
         size: int,
-    ) -> tuple[list[tuple[Review, bool]], int]:
+        cursor: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> Page[tuple[Review, bool | None]]:
         """Return paginated reviews with verified_purchase flag for each.
 
-        N+1 queries for verified_purchase are accepted for page sizes up to 20
-        (documented known limitation).
+        verified_purchase is resolved for the whole page with one purchase
+        ledger lookup (OrderRepository.purchasers_of_book).
+
+        With fields (sparse fieldset), only the columns and relationships those
+        fields need are loaded, and verified_purchase is None unless requested.
 
-        Returns ([(review, verified_purchase), ...], total).
+        Returns a Page of (review, verified_purchase) pairs — unpacks as
+        ([(review, verified_purchase), ...], total).
         """
-        reviews, total = await self.review_repo.list_for_book(
-            book_id, page=page, size=size
+        wants = (lambda name: True) if fields is None else fields.__contains__
+        columns = None
+        if fields is not None:
+            columns = [*fields, "user_id", "book_id"] if wants("verified_purchase") else fields
+        result = await self.review_repo.list_for_book(
+            book_id,
+            page=page,
+            size=size,
+            cursor=cursor,
+            columns=columns,
+            with_user=wants("author"),
+            with_book=wants("book"),
         )
-        items_with_vp: list[tuple[Review, bool]] = []
-        for review in reviews:
-            vp = await self.order_repo.has_user_purchased_book(
-                review.user_id, review.book_id
+        purchasers: set[int] | None = None
+        if wants("verified_purchase"):
+            purchasers = await self.order_repo.purchasers_of_book(
+                book_id, (review.user_id for review in result.items)
             )
-            items_with_vp.append((review, vp))
-        return items_with_vp, total
+        items_with_vp: list[tuple[Review, bool | None]] = [
+            (review, None if purchasers is None else review.user_id in purchasers)
+            for review in result.items
+        ]
+        return Page(
+            items=items_with_vp, total=result.total, next_cursor=result.next_cursor
+        )
 
     async def get(self, review_id: int) -> tuple[Review, bool]:
         """Fetch a single review by ID with verified_purchase flag.
@@ -207,3 +231,29 @@ class ReviewService:
                 "cover_image_url": review.book.cover_image_url,
             },
         }
+
+    def _build_sparse_review_data(
+        self, review: Review, verified_purchase: bool | None, fields: Iterable[str]
+    ) -> dict:
+        """Like _build_review_data, limited to `fields` (in that order).
+
+        Only the attributes behind the requested fields are touched, so it is
+        safe on reviews loaded by list_for_book(fields=...).
+        """
+        builders = {
+            "verified_purchase": lambda: verified_purchase,
+            "author": lambda: {
+                "user_id": review.user.id,
+                "display_name": review.user.email.split("@")[0],
+                "avatar_url": None,
+            },
+            "book": lambda: {
+                "book_id": review.book.id,
+                "title": review.book.title,
+                "cover_image_url": review.book.cover_image_url,
+            },
+        }
+        return {
+            name: builders[name]() if name in builders else getattr(review, name)
+            for name in fields
+        }
@@ -3,9 +3,10 @@
 import uuid
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import func, select, update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Page, SortKey, TotalMode, count_total, paginate
 from app.users.models import OAuthAccount, RefreshToken, User, UserRole
 
 
@@ -65,20 +66,35 @@ class UserRepository:
         per_page: int = 20,
         role: UserRole | None = None,
         is_active: bool | None = None,
-    ) -> tuple[list[User], int]:
-        """Return paginated list of users sorted by created_at DESC with optional filters."""
-        stmt = select(User).order_by(User.created_at.desc())
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+    ) -> Page[User]:
+        """Return paginated list of users sorted by created_at DESC with optional filters.
+
+        id DESC breaks created_at ties so keyset cursors are stable.
+        total_mode: "exact", "estimate" or "none" (see count_total).
+        """
+        stmt = select(User)
         if role is not None:
             stmt = stmt.where(User.role == role)
         if is_active is not None:
             stmt = stmt.where(User.is_active == is_active)
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = await self.session.scalar(count_stmt)
-        offset = (page - 1) * per_page
-        stmt = stmt.limit(per_page).offset(offset)
-        result = await self.session.execute(stmt)
-        users = list(result.scalars().all())
-        return users, total or 0
+        total, total_mode = await count_total(self.session, stmt, total_mode)
+        users, next_cursor = await paginate(
+            self.session,
+            stmt,
+            [
+                SortKey(User.created_at, descending=True),
+                SortKey(User.id, descending=True),
+            ],
+            scope="users:created_at:desc",
+            cursor=cursor,
+            page=page,
+            size=per_page,
+        )
+        return Page(
+            items=users, total=total, next_cursor=next_cursor, total_mode=total_mode
+        )
 
 
 class RefreshTokenRepository:
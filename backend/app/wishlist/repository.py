@@ -1,11 +1,12 @@
 """Repository layer for WishlistItem database access."""
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.exceptions import AppError
+from app.core.pagination import Page, SortKey, paginate
 from app.wishlist.models import WishlistItem
 
 
@@ -54,6 +55,30 @@ class WishlistRepository:
         )
         return list(result.scalars().all())
 
+    async def get_page_for_user(
+        self, user_id: int, *, cursor: str | None = None, size: int = 20
+    ) -> Page[WishlistItem]:
+        """Return one keyset page of the user's wishlist, same order as get_all_for_user.
+
+        total is the user's full wishlist size.
+        """
+        stmt = select(WishlistItem).where(WishlistItem.user_id == user_id)
+        total = await self.session.scalar(
+            select(func.count()).select_from(stmt.subquery())
+        )
+        items, next_cursor = await paginate(
+            self.session,
+            stmt.options(selectinload(WishlistItem.book)),
+            [
+                SortKey(WishlistItem.added_at, descending=True),
+                SortKey(WishlistItem.id, descending=True),
+            ],
+            scope=f"wishlist:{user_id}",
+            cursor=cursor,
+            size=size,
+        )
+        return Page(items=items, total=total or 0, next_cursor=next_cursor)
+
     async def get_by_user_and_book(
         self, user_id: int, book_id: int
     ) -> WishlistItem | None:
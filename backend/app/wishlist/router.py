@@ -1,6 +1,6 @@
 """Wishlist HTTP endpoints: POST /wishlist, GET /wishlist, DELETE /wishlist/{book_id}."""
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, status
 
 from app.books.repository import BookRepository
 from app.core.deps import ActiveUser, DbSession
@@ -37,13 +37,29 @@ async def add_to_wishlist(
 
 
 @router.get("", response_model=WishlistResponse)
-async def get_wishlist(db: DbSession, current_user: ActiveUser) -> WishlistResponse:
-    """Return the authenticated user's wishlist with current book price and stock."""
+async def get_wishlist(
+    db: DbSession,
+    current_user: ActiveUser,
+    cursor: str | None = Query(None),
+    size: int | None = Query(None, ge=1, le=100),
+) -> WishlistResponse:
+    """Return the authenticated user's wishlist with current book price and stock.
+
+    Without cursor/size the full wishlist is returned (original behaviour).
+    With either, one keyset page of `size` items (default 20) is returned
+    along with next_cursor.
+    """
     user_id = int(current_user["sub"])
     service = _make_service(db)
-    items = await service.list(user_id)
+    if cursor is None and size is None:
+        items = await service.list(user_id)
+        return WishlistResponse(
+            items=[WishlistItemResponse.model_validate(i) for i in items]
+        )
+    result = await service.list_page(user_id, cursor=cursor, size=size or 20)
     return WishlistResponse(
-        items=[WishlistItemResponse.model_validate(i) for i in items]
+        items=[WishlistItemResponse.model_validate(i) for i in result.items],
+        next_cursor=result.next_cursor,
     )
 
 
@@ -37,6 +37,10 @@ class WishlistItemResponse(BaseModel):
 
 
 class WishlistResponse(BaseModel):
-    """Response schema for GET /wishlist — full wishlist with all saved books."""
+    """Response schema for GET /wishlist — full wishlist with all saved books.
+
+    next_cursor is only set when the client opted into paging (cursor/size).
+    """
 
     items: list[WishlistItemResponse]
+    next_cursor: str | None = None
@@ -2,6 +2,7 @@
 
 from app.books.repository import BookRepository
 from app.core.exceptions import AppError
+from app.core.pagination import Page
 from app.wishlist.models import WishlistItem
 from app.wishlist.repository import WishlistRepository
 
@@ -33,6 +34,14 @@ class WishlistService:
         """Return all wishlist items for the user, newest first."""
         return await self.wishlist_repo.get_all_for_user(user_id)
 
+    async def list_page(
+        self, user_id: int, *, cursor: str | None = None, size: int = 20
+    ) -> Page[WishlistItem]:
+        """Return one cursor page of the user's wishlist, newest first."""
+        return await self.wishlist_repo.get_page_for_user(
+            user_id, cursor=cursor, size=size
+        )
+
     async def remove(self, user_id: int, book_id: int) -> None:
         """Remove a book from the user's wishlist.
 
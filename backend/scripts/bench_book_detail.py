@@ -0,0 +1,93 @@
+"""Benchmark GET /books/{id} data loading: previous two queries vs one statement.
+
+"before" is the path the endpoint used until the single-statement detail:
+BookService._get_book_or_404 followed by ReviewRepository.get_aggregates.
+"after" is BookService.get_book_detail (BookRepository.get_detail), which also
+returns the genre name. Caches are bypassed. Run with:
+    poetry run python scripts/bench_book_detail.py [--book-id N] [--iterations 500] [--reviews 5]
+
+Defaults to the book with the most reviews.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+
+async def _time(fn: Callable[[], Awaitable[object]], iterations: int) -> list[float]:
+    await fn()  # warm up connection and statement caches
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    q = statistics.quantiles(samples, n=20)
+    print(
+        f"{label:<22} mean {statistics.fmean(samples):6.3f} ms   "
+        f"p50 {statistics.median(samples):6.3f} ms   p95 {q[18]:6.3f} ms"
+    )
+
+
+async def run_benchmark(book_id: int | None, iterations: int, reviews: int) -> None:
+    from sqlalchemy import func, select
+
+    from app.books.models import Book
+    from app.books.repository import BookRepository, GenreRepository
+    from app.books.service import BookService
+    from app.db.session import AsyncSessionLocal
+    from app.reviews.models import BookRatingStats
+    from app.reviews.repository import ReviewRepository
+    from app.users.models import User  # noqa: F401  (resolves Review.user)
+
+    async with AsyncSessionLocal() as session:
+        if book_id is None:
+            book_id = await session.scalar(
+                select(BookRatingStats.book_id)
+                .order_by(BookRatingStats.review_count.desc())
+                .limit(1)
+            ) or await session.scalar(select(func.min(Book.id)))
+        if book_id is None:
+            print("no books to benchmark")
+            return
+        service = BookService(BookRepository(session), GenreRepository(session))
+        review_repo = ReviewRepository(session)
+
+        async def before() -> None:
+            book = await service._get_book_or_404(book_id)
+            await review_repo.get_aggregates(book.id)
+            session.expunge_all()  # measure the query, not the identity map
+
+        async def after() -> None:
+            await service.get_book_detail(book_id)
+
+        async def after_reviews() -> None:
+            await service.get_book_detail(book_id, reviews=reviews)
+
+        print(f"book_id={book_id}, {iterations} iterations")
+        _report("before (2 queries)", await _time(before, iterations))
+        _report("after (1 statement)", await _time(after, iterations))
+        _report(f"after + {reviews} reviews", await _time(after_reviews, iterations))
+        await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--book-id", type=int, help="book to load (default: most reviewed)"
+    )
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument(
+        "--reviews", type=int, default=5, help="reviews to embed in the third run"
+    )
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.book_id, args.iterations, args.reviews))
+
+
+if __name__ == "__main__":
+    main()
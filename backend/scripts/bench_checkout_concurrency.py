@@ -0,0 +1,155 @@
+"""Benchmark concurrent checkouts of one popular title per CHECKOUT_STOCK_MODE.
+
+Every buyer has the same book in their cart and checks out at the same time,
+each in its own session and transaction, against a payment gateway that takes
+--payment-ms to answer. In "lock" and "atomic" mode the book row stays locked
+while the gateway runs, so checkouts of the title queue behind each other; in
+"reserve" mode the lock is released before payment. Run with:
+    poetry run python scripts/bench_checkout_concurrency.py [--buyers 10] [--payment-ms 200]
+
+Creates its own book and users and deletes them (and their orders) afterwards.
+Keep --buyers within the engine pool (pool_size + max_overflow).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from decimal import Decimal
+
+EMAIL_DOMAIN = "checkout-bench.invalid"
+
+
+class SlowPaymentService:
+    """Always approves, after a fixed gateway delay."""
+
+    def __init__(self, delay_seconds: float) -> None:
+        self.delay_seconds = delay_seconds
+
+    async def charge(self, *, force_fail: bool = False) -> bool:
+        await asyncio.sleep(self.delay_seconds)
+        return not force_fail
+
+    async def refund(self) -> None:
+        return None
+
+
+async def _seed(buyers: int, stock: int) -> tuple[int, list[int]]:
+    from app.books.models import Book
+    from app.cart.models import Cart
+    from app.db.session import AsyncSessionLocal
+    from app.users.models import User
+
+    async with AsyncSessionLocal() as session:
+        book = Book(
+            title="Checkout Bench",
+            author="Bench",
+            price=Decimal("10.00"),
+            stock_quantity=stock,
+        )
+        users = [
+            User(email=f"buyer{i}@{EMAIL_DOMAIN}", hashed_password="!")
+            for i in range(buyers)
+        ]
+        session.add(book)
+        session.add_all(users)
+        await session.flush()
+        session.add_all(Cart(user_id=user.id) for user in users)
+        await session.commit()
+        return book.id, [user.id for user in users]
+
+
+async def _fill_carts(book_id: int, user_ids: list[int]) -> None:
+    from sqlalchemy import delete, select
+
+    from app.cart.models import Cart, CartItem
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        carts = (
+            await session.scalars(select(Cart).where(Cart.user_id.in_(user_ids)))
+        ).all()
+        await session.execute(delete(CartItem).where(CartItem.book_id == book_id))
+        session.add_all(
+            CartItem(cart_id=cart.id, book_id=book_id, quantity=1) for cart in carts
+        )
+        await session.commit()
+
+
+async def _checkout(user_id: int, mode: str, delay_seconds: float) -> float:
+    from app.cart.repository import CartRepository
+    from app.db.session import AsyncSessionLocal
+    from app.orders.repository import OrderRepository
+    from app.orders.schemas import CheckoutRequest
+    from app.orders.service import OrderService
+
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        service = OrderService(
+            order_repo=OrderRepository(session),
+            cart_repo=CartRepository(session),
+            payment_service=SlowPaymentService(delay_seconds),
+            stock_mode=mode,
+        )
+        await service.checkout(user_id, CheckoutRequest())
+        await session.commit()
+    return (time.perf_counter() - start) * 1000
+
+
+async def _cleanup(book_id: int) -> None:
+    from sqlalchemy import delete, select
+
+    from app.books.models import Book
+    from app.db.session import AsyncSessionLocal
+    from app.orders.models import Order
+    from app.users.models import User
+
+    async with AsyncSessionLocal() as session:
+        user_ids = select(User.id).where(User.email.like(f"%@{EMAIL_DOMAIN}"))
+        await session.execute(delete(Order).where(Order.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+        await session.execute(delete(Book).where(Book.id == book_id))
+        await session.commit()
+
+
+async def run_benchmark(buyers: int, payment_ms: float, rounds: int) -> None:
+    modes = ("lock", "atomic", "reserve")
+    book_id, user_ids = await _seed(buyers, stock=buyers * rounds * len(modes))
+    try:
+        print(
+            f"{buyers} concurrent buyers, payment {payment_ms:.0f} ms, {rounds} round(s)"
+        )
+        for mode in modes:
+            latencies: list[float] = []
+            wall = 0.0
+            for _ in range(rounds):
+                await _fill_carts(book_id, user_ids)
+                start = time.perf_counter()
+                latencies += await asyncio.gather(
+                    *(
+                        _checkout(user_id, mode, payment_ms / 1000)
+                        for user_id in user_ids
+                    )
+                )
+                wall += time.perf_counter() - start
+            q = statistics.quantiles(latencies, n=20)
+            print(
+                f"{mode:<8} {len(latencies) / wall:7.1f} checkouts/s   "
+                f"p50 {statistics.median(latencies):7.1f} ms   p95 {q[18]:7.1f} ms   "
+                f"max {max(latencies):7.1f} ms"
+            )
+    finally:
+        await _cleanup(book_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--buyers", type=int, default=10)
+    parser.add_argument("--payment-ms", type=float, default=200.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.buyers, args.payment_ms, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
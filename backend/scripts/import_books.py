@@ -0,0 +1,70 @@
+"""Bulk-import a book catalog from a CSV or NDJSON file.
+
+Same pipeline as POST /admin/books/import (app/books/importer.py): rows are
+COPYed into a staging table and upserted by ISBN in one statement. Run with:
+    poetry run python scripts/import_books.py catalog.csv [--create-genres] [--dry-run]
+
+Exits with status 1 when any row was rejected.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+
+async def run_import(path: Path, fmt: str, create_genres: bool, dry_run: bool) -> int:
+    """Import the file (rolled back when dry_run); return the number of rejected rows."""
+    from app.books.importer import import_catalog
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        with path.open(encoding="utf-8-sig", newline="") as stream:
+            report = await import_catalog(
+                session, stream, fmt, create_genres=create_genres
+            )
+
+        for error in report.errors:
+            field = f" [{error.field}]" if error.field else ""
+            print(f"row {error.row}{field}: {error.message}")
+        if report.errors_truncated:
+            print("... more rejected rows not listed")
+
+        if dry_run:
+            await session.rollback()
+        else:
+            await session.commit()
+
+    action = "dry run, nothing written" if dry_run else "committed"
+    print(
+        f"{report.rows} row(s): {report.inserted} inserted, {report.updated} updated, "
+        f"{report.rejected} rejected, {report.genres_created} genre(s) created ({action})"
+    )
+    return report.rejected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="CSV (with header) or NDJSON file")
+    parser.add_argument(
+        "--format",
+        choices=("csv", "ndjson"),
+        help="file format (default: from the extension; .csv, .ndjson or .jsonl)",
+    )
+    parser.add_argument(
+        "--create-genres",
+        action="store_true",
+        help="create genres named in the file that do not exist yet",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="validate and report without writing"
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    rejected = asyncio.run(run_import(args.path, fmt, args.create_genres, args.dry_run))
+    sys.exit(1 if rejected else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Rebuild book_rating_stats from the reviews table.
+
+Reports every book whose stored counters disagree with its live (non-deleted)
+reviews, then rewrites those rows. Run with:
+    poetry run python scripts/reconcile_rating_stats.py [--dry-run]
+
+Exits with status 1 when drift was found, so it can double as a health check.
+"""
+
+import argparse
+import asyncio
+import sys
+
+
+async def reconcile(dry_run: bool) -> int:
+    """Compare and (unless dry_run) repair stats; return the number of drifted books."""
+    from app.db.session import AsyncSessionLocal
+    from app.reviews.repository import ReviewRepository
+
+    async with AsyncSessionLocal() as session:
+        repo = ReviewRepository(session)
+        report = await repo.reconcile_rating_stats(apply=not dry_run)
+
+        for entry in report:
+            changed = {
+                field: (entry["stored"][field], expected)
+                for field, expected in entry["expected"].items()
+                if entry["stored"][field] != expected
+            }
+            details = ", ".join(
+                f"{field}: {stored} -> {expected}"
+                for field, (stored, expected) in changed.items()
+            )
+            print(f"book_id={entry['book_id']}: {details}")
+
+        if dry_run:
+            await session.rollback()
+        else:
+            await session.commit()
+
+    action = "found (dry run, nothing written)" if dry_run else "repaired"
+    print(f"{len(report)} drifted book(s) {action}")
+    return len(report)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report drift without writing"
+    )
+    args = parser.parse_args()
+
+    drifted = asyncio.run(reconcile(args.dry_run))
+    sys.exit(1 if drifted else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Refresh the "also bought" co-purchase index from confirmed orders.
+
+Same step the app runs every COPURCHASE_REFRESH_SECONDS (app/books/copurchase.py),
+for cron or a one-off rebuild. Run with:
+    poetry run python scripts/refresh_copurchase.py [--full]
+
+--full recounts every order and re-ranks every book.
+"""
+
+import argparse
+import asyncio
+
+
+async def run_refresh(full: bool) -> None:
+    from app.books.copurchase import refresh_copurchase
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        result = await refresh_copurchase(session, full=full)
+        await session.commit()
+
+    if result is None:
+        print("another refresh is running; nothing done")
+        return
+    print(
+        f"{result.orders} order(s) counted, {result.books} book(s) re-ranked, "
+        f"high-water mark at order {result.last_order_id}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="recount all orders instead of only new ones",
+    )
+    args = parser.parse_args()
+    asyncio.run(run_refresh(args.full))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Refresh the daily sales rollup from confirmed orders.
+
+Same step the app runs every SALES_ROLLUP_REFRESH_SECONDS (app/admin/sales_rollup.py),
+for cron or a one-off rebuild. Run with:
+    poetry run python scripts/refresh_sales_rollup.py [--full]
+
+--full rebuilds the rollup from the first order.
+"""
+
+import argparse
+import asyncio
+
+
+async def run_refresh(full: bool) -> None:
+    from app.admin.sales_rollup import refresh_sales_rollup
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        result = await refresh_sales_rollup(session, full=full)
+        await session.commit()
+
+    if result is None:
+        print("another refresh is running; nothing done")
+        return
+    print(
+        f"{result.orders} order(s) rolled up into {result.rows} book-day row(s), "
+        f"high-water mark at order {result.last_order_id}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="rebuild from all orders instead of only new ones",
+    )
+    args = parser.parse_args()
+    asyncio.run(run_refresh(args.full))
+
+
+if __name__ == "__main__":
+    main()
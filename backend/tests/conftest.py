@@ -4,6 +4,8 @@ Provides three fixtures used by every test module:
   - test_engine: Session-scoped async engine that creates/drops tables once per session
   - db_session: Function-scoped async session that rolls back after each test
   - client: Function-scoped httpx AsyncClient wired to the FastAPI app with DB override
+  - _clear_catalog_cache: autouse; empties the catalog cache and suggestion index around each test
+  - statements: SQL statements sent to the database during the test, for round-trip checks
 
 Email fixtures:
   - mail_config: ConnectionConfig with SUPPRESS_SEND=1 for test email capture
@@ -16,8 +18,11 @@ from pathlib import Path
 import pytest_asyncio
 from fastapi_mail import ConnectionConfig, FastMail
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.books.suggest import suggestion_index
+from app.core.cache import catalog_cache
 from app.core.deps import get_db
 from app.db.base import Base
 from app.email.service import EmailService
@@ -46,23 +51,52 @@ async def test_engine():
     await engine.dispose()
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def _clear_catalog_cache():
+    """Empty process-local catalog state so entries never outlive a test's rollback."""
+    catalog_cache.clear()
+    suggestion_index.clear()
+    yield
+    catalog_cache.clear()
+    suggestion_index.clear()
+
+
 @pytest_asyncio.fixture
 async def db_session(test_engine):
     """Yield a per-test async session that rolls back after each test.
 
-    Each test gets an isolated session. After the test, the session is
-    rolled back so no test data leaks between tests.
+    Each test gets an isolated session bound to a connection whose outer
+    transaction is rolled back after the test, so no test data leaks between
+    tests. Code under test may commit (e.g. checkout commits its stock
+    reservation): with join_transaction_mode="create_savepoint" commits and
+    rollbacks only end savepoints inside that outer transaction.
     """
-    test_session_local = async_sessionmaker(
-        test_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
-    async with test_session_local() as session:
-        yield session
-        await session.rollback()
+    async with test_engine.connect() as connection:
+        transaction = await connection.begin()
+        test_session_local = async_sessionmaker(
+            bind=connection,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+        async with test_session_local() as session:
+            yield session
+        await transaction.rollback()
+
+
+@pytest_asyncio.fixture
+def statements(test_engine):
+    """Collect SQL statements executed during the test."""
+    captured: list[str] = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_execute)
+    yield captured
+    event.remove(test_engine.sync_engine, "before_cursor_execute", before_execute)
 
 
 @pytest_asyncio.fixture
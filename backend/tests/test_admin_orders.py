@@ -0,0 +1,198 @@
+"""Tests for GET /admin/orders filters and paging, and GET /admin/orders/export.
+
+Coverage:
+  - status, user_id, created_at range and book_id filters (combined with AND)
+  - keyset pages newest first with user_id on every order
+  - NDJSON export: one line per order item, filtered, streamed in partitions
+  - CSV export header; deleted books keep their title snapshot
+  - admin-only access
+"""
+
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.core.security import hash_password
+from app.orders import exporter
+from app.orders.models import Order, OrderItem, OrderStatus
+from app.users.models import User
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    repo = UserRepository(db_session)
+    user = await repo.create(
+        email="admin_orders@example.com",
+        hashed_password=await hash_password("adminorders1"),
+    )
+    await repo.set_role_admin(user.id)
+    await db_session.flush()
+    resp = await client.post(
+        "/auth/login",
+        json={"email": "admin_orders@example.com", "password": "adminorders1"},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def placed(db_session: AsyncSession) -> dict:
+    """Two buyers, two books, four orders; orders[0] is ten days old."""
+    repo = UserRepository(db_session)
+    alice = await repo.create(email="admin_orders_a@example.com", hashed_password="x")
+    bob = await repo.create(email="admin_orders_b@example.com", hashed_password="x")
+    books = [
+        Book(title="Ledger One", author="L", price=Decimal("4.00")),
+        Book(title="Ledger Two", author="L", price=Decimal("6.50")),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+
+    def line(book: Book, quantity: int = 1) -> OrderItem:
+        return OrderItem(
+            book_id=book.id,
+            quantity=quantity,
+            unit_price=book.price,
+            title=book.title,
+            author=book.author,
+        )
+
+    def order(user: User, *items: OrderItem, **kwargs) -> Order:
+        return Order(
+            user_id=user.id,
+            items=list(items),
+            total_amount=sum(i.unit_price * i.quantity for i in items),
+            item_count=len(items),
+            **kwargs,
+        )
+
+    orders = [
+        order(alice, line(books[0]), line(books[1], 2)),
+        order(alice, line(books[1])),
+        order(bob, line(books[0], 3)),
+        order(bob, line(books[1]), status=OrderStatus.PAYMENT_FAILED),
+    ]
+    db_session.add_all(orders)
+    await db_session.flush()
+    now = await db_session.scalar(select(func.now()))
+    await db_session.execute(
+        update(Order)
+        .where(Order.id == orders[0].id)
+        .values(created_at=now - timedelta(days=10))
+    )
+    return {"users": (alice, bob), "books": books, "orders": orders, "now": now}
+
+
+async def _ids(client: AsyncClient, headers: dict, **params) -> list[int]:
+    resp = await client.get("/admin/orders", params=params, headers=headers)
+    assert resp.status_code == 200, resp.json()
+    return [o["id"] for o in resp.json()["items"]]
+
+
+async def test_admin_orders_filters(
+    client: AsyncClient, admin_headers: dict, placed: dict
+) -> None:
+    (alice, bob), books, orders = placed["users"], placed["books"], placed["orders"]
+    ids = [o.id for o in orders]
+
+    assert await _ids(client, admin_headers, user_id=alice.id) == [ids[1], ids[0]]
+    assert await _ids(client, admin_headers, user_id=bob.id, status="confirmed") == [
+        ids[2]
+    ]
+    assert await _ids(client, admin_headers, status="payment_failed") == [ids[3]]
+    assert await _ids(client, admin_headers, book_id=books[0].id) == [ids[2], ids[0]]
+    since = (placed["now"] - timedelta(days=1)).isoformat()
+    assert await _ids(client, admin_headers, user_id=alice.id, created_from=since) == [
+        ids[1]
+    ]
+    assert await _ids(client, admin_headers, book_id=books[0].id, created_to=since) == [
+        ids[0]
+    ]
+
+
+async def test_admin_orders_pages_with_cursor(
+    client: AsyncClient, admin_headers: dict, placed: dict
+) -> None:
+    orders = placed["orders"]
+    params = {"book_id": placed["books"][1].id, "size": 2}
+    first = await client.get("/admin/orders", params=params, headers=admin_headers)
+    body = first.json()
+    assert [o["id"] for o in body["items"]] == [orders[3].id, orders[1].id]
+    assert body["items"][0]["user_id"] == placed["users"][1].id
+    assert body["has_more"] is True
+
+    second = await client.get(
+        "/admin/orders",
+        params={**params, "cursor": body["next_cursor"]},
+        headers=admin_headers,
+    )
+    assert [o["id"] for o in second.json()["items"]] == [orders[0].id]
+    assert second.json()["next_cursor"] is None
+
+    sparse = await client.get(
+        "/admin/orders",
+        params={**params, "fields": "user_id,total_price"},
+        headers=admin_headers,
+    )
+    assert sparse.json()["items"][1] == {
+        "id": orders[1].id,
+        "user_id": placed["users"][0].id,
+        "total_price": "6.50",
+    }
+
+
+async def test_export_ndjson_lines(
+    client: AsyncClient, admin_headers: dict, placed: dict, monkeypatch
+) -> None:
+    monkeypatch.setattr(exporter, "EXPORT_BATCH_ROWS", 1)  # one cursor fetch per row
+    alice = placed["users"][0]
+    orders = placed["orders"]
+    resp = await client.get(
+        "/admin/orders/export", params={"user_id": alice.id}, headers=admin_headers
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [(r["order_id"], r["title"], r["quantity"]) for r in rows] == [
+        (orders[1].id, "Ledger Two", 1),
+        (orders[0].id, "Ledger One", 1),
+        (orders[0].id, "Ledger Two", 2),
+    ]
+    assert (rows[0]["user_id"], rows[0]["status"], rows[0]["unit_price"]) == (
+        alice.id,
+        "confirmed",
+        "6.50",
+    )
+
+
+async def test_export_csv(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict, placed: dict
+) -> None:
+    book = placed["books"][0]
+    await db_session.delete(book)  # its order line keeps the title snapshot
+    await db_session.flush()
+
+    resp = await client.get(
+        "/admin/orders/export",
+        params={"format": "csv", "user_id": placed["users"][1].id},
+        headers=admin_headers,
+    )
+    assert resp.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [(r["status"], r["book_id"], r["title"], r["quantity"]) for r in rows] == [
+        ("payment_failed", str(placed["books"][1].id), "Ledger Two", "1"),
+        ("confirmed", "", "Ledger One", "3"),
+    ]
+
+
+async def test_admin_orders_export_requires_admin(client: AsyncClient) -> None:
+    assert (await client.get("/admin/orders/export")).status_code == 401
@@ -16,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.books.models import Book
 from app.core.security import hash_password
 from app.orders.models import Order, OrderItem, OrderStatus
+from app.orders.repository import OrderRepository
 from app.users.models import User
 from app.users.repository import UserRepository
 
@@ -112,6 +113,9 @@ async def agg_purchased_book(
     )
     db_session.add(item)
     await db_session.flush()
+    await OrderRepository(db_session).record_purchases(
+        agg_user.id, [agg_book.id], order.id
+    )
     return agg_book
 
 
@@ -137,6 +141,9 @@ async def agg_purchased_book_user2(
     )
     db_session.add(item)
     await db_session.flush()
+    await OrderRepository(db_session).record_purchases(
+        agg_user2.id, [agg_book.id], order.id
+    )
     return agg_book
 
 
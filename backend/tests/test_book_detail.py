@@ -0,0 +1,171 @@
+"""Tests for the single-statement GET /books/{id} (BookRepository.get_detail).
+
+Coverage:
+  - book, genre name and rating aggregates in one query after the ETag probe
+  - reviews=N embeds the newest live reviews (LEFT JOIN LATERAL)
+  - sparse fields reach genre_name / recent_reviews
+  - text-only review edits refresh a cached detail and its ETag
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book, Genre
+from app.reviews.models import Review
+from app.reviews.repository import ReviewRepository
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def detail_book(db_session: AsyncSession) -> Book:
+    genre = Genre(name="Detail Genre")
+    db_session.add(genre)
+    await db_session.flush()
+    book = Book(
+        title="Detail Book",
+        author="Author",
+        price=Decimal("12.50"),
+        isbn="9780306406157",
+        genre_id=genre.id,
+        stock_quantity=3,
+    )
+    db_session.add(book)
+    await db_session.flush()
+    return book
+
+
+@pytest_asyncio.fixture
+async def reviews(db_session: AsyncSession, detail_book: Book) -> list[Review]:
+    """Three reviews, oldest first; the newest one is soft-deleted."""
+    users = UserRepository(db_session)
+    repo = ReviewRepository(db_session)
+    created = []
+    for i, rating in enumerate((5, 2, 4)):
+        user = await users.create(
+            email=f"detail_reader{i}@example.com", hashed_password="x"
+        )
+        created.append(
+            await repo.create(user.id, detail_book.id, rating=rating, text=f"r{i}")
+        )
+    base = datetime.now(UTC) - timedelta(days=1)
+    for i, review in enumerate(created):
+        await db_session.execute(
+            update(Review)
+            .where(Review.id == review.id)
+            .values(created_at=base + timedelta(hours=i))
+        )
+    await repo.soft_delete(created[2])
+    return created
+
+
+async def test_detail_single_query(
+    client: AsyncClient, detail_book: Book, reviews: list[Review], statements: list[str]
+) -> None:
+    statements.clear()
+    resp = await client.get(f"/books/{detail_book.id}")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(statements) == 2  # ETag version probe + the detail statement
+
+    assert body == {
+        "id": detail_book.id,
+        "title": "Detail Book",
+        "author": "Author",
+        "price": "12.50",
+        "isbn": "9780306406157",
+        "genre_id": detail_book.genre_id,
+        "description": None,
+        "cover_image_url": None,
+        "publish_date": None,
+        "stock_quantity": 3,
+        "genre_name": "Detail Genre",
+        "avg_rating": 3.5,
+        "review_count": 2,
+        "recent_reviews": None,
+        "in_stock": True,
+    }
+
+
+async def test_detail_recent_reviews(
+    client: AsyncClient, detail_book: Book, reviews: list[Review], statements: list[str]
+) -> None:
+    statements.clear()
+    body = (await client.get(f"/books/{detail_book.id}", params={"reviews": 5})).json()
+    assert len(statements) == 2
+    assert [
+        (r["id"], r["display_name"], r["rating"]) for r in body["recent_reviews"]
+    ] == [
+        (reviews[1].id, "detail_reader1", 2),
+        (reviews[0].id, "detail_reader0", 5),
+    ]
+
+    body = (await client.get(f"/books/{detail_book.id}", params={"reviews": 1})).json()
+    assert [r["text"] for r in body["recent_reviews"]] == ["r1"]
+
+    resp = await client.get(f"/books/{detail_book.id}", params={"reviews": 11})
+    assert resp.status_code == 422
+
+
+async def test_detail_no_reviews(client: AsyncClient, db_session: AsyncSession) -> None:
+    book = Book(title="Lonely", author="Author", price=Decimal("1.00"))
+    db_session.add(book)
+    await db_session.flush()
+    body = (await client.get(f"/books/{book.id}", params={"reviews": 3})).json()
+    assert (body["genre_name"], body["avg_rating"], body["recent_reviews"]) == (
+        None,
+        None,
+        [],
+    )
+
+    resp = await client.get("/books/999999", params={"reviews": 3})
+    assert resp.status_code == 404
+
+
+async def test_detail_sparse_fields(
+    client: AsyncClient, detail_book: Book, reviews: list[Review]
+) -> None:
+    resp = await client.get(
+        f"/books/{detail_book.id}",
+        params={"fields": "genre_name,in_stock,recent_reviews", "reviews": 1},
+    )
+    body = resp.json()
+    assert set(body) == {"id", "genre_name", "in_stock", "recent_reviews"}
+    assert (body["genre_name"], body["in_stock"]) == ("Detail Genre", True)
+    assert [r["id"] for r in body["recent_reviews"]] == [reviews[1].id]
+
+    # reviews= is ignored unless recent_reviews is selected
+    body = (
+        await client.get(
+            f"/books/{detail_book.id}", params={"fields": "title", "reviews": 3}
+        )
+    ).json()
+    assert body == {"id": detail_book.id, "title": "Detail Book"}
+
+
+async def test_review_text_edit_refreshes_detail(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    detail_book: Book,
+    reviews: list[Review],
+) -> None:
+    url = f"/books/{detail_book.id}"
+    first = await client.get(url, params={"reviews": 2})
+    etag = first.headers["ETag"]
+
+    await ReviewRepository(db_session).update(reviews[1], text="edited")
+    # now() is frozen inside the test transaction; stamp the edit as a later one would
+    await db_session.execute(
+        update(Review)
+        .where(Review.id == reviews[1].id)
+        .values(updated_at=datetime.now(UTC) + timedelta(seconds=1))
+    )
+
+    resp = await client.get(url, params={"reviews": 2}, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert resp.json()["recent_reviews"][0]["text"] == "edited"
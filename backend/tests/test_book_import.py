@@ -0,0 +1,206 @@
+"""Tests for POST /admin/books/import (COPY staging + ISBN upsert).
+
+Coverage:
+  - CSV insert with genre resolution by name, per-row validation errors
+  - ISBN upsert: updates keep stock and non-empty fields, last duplicate wins
+  - unknown genres rejected, or created with create_genres=true
+  - NDJSON input, malformed lines
+  - whole-file errors (header, format) and admin-only access
+  - updated books are dropped from the catalog cache
+"""
+
+import json
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book, Genre
+from app.core.security import hash_password
+from app.users.repository import UserRepository
+
+CSV_HEADER = "title,author,price,isbn,genre,description,stock_quantity\n"
+
+
+@pytest_asyncio.fixture
+async def admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    repo = UserRepository(db_session)
+    user = await repo.create(
+        email="import_admin@example.com",
+        hashed_password=await hash_password("importpass1"),
+    )
+    await repo.set_role_admin(user.id)
+    await db_session.flush()
+    resp = await client.post(
+        "/auth/login",
+        json={"email": "import_admin@example.com", "password": "importpass1"},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def fantasy(db_session: AsyncSession) -> Genre:
+    genre = Genre(name="Import Fantasy")
+    db_session.add(genre)
+    await db_session.flush()
+    return genre
+
+
+async def _import(
+    client: AsyncClient,
+    headers: dict,
+    content: str,
+    filename: str = "books.csv",
+    **params,
+):
+    return await client.post(
+        "/admin/books/import",
+        params=params,
+        files={"file": (filename, content.encode(), "application/octet-stream")},
+        headers=headers,
+    )
+
+
+async def _book(db_session: AsyncSession, isbn: str) -> Book | None:
+    return await db_session.scalar(
+        select(Book).where(Book.isbn == isbn).execution_options(populate_existing=True)
+    )
+
+
+async def test_import_csv_inserts_and_reports(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict, fantasy: Genre
+) -> None:
+    content = CSV_HEADER + (
+        "The Hobbit,J.R.R. Tolkien,14.99,978-0-547-92822-7,Import Fantasy,Dragons,5\n"
+        "No Price,Someone,,,,,\n"
+        "Bad ISBN,Someone,5.00,12345,,,\n"
+        '"Quoted, title",Author,7.5,,,"multi\nline",\n'
+    )
+    resp = await _import(client, admin_headers, content)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (
+        report["rows"],
+        report["inserted"],
+        report["updated"],
+        report["rejected"],
+    ) == (
+        4,
+        2,
+        0,
+        2,
+    )
+    assert [(e["row"], e["field"]) for e in report["errors"]] == [
+        (2, "price"),
+        (3, "isbn"),
+    ]
+    assert report["errors_truncated"] is False
+
+    hobbit = await _book(db_session, "9780547928227")
+    assert hobbit.genre_id == fantasy.id
+    assert hobbit.stock_quantity == 5 and hobbit.price == Decimal("14.99")
+    quoted = await db_session.scalar(select(Book).where(Book.title == "Quoted, title"))
+    assert quoted.description == "multi\nline" and quoted.stock_quantity == 0
+
+
+async def test_import_upserts_by_isbn(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict, fantasy: Genre
+) -> None:
+    db_session.add(
+        Book(
+            title="Old",
+            author="Old Author",
+            price=Decimal("1.00"),
+            isbn="9780306406157",
+            description="keep me",
+            stock_quantity=9,
+            genre_id=fantasy.id,
+        )
+    )
+    await db_session.flush()
+
+    content = CSV_HEADER + (
+        "First,New Author,3.00,9780306406157,,,1\n"
+        "Second,New Author,4.00,978-0-306-40615-7,,,2\n"
+    )
+    report = (await _import(client, admin_headers, content)).json()
+    assert (report["inserted"], report["updated"], report["rejected"]) == (0, 1, 1)
+    assert report["errors"][0]["row"] == 1
+    assert "superseded by row 2" in report["errors"][0]["message"]
+
+    book = await _book(db_session, "9780306406157")
+    assert (book.title, book.price) == ("Second", Decimal("4.00"))
+    assert book.description == "keep me"
+    assert book.genre_id == fantasy.id
+    assert book.stock_quantity == 9
+
+
+async def test_import_unknown_genre(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+) -> None:
+    content = CSV_HEADER + "Genreless,Author,5.00,,Import Poetry,,\n"
+    report = (await _import(client, admin_headers, content)).json()
+    assert report["rejected"] == 1
+    assert report["errors"][0]["message"] == "Unknown genre: Import Poetry"
+
+    report = (
+        await _import(client, admin_headers, content, create_genres="true")
+    ).json()
+    assert (report["inserted"], report["genres_created"]) == (1, 1)
+    genre = await db_session.scalar(select(Genre).where(Genre.name == "Import Poetry"))
+    book = await db_session.scalar(select(Book).where(Book.title == "Genreless"))
+    assert book.genre_id == genre.id
+
+
+async def test_import_ndjson(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+) -> None:
+    lines = [
+        json.dumps(
+            {"title": "Json Book", "author": "A", "price": "9.99", "isbn": "0306406152"}
+        ),
+        "",
+        "{not json",
+        json.dumps(["not", "an", "object"]),
+    ]
+    resp = await _import(
+        client, admin_headers, "\n".join(lines), filename="feed.ndjson"
+    )
+    report = resp.json()
+    assert (report["rows"], report["inserted"], report["rejected"]) == (3, 1, 2)
+    assert [e["row"] for e in report["errors"]] == [2, 3]
+    assert (await _book(db_session, "0306406152")).title == "Json Book"
+
+
+async def test_import_invalidates_cached_books(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+) -> None:
+    book = Book(title="Cached", author="A", price=Decimal("2.00"), isbn="9780306406157")
+    db_session.add(book)
+    await db_session.flush()
+    assert (await client.get(f"/books/{book.id}")).json()["title"] == "Cached"
+
+    await _import(
+        client, admin_headers, CSV_HEADER + "Renamed,A,2.00,9780306406157,,,\n"
+    )
+    db_session.expunge(book)  # the upsert is plain SQL; drop the stale identity
+    assert (await client.get(f"/books/{book.id}")).json()["title"] == "Renamed"
+
+
+async def test_import_rejects_whole_file(
+    client: AsyncClient, admin_headers: dict
+) -> None:
+    resp = await _import(client, admin_headers, "title,price\nX,1\n")
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "BOOK_IMPORT_INVALID_HEADER"
+
+    resp = await _import(client, admin_headers, "x", filename="books.xlsx")
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "BOOK_IMPORT_FORMAT_UNKNOWN"
+
+
+async def test_import_requires_admin(client: AsyncClient) -> None:
+    resp = await _import(client, {}, CSV_HEADER)
+    assert resp.status_code == 401
@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.books.models import Book
 from app.core.security import hash_password
-from app.reviews.models import Review
+from app.reviews.repository import ReviewRepository
 from app.users.repository import UserRepository
 
 
@@ -180,12 +180,12 @@ class TestBookPriceFilterAndSortDir:
         user2 = await user_repo.create(email="reviewer2@example.com", hashed_password=hashed2)
         await db_session.flush()
 
-        review_a1 = Review(user_id=admin_user.id, book_id=book_a_id, rating=5)
-        review_a2 = Review(user_id=user2.id, book_id=book_a_id, rating=4)
-        review_b1 = Review(user_id=admin_user.id, book_id=book_b_id, rating=2)
-        review_b2 = Review(user_id=user2.id, book_id=book_b_id, rating=2)
-        db_session.add_all([review_a1, review_a2, review_b1, review_b2])
-        await db_session.flush()
+        # Go through ReviewRepository so book_rating_stats is maintained
+        review_repo = ReviewRepository(db_session)
+        await review_repo.create(admin_user.id, book_a_id, rating=5)
+        await review_repo.create(user2.id, book_a_id, rating=4)
+        await review_repo.create(admin_user.id, book_b_id, rating=2)
+        await review_repo.create(user2.id, book_b_id, rating=2)
 
         resp = await client.get(
             f"/books?sort=avg_rating&sort_dir=desc&min_price=7&max_price=13"
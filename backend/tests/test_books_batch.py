@@ -0,0 +1,88 @@
+"""Tests for POST /books/batch.
+
+Coverage:
+  - ids and isbns resolved in request order with not-found markers
+  - ISBN normalization (hyphens) and duplicates preserved
+  - optional rating aggregates
+  - request size validation
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.reviews.repository import ReviewRepository
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def batch_books(db_session: AsyncSession) -> list[Book]:
+    books = [
+        Book(
+            title="Batch A",
+            author="Batch Author",
+            price=Decimal("5.00"),
+            isbn="9780306406157",
+        ),
+        Book(title="Batch B", author="Batch Author", price=Decimal("6.00")),
+        Book(title="Batch C", author="Batch Author", price=Decimal("7.00")),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+async def test_batch_preserves_request_order(
+    client: AsyncClient, batch_books: list[Book]
+) -> None:
+    a, b, c = batch_books
+    resp = await client.post(
+        "/books/batch",
+        json={
+            "ids": [c.id, 999999, a.id, c.id],
+            "isbns": ["978-0-306-40615-7", "0000000000"],
+        },
+    )
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [(i["id"], i["isbn"], i["found"]) for i in items] == [
+        (c.id, None, True),
+        (999999, None, False),
+        (a.id, None, True),
+        (c.id, None, True),
+        (None, "9780306406157", True),
+        (None, "0000000000", False),
+    ]
+    assert items[0]["book"]["title"] == "Batch C"
+    assert items[1]["book"] is None
+    assert items[4]["book"]["id"] == a.id
+    assert items[0]["avg_rating"] is None and items[0]["review_count"] is None
+
+
+async def test_batch_include_ratings(
+    client: AsyncClient, db_session: AsyncSession, batch_books: list[Book]
+) -> None:
+    a, b, _ = batch_books
+    users = UserRepository(db_session)
+    reviews = ReviewRepository(db_session)
+    for i, rating in enumerate((5, 4)):
+        user = await users.create(
+            email=f"batch_rev{i}@example.com", hashed_password="x"
+        )
+        await reviews.create(user.id, a.id, rating=rating)
+
+    resp = await client.post(
+        "/books/batch", json={"ids": [a.id, b.id], "include_ratings": True}
+    )
+    items = resp.json()["items"]
+    assert (items[0]["avg_rating"], items[0]["review_count"]) == (4.5, 2)
+    assert (items[1]["avg_rating"], items[1]["review_count"]) == (None, 0)
+
+
+async def test_batch_size_limits(client: AsyncClient) -> None:
+    assert (await client.post("/books/batch", json={})).status_code == 422
+    resp = await client.post("/books/batch", json={"ids": list(range(1, 302))})
+    assert resp.status_code == 422
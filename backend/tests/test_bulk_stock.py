@@ -0,0 +1,197 @@
+"""Tests for PATCH /admin/books/stock (set-based bulk stock update).
+
+Coverage:
+  - absolute quantities by book_id and deltas by ISBN, old/new in request order
+  - unknown books reported with found=false while the rest apply
+  - 0 -> positive transitions notify waiting pre-bookings (and only those)
+  - negative results and duplicate targets reject the whole batch unchanged
+  - request validation and admin-only access
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.core.security import hash_password
+from app.prebooks.models import PreBooking, PreBookStatus
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    repo = UserRepository(db_session)
+    user = await repo.create(
+        email="bulkstock_admin@example.com",
+        hashed_password=await hash_password("stockpass1"),
+    )
+    await repo.set_role_admin(user.id)
+    await db_session.flush()
+    resp = await client.post(
+        "/auth/login",
+        json={"email": "bulkstock_admin@example.com", "password": "stockpass1"},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def stock_books(db_session: AsyncSession) -> list[Book]:
+    books = [
+        Book(title="Stock A", author="S", price=Decimal("5.00"), stock_quantity=0),
+        Book(
+            title="Stock B",
+            author="S",
+            price=Decimal("5.00"),
+            stock_quantity=4,
+            isbn="9780306406157",
+        ),
+        Book(title="Stock C", author="S", price=Decimal("5.00"), stock_quantity=1),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+async def _quantities(db_session: AsyncSession, books: list[Book]) -> list[int]:
+    rows = await db_session.execute(
+        select(Book.id, Book.stock_quantity).where(Book.id.in_([b.id for b in books]))
+    )
+    by_id = dict(rows.all())
+    return [by_id[b.id] for b in books]
+
+
+async def test_bulk_stock_applies_in_one_batch(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    admin_headers: dict,
+    stock_books: list[Book],
+) -> None:
+    a, b, c = stock_books
+    resp = await client.patch(
+        "/admin/books/stock",
+        json={
+            "items": [
+                {"book_id": a.id, "quantity": 7},
+                {"isbn": "978-0-306-40615-7", "delta": -3},
+                {"book_id": 999999, "quantity": 1},
+                {"book_id": c.id, "delta": 10},
+            ]
+        },
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [
+        (i["book_id"], i["found"], i["old_quantity"], i["new_quantity"]) for i in items
+    ] == [
+        (a.id, True, 0, 7),
+        (b.id, True, 4, 1),
+        (999999, False, None, None),
+        (c.id, True, 1, 11),
+    ]
+    assert await _quantities(db_session, stock_books) == [7, 1, 11]
+    # Instances already in the session see the new quantity without a refresh
+    assert a.stock_quantity == 7
+
+
+async def test_bulk_stock_notifies_only_restocked_books(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    admin_headers: dict,
+    stock_books: list[Book],
+) -> None:
+    a, b, _ = stock_books
+    user = await UserRepository(db_session).create(
+        email="bulkstock_waiter@example.com", hashed_password="x"
+    )
+    db_session.add_all(
+        [
+            PreBooking(user_id=user.id, book_id=a.id, status=PreBookStatus.WAITING),
+            PreBooking(user_id=user.id, book_id=b.id, status=PreBookStatus.WAITING),
+        ]
+    )
+    await db_session.flush()
+
+    resp = await client.patch(
+        "/admin/books/stock",
+        json={
+            "items": [{"book_id": a.id, "delta": 2}, {"book_id": b.id, "quantity": 9}]
+        },
+        headers=admin_headers,
+    )
+    assert resp.json()["notified"] == 1
+    statuses = dict(
+        (
+            await db_session.execute(
+                select(PreBooking.book_id, PreBooking.status).where(
+                    PreBooking.user_id == user.id
+                )
+            )
+        ).all()
+    )
+    assert statuses == {a.id: PreBookStatus.NOTIFIED, b.id: PreBookStatus.WAITING}
+
+
+async def test_bulk_stock_negative_rejects_batch(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    admin_headers: dict,
+    stock_books: list[Book],
+) -> None:
+    a, _, c = stock_books
+    resp = await client.patch(
+        "/admin/books/stock",
+        json={
+            "items": [{"book_id": a.id, "quantity": 5}, {"book_id": c.id, "delta": -2}]
+        },
+        headers=admin_headers,
+    )
+    assert resp.status_code == 409
+    assert resp.json()["code"] == "BOOK_STOCK_NEGATIVE"
+    assert await _quantities(db_session, stock_books) == [0, 4, 1]
+
+
+async def test_bulk_stock_duplicate_target_rejects_batch(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    admin_headers: dict,
+    stock_books: list[Book],
+) -> None:
+    _, b, _ = stock_books
+    resp = await client.patch(
+        "/admin/books/stock",
+        json={
+            "items": [
+                {"book_id": b.id, "quantity": 5},
+                {"isbn": "9780306406157", "delta": 1},
+            ]
+        },
+        headers=admin_headers,
+    )
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "BOOK_STOCK_DUPLICATE"
+    assert await _quantities(db_session, stock_books) == [0, 4, 1]
+
+
+async def test_bulk_stock_validation(client: AsyncClient, admin_headers: dict) -> None:
+    for items in (
+        [],
+        [{"book_id": 1}],
+        [{"book_id": 1, "isbn": "9780306406157", "quantity": 1}],
+        [{"book_id": 1, "quantity": 1, "delta": 1}],
+        [{"book_id": 1, "quantity": -1}],
+    ):
+        resp = await client.patch(
+            "/admin/books/stock", json={"items": items}, headers=admin_headers
+        )
+        assert resp.status_code == 422, items
+
+
+async def test_bulk_stock_requires_admin(client: AsyncClient) -> None:
+    resp = await client.patch(
+        "/admin/books/stock", json={"items": [{"book_id": 1, "quantity": 1}]}
+    )
+    assert resp.status_code == 401
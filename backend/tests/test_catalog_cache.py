@@ -0,0 +1,226 @@
+"""Tests for the process-local catalog cache (app.core.cache) and its invalidation.
+
+Coverage:
+  - TaggedTTLCache: LRU eviction, TTL expiry, tag invalidation, load/invalidate race
+  - GET /books, GET /books/{id}, GET /genres are served from cache on repeat
+  - Admin writes, checkout-style stock changes and review writes drop only the
+    affected entries
+  - GET /admin/cache/catalog exposes counters (admin only)
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.core.cache import TaggedTTLCache, catalog_cache
+from app.core.security import hash_password
+from app.reviews.repository import ReviewRepository
+from app.users.repository import UserRepository
+
+# ---------------------------------------------------------------------------
+# Unit: TaggedTTLCache
+# ---------------------------------------------------------------------------
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_drops_least_recently_used() -> None:
+    cache = TaggedTTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)  # a is now most recent
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry_counts_as_miss() -> None:
+    clock = _Clock()
+    cache = TaggedTTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("k", "v")
+    clock.now = 4.9
+    assert cache.get("k") == (True, "v")
+    clock.now = 5.0
+    assert cache.get("k") == (False, None)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+    assert stats["entries"] == 0
+
+
+def test_invalidate_tags_drops_only_tagged_entries() -> None:
+    cache = TaggedTTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("list", 1, ["books:list", "book:1", "book:2"])
+    cache.set("detail1", 2, ["book:1"])
+    cache.set("detail3", 3, ["book:3"])
+
+    assert cache.invalidate_tags("book:1") == 2
+    assert cache.get("detail3") == (True, 3)
+    assert cache.get("list") == (False, None)
+
+
+async def test_get_or_load_skips_store_when_invalidated_during_load() -> None:
+    cache = TaggedTTLCache(max_entries=10, ttl_seconds=60)
+
+    async def stale_loader() -> str:
+        cache.invalidate_tags("book:1")  # a writer commits while we are loading
+        return "stale"
+
+    assert await cache.get_or_load("k", ["book:1"], stale_loader) == "stale"
+    assert cache.get("k") == (False, None)
+
+
+def test_disabled_cache_stores_nothing() -> None:
+    cache = TaggedTTLCache(max_entries=0, ttl_seconds=60)
+    cache.set("k", "v")
+    assert cache.get("k") == (False, None)
+
+
+# ---------------------------------------------------------------------------
+# Integration fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest_asyncio.fixture
+async def admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    """Create an admin user and return Authorization headers."""
+    repo = UserRepository(db_session)
+    hashed = await hash_password("adminpass123")
+    user = await repo.create(email="cache_admin@example.com", hashed_password=hashed)
+    await repo.set_role_admin(user.id)
+    await db_session.flush()
+    resp = await client.post(
+        "/auth/login",
+        json={"email": "cache_admin@example.com", "password": "adminpass123"},
+    )
+    assert resp.status_code == 200, f"Admin login failed: {resp.json()}"
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def cache_books(db_session: AsyncSession) -> list[Book]:
+    """Two in-stock books."""
+    books = [
+        Book(
+            title=f"Cache Book {i}",
+            author="Cache Author",
+            price=Decimal("10.00"),
+            stock_quantity=5,
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+# ---------------------------------------------------------------------------
+# Integration: hits and invalidation
+# ---------------------------------------------------------------------------
+
+
+async def test_repeat_reads_are_hits_with_normalized_keys(
+    client: AsyncClient, cache_books: list[Book]
+) -> None:
+    """Equivalent parameters (case, price formatting) share one cache entry."""
+    await client.get("/books", params={"author": "Cache", "min_price": "7"})
+    await client.get("/books", params={"author": "cache ", "min_price": "7.00"})
+    await client.get(f"/books/{cache_books[0].id}")
+    await client.get(f"/books/{cache_books[0].id}")
+
+    stats = catalog_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+async def test_stock_change_invalidates_only_affected_entries(
+    client: AsyncClient, admin_headers: dict, cache_books: list[Book]
+) -> None:
+    """PATCH stock drops the book's detail and pages containing it, nothing else."""
+    first, second = cache_books
+    await client.get("/books", params={"author": "cache"})
+    await client.get(f"/books/{first.id}")
+    await client.get(f"/books/{second.id}")
+    await client.get("/genres")
+
+    resp = await client.patch(
+        f"/books/{first.id}/stock", json={"quantity": 0}, headers=admin_headers
+    )
+    assert resp.status_code == 200
+    assert catalog_cache.stats()["entries"] == 2  # second's detail + genres
+
+    detail = (await client.get(f"/books/{first.id}")).json()
+    assert detail["stock_quantity"] == 0
+    listed = (await client.get("/books", params={"author": "cache"})).json()
+    assert {b["id"]: b["stock_quantity"] for b in listed["items"]}[first.id] == 0
+
+
+async def test_book_create_invalidates_list_pages(
+    client: AsyncClient, admin_headers: dict, cache_books: list[Book]
+) -> None:
+    """A new book shows up in a previously cached listing."""
+    before = (await client.get("/books", params={"author": "cache"})).json()
+    resp = await client.post(
+        "/books",
+        json={"title": "Cache Book New", "author": "Cache Author", "price": "3.00"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 201
+    after = (await client.get("/books", params={"author": "cache"})).json()
+    assert after["total"] == before["total"] + 1
+
+
+async def test_genre_create_invalidates_genres(
+    client: AsyncClient, admin_headers: dict
+) -> None:
+    """GET /genres reflects POST /genres immediately."""
+    before = (await client.get("/genres")).json()
+    resp = await client.post(
+        "/genres", json={"name": "Cache Genre"}, headers=admin_headers
+    )
+    assert resp.status_code == 201
+    after = (await client.get("/genres")).json()
+    assert len(after) == len(before) + 1
+
+
+async def test_review_write_invalidates_book_detail(
+    client: AsyncClient, db_session: AsyncSession, cache_books: list[Book]
+) -> None:
+    """Rating aggregates on a cached detail response update after a new review."""
+    book = cache_books[0]
+    assert (await client.get(f"/books/{book.id}")).json()["review_count"] == 0
+
+    user = await UserRepository(db_session).create(
+        email="cache_reviewer@example.com", hashed_password="x"
+    )
+    await ReviewRepository(db_session).create(user.id, book.id, rating=4)
+
+    detail = (await client.get(f"/books/{book.id}")).json()
+    assert detail["review_count"] == 1
+    assert detail["avg_rating"] == 4.0
+
+
+async def test_cache_stats_endpoint_is_admin_only(
+    client: AsyncClient, admin_headers: dict, cache_books: list[Book]
+) -> None:
+    """Counters are exposed to admins and hidden from anonymous callers."""
+    await client.get("/genres")
+    await client.get("/genres")
+
+    assert (await client.get("/admin/cache/catalog")).status_code == 401
+    resp = await client.get("/admin/cache/catalog", headers=admin_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["hits"] == 1
+    assert data["misses"] == 1
+    assert data["hit_ratio"] == 0.5
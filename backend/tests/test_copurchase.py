@@ -0,0 +1,156 @@
+"""Tests for the precomputed "also bought" index (app/books/copurchase.py).
+
+Coverage:
+  - one refresh counts confirmed orders into pair counts, support and lift
+  - GET /books/{id}/also-bought ranking, min-orders cut-off, limit, 404
+  - incremental refresh from the high-water mark re-ranks only touched books
+  - unsettled (very recent) orders wait for the next refresh
+  - full rebuild matches the incremental result
+"""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books import copurchase
+from app.books.copurchase import refresh_copurchase
+from app.books.models import Book, BookCopurchase, BookCopurchaseState
+from app.orders.models import Order, OrderItem, OrderStatus
+from app.users.repository import UserRepository
+
+
+@pytest.fixture(autouse=True)
+def _no_settle_delay(monkeypatch):
+    # Orders created inside the test transaction are stamped with its start time.
+    monkeypatch.setattr(copurchase, "COPURCHASE_SETTLE_SECONDS", 0)
+
+
+@pytest_asyncio.fixture
+async def books(db_session: AsyncSession) -> dict[str, Book]:
+    books = {
+        name: Book(
+            title=f"Copurchase {name}",
+            author="Author",
+            price=Decimal("9.99"),
+            stock_quantity=1,
+        )
+        for name in "ABCD"
+    }
+    db_session.add_all(books.values())
+    await db_session.flush()
+    return books
+
+
+@pytest_asyncio.fixture
+async def place(db_session: AsyncSession, books: dict[str, Book]):
+    user = await UserRepository(db_session).create(
+        email="copurchase_buyer@example.com", hashed_password="x"
+    )
+
+    async def place(names: str, status: OrderStatus = OrderStatus.CONFIRMED) -> Order:
+        order = Order(
+            user_id=user.id,
+            status=status,
+            items=[
+                OrderItem(book_id=books[n].id, quantity=1, unit_price=Decimal("9.99"))
+                for n in names
+            ],
+        )
+        db_session.add(order)
+        await db_session.flush()
+        return order
+
+    return place
+
+
+async def _also_bought(
+    client: AsyncClient, book: Book, **params
+) -> list[tuple[int, int]]:
+    resp = await client.get(f"/books/{book.id}/also-bought", params=params)
+    assert resp.status_code == 200
+    return [(item["id"], item["order_count"]) for item in resp.json()["items"]]
+
+
+async def test_refresh_and_lookup(
+    client: AsyncClient, db_session: AsyncSession, books: dict[str, Book], place
+) -> None:
+    a, b, c, d = books.values()
+    for names in ("ABC", "AB", "AC", "ABD"):
+        await place(names)
+    await place("BC", OrderStatus.PAYMENT_FAILED)
+    assert await _also_bought(client, a) == []
+
+    result = await refresh_copurchase(db_session)
+    assert (result.orders, result.books) == (4, 4)
+
+    # A-D was bought together once only: below COPURCHASE_MIN_ORDERS
+    assert await _also_bought(client, a) == [(b.id, 3), (c.id, 2)]
+    assert await _also_bought(client, a, limit=1) == [(b.id, 3)]
+    assert await _also_bought(client, c) == [(a.id, 2)]
+
+    item = (await client.get(f"/books/{a.id}/also-bought")).json()["items"][0]
+    # 4 orders: A in 4, B in 3, A+B in 3 -> support 0.75, lift 0.75 / (1 * 0.75)
+    assert (item["title"], item["support"], item["lift"], item["in_stock"]) == (
+        "Copurchase B",
+        0.75,
+        1.0,
+        True,
+    )
+
+
+async def test_incremental_refresh(
+    client: AsyncClient, db_session: AsyncSession, books: dict[str, Book], place
+) -> None:
+    a, b, c, d = books.values()
+    for names in ("ABC", "AB", "AC", "ABD"):
+        await place(names)
+    await refresh_copurchase(db_session)
+    a_rows = (
+        await db_session.scalars(
+            select(BookCopurchase).where(BookCopurchase.book_id == a.id)
+        )
+    ).all()
+
+    await place("CD")
+    last = await place("CD")
+    result = await refresh_copurchase(db_session)
+    assert (result.orders, result.books, result.last_order_id) == (2, 2, last.id)
+    state = await db_session.get(BookCopurchaseState, 1, populate_existing=True)
+    assert (state.last_order_id, state.order_count) == (last.id, 6)
+
+    # Tie on count: D (in 3 orders) has the higher lift than A (in 4)
+    assert await _also_bought(client, c) == [(d.id, 2), (a.id, 2)]
+    assert await _also_bought(client, d) == [(c.id, 2)]
+    # A was not in the new orders: its rows were not rewritten
+    assert (
+        await db_session.scalars(
+            select(BookCopurchase).where(BookCopurchase.book_id == a.id)
+        )
+    ).all() == a_rows
+
+    again = await refresh_copurchase(db_session)
+    assert (again.orders, again.books) == (0, 0)
+
+    full = await refresh_copurchase(db_session, full=True)
+    assert (full.orders, full.books) == (6, 4)
+    assert await _also_bought(client, c) == [(d.id, 2), (a.id, 2)]
+    assert await _also_bought(client, a) == [(b.id, 3), (c.id, 2)]
+
+
+async def test_recent_orders_wait_to_settle(
+    db_session: AsyncSession, books: dict[str, Book], place, monkeypatch
+) -> None:
+    monkeypatch.setattr(copurchase, "COPURCHASE_SETTLE_SECONDS", 60)
+    await place("AB")
+    result = await refresh_copurchase(db_session)
+    assert result.orders == 0
+
+
+async def test_also_bought_unknown_book(client: AsyncClient) -> None:
+    resp = await client.get("/books/999999/also-bought")
+    assert resp.status_code == 404
+    assert resp.json()["code"] == "BOOK_NOT_FOUND"
@@ -0,0 +1,348 @@
+"""Integration tests for keyset (cursor) pagination across list endpoints.
+
+Coverage:
+  - Cursor walk over GET /books returns the same rows, in the same order, as page=
+  - Nullable sort keys (publish_date, avg_rating) paginate without gaps or repeats
+  - Tampered cursors and cursors replayed against another sort order return 400
+  - GET /admin/users, ReviewRepository.list_for_book, GET /wishlist accept cursors
+  - total_mode=exact|estimate|none on GET /books, GET /admin/reviews, GET /admin/users
+
+Uses the existing conftest.py async infrastructure:
+  - asyncio_mode = "auto" (no @pytest.mark.asyncio needed)
+  - client / db_session fixtures with per-test rollback
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.core.pagination import count_total
+from app.core.security import hash_password
+from app.reviews.repository import ReviewRepository
+from app.users.repository import UserRepository
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest_asyncio.fixture
+async def admin_headers(client: AsyncClient, db_session: AsyncSession) -> dict:
+    """Create an admin user and return Authorization headers."""
+    repo = UserRepository(db_session)
+    hashed = await hash_password("adminpass123")
+    user = await repo.create(email="cursor_admin@example.com", hashed_password=hashed)
+    await repo.set_role_admin(user.id)
+    await db_session.flush()
+    resp = await client.post(
+        "/auth/login",
+        json={"email": "cursor_admin@example.com", "password": "adminpass123"},
+    )
+    assert resp.status_code == 200, f"Admin login failed: {resp.json()}"
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def catalog(db_session: AsyncSession) -> list[Book]:
+    """Seven books with duplicate prices and some NULL publish dates."""
+    from datetime import date
+
+    books = [
+        Book(
+            title=f"Cursor Book {i}",
+            author="Cursor Author",
+            price=Decimal(price),
+            publish_date=pub,
+        )
+        for i, (price, pub) in enumerate(
+            [
+                ("10.00", date(2020, 1, 1)),
+                ("5.00", None),
+                ("10.00", date(2019, 6, 1)),
+                ("7.50", None),
+                ("5.00", date(2021, 3, 3)),
+                ("10.00", date(2020, 1, 1)),
+                ("12.00", None),
+            ]
+        )
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+async def _walk(client: AsyncClient, url: str, params: dict) -> list[int]:
+    """Follow next_cursor until exhausted; return ids in the order served."""
+    ids: list[int] = []
+    resp = await client.get(url, params=params)
+    assert resp.status_code == 200, resp.json()
+    while True:
+        data = resp.json()
+        ids.extend(item["id"] for item in data["items"])
+        if data["next_cursor"] is None:
+            return ids
+        resp = await client.get(url, params={**params, "cursor": data["next_cursor"]})
+        assert resp.status_code == 200, resp.json()
+
+
+async def _all_ids(client: AsyncClient, params: dict) -> list[int]:
+    """Return ids for the full result set in one large OFFSET page."""
+    resp = await client.get("/books", params={**params, "size": 100})
+    return [item["id"] for item in resp.json()["items"]]
+
+
+# ---------------------------------------------------------------------------
+# GET /books
+# ---------------------------------------------------------------------------
+
+
+async def test_books_cursor_walk_matches_offset_order(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """Every sort/direction yields the same sequence via cursor as via a single page."""
+    for sort in ("title", "price", "date", "created_at", "avg_rating"):
+        for sort_dir in ("asc", "desc"):
+            params = {"sort": sort, "sort_dir": sort_dir, "size": 2}
+            expected = await _all_ids(client, {"sort": sort, "sort_dir": sort_dir})
+            walked = await _walk(client, "/books", params)
+            assert walked == expected, f"{sort} {sort_dir}"
+            assert len(walked) == len(catalog)
+
+
+async def test_books_cursor_with_search_relevance(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """Relevance-ranked (q=) results paginate by (ts_rank, id)."""
+    expected = await _all_ids(client, {"q": "cursor"})
+    walked = await _walk(client, "/books", {"q": "cursor", "size": 3})
+    assert walked == expected
+    assert len(walked) == len(catalog)
+
+
+async def test_books_last_page_has_no_next_cursor(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """A page that reaches the end of the result set returns next_cursor=None."""
+    resp = await client.get("/books", params={"size": 100})
+    assert resp.json()["next_cursor"] is None
+
+    resp = await client.get("/books", params={"size": 3})
+    assert resp.json()["next_cursor"] is not None
+
+
+async def test_books_offset_page_cursor_continues_from_that_page(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """next_cursor from page=2 resumes at what page=3 would return."""
+    page2 = (await client.get("/books", params={"page": 2, "size": 2})).json()
+    page3 = (await client.get("/books", params={"page": 3, "size": 2})).json()
+    via_cursor = (
+        await client.get("/books", params={"size": 2, "cursor": page2["next_cursor"]})
+    ).json()
+    assert [b["id"] for b in via_cursor["items"]] == [b["id"] for b in page3["items"]]
+
+
+async def test_books_tampered_cursor_returns_400(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """A cursor whose signature does not verify is rejected."""
+    cursor = (await client.get("/books", params={"size": 2})).json()["next_cursor"]
+    resp = await client.get("/books", params={"cursor": cursor[:-2] + "xx"})
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "PAGINATION_INVALID_CURSOR"
+
+
+async def test_books_cursor_from_other_sort_returns_400(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """A cursor issued for sort=title cannot be replayed against sort=price."""
+    cursor = (await client.get("/books", params={"size": 2})).json()["next_cursor"]
+    resp = await client.get("/books", params={"sort": "price", "cursor": cursor})
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "PAGINATION_INVALID_CURSOR"
+
+
+# ---------------------------------------------------------------------------
+# Other list endpoints
+# ---------------------------------------------------------------------------
+
+
+async def test_admin_users_cursor_walk(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+) -> None:
+    """GET /admin/users cursor pages cover every user exactly once."""
+    repo = UserRepository(db_session)
+    for i in range(4):
+        await repo.create(email=f"cursor_user{i}@example.com", hashed_password="x")
+    await db_session.flush()
+
+    ids: list[int] = []
+    params: dict = {"per_page": 2}
+    while True:
+        resp = await client.get("/admin/users", params=params, headers=admin_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        ids.extend(u["id"] for u in data["items"])
+        if data["next_cursor"] is None:
+            break
+        params = {"per_page": 2, "cursor": data["next_cursor"]}
+
+    assert len(ids) == len(set(ids)) == data["total_count"] == 5
+
+
+async def test_review_repository_list_for_book_cursor(
+    db_session: AsyncSession, catalog: list[Book]
+) -> None:
+    """list_for_book resumes after the cursor and still unpacks as (items, total)."""
+    user_repo = UserRepository(db_session)
+    review_repo = ReviewRepository(db_session)
+    book = catalog[0]
+    for i in range(5):
+        user = await user_repo.create(
+            email=f"cursor_reviewer{i}@example.com", hashed_password="x"
+        )
+        await review_repo.create(user.id, book.id, rating=(i % 5) + 1)
+
+    all_reviews, total = await review_repo.list_for_book(book.id, size=10)
+    first = await review_repo.list_for_book(book.id, size=3)
+    second = await review_repo.list_for_book(book.id, size=3, cursor=first.next_cursor)
+
+    assert total == 5
+    assert second.next_cursor is None
+    assert [r.id for r in first.items + second.items] == [r.id for r in all_reviews]
+
+
+async def test_wishlist_cursor_is_opt_in(
+    client: AsyncClient, db_session: AsyncSession, catalog: list[Book]
+) -> None:
+    """GET /wishlist returns everything by default and pages only when asked."""
+    repo = UserRepository(db_session)
+    hashed = await hash_password("userpass123")
+    await repo.create(email="cursor_wisher@example.com", hashed_password=hashed)
+    await db_session.flush()
+    login = await client.post(
+        "/auth/login",
+        json={"email": "cursor_wisher@example.com", "password": "userpass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    for book in catalog[:3]:
+        resp = await client.post(
+            "/wishlist", json={"book_id": book.id}, headers=headers
+        )
+        assert resp.status_code == 201
+
+    full = (await client.get("/wishlist", headers=headers)).json()
+    assert len(full["items"]) == 3
+    assert full["next_cursor"] is None
+
+    first = (await client.get("/wishlist", params={"size": 2}, headers=headers)).json()
+    rest = (
+        await client.get(
+            "/wishlist",
+            params={"size": 2, "cursor": first["next_cursor"]},
+            headers=headers,
+        )
+    ).json()
+    assert [i["id"] for i in first["items"] + rest["items"]] == [
+        i["id"] for i in full["items"]
+    ]
+
+
+# ---------------------------------------------------------------------------
+# total_mode
+# ---------------------------------------------------------------------------
+
+
+async def test_books_total_mode_default_is_exact(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """Without total_mode the response carries an exact total and says so."""
+    data = (await client.get("/books", params={"size": 5})).json()
+    assert data["total"] == len(catalog)
+    assert data["total_mode"] == "exact"
+    assert data["has_more"] is True
+
+
+async def test_books_total_mode_none_skips_count(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """total_mode=none returns total=null and relies on has_more."""
+    first = (
+        await client.get("/books", params={"size": 5, "total_mode": "none"})
+    ).json()
+    assert first["total"] is None
+    assert first["total_mode"] == "none"
+    assert first["has_more"] is True
+
+    last = (
+        await client.get("/books", params={"size": 5, "page": 2, "total_mode": "none"})
+    ).json()
+    assert len(last["items"]) == 2
+    assert last["has_more"] is False
+
+
+async def test_books_total_mode_estimate_small_set_is_exact(
+    client: AsyncClient, catalog: list[Book]
+) -> None:
+    """Result sets under the cap are counted exactly even in estimate mode."""
+    data = (await client.get("/books", params={"total_mode": "estimate"})).json()
+    assert data["total"] == len(catalog)
+    assert data["total_mode"] == "exact"
+
+
+async def test_books_total_mode_estimate_uses_planner_above_cap(
+    client: AsyncClient, catalog: list[Book], monkeypatch
+) -> None:
+    """Above the cap, the total comes from EXPLAIN and is flagged as an estimate."""
+    import app.core.pagination as pagination
+
+    monkeypatch.setattr(pagination, "ESTIMATE_EXACT_CAP", 2)
+    data = (
+        await client.get(
+            "/books", params={"total_mode": "estimate", "author": "cursor"}
+        )
+    ).json()
+    assert data["total_mode"] == "estimate"
+    assert data["total"] >= 3
+    assert len(data["items"]) == len(catalog)
+
+
+async def test_estimate_of_whole_table_reads_pg_class(
+    db_session: AsyncSession, catalog: list[Book], statements: list[str], monkeypatch
+) -> None:
+    """An unfiltered, large table is estimated from reltuples, without counting."""
+    import app.core.pagination as pagination
+
+    monkeypatch.setattr(pagination, "ESTIMATE_EXACT_CAP", 2)
+    await db_session.execute(text("ANALYZE books"))
+    statements.clear()
+
+    total, mode = await count_total(db_session, select(Book), "estimate")
+
+    assert (total, mode) == (len(catalog), "estimate")
+    assert not any("count(" in sql or "EXPLAIN" in sql for sql in statements)
+
+
+async def test_admin_lists_accept_total_mode_none(
+    client: AsyncClient, admin_headers: dict
+) -> None:
+    """GET /admin/users and GET /admin/reviews return null totals in none mode."""
+    for url in ("/admin/users", "/admin/reviews"):
+        resp = await client.get(
+            url, params={"total_mode": "none"}, headers=admin_headers
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total_count"] is None
+        assert data["total_pages"] is None
+        assert data["total_mode"] == "none"
+
+
+async def test_invalid_total_mode_returns_422(client: AsyncClient) -> None:
+    """Unknown total_mode values are rejected by validation."""
+    resp = await client.get("/books", params={"total_mode": "approximate"})
+    assert resp.status_code == 422
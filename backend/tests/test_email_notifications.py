@@ -341,6 +341,41 @@ class TestRestockAlertEmail:
                 f"Unexpected subject: {msg['Subject']}"
             )
 
+    async def test_bulk_restock_sends_alerts(
+        self,
+        email_client,
+        enotif_admin_headers,
+        enotif_user_headers,
+        enotif_user2_headers,
+    ):
+        """PATCH /admin/books/stock emails every pre-booker of each restocked book (EMAL-03)."""
+        ac, outbox = email_client
+
+        book1 = await _create_oos_book(ac, enotif_admin_headers, title="Bulk Restock One")
+        book2 = await _create_oos_book(ac, enotif_admin_headers, title="Bulk Restock Two")
+        await ac.post("/prebooks", json={"book_id": book1["id"]}, headers=enotif_user_headers)
+        await ac.post("/prebooks", json={"book_id": book2["id"]}, headers=enotif_user_headers)
+        await ac.post("/prebooks", json={"book_id": book2["id"]}, headers=enotif_user2_headers)
+
+        outbox.clear()
+        resp = await ac.patch(
+            "/admin/books/stock",
+            json={"items": [
+                {"book_id": book1["id"], "quantity": 3},
+                {"book_id": book2["id"], "delta": 12},
+            ]},
+            headers=enotif_admin_headers,
+        )
+
+        assert resp.status_code == 200
+        assert resp.json()["notified"] == 3
+        assert len(outbox) == 3
+        assert sorted(msg["Subject"] for msg in outbox) == [
+            "'Bulk Restock One' is back in stock",
+            "'Bulk Restock Two' is back in stock",
+            "'Bulk Restock Two' is back in stock",
+        ]
+
     async def test_no_restock_email_on_positive_to_positive(
         self,
         email_client,
@@ -0,0 +1,145 @@
+"""Tests for ETag / If-None-Match conditional GETs.
+
+Coverage:
+  - GET /books/{id}: strong ETag, 304 on match (W/ and lists accepted), new ETag
+    after stock or review changes, no ETag on 404
+  - GET /books/{id}/reviews: ETag changes when a review is added or deleted
+  - GET /genres: ETag changes when a genre is created
+  - 304s are decided before the body is built (catalog cache not consulted)
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book, Genre
+from app.core.cache import catalog_cache
+from app.reviews.repository import ReviewRepository
+from app.users.models import User
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def etag_book(db_session: AsyncSession) -> Book:
+    book = Book(
+        title="ETag Book",
+        author="ETag Author",
+        price=Decimal("12.00"),
+        stock_quantity=3,
+    )
+    db_session.add(book)
+    await db_session.flush()
+    return book
+
+
+@pytest_asyncio.fixture
+async def etag_users(db_session: AsyncSession) -> list[User]:
+    repo = UserRepository(db_session)
+    users = [
+        await repo.create(email=f"etag_user{i}@example.com", hashed_password="x")
+        for i in range(2)
+    ]
+    await db_session.flush()
+    return users
+
+
+async def _conditional(client: AsyncClient, url: str, etag: str):
+    return await client.get(url, headers={"If-None-Match": etag})
+
+
+async def test_book_detail_etag_and_304(client: AsyncClient, etag_book: Book) -> None:
+    """A matching If-None-Match yields an empty 304 with the same ETag."""
+    url = f"/books/{etag_book.id}"
+    first = await client.get(url)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    resp = await _conditional(client, url, etag)
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    assert (await _conditional(client, url, f'"other", W/{etag}')).status_code == 304
+    assert (await _conditional(client, url, '"stale"')).status_code == 200
+
+
+async def test_book_detail_304_skips_body(client: AsyncClient, etag_book: Book) -> None:
+    """The 304 path never reaches the (cached) body loader."""
+    url = f"/books/{etag_book.id}"
+    etag = (await client.get(url)).headers["etag"]
+    lookups = catalog_cache.hits + catalog_cache.misses
+
+    assert (await _conditional(client, url, etag)).status_code == 304
+    assert catalog_cache.hits + catalog_cache.misses == lookups
+
+
+async def test_book_detail_etag_changes_on_stock_and_reviews(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    etag_book: Book,
+    etag_users: list[User],
+) -> None:
+    """Stock changes and new reviews both produce a fresh ETag."""
+    url = f"/books/{etag_book.id}"
+    etag1 = (await client.get(url)).headers["etag"]
+
+    etag_book.stock_quantity = 0
+    await db_session.flush()
+    resp = await _conditional(client, url, etag1)
+    assert resp.status_code == 200
+    etag2 = resp.headers["etag"]
+    assert etag2 != etag1
+
+    await ReviewRepository(db_session).create(etag_users[0].id, etag_book.id, rating=5)
+    resp = await _conditional(client, url, etag2)
+    assert resp.status_code == 200
+    assert resp.json()["review_count"] == 1
+
+
+async def test_missing_book_has_no_etag(client: AsyncClient) -> None:
+    resp = await client.get("/books/999999", headers={"If-None-Match": "*"})
+    assert resp.status_code == 404
+    assert "etag" not in resp.headers
+
+
+async def test_reviews_list_etag_tracks_review_changes(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    etag_book: Book,
+    etag_users: list[User],
+) -> None:
+    """Adding or soft-deleting a review invalidates the list ETag."""
+    repo = ReviewRepository(db_session)
+    review = await repo.create(etag_users[0].id, etag_book.id, rating=4)
+    url = f"/books/{etag_book.id}/reviews"
+
+    etag1 = (await client.get(url)).headers["etag"]
+    assert (await _conditional(client, url, etag1)).status_code == 304
+
+    await repo.create(etag_users[1].id, etag_book.id, rating=2)
+    resp = await _conditional(client, url, etag1)
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 2
+    etag2 = resp.headers["etag"]
+
+    await repo.soft_delete(review)
+    resp = await _conditional(client, url, etag2)
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 1
+
+
+async def test_genres_etag_tracks_genre_version(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """A new genre bumps the genre version and therefore the ETag."""
+    etag1 = (await client.get("/genres")).headers["etag"]
+    assert (await _conditional(client, "/genres", etag1)).status_code == 304
+
+    db_session.add(Genre(name="ETag Genre"))
+    await db_session.flush()
+    resp = await _conditional(client, "/genres", etag1)
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag1
@@ -0,0 +1,128 @@
+"""Tests for facets=true on GET /books (genre counts and price buckets).
+
+Coverage:
+  - genre counts ignore the genre_id filter but honour q/author/price
+  - price buckets ignore min/max_price but honour q/author/genre_id
+  - custom price_buckets, validation, and that facets are omitted by default
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book, Genre
+
+
+@pytest_asyncio.fixture
+async def facet_catalog(db_session: AsyncSession) -> dict:
+    fantasy = Genre(name="Facet Fantasy")
+    scifi = Genre(name="Facet SciFi")
+    db_session.add_all([fantasy, scifi])
+    await db_session.flush()
+    rows = [
+        ("Facet One", fantasy.id, "5.00"),
+        ("Facet Two", fantasy.id, "15.00"),
+        ("Facet Three", fantasy.id, "25.00"),
+        ("Facet Four", scifi.id, "15.00"),
+        ("Facet Five", None, "150.00"),
+    ]
+    db_session.add_all(
+        Book(title=t, author="Facet Author", genre_id=g, price=Decimal(p))
+        for t, g, p in rows
+    )
+    await db_session.flush()
+    return {"fantasy": fantasy.id, "scifi": scifi.id}
+
+
+def _bucket_counts(data: dict) -> list[int]:
+    return [b["count"] for b in data["facets"]["price"]]
+
+
+async def test_facets_absent_by_default(
+    client: AsyncClient, facet_catalog: dict
+) -> None:
+    data = (await client.get("/books", params={"author": "facet"})).json()
+    assert data["facets"] is None
+
+
+async def test_facets_over_filtered_set(
+    client: AsyncClient, facet_catalog: dict
+) -> None:
+    """Default buckets (<10, 10-20, 20-50, 50-100, >=100) over the author filter."""
+    data = (
+        await client.get(
+            "/books", params={"author": "facet", "facets": True, "size": 1}
+        )
+    ).json()
+    genres = {g["genre_id"]: g["count"] for g in data["facets"]["genres"]}
+    assert genres == {facet_catalog["fantasy"]: 3, facet_catalog["scifi"]: 1, None: 1}
+    assert data["facets"]["genres"][0]["genre_id"] == facet_catalog["fantasy"]
+    assert _bucket_counts(data) == [1, 2, 1, 0, 1]
+    assert data["facets"]["price"][0]["min"] is None
+    assert data["facets"]["price"][-1]["max"] is None
+    assert len(data["items"]) == 1  # facets cover the whole set, not the page
+
+
+async def test_each_facet_ignores_its_own_filter(
+    client: AsyncClient, facet_catalog: dict
+) -> None:
+    """genre_id narrows buckets but not genre counts; price narrows genres but not buckets."""
+    data = (
+        await client.get(
+            "/books",
+            params={
+                "author": "facet",
+                "facets": True,
+                "genre_id": facet_catalog["fantasy"],
+                "min_price": "10",
+                "max_price": "20",
+            },
+        )
+    ).json()
+    assert data["total"] == 1
+    genres = {g["genre_id"]: g["count"] for g in data["facets"]["genres"]}
+    assert genres == {facet_catalog["fantasy"]: 1, facet_catalog["scifi"]: 1}
+    assert _bucket_counts(data) == [1, 1, 1, 0, 0]
+
+
+async def test_custom_price_buckets(client: AsyncClient, facet_catalog: dict) -> None:
+    data = (
+        await client.get(
+            "/books",
+            params={"author": "facet", "facets": True, "price_buckets": "20, 100"},
+        )
+    ).json()
+    bounds = [
+        (
+            None if b["min"] is None else Decimal(b["min"]),
+            None if b["max"] is None else Decimal(b["max"]),
+            b["count"],
+        )
+        for b in data["facets"]["price"]
+    ]
+    assert bounds == [
+        (None, Decimal("20"), 3),
+        (Decimal("20"), Decimal("100"), 1),
+        (Decimal("100"), None, 1),
+    ]
+
+
+async def test_invalid_price_buckets_return_422(
+    client: AsyncClient, facet_catalog: dict
+) -> None:
+    for raw in ("20,10", "10,abc", "-5,10", "10,10"):
+        resp = await client.get("/books", params={"facets": True, "price_buckets": raw})
+        assert resp.status_code == 422, raw
+        assert resp.json()["code"] == "BOOK_PRICE_BUCKETS_INVALID"
+
+
+async def test_facets_honour_search_query(
+    client: AsyncClient, facet_catalog: dict
+) -> None:
+    data = (await client.get("/books", params={"q": "three", "facets": True})).json()
+    assert data["total"] == 1
+    assert data["facets"]["genres"] == [
+        {"genre_id": facet_catalog["fantasy"], "count": 1}
+    ]
@@ -0,0 +1,107 @@
+"""Tests for fuzzy=true (pg_trgm) search on GET /books.
+
+Coverage:
+  - fuzzy=true leaves FTS results untouched when q matches
+  - misspelled q returns nothing without fuzzy, similarity-ranked hits with it
+  - fuzzy results paginate by cursor
+  - author substring filter still works alongside the trigram indexes
+
+Trigram tests need the pg_trgm extension; they are skipped on servers that do
+not ship it (the migration installs it in real deployments).
+"""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+
+
+@pytest_asyncio.fixture
+async def fuzzy_books(db_session: AsyncSession) -> list[Book]:
+    books = [
+        Book(title="The Hobbit", author="J.R.R. Tolkien", price=Decimal("10.00")),
+        Book(title="The Silmarillion", author="J.R.R. Tolkien", price=Decimal("12.00")),
+        Book(title="Dune", author="Frank Herbert", price=Decimal("9.00")),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+@pytest_asyncio.fixture
+async def pg_trgm(db_session: AsyncSession) -> None:
+    """Install pg_trgm inside the test transaction, or skip if unavailable."""
+    available = await db_session.scalar(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if not available:
+        pytest.skip("pg_trgm extension not available on this server")
+    await db_session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+async def test_fuzzy_does_not_change_exact_matches(
+    client: AsyncClient, fuzzy_books: list[Book]
+) -> None:
+    """When FTS finds rows, fuzzy=true returns the same relevance-ranked page."""
+    plain = (await client.get("/books", params={"q": "tolkien"})).json()
+    fuzzy = (await client.get("/books", params={"q": "tolkien", "fuzzy": True})).json()
+    assert [b["id"] for b in fuzzy["items"]] == [b["id"] for b in plain["items"]]
+    assert plain["total"] == 2
+
+
+async def test_misspelling_needs_fuzzy(
+    client: AsyncClient, fuzzy_books: list[Book]
+) -> None:
+    resp = await client.get("/books", params={"q": "tolkein"})
+    assert resp.json()["total"] == 0
+
+
+async def test_fuzzy_answers_misspelled_author(
+    client: AsyncClient, fuzzy_books: list[Book], pg_trgm: None
+) -> None:
+    """'tolkein' finds both Tolkien books and nothing else."""
+    data = (await client.get("/books", params={"q": "tolkein", "fuzzy": True})).json()
+    assert data["total"] == 2
+    assert {b["author"] for b in data["items"]} == {"J.R.R. Tolkien"}
+
+
+async def test_fuzzy_ranks_by_similarity(
+    client: AsyncClient, fuzzy_books: list[Book], pg_trgm: None
+) -> None:
+    """The closest title wins: 'hobit' ranks The Hobbit first."""
+    data = (await client.get("/books", params={"q": "hobit", "fuzzy": True})).json()
+    assert data["items"][0]["title"] == "The Hobbit"
+
+
+async def test_fuzzy_results_paginate_by_cursor(
+    client: AsyncClient, fuzzy_books: list[Book], pg_trgm: None
+) -> None:
+    params = {"q": "tolkein", "fuzzy": True, "size": 1}
+    first = (await client.get("/books", params=params)).json()
+    second = (
+        await client.get("/books", params={**params, "cursor": first["next_cursor"]})
+    ).json()
+    ids = [b["id"] for b in first["items"] + second["items"]]
+    assert len(set(ids)) == 2
+    assert second["next_cursor"] is None
+
+
+async def test_author_substring_filter_with_trigram_index(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    fuzzy_books: list[Book],
+    pg_trgm: None,
+) -> None:
+    """ILIKE substring filtering keeps working once the GIN trigram index exists."""
+    await db_session.execute(
+        text(
+            "CREATE INDEX ix_books_author_trgm ON books USING gin (author gin_trgm_ops)"
+        )
+    )
+    data = (await client.get("/books", params={"author": "olkie"})).json()
+    assert data["total"] == 2
@@ -0,0 +1,235 @@
+"""Tests for Idempotency-Key on checkout, cart add and review create.
+
+Coverage:
+  - a retried checkout replays the first order (one order, stock taken once)
+  - cart add and review create retries replay instead of failing as duplicates
+  - a key reused for a different request is rejected (422); keys are per user
+  - failed requests are not stored, even a checkout that committed its stock
+    reservation before the payment was declined
+  - a duplicate of an in-flight request waits, then gives up with 409
+  - expired keys are reclaimed and purged
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.core.config import get_settings
+from app.core.idempotency import IdempotencyKey, purge_expired, request_fingerprint
+from app.core.security import hash_password
+from app.orders.models import Order
+from app.orders.repository import OrderRepository
+from app.users.models import User
+from app.users.repository import UserRepository
+
+
+async def _login(
+    client: AsyncClient, db_session: AsyncSession, email: str
+) -> tuple[User, dict]:
+    user = await UserRepository(db_session).create(
+        email=email, hashed_password=await hash_password("idempass1")
+    )
+    await db_session.flush()
+    resp = await client.post(
+        "/auth/login", json={"email": email, "password": "idempass1"}
+    )
+    return user, {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def buyer(client: AsyncClient, db_session: AsyncSession) -> tuple[User, dict]:
+    return await _login(client, db_session, "idem_user@example.com")
+
+
+@pytest_asyncio.fixture
+async def book(db_session: AsyncSession) -> Book:
+    book = Book(
+        title="Idempotent Book", author="I", price=Decimal("12.00"), stock_quantity=5
+    )
+    db_session.add(book)
+    await db_session.flush()
+    return book
+
+
+def _with_key(headers: dict, key: str) -> dict:
+    return {**headers, "Idempotency-Key": key}
+
+
+async def _add(
+    client: AsyncClient, headers: dict, book: Book, quantity: int = 2
+) -> object:
+    return await client.post(
+        "/cart/items", json={"book_id": book.id, "quantity": quantity}, headers=headers
+    )
+
+
+def _paid():
+    return patch(
+        "app.orders.service.MockPaymentService.charge", new=AsyncMock(return_value=True)
+    )
+
+
+async def test_checkout_retry_replays_first_order(
+    client: AsyncClient, db_session: AsyncSession, buyer: tuple[User, dict], book: Book
+) -> None:
+    user, headers = buyer
+    await _add(client, headers, book)
+
+    with _paid():
+        first = await client.post(
+            "/orders/checkout", json={}, headers=_with_key(headers, "co-1")
+        )
+        retry = await client.post(
+            "/orders/checkout", json={}, headers=_with_key(headers, "co-1")
+        )
+
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert (
+        await db_session.scalar(
+            select(func.count()).select_from(Order).where(Order.user_id == user.id)
+        )
+        == 1
+    )
+    await db_session.refresh(book)
+    assert book.stock_quantity == 3
+
+
+async def test_cart_add_and_review_retries_replay(
+    client: AsyncClient, db_session: AsyncSession, buyer: tuple[User, dict], book: Book
+) -> None:
+    user, headers = buyer
+    first = await _add(client, _with_key(headers, "cart-1"), book)
+    retry = await _add(client, _with_key(headers, "cart-1"), book)
+    assert (first.status_code, retry.status_code) == (201, 201)
+    assert retry.json() == first.json()
+
+    await OrderRepository(db_session).record_purchases(user.id, [book.id], None)
+    review_headers = _with_key(headers, "review-1")
+    url = f"/books/{book.id}/reviews"
+    first = await client.post(url, json={"rating": 5}, headers=review_headers)
+    retry = await client.post(url, json={"rating": 5}, headers=review_headers)
+    assert (first.status_code, retry.status_code) == (201, 201)
+    assert retry.json()["id"] == first.json()["id"]
+
+    # Without a key the same add is a plain duplicate (this rolls the session back)
+    assert (await _add(client, headers, book)).json()["code"] == "CART_ITEM_DUPLICATE"
+
+
+async def test_key_reused_for_other_request_rejected(
+    client: AsyncClient, db_session: AsyncSession, buyer: tuple[User, dict], book: Book
+) -> None:
+    _, headers = buyer
+    assert (await _add(client, _with_key(headers, "k"), book, 1)).status_code == 201
+
+    resp = await _add(client, _with_key(headers, "k"), book, 3)
+
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+    _, other_headers = await _login(client, db_session, "idem_other@example.com")
+    assert (
+        await _add(client, _with_key(other_headers, "k"), book, 3)
+    ).status_code == 201
+
+
+async def test_failed_checkout_is_not_stored(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    buyer: tuple[User, dict],
+    book: Book,
+) -> None:
+    """A declined payment frees the key although reserve mode committed its hold.
+
+    (Without a mid-request commit the claim goes with get_db's rollback, which
+    the test client's session override does not perform.)
+    """
+    _, headers = buyer
+    await _add(client, headers, book)
+    keyed = _with_key(headers, "co-retry")
+
+    with patch(
+        "app.orders.service.MockPaymentService.charge",
+        new=AsyncMock(return_value=False),
+    ):
+        declined = await client.post("/orders/checkout", json={}, headers=keyed)
+    assert declined.status_code == 402
+    assert await db_session.get(IdempotencyKey, (buyer[0].id, "co-retry")) is None
+
+    with _paid():
+        retry = await client.post("/orders/checkout", json={}, headers=keyed)
+    assert retry.status_code == 201
+    assert "idempotent-replayed" not in retry.headers
+
+
+async def test_duplicate_of_in_flight_request_gives_up(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    buyer: tuple[User, dict],
+    book: Book,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "IDEMPOTENCY_WAIT_SECONDS", 0.3)
+    user, headers = buyer
+    body = b'{"book_id":%d,"quantity":1}' % book.id
+    db_session.add(
+        IdempotencyKey(
+            user_id=user.id,
+            key="busy",
+            fingerprint=request_fingerprint("POST", "/cart/items", "", body),
+            expires_at=func.now() + timedelta(minutes=5),
+        )
+    )
+    await db_session.flush()
+
+    resp = await client.post(
+        "/cart/items",
+        content=body,
+        headers={**_with_key(headers, "busy"), "Content-Type": "application/json"},
+    )
+
+    assert resp.status_code == 409
+    assert resp.json()["code"] == "IDEMPOTENCY_KEY_IN_PROGRESS"
+
+
+async def test_expired_keys_reclaimed_and_purged(
+    client: AsyncClient, db_session: AsyncSession, buyer: tuple[User, dict], book: Book
+) -> None:
+    user, headers = buyer
+    past = func.now() - timedelta(seconds=1)
+    db_session.add_all(
+        [
+            IdempotencyKey(
+                user_id=user.id,
+                key="old",
+                fingerprint="x",
+                status_code=200,
+                response_body={},
+                expires_at=past,
+            ),
+            IdempotencyKey(
+                user_id=user.id, key="stale", fingerprint="x", expires_at=past
+            ),
+        ]
+    )
+    await db_session.flush()
+
+    resp = await _add(client, _with_key(headers, "old"), book)
+    assert resp.status_code == 201
+    assert "idempotent-replayed" not in resp.headers
+
+    assert await purge_expired(db_session) == 1
+    keys = await db_session.scalars(
+        select(IdempotencyKey.key).where(IdempotencyKey.user_id == user.id)
+    )
+    assert keys.all() == ["old"]
@@ -3,8 +3,15 @@
 Tests cover:
   - COMM-03: POST /orders/checkout — success, empty cart, insufficient stock,
              payment failure, and concurrent race condition safety
-  - COMM-04: Order confirmation response structure and unit_price snapshot
+  - Checkout records purchases in the user_book_purchases ledger
+  - ORDER_INSUFFICIENT_STOCK per-item details and stock left untouched on failure,
+    in every CHECKOUT_STOCK_MODE ("reserve", "atomic" and "lock")
+  - Checkout round trips do not grow with the number of cart lines
+  - COMM-04: Order confirmation response structure, unit_price and book snapshots
   - COMM-05: GET /orders (user history), GET /orders/{id} (detail), user isolation
+  - GET /orders without view/size/cursor returns the full history as a list;
+    with them, cursor pages where view=summary aggregates in one query and
+    view=full loads line items
   - ENGM-06: GET /admin/orders access control
 
 Uses the existing conftest.py async infrastructure:
@@ -21,13 +28,21 @@ Notes:
     Decimal-to-float conversion checks.
 """
 
+from decimal import Decimal
 from unittest.mock import AsyncMock, patch
 
+import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.books.models import Book
+from app.cart.repository import CartItemRepository, CartRepository
+from app.core.config import get_settings
 from app.core.security import hash_password
+from app.orders.models import Order, OrderItem, UserBookPurchase
+from app.orders.repository import OrderRepository
 from app.users.repository import UserRepository
 
 # ---------------------------------------------------------------------------
@@ -104,6 +119,13 @@ async def sample_book(client: AsyncClient, admin_headers: dict) -> dict:
     return stock_resp.json()
 
 
+@pytest.fixture(params=["reserve", "atomic", "lock"])
+def stock_mode(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run the test once per CHECKOUT_STOCK_MODE."""
+    monkeypatch.setattr(get_settings(), "CHECKOUT_STOCK_MODE", request.param)
+    return request.param
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -187,6 +209,28 @@ async def test_checkout_success_creates_order_and_decrements_stock(
     assert cart_resp.json()["items"] == []
 
 
+async def test_checkout_records_purchase_ledger(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    user_headers: dict,
+    sample_book: dict,
+) -> None:
+    """Checkout writes one user_book_purchases row per book; re-buying keeps the first."""
+    book_id = sample_book["id"]
+    await _add_to_cart(client, user_headers, book_id, quantity=1)
+    first = (await _checkout(client, user_headers)).json()
+    await _add_to_cart(client, user_headers, book_id, quantity=1)
+    second = await _checkout(client, user_headers)
+    assert second.status_code == 201
+
+    rows = (
+        await db_session.scalars(
+            select(UserBookPurchase).where(UserBookPurchase.book_id == book_id)
+        )
+    ).all()
+    assert [row.first_order_id for row in rows] == [first["id"]]
+
+
 async def test_checkout_empty_cart_rejected(
     client: AsyncClient,
     user_headers: dict,
@@ -251,6 +295,129 @@ async def test_checkout_payment_failure_preserves_cart(
     assert orders_resp.json() == []
 
 
+async def _book_with_stock(
+    client: AsyncClient, admin_headers: dict, title: str, quantity: int
+) -> int:
+    resp = await client.post(
+        "/books",
+        json={"title": title, "author": "Stock Author", "price": "5.00"},
+        headers=admin_headers,
+    )
+    assert resp.status_code == 201
+    book_id = resp.json()["id"]
+    await client.patch(
+        f"/books/{book_id}/stock", json={"quantity": quantity}, headers=admin_headers
+    )
+    return book_id
+
+
+async def test_checkout_insufficient_stock_lists_items(
+    client: AsyncClient,
+    admin_headers: dict,
+    user_headers: dict,
+    stock_mode: str,
+) -> None:
+    """The 409 lists every short item; stock of the books that had enough is untouched."""
+    plenty = await _book_with_stock(client, admin_headers, "Plenty Book", 5)
+    short = await _book_with_stock(client, admin_headers, "Short Book", 1)
+    await _add_to_cart(client, user_headers, plenty, quantity=2)
+    await _add_to_cart(client, user_headers, short, quantity=3)
+
+    resp = await _checkout(client, user_headers)
+    assert resp.status_code == 409
+    body = resp.json()
+    assert body["code"] == "ORDER_INSUFFICIENT_STOCK"
+    assert body["items"] == [
+        {"book_id": short, "title": "Short Book", "requested": 3, "available": 1}
+    ]
+
+    for book_id, stock in ((plenty, 5), (short, 1)):
+        book_resp = await client.get(f"/books/{book_id}")
+        assert book_resp.json()["stock_quantity"] == stock
+
+
+async def test_checkout_multiple_books_decrements_each(
+    client: AsyncClient,
+    admin_headers: dict,
+    user_headers: dict,
+    stock_mode: str,
+) -> None:
+    """A multi-book checkout prices every item, decrements each book exactly once
+    and stores the order's total_amount and item_count."""
+    first = await _book_with_stock(client, admin_headers, "First Book", 4)
+    second = await _book_with_stock(client, admin_headers, "Second Book", 2)
+    await _add_to_cart(client, user_headers, first, quantity=1)
+    await _add_to_cart(client, user_headers, second, quantity=2)
+
+    resp = await _checkout(client, user_headers)
+    assert resp.status_code == 201, resp.json()
+    assert sorted(
+        (item["book_id"], item["unit_price"]) for item in resp.json()["items"]
+    ) == [(first, "5.00"), (second, "5.00")]
+
+    for book_id, stock in ((first, 3), (second, 0)):
+        book_resp = await client.get(f"/books/{book_id}")
+        assert book_resp.json()["stock_quantity"] == stock
+
+    orders_resp = await client.get(
+        "/orders", params={"view": "summary"}, headers=user_headers
+    )
+    (summary,) = orders_resp.json()["items"]
+    assert (summary["item_count"], summary["total_price"]) == (2, "15.00")
+    assert summary["total_price"] == resp.json()["total_price"]
+
+
+async def test_checkout_payment_failure_keeps_stock(
+    client: AsyncClient,
+    user_headers: dict,
+    sample_book: dict,
+    stock_mode: str,
+) -> None:
+    """A declined payment leaves stock where it was, even after an atomic decrement."""
+    await _add_to_cart(client, user_headers, sample_book["id"], quantity=3)
+
+    resp = await _checkout(client, user_headers, force_fail=True)
+    assert resp.status_code == 402
+
+    book_resp = await client.get(f"/books/{sample_book['id']}")
+    assert book_resp.json()["stock_quantity"] == sample_book["stock_quantity"]
+
+
+async def test_checkout_statements_independent_of_cart_size(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    user_headers: dict,
+    statements: list[str],
+    stock_mode: str,
+) -> None:
+    """Order, items and cart clear are set-based: 30 lines cost what 3 lines do."""
+    user = await UserRepository(db_session).get_by_email("orders_user@example.com")
+    books = [
+        Book(title=f"Bulk {i}", author="B2B", price=Decimal("2.00"), stock_quantity=10)
+        for i in range(30)
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    book_ids = [book.id for book in books]
+    cart = await CartRepository(db_session).get_or_create(user.id)
+    cart_id = cart.id
+
+    counts = []
+    for lines in (3, 30):
+        for book_id in book_ids[:lines]:
+            await CartItemRepository(db_session).add(cart_id, book_id, 1)
+        statements.clear()
+        resp = await _checkout(client, user_headers)
+        assert resp.status_code == 201, resp.json()
+        assert len(resp.json()["items"]) == lines
+        assert resp.json()["items"][-1]["book"]["title"] == f"Bulk {lines - 1}"
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
+    cart_resp = await client.get("/cart", headers=user_headers)
+    assert cart_resp.json()["items"] == []
+
+
 async def test_checkout_concurrent_race_condition_safe(
     client: AsyncClient,
     admin_headers: dict,
@@ -483,6 +650,124 @@ async def test_list_orders_user_isolation(
     assert orders_resp.json() == []
 
 
+async def _seed_orders(db_session: AsyncSession, count: int) -> list[Order]:
+    """Insert `count` orders for orders_user (order i has i + 1 lines of 2 x 1.50).
+
+    Line j carries the title snapshot "History j".
+    """
+    user = await UserRepository(db_session).get_by_email("orders_user@example.com")
+    book = Book(title="History", author="H", price=Decimal("1.50"), stock_quantity=0)
+    db_session.add(book)
+    await db_session.flush()
+    orders = [
+        Order(
+            user_id=user.id,
+            total_amount=Decimal("3.00") * (i + 1),
+            item_count=i + 1,
+            items=[
+                OrderItem(
+                    book_id=book.id,
+                    quantity=2,
+                    unit_price=Decimal("1.50"),
+                    title=f"History {j}",
+                )
+                for j in range(i + 1)
+            ],
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(orders)
+    await db_session.flush()
+    return orders
+
+
+async def test_list_orders_summary_pages_with_cursor(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    user_headers: dict,
+    user2_headers: dict,
+) -> None:
+    """view=summary pages newest first with item_count/total_price from SQL."""
+    orders = await _seed_orders(db_session, 5)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"size": 2} | ({"cursor": cursor} if cursor else {})
+        resp = await client.get("/orders", params=params, headers=user_headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) <= 2
+        seen += body["items"]
+        cursor = body["next_cursor"]
+        assert body["has_more"] is (cursor is not None)
+        if cursor is None:
+            break
+
+    # Same created_at within one transaction: id breaks the tie
+    assert [o["id"] for o in seen] == [o.id for o in reversed(orders)]
+    assert seen[0] == {
+        "id": orders[4].id,
+        "status": "confirmed",
+        "created_at": seen[0]["created_at"],
+        "item_count": 5,
+        "total_price": "15.00",
+        "first_title": "History 0",
+    }
+
+    # view=full continues from a summary cursor; cursors are bound to the user
+    first = await client.get("/orders", params={"size": 2}, headers=user_headers)
+    cursor = first.json()["next_cursor"]
+    full = await client.get(
+        "/orders",
+        params={"view": "full", "size": 2, "cursor": cursor},
+        headers=user_headers,
+    )
+    assert [o["id"] for o in full.json()["items"]] == [orders[2].id, orders[1].id]
+    assert full.json()["items"][0]["total_price"] == "9.00"
+    assert len(full.json()["items"][0]["items"]) == 3
+    other = await client.get(
+        "/orders", params={"cursor": cursor}, headers=user2_headers
+    )
+    assert other.status_code == 400
+    assert other.json()["code"] == "PAGINATION_INVALID_CURSOR"
+
+
+async def test_list_orders_summary_skips_line_items(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    user_headers: dict,
+    statements: list[str],
+) -> None:
+    """A summary page is one query however many orders and lines exist."""
+    await _seed_orders(db_session, 6)
+
+    statements.clear()
+    resp = await client.get("/orders", params={"size": 4}, headers=user_headers)
+    assert resp.status_code == 200
+    assert [o["item_count"] for o in resp.json()["items"]] == [6, 5, 4, 3]
+    assert {o["first_title"] for o in resp.json()["items"]} == {"History 0"}
+    order_queries = [s for s in statements if "order_items" in s or "FROM orders" in s]
+    assert len(order_queries) == 1
+    assert "books" not in order_queries[0]
+
+
+async def test_order_created_at_is_insert_time(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    user_headers: dict,
+    sample_book: dict,
+) -> None:
+    """created_at is stamped at insert, after payment, not at transaction start."""
+    started = await db_session.scalar(select(func.now()))
+    await _add_to_cart(client, user_headers, sample_book["id"], quantity=1)
+    order_id = (await _checkout(client, user_headers)).json()["id"]
+
+    order = await db_session.get(Order, order_id)
+    assert order.created_at > started
+    assert await OrderRepository(db_session).settled_order_id(0) != order_id
+
+
 async def test_get_order_detail(
     client: AsyncClient,
     user_headers: dict,
@@ -504,6 +789,54 @@ async def test_get_order_detail(
     assert data["items"][0]["quantity"] == 3
 
 
+async def test_order_items_keep_book_snapshot(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    admin_headers: dict,
+    user_headers: dict,
+    statements: list[str],
+) -> None:
+    """Items serialize from their checkout snapshot, without reading books."""
+    book_id = await _book_with_stock(client, admin_headers, "Snapshot Title", 5)
+    await client.put(
+        f"/books/{book_id}",
+        json={"isbn": "9780306406157", "cover_image_url": "https://img.example/s.jpg"},
+        headers=admin_headers,
+    )
+    await _add_to_cart(client, user_headers, book_id, quantity=1)
+    order_id = (await _checkout(client, user_headers)).json()["id"]
+
+    await client.put(
+        f"/books/{book_id}", json={"title": "Renamed"}, headers=admin_headers
+    )
+    statements.clear()
+    (item,) = (await client.get(f"/orders/{order_id}", headers=user_headers)).json()[
+        "items"
+    ]
+    assert not any("FROM books" in s for s in statements)
+    assert (item["title"], item["author"], item["isbn"], item["cover_image_url"]) == (
+        "Snapshot Title",
+        "Stock Author",
+        "9780306406157",
+        "https://img.example/s.jpg",
+    )
+    assert item["book"]["title"] == "Snapshot Title"
+
+    await db_session.execute(delete(Book).where(Book.id == book_id))
+    db_session.expire_all()  # the item's book_id was SET NULL in the database
+    (item,) = (await client.get(f"/orders/{order_id}", headers=user_headers)).json()[
+        "items"
+    ]
+    assert (item["book_id"], item["title"]) == (None, "Snapshot Title")
+    assert item["book"] == {
+        "id": None,
+        "title": "Snapshot Title",
+        "author": "Stock Author",
+        "cover_image_url": "https://img.example/s.jpg",
+        "price": item["unit_price"],
+    }
+
+
 async def test_get_order_not_found(
     client: AsyncClient,
     user_headers: dict,
@@ -562,7 +895,7 @@ async def test_admin_list_all_orders(
     # Admin GET /admin/orders sees all orders
     admin_resp = await client.get("/admin/orders", headers=admin_headers)
     assert admin_resp.status_code == 200
-    all_orders = admin_resp.json()
+    all_orders = admin_resp.json()["items"]
     all_order_ids = [o["id"] for o in all_orders]
     assert user1_order_id in all_order_ids
     assert user2_order_id in all_order_ids
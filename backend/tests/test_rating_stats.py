@@ -0,0 +1,167 @@
+"""Integration tests for the incrementally maintained book_rating_stats table.
+
+Coverage:
+  - ReviewRepository.create / update / soft_delete / bulk_soft_delete keep the
+    count, sum and 1-5 histogram in step with live reviews
+  - avg_rating and bayesian_avg generated columns
+  - reconcile_rating_stats reports and repairs drift (dry run writes nothing)
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.reviews.models import BookRatingStats
+from app.reviews.repository import ReviewRepository
+from app.users.models import User
+from app.users.repository import UserRepository
+
+# ---------------------------------------------------------------------------
+# Fixtures — stats_ prefix avoids collisions with other test files
+# ---------------------------------------------------------------------------
+
+
+@pytest_asyncio.fixture
+async def stats_users(db_session: AsyncSession) -> list[User]:
+    """Create four reviewers."""
+    repo = UserRepository(db_session)
+    users = [
+        await repo.create(email=f"stats_user{i}@example.com", hashed_password="x")
+        for i in range(4)
+    ]
+    await db_session.flush()
+    return users
+
+
+@pytest_asyncio.fixture
+async def stats_book(db_session: AsyncSession) -> Book:
+    """Create a book to review."""
+    book = Book(title="Stats Book", author="Stats Author", price=Decimal("9.99"))
+    db_session.add(book)
+    await db_session.flush()
+    return book
+
+
+async def _stats(db_session: AsyncSession, book_id: int) -> dict | None:
+    row = (
+        (
+            await db_session.execute(
+                select(BookRatingStats.__table__).where(
+                    BookRatingStats.book_id == book_id
+                )
+            )
+        )
+        .mappings()
+        .one_or_none()
+    )
+    return dict(row) if row else None
+
+
+# ---------------------------------------------------------------------------
+# Incremental maintenance
+# ---------------------------------------------------------------------------
+
+
+async def test_create_update_delete_maintain_stats(
+    db_session: AsyncSession, stats_users: list[User], stats_book: Book
+) -> None:
+    """Each write path moves the counters and histogram by exactly its delta."""
+    repo = ReviewRepository(db_session)
+    assert await _stats(db_session, stats_book.id) is None
+
+    r1 = await repo.create(stats_users[0].id, stats_book.id, rating=5)
+    r2 = await repo.create(stats_users[1].id, stats_book.id, rating=2)
+    stats = await _stats(db_session, stats_book.id)
+    assert stats["review_count"] == 2
+    assert stats["rating_sum"] == 7
+    assert (stats["rating_5"], stats["rating_2"]) == (1, 1)
+    assert stats["avg_rating"] == Decimal("3.5")
+    assert round(stats["bayesian_avg"], 4) == Decimal("3.1429")  # (7 + 3*5) / (2 + 5)
+
+    await repo.update(r2, rating=4)
+    stats = await _stats(db_session, stats_book.id)
+    assert (stats["review_count"], stats["rating_sum"]) == (2, 9)
+    assert (stats["rating_2"], stats["rating_4"]) == (0, 1)
+
+    # Text-only edit leaves counters alone
+    await repo.update(r2, text="Changed my mind")
+    assert (await _stats(db_session, stats_book.id))["rating_sum"] == 9
+
+    await repo.soft_delete(r1)
+    await repo.soft_delete(r1)  # second call is a no-op
+    stats = await _stats(db_session, stats_book.id)
+    assert (stats["review_count"], stats["rating_sum"], stats["rating_5"]) == (1, 4, 0)
+
+    assert await repo.get_aggregates(stats_book.id) == {
+        "avg_rating": 4.0,
+        "review_count": 1,
+    }
+
+
+async def test_bulk_soft_delete_updates_stats_per_book(
+    db_session: AsyncSession, stats_users: list[User], stats_book: Book
+) -> None:
+    """bulk_soft_delete subtracts each deleted review from its own book's row."""
+    other = Book(title="Stats Other", author="Stats Author", price=Decimal("1.00"))
+    db_session.add(other)
+    await db_session.flush()
+
+    repo = ReviewRepository(db_session)
+    a = await repo.create(stats_users[0].id, stats_book.id, rating=3)
+    b = await repo.create(stats_users[1].id, stats_book.id, rating=1)
+    c = await repo.create(stats_users[2].id, other.id, rating=5)
+    await repo.create(stats_users[3].id, other.id, rating=4)
+
+    await repo.soft_delete(a)
+    count = await repo.bulk_soft_delete([a.id, b.id, c.id])
+
+    assert count == 2  # a was already deleted
+    first = await _stats(db_session, stats_book.id)
+    assert (first["review_count"], first["rating_sum"]) == (0, 0)
+    assert first["avg_rating"] is None
+    second = await _stats(db_session, other.id)
+    assert (second["review_count"], second["rating_sum"], second["rating_4"]) == (
+        1,
+        4,
+        1,
+    )
+    assert await repo.get_aggregates(stats_book.id) == {
+        "avg_rating": None,
+        "review_count": 0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reconcile
+# ---------------------------------------------------------------------------
+
+
+async def test_reconcile_reports_and_repairs_drift(
+    db_session: AsyncSession, stats_users: list[User], stats_book: Book
+) -> None:
+    """Drifted rows are reported; dry run leaves them, apply rewrites them."""
+    repo = ReviewRepository(db_session)
+    await repo.create(stats_users[0].id, stats_book.id, rating=5)
+    await repo.create(stats_users[1].id, stats_book.id, rating=3)
+    assert await repo.reconcile_rating_stats(apply=False) == []
+
+    await db_session.execute(
+        update(BookRatingStats)
+        .where(BookRatingStats.book_id == stats_book.id)
+        .values(review_count=7, rating_3=0)
+    )
+
+    report = await repo.reconcile_rating_stats(apply=False)
+    assert len(report) == 1
+    assert report[0]["book_id"] == stats_book.id
+    assert report[0]["stored"]["review_count"] == 7
+    assert report[0]["expected"]["review_count"] == 2
+    assert (await _stats(db_session, stats_book.id))["review_count"] == 7
+
+    await repo.reconcile_rating_stats()
+    stats = await _stats(db_session, stats_book.id)
+    assert (stats["review_count"], stats["rating_sum"], stats["rating_3"]) == (2, 8, 1)
+    assert await repo.reconcile_rating_stats(apply=False) == []
@@ -30,6 +30,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.books.models import Book
 from app.core.security import hash_password
 from app.orders.models import Order, OrderItem, OrderStatus
+from app.orders.repository import OrderRepository
 from app.users.models import User
 from app.users.repository import UserRepository
 
@@ -163,6 +164,7 @@ async def purchased_book(
     )
     db_session.add(item)
     await db_session.flush()
+    await OrderRepository(db_session).record_purchases(rev_user.id, [sample_book.id], order.id)
 
     return sample_book
 
@@ -186,6 +188,7 @@ async def purchased_book2(
     )
     db_session.add(item)
     await db_session.flush()
+    await OrderRepository(db_session).record_purchases(rev_user2.id, [sample_book2.id], order.id)
 
     return sample_book2
 
@@ -419,6 +422,9 @@ class TestListReviews:
         )
         db_session.add(item)
         await db_session.flush()
+        await OrderRepository(db_session).record_purchases(
+            rev_user2.id, [purchased_book.id], order.id
+        )
 
         # Create two reviews
         await _create_review(client, user_headers, purchased_book.id, rating=5, text="Great!")
@@ -495,6 +495,7 @@ class TestHasUserPurchasedBook:
         await db_session.flush()
 
         repo = OrderRepository(db_session)
+        await repo.record_purchases(review_user.id, [sample_book.id], order.id)
         result = await repo.has_user_purchased_book(review_user.id, sample_book.id)
         assert result is True
 
@@ -553,6 +554,27 @@ class TestHasUserPurchasedBook:
         await db_session.flush()
 
         repo = OrderRepository(db_session)
+        await repo.record_purchases(review_user.id, [sample_book.id], order.id)
         # Checking book2, but order only contains book1
         result = await repo.has_user_purchased_book(review_user.id, sample_book2.id)
         assert result is False
+
+    async def test_purchasers_of_book_batch(
+        self,
+        db_session: AsyncSession,
+        review_user: User,
+        sample_book: Book,
+        sample_book2: Book,
+    ) -> None:
+        """One ledger lookup resolves which of many users bought the book."""
+        other = await UserRepository(db_session).create(
+            email="rd_other_buyer@example.com", hashed_password="x"
+        )
+        repo = OrderRepository(db_session)
+        await repo.record_purchases(review_user.id, [sample_book.id, sample_book.id], None)
+        await repo.record_purchases(other.id, [sample_book2.id], None)
+
+        assert await repo.purchasers_of_book(
+            sample_book.id, [review_user.id, other.id, review_user.id]
+        ) == {review_user.id}
+        assert await repo.purchasers_of_book(sample_book.id, []) == set()
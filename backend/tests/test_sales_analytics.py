@@ -118,8 +118,14 @@ async def _create_confirmed_order(
     """Create a CONFIRMED Order with the given OrderItems and flush.
 
     Each item dict must have: book_id (int), quantity (int), unit_price (Decimal).
+    The order's total_amount and item_count are set as checkout would.
     """
-    order = Order(user_id=user_id, status=OrderStatus.CONFIRMED)
+    order = Order(
+        user_id=user_id,
+        status=OrderStatus.CONFIRMED,
+        total_amount=sum(i["quantity"] * i["unit_price"] for i in items),
+        item_count=len(items),
+    )
     db_session.add(order)
     await db_session.flush()
 
@@ -220,7 +226,12 @@ class TestSalesSummary:
         book_a = sample_books[0]
 
         # Create one CONFIRMED order: 1 * 50.00 = 50.00
-        confirmed_order = Order(user_id=admin_user_id, status=OrderStatus.CONFIRMED)
+        confirmed_order = Order(
+            user_id=admin_user_id,
+            status=OrderStatus.CONFIRMED,
+            total_amount=Decimal("50.00"),
+            item_count=1,
+        )
         db_session.add(confirmed_order)
         await db_session.flush()
         db_session.add(
@@ -233,7 +244,12 @@ class TestSalesSummary:
         )
 
         # Create one PAYMENT_FAILED order: 3 * 50.00 = 150.00 — should NOT be counted
-        failed_order = Order(user_id=admin_user_id, status=OrderStatus.PAYMENT_FAILED)
+        failed_order = Order(
+            user_id=admin_user_id,
+            status=OrderStatus.PAYMENT_FAILED,
+            total_amount=Decimal("150.00"),
+            item_count=1,
+        )
         db_session.add(failed_order)
         await db_session.flush()
         db_session.add(
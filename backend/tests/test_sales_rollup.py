@@ -0,0 +1,172 @@
+"""Tests for the daily sales rollup behind the admin sales analytics.
+
+Coverage:
+  - a refresh folds settled confirmed orders into sales_daily/sales_daily_totals
+    once, by UTC day; failed payments and deleted books' lines are left out
+  - revenue_summary and top_books return the same figures from the raw tables
+    (empty rollup), a fresh rollup, and a rollup that is behind (orders past
+    the high-water mark, books deleted since)
+"""
+
+from datetime import UTC, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest_asyncio
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.admin.analytics_models import SalesDaily, SalesDailyTotal
+from app.admin.analytics_repository import AnalyticsRepository, SalesRollupRepository
+from app.admin.analytics_service import _period_bounds, _prior_period_bounds
+from app.admin.sales_rollup import refresh_sales_rollup
+from app.books.models import Book
+from app.orders.models import Order, OrderItem, OrderStatus
+from app.users.models import User
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def buyer(db_session: AsyncSession) -> User:
+    user = await UserRepository(db_session).create(
+        email="rollup_buyer@example.com", hashed_password="!"
+    )
+    await db_session.flush()
+    return user
+
+
+@pytest_asyncio.fixture
+async def books(db_session: AsyncSession) -> list[Book]:
+    books = [
+        Book(title="Rollup A", author="R", price=Decimal("20.00"), stock_quantity=50),
+        Book(title="Rollup B", author="R", price=Decimal("7.50"), stock_quantity=50),
+        Book(title="Rollup C", author="R", price=Decimal("12.25"), stock_quantity=50),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+async def _now(db_session: AsyncSession) -> datetime:
+    return await db_session.scalar(select(func.now()))
+
+
+async def _order(
+    db_session: AsyncSession,
+    user: User,
+    created_at: datetime,
+    lines: list[tuple[Book, int]],
+    status: OrderStatus = OrderStatus.CONFIRMED,
+) -> Order:
+    order = Order(
+        user_id=user.id,
+        status=status,
+        created_at=created_at,
+        total_amount=sum(book.price * quantity for book, quantity in lines),
+        item_count=len(lines),
+    )
+    db_session.add(order)
+    await db_session.flush()
+    db_session.add_all(
+        OrderItem(
+            order_id=order.id, book_id=book.id, quantity=quantity, unit_price=book.price
+        )
+        for book, quantity in lines
+    )
+    await db_session.flush()
+    return order
+
+
+async def _seed(
+    db_session: AsyncSession, user: User, books: list[Book], now: datetime
+) -> None:
+    a, b, c = books
+    yesterday = datetime.combine(now.date() - timedelta(days=1), time(), UTC)
+    await _order(db_session, user, now - timedelta(days=40), [(a, 1), (b, 4)])
+    await _order(db_session, user, now - timedelta(days=3, hours=5), [(c, 2)])
+    await _order(db_session, user, yesterday, [(a, 2), (c, 1)])
+    await _order(
+        db_session, user, yesterday + timedelta(hours=23, minutes=59), [(b, 3)]
+    )
+    await _order(
+        db_session, user, yesterday, [(a, 5)], status=OrderStatus.PAYMENT_FAILED
+    )
+    await _order(db_session, user, now, [(a, 1), (b, 1)])
+
+
+async def _figures(db_session: AsyncSession, now: datetime) -> list:
+    """Every figure the analytics endpoints report, for each period they offer."""
+    repo = AnalyticsRepository(db_session)
+    bounds = [(None, None), (now - timedelta(days=3, hours=12), now)]
+    for period in ("today", "week", "month"):
+        bounds += [_period_bounds(now, period), _prior_period_bounds(now, period)]
+    figures = []
+    for start, end in bounds:
+        if start is not None:
+            figures.append(
+                await repo.revenue_summary(period_start=start, period_end=end)
+            )
+        for sort_by in ("revenue", "volume"):
+            figures.append(
+                await repo.top_books(
+                    sort_by=sort_by, limit=50, period_start=start, period_end=end
+                )
+            )
+    return figures
+
+
+async def test_refresh_rolls_up_settled_confirmed_orders(
+    db_session: AsyncSession, buyer: User, books: list[Book]
+) -> None:
+    now = await _now(db_session)
+    await _seed(db_session, buyer, books, now)
+    a, b, c = books
+    yesterday = now.date() - timedelta(days=1)
+
+    result = await refresh_sales_rollup(db_session)
+
+    # Today's order is too recent to be settled; the failed payment is skipped
+    assert (result.orders, result.rows) == (4, 6)
+    daily = await db_session.execute(
+        select(
+            SalesDaily.book_id,
+            SalesDaily.units,
+            SalesDaily.revenue,
+            SalesDaily.order_count,
+        )
+        .where(SalesDaily.day == yesterday)
+        .order_by(SalesDaily.book_id)
+    )
+    assert daily.all() == [
+        (a.id, 2, Decimal("40.00"), 1),
+        (b.id, 3, Decimal("22.50"), 1),
+        (c.id, 1, Decimal("12.25"), 1),
+    ]
+    totals = await db_session.get(SalesDailyTotal, yesterday)
+    assert (totals.revenue, totals.order_count) == (Decimal("74.75"), 2)
+
+    again = await refresh_sales_rollup(db_session)
+    assert (again.orders, again.last_order_id) == (0, result.last_order_id)
+
+
+async def test_rollup_figures_match_raw_tables(
+    db_session: AsyncSession, buyer: User, books: list[Book]
+) -> None:
+    now = await _now(db_session)
+    await _seed(db_session, buyer, books, now)
+    raw = await _figures(db_session, now)
+    assert raw[0][0]["book_id"] == books[0].id
+    assert raw[0][0]["total_revenue"] == Decimal("80.00")
+
+    await refresh_sales_rollup(db_session)
+    assert await _figures(db_session, now) == raw
+
+    # Behind the raw tables: backdated orders past the mark, a deleted book
+    a, b, c = books
+    await _order(db_session, buyer, now - timedelta(days=3, hours=1), [(b, 6), (c, 1)])
+    await _order(db_session, buyer, now - timedelta(days=1, hours=2), [(c, 2)])
+    await db_session.execute(delete(Book).where(Book.id == a.id))
+    db_session.expire_all()
+    behind = await _figures(db_session, now)
+
+    await SalesRollupRepository(db_session).reset()
+    assert await _figures(db_session, now) == behind
@@ -0,0 +1,258 @@
+"""Tests for sparse fieldsets (fields=) on catalog, review and order lists.
+
+Coverage:
+  - GET /books and GET /books/{id}: only requested keys, id always present
+  - the SELECT list is pruned (books.description not read)
+  - computed / derived fields (in_stock, avg_rating) on the detail route
+  - GET /books/{id}/reviews and GET /orders sparse payloads
+  - unknown field names -> 422 FIELDS_INVALID
+  - fields participates in cache keys and ETags
+
+Sessions are expunged before each request so entities are loaded fresh with
+load_only() -- a stray access to a deferred column would fail under asyncio.
+"""
+
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.core.security import hash_password
+from app.orders.models import Order, OrderItem
+from app.reviews.repository import ReviewRepository
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def sparse_books(db_session: AsyncSession) -> list[Book]:
+    books = [
+        Book(
+            title="Sparse A",
+            author="Field Author",
+            price=Decimal("9.50"),
+            description="long " * 200,
+            stock_quantity=3,
+        ),
+        Book(
+            title="Sparse B",
+            author="Field Author",
+            price=Decimal("12.00"),
+            description="long " * 200,
+            stock_quantity=0,
+        ),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+@pytest_asyncio.fixture
+def statements(test_engine):
+    """Collect SQL statements executed during the test."""
+    captured: list[str] = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_execute)
+    yield captured
+    event.remove(test_engine.sync_engine, "before_cursor_execute", before_execute)
+
+
+async def _login(client: AsyncClient, db_session: AsyncSession, email: str) -> dict:
+    repo = UserRepository(db_session)
+    await repo.create(email=email, hashed_password=await hash_password("sparsepass1"))
+    await db_session.flush()
+    resp = await client.post(
+        "/auth/login", json={"email": email, "password": "sparsepass1"}
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def test_book_list_fields(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    sparse_books: list[Book],
+    statements: list[str],
+) -> None:
+    db_session.expunge_all()
+    resp = await client.get(
+        "/books", params={"author": "Field Author", "fields": "price, title"}
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["items"] == [
+        {"id": sparse_books[0].id, "title": "Sparse A", "price": "9.50"},
+        {"id": sparse_books[1].id, "title": "Sparse B", "price": "12.00"},
+    ]
+    assert body["total"] == 2 and body["has_more"] is False
+
+    page_query = next(s for s in statements if "LIMIT" in s and "books.title" in s)
+    assert "books.description" not in page_query
+    assert "books.cover_image_url" not in page_query
+
+
+async def test_book_list_fields_cached_separately(
+    client: AsyncClient, sparse_books: list[Book]
+) -> None:
+    params = {"author": "Field Author"}
+    sparse = await client.get("/books", params={**params, "fields": "title"})
+    full = await client.get("/books", params=params)
+    again = await client.get("/books", params={**params, "fields": "title,id"})
+    assert set(sparse.json()["items"][0]) == {"id", "title"}
+    assert "description" in full.json()["items"][0]
+    assert again.json() == sparse.json()
+
+
+async def test_book_list_unknown_field(client: AsyncClient) -> None:
+    resp = await client.get("/books", params={"fields": "title,secret"})
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "FIELDS_INVALID"
+
+
+async def test_book_detail_fields(
+    client: AsyncClient, db_session: AsyncSession, sparse_books: list[Book]
+) -> None:
+    a, b = sparse_books
+    user = await UserRepository(db_session).create(
+        email="sparse_reviewer@example.com", hashed_password="x"
+    )
+    await ReviewRepository(db_session).create(user.id, a.id, rating=4)
+    db_session.expunge_all()
+
+    resp = await client.get(
+        f"/books/{a.id}", params={"fields": "in_stock,avg_rating,title"}
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "id": a.id,
+        "title": "Sparse A",
+        "avg_rating": 4.0,
+        "in_stock": True,
+    }
+    resp = await client.get(f"/books/{b.id}", params={"fields": "in_stock"})
+    assert resp.json() == {"id": b.id, "in_stock": False}
+
+
+async def test_book_detail_etag_depends_on_fields(
+    client: AsyncClient, sparse_books: list[Book]
+) -> None:
+    book_id = sparse_books[0].id
+    sparse = await client.get(f"/books/{book_id}", params={"fields": "title"})
+    full = await client.get(f"/books/{book_id}")
+    assert sparse.headers["ETag"] != full.headers["ETag"]
+
+    resp = await client.get(
+        f"/books/{book_id}",
+        params={"fields": "title"},
+        headers={"If-None-Match": sparse.headers["ETag"]},
+    )
+    assert resp.status_code == 304
+
+
+async def test_review_list_fields(
+    client: AsyncClient, db_session: AsyncSession, sparse_books: list[Book]
+) -> None:
+    book = sparse_books[0]
+    user = await UserRepository(db_session).create(
+        email="sparse_rev@example.com", hashed_password="x"
+    )
+    review = await ReviewRepository(db_session).create(
+        user.id, book.id, rating=5, text="great"
+    )
+    db_session.expunge_all()
+
+    resp = await client.get(f"/books/{book.id}/reviews", params={"fields": "rating"})
+    assert resp.status_code == 200
+    assert resp.json()["items"] == [{"id": review.id, "rating": 5}]
+    assert resp.json()["total"] == 1
+
+    resp = await client.get(
+        f"/books/{book.id}/reviews", params={"fields": "author,verified_purchase"}
+    )
+    assert resp.json()["items"] == [
+        {
+            "id": review.id,
+            "verified_purchase": False,
+            "author": {
+                "user_id": user.id,
+                "display_name": "sparse_rev",
+                "avatar_url": None,
+            },
+        }
+    ]
+
+
+async def test_order_list_fields(
+    client: AsyncClient, db_session: AsyncSession, sparse_books: list[Book]
+) -> None:
+    headers = await _login(client, db_session, "sparse_orders@example.com")
+    user = await UserRepository(db_session).get_by_email("sparse_orders@example.com")
+    order = Order(
+        user_id=user.id,
+        total_amount=Decimal("31.00"),
+        item_count=2,
+        items=[
+            OrderItem(
+                book_id=sparse_books[0].id,
+                quantity=2,
+                unit_price=Decimal("9.50"),
+                title="Sparse A",
+                author="Field Author",
+            ),
+            OrderItem(
+                book_id=sparse_books[1].id,
+                quantity=1,
+                unit_price=Decimal("12.00"),
+                title="Sparse B",
+                author="Field Author",
+            ),
+        ],
+    )
+    db_session.add(order)
+    await db_session.flush()
+    db_session.expunge_all()
+
+    resp = await client.get(
+        "/orders", params={"fields": "status,total_price"}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"id": order.id, "status": "confirmed", "total_price": "31.00"}
+    ]
+
+    resp = await client.get(
+        "/orders",
+        params={"view": "summary", "fields": "status,total_price"},
+        headers=headers,
+    )
+    assert resp.json()["items"] == [
+        {"id": order.id, "status": "confirmed", "total_price": "31.00"}
+    ]
+
+    resp = await client.get(
+        "/orders",
+        params={"view": "full", "fields": "status,total_price"},
+        headers=headers,
+    )
+    assert resp.json()["items"] == [
+        {"id": order.id, "status": "confirmed", "total_price": "31.00"}
+    ]
+
+    resp = await client.get(
+        "/orders", params={"view": "full", "fields": "items"}, headers=headers
+    )
+    (body,) = resp.json()["items"]
+    assert set(body) == {"id", "items"}
+    assert {i["book"]["title"] for i in body["items"]} == {"Sparse A", "Sparse B"}
+
+    resp = await client.get("/orders", params={"fields": "total"}, headers=headers)
+    assert resp.status_code == 422
+
+    resp = await client.get(
+        "/orders", params={"view": "summary", "fields": "items"}, headers=headers
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,275 @@
+"""Tests for checkout stock reservations (CHECKOUT_STOCK_MODE="reserve").
+
+Coverage:
+  - reserve takes stock and holds it; release gives it back
+  - the sweeper releases only expired holds
+  - checkout leaves no holds behind, whether payment succeeds or is declined
+  - a hold swept while payment runs fails with ORDER_RESERVATION_EXPIRED,
+    refunds the charge and keeps the cart
+  - a partial confirm (one of several holds swept) or a failed order insert
+    gives back every hold and refunds the charge
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.core.deps import get_db
+from app.core.security import hash_password
+from app.main import app
+from app.orders.models import StockReservation
+from app.orders.repository import StockReservationRepository
+from app.orders.reservations import sweep_expired
+from app.users.models import User
+from app.users.repository import UserRepository
+
+
+@pytest_asyncio.fixture
+async def buyer(db_session: AsyncSession) -> User:
+    user = await UserRepository(db_session).create(
+        email="reserve_user@example.com",
+        hashed_password=await hash_password("reservepass1"),
+    )
+    await db_session.flush()
+    return user
+
+
+@pytest_asyncio.fixture
+async def buyer_headers(client: AsyncClient, buyer: User) -> dict:
+    resp = await client.post(
+        "/auth/login",
+        json={"email": "reserve_user@example.com", "password": "reservepass1"},
+    )
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def books(db_session: AsyncSession) -> list[Book]:
+    books = [
+        Book(title="Reserve A", author="R", price=Decimal("8.00"), stock_quantity=5),
+        Book(title="Reserve B", author="R", price=Decimal("3.50"), stock_quantity=2),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+    return books
+
+
+@pytest_asyncio.fixture
+async def rollback_on_error(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Give routes get_db's semantics: a failed request rolls back what it did not commit."""
+
+    async def override_get_db():
+        try:
+            yield db_session
+        except Exception:
+            await db_session.rollback()
+            raise
+
+    app.dependency_overrides[get_db] = override_get_db
+
+
+async def _stock(db_session: AsyncSession, books: list[Book]) -> list[int]:
+    rows = await db_session.execute(
+        select(Book.id, Book.stock_quantity).where(Book.id.in_([b.id for b in books]))
+    )
+    by_id = dict(rows.all())
+    return [by_id[b.id] for b in books]
+
+
+async def _holds(db_session: AsyncSession) -> int:
+    return await db_session.scalar(select(func.count()).select_from(StockReservation))
+
+
+async def test_reserve_then_release_restores_stock(
+    db_session: AsyncSession, buyer: User, books: list[Book]
+) -> None:
+    repo = StockReservationRepository(db_session)
+    expires_at = datetime.now(UTC) + timedelta(minutes=5)
+
+    taken = await repo.reserve(
+        "t1", buyer.id, {books[0].id: 2, books[1].id: 3}, expires_at
+    )
+    assert [(row.id, row.stock_quantity) for row in taken] == [(books[0].id, 3)]
+    assert await _stock(db_session, books) == [3, 2]
+    assert await _holds(db_session) == 1
+
+    assert await repo.release("t1") == [books[0].id]
+    assert await _stock(db_session, books) == [5, 2]
+    assert await _holds(db_session) == 0
+
+
+async def test_sweeper_releases_only_expired_holds(
+    db_session: AsyncSession, buyer: User, books: list[Book]
+) -> None:
+    repo = StockReservationRepository(db_session)
+    now = datetime.now(UTC)
+    await repo.reserve(
+        "old", buyer.id, {books[0].id: 1, books[1].id: 2}, now - timedelta(seconds=1)
+    )
+    await repo.reserve("new", buyer.id, {books[0].id: 1}, now + timedelta(minutes=5))
+    assert await _stock(db_session, books) == [3, 0]
+
+    assert await sweep_expired(db_session, batch_size=1) == 2
+    assert await _stock(db_session, books) == [4, 2]
+    assert await repo.confirm("new") == {books[0].id: 1}
+    assert await _holds(db_session) == 0
+
+
+async def _checkout(client: AsyncClient, headers: dict, **kwargs) -> object:
+    return await client.post(
+        "/orders/checkout",
+        json={"force_payment_failure": False},
+        headers=headers,
+        **kwargs,
+    )
+
+
+async def _fill_cart(client: AsyncClient, headers: dict, books: list[Book]) -> None:
+    for book, quantity in zip(books, (2, 1), strict=True):
+        resp = await client.post(
+            "/cart/items",
+            json={"book_id": book.id, "quantity": quantity},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+
+
+async def test_checkout_confirms_hold(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    buyer_headers: dict,
+    books: list[Book],
+) -> None:
+    await _fill_cart(client, buyer_headers, books)
+
+    with patch(
+        "app.orders.service.MockPaymentService.charge", new=AsyncMock(return_value=True)
+    ):
+        resp = await _checkout(client, buyer_headers)
+
+    assert resp.status_code == 201, resp.json()
+    assert await _stock(db_session, books) == [3, 1]
+    assert await _holds(db_session) == 0
+
+
+async def test_declined_payment_releases_hold(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    buyer_headers: dict,
+    books: list[Book],
+) -> None:
+    await _fill_cart(client, buyer_headers, books)
+
+    resp = await client.post(
+        "/orders/checkout", json={"force_payment_failure": True}, headers=buyer_headers
+    )
+
+    assert resp.status_code == 402
+    assert await _stock(db_session, books) == [5, 2]
+    assert await _holds(db_session) == 0
+
+
+@pytest.mark.usefixtures("rollback_on_error")
+async def test_hold_swept_during_payment_is_refunded(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    buyer_headers: dict,
+    books: list[Book],
+) -> None:
+    await _fill_cart(client, buyer_headers, books)
+
+    async def slow_gateway(self, **kwargs) -> bool:
+        await db_session.execute(
+            update(StockReservation).values(
+                expires_at=func.now() - timedelta(seconds=1)
+            )
+        )
+        await sweep_expired(db_session)
+        await db_session.commit()
+        return True
+
+    with (
+        patch("app.orders.service.MockPaymentService.charge", new=slow_gateway),
+        patch(
+            "app.orders.service.MockPaymentService.refund", new=AsyncMock()
+        ) as refund,
+    ):
+        resp = await _checkout(client, buyer_headers)
+
+    assert resp.status_code == 409
+    assert resp.json()["code"] == "ORDER_RESERVATION_EXPIRED"
+    refund.assert_awaited_once()
+    assert await _stock(db_session, books) == [5, 2]
+    cart = await client.get("/cart", headers=buyer_headers)
+    assert len(cart.json()["items"]) == 2
+
+
+@pytest.mark.usefixtures("rollback_on_error")
+async def test_partial_confirm_releases_remaining_holds(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    buyer_headers: dict,
+    books: list[Book],
+) -> None:
+    await _fill_cart(client, buyer_headers, books)
+
+    async def slow_gateway(self, **kwargs) -> bool:
+        await db_session.execute(
+            update(StockReservation)
+            .where(StockReservation.book_id == books[1].id)
+            .values(expires_at=func.now() - timedelta(seconds=1))
+        )
+        await sweep_expired(db_session)
+        await db_session.commit()
+        return True
+
+    with (
+        patch("app.orders.service.MockPaymentService.charge", new=slow_gateway),
+        patch(
+            "app.orders.service.MockPaymentService.refund", new=AsyncMock()
+        ) as refund,
+    ):
+        resp = await _checkout(client, buyer_headers)
+
+    assert resp.status_code == 409
+    assert resp.json()["code"] == "ORDER_RESERVATION_EXPIRED"
+    refund.assert_awaited_once()
+    assert await _stock(db_session, books) == [5, 2]
+    assert await _holds(db_session) == 0
+
+
+@pytest.mark.usefixtures("rollback_on_error")
+async def test_failed_order_insert_releases_holds_and_refunds(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    buyer_headers: dict,
+    books: list[Book],
+) -> None:
+    await _fill_cart(client, buyer_headers, books)
+
+    with (
+        patch(
+            "app.orders.service.MockPaymentService.charge",
+            new=AsyncMock(return_value=True),
+        ),
+        patch(
+            "app.orders.service.MockPaymentService.refund", new=AsyncMock()
+        ) as refund,
+        patch(
+            "app.orders.repository.OrderRepository.create_order",
+            new=AsyncMock(side_effect=RuntimeError("insert failed")),
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        await _checkout(client, buyer_headers)
+
+    refund.assert_awaited_once()
+    assert await _stock(db_session, books) == [5, 2]
+    assert await _holds(db_session) == 0
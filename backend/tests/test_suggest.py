@@ -0,0 +1,200 @@
+"""Tests for GET /books/suggest and the in-process prefix index behind it.
+
+Coverage:
+  - PrefixIndex: accent/case normalization, multi-word prefixes, popularity
+    ranking, upsert/remove keep the sorted token list and ranked postings consistent
+  - refresh(): full build, incremental pickup of updated books and of review
+    count changes, drops deleted books even when as many were created
+  - deleting a book through BookService drops it from the index at once
+  - Endpoint serves from the index and validates its parameters
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.books.models import Book
+from app.books.repository import BookRepository, GenreRepository
+from app.books.service import BookService
+from app.books.suggest import PrefixIndex, suggestion_index
+from app.orders.models import Order, OrderItem, OrderStatus
+from app.reviews.models import BookRatingStats
+from app.users.repository import UserRepository
+
+# ---------------------------------------------------------------------------
+# Unit: PrefixIndex
+# ---------------------------------------------------------------------------
+
+
+def _index() -> PrefixIndex:
+    index = PrefixIndex()
+    index.rebuild(
+        [
+            (1, "The Hobbit", "J.R.R. Tolkien", 5),
+            (2, "The Lord of the Rings", "J.R.R. Tolkien", 9),
+            (3, "Cien años de soledad", "Gabriel García Márquez", 1),
+            (4, "Lord Jim", "Joseph Conrad", 2),
+        ]
+    )
+    return index
+
+
+def test_prefix_matches_title_and_author_tokens() -> None:
+    index = _index()
+    assert [s.id for s in index.search("tolk")] == [2, 1]  # weight 9 before 5
+    assert [s.id for s in index.search("hob")] == [1]
+    assert index.search("xyz") == []
+    assert index.search("  ") == []
+
+
+def test_accents_and_case_are_normalized() -> None:
+    index = _index()
+    assert [s.id for s in index.search("GARCIA")] == [3]
+    assert [s.id for s in index.search("años")] == [3]
+
+
+def test_multi_word_prefix_requires_every_word() -> None:
+    index = _index()
+    assert [s.id for s in index.search("lord ri")] == [2]
+    assert [s.id for s in index.search("lord")] == [2, 4]
+    assert [s.id for s in index.search("lord", limit=1)] == [2]
+
+
+def test_upsert_and_remove_maintain_tokens() -> None:
+    index = _index()
+    index.upsert(4, "Heart of Darkness", "Joseph Conrad", 2)
+    assert [s.id for s in index.search("lord")] == [2]
+    assert [s.id for s in index.search("heart")] == [4]
+
+    index.upsert(1, "The Hobbit", "J.R.R. Tolkien", 12)
+    assert [s.id for s in index.search("tolk")] == [1, 2]
+
+    index.remove(4)
+    assert index.search("conrad") == []
+    assert index._tokens == sorted(index._postings)
+    assert all(ranks == sorted(ranks) for ranks in index._postings.values())
+    assert len(index) == 3
+
+
+# ---------------------------------------------------------------------------
+# Integration: refresh from the database and the endpoint
+# ---------------------------------------------------------------------------
+
+
+@pytest_asyncio.fixture
+async def suggest_books(db_session: AsyncSession) -> list[Book]:
+    """Two Dune books; the sequel has sold more copies."""
+    books = [
+        Book(title="Dune", author="Frank Herbert", price=Decimal("9.00")),
+        Book(title="Dune Messiah", author="Frank Herbert", price=Decimal("9.00")),
+    ]
+    db_session.add_all(books)
+    await db_session.flush()
+
+    user = await UserRepository(db_session).create(
+        email="suggest_buyer@example.com", hashed_password="x"
+    )
+    order = Order(user_id=user.id, status=OrderStatus.CONFIRMED)
+    order.items = [
+        OrderItem(book_id=books[1].id, quantity=3, unit_price=Decimal("9.00"))
+    ]
+    db_session.add(order)
+    await db_session.flush()
+    return books
+
+
+async def test_suggest_endpoint_ranks_by_popularity(
+    client: AsyncClient, db_session: AsyncSession, suggest_books: list[Book]
+) -> None:
+    await suggestion_index.refresh(db_session)
+
+    resp = await client.get("/books/suggest", params={"prefix": "dun"})
+    assert resp.status_code == 200
+    titles = [s["title"] for s in resp.json()["items"]]
+    assert titles == ["Dune Messiah", "Dune"]
+
+
+async def test_refresh_is_incremental_and_handles_deletes(
+    client: AsyncClient, db_session: AsyncSession, suggest_books: list[Book]
+) -> None:
+    await suggestion_index.refresh(db_session)
+    assert suggestion_index.search("children") == []
+
+    book = Book(title="Children of Dune", author="Frank Herbert", price=Decimal("9.00"))
+    db_session.add(book)
+    await db_session.flush()
+    await suggestion_index.refresh(db_session)
+    assert [s.id for s in suggestion_index.search("children")] == [book.id]
+
+    await db_session.delete(suggest_books[0])
+    await db_session.flush()
+    await suggestion_index.refresh(db_session)
+    ids = {s.id for s in suggestion_index.search("dune")}
+    assert suggest_books[0].id not in ids
+    assert book.id in ids
+
+
+async def test_refresh_drops_deleted_book_when_another_is_created(
+    db_session: AsyncSession, suggest_books: list[Book]
+) -> None:
+    """One delete and one create between refreshes leave the count unchanged."""
+    await suggestion_index.refresh(db_session)
+    size = len(suggestion_index)
+
+    await db_session.delete(suggest_books[0])
+    book = Book(title="Dune Chronicles", author="Frank Herbert", price=Decimal("9.00"))
+    db_session.add(book)
+    await db_session.flush()
+    await suggestion_index.refresh(db_session)
+
+    assert len(suggestion_index) == size
+    ids = {s.id for s in suggestion_index.search("dune")}
+    assert ids == {suggest_books[1].id, book.id}
+
+
+async def test_delete_book_drops_it_from_index(
+    db_session: AsyncSession, suggest_books: list[Book]
+) -> None:
+    await suggestion_index.refresh(db_session)
+
+    await BookService(
+        BookRepository(db_session), GenreRepository(db_session)
+    ).delete_book(suggest_books[0].id)
+
+    assert [s.id for s in suggestion_index.search("dune")] == [suggest_books[1].id]
+
+
+async def test_refresh_picks_up_review_count_changes(
+    db_session: AsyncSession, suggest_books: list[Book]
+) -> None:
+    """Review writes move book_rating_stats.updated_at, not Book.updated_at."""
+    dune, _ = suggest_books
+    await db_session.execute(
+        update(Book)
+        .where(Book.id.in_([b.id for b in suggest_books]))
+        .values(updated_at=func.now() - timedelta(days=1))
+    )
+    db_session.add(Book(title="Anchor", author="Recent", price=Decimal("1.00")))
+    await db_session.flush()
+    index = PrefixIndex()
+    await index.refresh(db_session)
+    assert [s.title for s in index.search("dune")] == ["Dune Messiah", "Dune"]
+
+    db_session.add(BookRatingStats(book_id=dune.id, review_count=5, rating_sum=20))
+    await db_session.flush()
+    await index.refresh(db_session)
+
+    assert [s.title for s in index.search("dune")] == ["Dune", "Dune Messiah"]
+
+
+async def test_suggest_validates_params(client: AsyncClient) -> None:
+    assert (await client.get("/books/suggest")).status_code == 422
+    assert (
+        await client.get("/books/suggest", params={"prefix": "a", "limit": 50})
+    ).status_code == 422
+    resp = await client.get("/books/suggest", params={"prefix": "nothing"})
+    assert resp.json() == {"items": []}
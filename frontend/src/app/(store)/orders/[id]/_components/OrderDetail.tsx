@@ -61,10 +61,10 @@ export function OrderDetail({ order, isConfirmed }: OrderDetailProps) {
           <div key={item.id} className="flex gap-4 py-3">
             {/* Book cover */}
             <div className="h-20 w-14 shrink-0 rounded overflow-hidden bg-muted flex items-center justify-center">
-              {item.book?.cover_image_url ? (
+              {item.cover_image_url ? (
                 <Image
-                  src={item.book.cover_image_url}
-                  alt={item.book?.title ?? 'Book cover'}
+                  src={item.cover_image_url}
+                  alt={item.title ?? 'Book cover'}
                   width={56}
                   height={80}
                   className="h-full w-full object-cover"
@@ -76,10 +76,10 @@ export function OrderDetail({ order, isConfirmed }: OrderDetailProps) {
             {/* Book details */}
             <div className="flex-1 min-w-0">
               <p className="font-medium text-sm truncate">
-                {item.book ? item.book.title : 'Deleted Book'}
+                {item.title ?? 'Deleted Book'}
               </p>
-              {item.book && (
-                <p className="text-xs text-muted-foreground">{item.book.author}</p>
+              {item.author && (
+                <p className="text-xs text-muted-foreground">{item.author}</p>
               )}
               <p className="text-xs text-muted-foreground mt-1">
                 Qty: {item.quantity} x ${parseFloat(item.unit_price).toFixed(2)}
@@ -1,22 +1,17 @@
-'use client'
-
-import { useState } from 'react'
 import Link from 'next/link'
 import { Button } from '@/components/ui/button'
 import type { components } from '@/types/api.generated'
 
-type OrderResponse = components['schemas']['OrderResponse']
-
-const PAGE_SIZE = 10
+type OrderSummaryResponse = components['schemas']['OrderSummaryResponse']
 
 interface OrderHistoryListProps {
-  orders: OrderResponse[]
+  orders: OrderSummaryResponse[]
+  nextCursor: string | null
+  isFirstPage: boolean
 }
 
-export function OrderHistoryList({ orders }: OrderHistoryListProps) {
-  const [page, setPage] = useState(1)
-
-  if (orders.length === 0) {
+export function OrderHistoryList({ orders, nextCursor, isFirstPage }: OrderHistoryListProps) {
+  if (orders.length === 0 && isFirstPage) {
     return (
       <div className="flex flex-col items-center justify-center py-16 text-center">
         <p className="text-muted-foreground mb-4">No orders yet.</p>
@@ -27,21 +22,17 @@ export function OrderHistoryList({ orders }: OrderHistoryListProps) {
     )
   }
 
-  const totalPages = Math.ceil(orders.length / PAGE_SIZE)
-  const pageOrders = orders.slice((page - 1) * PAGE_SIZE, page * PAGE_SIZE)
-
   return (
     <div>
       <div className="space-y-3">
-        {pageOrders.map((order) => {
-          const itemCount = order.items.length
-          const firstTitle = order.items[0]?.book?.title ?? 'Deleted Book'
+        {orders.map((order) => {
+          const firstTitle = order.first_title ?? 'Deleted Book'
           const itemSummary =
-            itemCount === 0
+            order.item_count === 0
               ? 'No items'
-              : itemCount === 1
+              : order.item_count === 1
               ? firstTitle
-              : `${firstTitle} +${itemCount - 1} more`
+              : `${firstTitle} +${order.item_count - 1} more`
 
           const orderDate = new Date(order.created_at).toLocaleDateString(undefined, {
             year: 'numeric',
@@ -68,27 +59,26 @@ export function OrderHistoryList({ orders }: OrderHistoryListProps) {
         })}
       </div>
 
-      {totalPages > 1 && (
+      {(!isFirstPage || nextCursor) && (
         <div className="flex items-center justify-center gap-4 mt-6">
-          <Button
-            variant="outline"
-            size="sm"
-            onClick={() => setPage((p) => p - 1)}
-            disabled={page === 1}
-          >
-            Previous
-          </Button>
-          <span className="text-sm text-muted-foreground">
-            Page {page} of {totalPages}
-          </span>
-          <Button
-            variant="outline"
-            size="sm"
-            onClick={() => setPage((p) => p + 1)}
-            disabled={page === totalPages}
-          >
-            Next
-          </Button>
+          {isFirstPage ? (
+            <Button variant="outline" size="sm" disabled>
+              Newest
+            </Button>
+          ) : (
+            <Button variant="outline" size="sm" asChild>
+              <Link href="/orders">Newest</Link>
+            </Button>
+          )}
+          {nextCursor ? (
+            <Button variant="outline" size="sm" asChild>
+              <Link href={`/orders?cursor=${encodeURIComponent(nextCursor)}`}>Older</Link>
+            </Button>
+          ) : (
+            <Button variant="outline" size="sm" disabled>
+              Older
+            </Button>
+          )}
         </div>
       )}
     </div>
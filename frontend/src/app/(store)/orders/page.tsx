@@ -1,30 +1,36 @@
 import { auth } from '@/auth'
 import { redirect } from 'next/navigation'
-import { fetchOrders } from '@/lib/orders'
+import { fetchOrders, type OrderSummaryPage } from '@/lib/orders'
 import { OrderHistoryList } from './_components/OrderHistoryList'
-import type { components } from '@/types/api.generated'
-
-type OrderResponse = components['schemas']['OrderResponse']
 
 export const metadata = {
   title: 'Order History',
 }
 
-export default async function OrdersPage() {
+type OrdersPageProps = {
+  searchParams: Promise<{ cursor?: string }>
+}
+
+export default async function OrdersPage({ searchParams }: OrdersPageProps) {
   const session = await auth()
   if (!session?.accessToken) redirect('/login')
 
-  let orders: OrderResponse[]
+  const { cursor } = await searchParams
+  let page: OrderSummaryPage
   try {
-    orders = await fetchOrders(session.accessToken)
+    page = await fetchOrders(session.accessToken, { cursor })
   } catch {
-    orders = []
+    page = { items: [], size: 0, next_cursor: null, has_more: false }
   }
 
   return (
     <div className="mx-auto max-w-3xl px-4 py-8">
       <h1 className="text-2xl font-bold mb-6">Order History</h1>
-      <OrderHistoryList orders={orders} />
+      <OrderHistoryList
+        orders={page.items}
+        nextCursor={page.next_cursor ?? null}
+        isFirstPage={!cursor}
+      />
     </div>
   )
 }
@@ -1,10 +1,20 @@
 import { apiFetch } from '@/lib/api'
 import type { components } from '@/types/api.generated'
 
-type OrderResponse = components['schemas']['OrderResponse']
+type OrderListResponse = components['schemas']['OrderListResponse']
+type OrderSummaryResponse = components['schemas']['OrderSummaryResponse']
 
-export async function fetchOrders(accessToken: string): Promise<OrderResponse[]> {
-  return apiFetch<OrderResponse[]>('/orders', {
+export type OrderSummaryPage = Omit<OrderListResponse, 'items'> & {
+  items: OrderSummaryResponse[]
+}
+
+export async function fetchOrders(
+  accessToken: string,
+  { cursor, size = 10 }: { cursor?: string; size?: number } = {}
+): Promise<OrderSummaryPage> {
+  const params = new URLSearchParams({ view: 'summary', size: String(size) })
+  if (cursor) params.set('cursor', cursor)
+  return apiFetch<OrderSummaryPage>(`/orders?${params}`, {
     headers: { Authorization: `Bearer ${accessToken}` },
   })
 }
@@ -412,7 +412,13 @@ export interface paths {
         };
         /**
          * List Orders
-         * @description Return the authenticated user's order history with line items.
+         * @description Return one page of the authenticated user's order history, newest first.
+         *
+         *     view=summary (default) returns id, status, created_at, item_count and
+         *     total_price from the orders row alone; line items are loaded only for
+         *     view=full. Pass next_cursor back as cursor= for the next page.
+         *     fields= returns only the named keys of the view's items; with view=full,
+         *     line items are not loaded unless items is requested.
          */
         get: operations["list_orders_orders_get"];
         put?: never;
@@ -1233,22 +1239,32 @@ export interface components {
         /**
          * OrderItemBookSummary
          * @description Minimal book info embedded in order item responses.
+         *
+         *     Built from the item's checkout snapshot. id is None once the book is
+         *     deleted. price is the unit price paid (same as the item's unit_price),
+         *     not the book's current price.
          */
         OrderItemBookSummary: {
             /** Id */
-            id: number;
+            id: number | null;
             /** Title */
             title: string;
             /** Author */
             author: string;
             /** Cover Image Url */
             cover_image_url: string | null;
-            /** Price */
+            /**
+             * Price
+             * @description Unit price paid at checkout, not the book's current price
+             */
             price: string | null;
         };
         /**
          * OrderItemResponse
          * @description Response schema for a single order item.
+         *
+         *     title, author, isbn and cover_image_url are the book as it was at checkout
+         *     (None only for lines whose book was deleted before snapshots were kept).
          */
         OrderItemResponse: {
             /** Id */
@@ -1259,7 +1275,42 @@ export interface components {
             quantity: number;
             /** Unit Price */
             unit_price: string;
-            book: components["schemas"]["OrderItemBookSummary"] | null;
+            /** Title */
+            title?: string | null;
+            /** Author */
+            author?: string | null;
+            /** Isbn */
+            isbn?: string | null;
+            /** Cover Image Url */
+            cover_image_url?: string | null;
+            /**
+             * @description The snapshot in its original nested shape (price: unit price paid).
+             *
+             *     Kept after the book is deleted, with id None; None only when the line
+             *     has no snapshot.
+             */
+            readonly book: components["schemas"]["OrderItemBookSummary"] | null;
+        };
+        /**
+         * OrderListResponse
+         * @description Paginated order history envelope for GET /orders.
+         *
+         *     items are OrderSummaryResponse for view=summary, OrderResponse for view=full.
+         *     next_cursor is an opaque token for the following page (pass as ?cursor=);
+         *     None on the last page.
+         */
+        OrderListResponse: {
+            /** Items */
+            items: components["schemas"]["OrderSummaryResponse"][] | components["schemas"]["OrderResponse"][];
+            /** Size */
+            size: number;
+            /** Next Cursor */
+            next_cursor?: string | null;
+            /**
+             * Has More
+             * @default false
+             */
+            has_more: boolean;
         };
         /**
          * OrderResponse
@@ -1283,6 +1334,32 @@ export interface components {
              */
             readonly total_price: string;
         };
+        /**
+         * OrderSummaryResponse
+         * @description One order without line items (GET /orders?view=summary).
+         *
+         *     item_count (lines) and total_price come from the order's denormalized
+         *     totals; total_price matches OrderResponse.total_price for the same order.
+         *     first_title is the title snapshot of the first line (None when the order
+         *     has no lines or that line has no snapshot).
+         */
+        OrderSummaryResponse: {
+            /** Id */
+            id: number;
+            /** Status */
+            status: string;
+            /**
+             * Created At
+             * Format: date-time
+             */
+            created_at: string;
+            /** Item Count */
+            item_count: number;
+            /** Total Price */
+            total_price: string;
+            /** First Title */
+            first_title?: string | null;
+        };
         /**
          * PreBookCreate
          * @description Request body for POST /prebooks.
@@ -2275,7 +2352,14 @@ export interface operations {
     };
     list_orders_orders_get: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description summary: totals only; full: with line items */
+                view?: "summary" | "full" | null;
+                size?: number | null;
+                cursor?: string | null;
+                /** @description Comma-separated order fields to return, e.g. status,created_at,total_price (id is always included) */
+                fields?: string | null;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -2288,7 +2372,16 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["OrderResponse"][];
+                    "application/json": components["schemas"]["OrderResponse"][] | components["schemas"]["OrderListResponse"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
                 };
             };
         };